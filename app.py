@@ -1,11 +1,13 @@
 import os
 import tkinter as tk
-from typing import Dict
+from typing import Dict, Optional
 
+from autosave_handler import AutosaveHandler
 from board import Board
 from menu import Menu
+from recent_boards import RecentBoards
 from toolbox import Toolbox
-import json
+from trace_recorder import TraceRecorder
 import pyglet
 
 
@@ -22,9 +24,12 @@ class App:
         root.title("Picasso")
         self.__root = root
         self.loaded_fonts: Dict[tuple[str, int], pyglet.font.Font] = {}
+        self.board: Optional[Board] = None
+        root.protocol("WM_DELETE_WINDOW", self.close)
         self.load_fonts()
         self.menu = Menu(self)
         self.show_menu_window()
+        self.menu.prompt_recovery()
 
     def get_root(self) -> tk.Tk:
         """
@@ -46,21 +51,23 @@ class App:
         """
         self.menu.hide()
         toolbox = Toolbox(self)
-        Board(self, toolbox, self.loaded_fonts)
+        self.board = Board(self, toolbox, self.loaded_fonts)
 
     def load_fonts(self) -> None:
         """
         Load the fonts from the "fonts" directory.
         """
         font_dir = "fonts"
-        for font_file in os.listdir(font_dir):
-            if font_file.endswith(".ttf"):
-                font_name = os.path.splitext(font_file)[0]
-                font_path = os.path.join(font_dir, font_file)
-                pyglet.font.add_file(font_path)
-                for size in range(8, 73, 4):  # Load font sizes from 8 to 72 in steps of 4
-                    pyglet_font = pyglet.font.load(font_name, size)
-                    self.loaded_fonts[(font_name, size)] = pyglet_font
+        with TraceRecorder.span("App.load_fonts", TraceRecorder.CATEGORY_FONTS):
+            for font_file in os.listdir(font_dir):
+                if font_file.endswith(".ttf"):
+                    font_name = os.path.splitext(font_file)[0]
+                    font_path = os.path.join(font_dir, font_file)
+                    with TraceRecorder.span(font_name, TraceRecorder.CATEGORY_FONTS):
+                        pyglet.font.add_file(font_path)
+                        for size in range(8, 73, 4):  # Load font sizes from 8 to 72 in steps of 4
+                            pyglet_font = pyglet.font.load(font_name, size)
+                            self.loaded_fonts[(font_name, size)] = pyglet_font
 
     def load_board(self, filename: str) -> None:
         """
@@ -68,9 +75,21 @@ class App:
 
         :param filename: The name of the file to load the board from.
         """
-        with open(filename, 'r') as f:
-            board_state = json.load(f)
         self.menu.hide()
         toolbox = Toolbox(self)
         board = Board(self, toolbox, self.loaded_fonts)
-        board.file_handler.load_objects(board_state['objects'])
+        self.board = board
+        board.file_handler.load_board(filename)
+        if os.path.abspath(filename) == os.path.abspath(AutosaveHandler.AUTOSAVE_PATH):
+            # A recovered board is closed cleanly like any other, so its autosave file goes with it
+            board.autosave_handler.owns_file = True
+        RecentBoards.add(filename)
+
+    def close(self) -> None:
+        """
+        Close the board, if any, and the application when the main window is closed.
+        """
+        if self.board is not None:
+            self.board.destroy()
+            self.board = None
+        self.__root.destroy()
@@ -0,0 +1,180 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from file_handler import FileHandler
+from image_handler import ImageHandler
+
+if TYPE_CHECKING:
+    from board import Board
+
+
+class AutosaveHandler:
+    """
+    A class that periodically saves the board in the background for crash recovery.
+
+    The board state is captured on the Tk thread from a cache of object states that is only refreshed for
+    changed objects, and written to disk on a worker thread.
+    """
+
+    AUTOSAVE_PATH = os.path.join(FileHandler.DEFAULT_DIR, "autosave.pcso")
+    DEFAULT_INTERVAL_MS = 60000
+
+    def __init__(self, board: 'Board', interval_ms: int = DEFAULT_INTERVAL_MS) -> None:
+        """
+        Initialize the AutosaveHandler.
+
+        :param board: The board instance.
+        :param interval_ms: The time between autosaves in milliseconds.
+        """
+        self.board = board
+        self.canvas = board.canvas
+        self.interval_ms = interval_ms
+        self.dirty: bool = False
+        self.state_cache: Dict[int, Dict[str, Any]] = {}
+        self.worker: Optional[threading.Thread] = None
+        self.after_id: Optional[str] = None
+        # True once the autosave file holds this board, so that closing the board cleanly removes it
+        self.owns_file: bool = False
+        board.add_objects_changed_listener(self.on_objects_changed)
+        self.schedule_autosave()
+
+    def on_objects_changed(self, change: str, objects: List[int]) -> None:
+        """
+        Mark the board as dirty and drop the cached state of the changed objects.
+
+        :param change: The change type.
+        :param objects: The IDs of the changed objects.
+        """
+        for obj in objects:
+            self.state_cache.pop(obj, None)
+        self.dirty = True
+
+    def schedule_autosave(self) -> None:
+        """
+        Schedule the next autosave.
+        """
+        self.after_id = self.board.app.get_root().after(self.interval_ms, self.autosave)
+
+    def autosave(self) -> None:
+        """
+        Capture a snapshot of a dirty board and write it on a worker thread.
+        """
+        if self.dirty and (self.worker is None or not self.worker.is_alive()):
+            snapshot = self.capture_snapshot()
+            self.dirty = False
+            images_data = self.board.image_handler.get_images_data(
+                ImageHandler.get_image_keys(obj_state for obj_state, _ in snapshot))
+            # Instance members keep their symbol tag, so their symbols are kept along with them
+            symbols_state = self.board.symbol_handler.get_definitions(
+                {obj_state['symbol'] for obj_state, _ in snapshot if obj_state.get('symbol')}
+                & set(self.board.symbol_handler.symbols))
+            self.worker = threading.Thread(target=self.write_snapshot,
+                                           args=(snapshot, self.board.layer_handler.get_layers_state(), images_data,
+                                                 symbols_state),
+                                           daemon=True)
+            self.worker.start()
+        self.schedule_autosave()
+
+    def capture_snapshot(self) -> List[Tuple[Dict[str, Any], int]]:
+        """
+        Capture the board state on the Tk thread.
+        Only objects changed since the last snapshot are read from the canvas; the cached states are
+        never modified, so they can be shared with the worker thread.
+
+        :return: A list of object states paired with their z-index. The objects of hidden layers come last,
+                 with their z-index within their layer.
+        """
+        positions = {obj: position for position, obj in enumerate(self.canvas.find_all())}
+        snapshot: List[Tuple[Dict[str, Any], int]] = []
+        for obj in self.board.objects:
+            if obj not in positions:
+                continue
+            obj_state = self.state_cache.get(obj)
+            if obj_state is None:
+                obj_state = self.board.file_handler.get_object_state(obj)
+                self.state_cache[obj] = obj_state
+            snapshot.append((obj_state, positions[obj]))
+        snapshot.extend((obj_state, obj_state['z-index'])
+                        for _, obj_state in self.board.layer_handler.get_hidden_objects())
+        return snapshot
+
+    def write_snapshot(self, snapshot: List[Tuple[Dict[str, Any], int]],
+                       layers_state: Optional[List[Dict[str, Any]]] = None,
+                       images_data: Optional[Dict[str, bytes]] = None,
+                       symbols_state: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> None:
+        """
+        Serialize a snapshot and atomically replace the autosave file.
+
+        :param snapshot: The object states paired with their z-index.
+        :param layers_state: The layers of the board, or None if it only has the default layer.
+        :param images_data: The file data of the images used by the snapshot, by content hash, if any.
+        :param symbols_state: The definitions of the symbols used by the snapshot, if any.
+        """
+        board_state: Dict[str, Any] = {
+            'objects': [dict(obj_state, **{'z-index': z_index}) for obj_state, z_index in snapshot],
+        }
+        if symbols_state:
+            board_state['symbols'] = symbols_state
+        if layers_state:
+            board_state['layers'] = layers_state
+        if images_data:
+            board_state['images'] = ImageHandler.encode_images(images_data)
+        temp_path = AutosaveHandler.AUTOSAVE_PATH + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(AutosaveHandler.AUTOSAVE_PATH), exist_ok=True)
+            with open(temp_path, 'w') as f:
+                json.dump(board_state, f)
+                f.write("\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, AutosaveHandler.AUTOSAVE_PATH)
+            self.owns_file = True
+        except OSError:
+            self.dirty = True
+
+    def mark_clean(self) -> None:
+        """
+        Mark the board as matching its saved state, so that it is not autosaved until it changes.
+        """
+        self.dirty = False
+
+    def discard(self) -> None:
+        """
+        Remove the autosave file, for example after the board has been saved explicitly.
+        """
+        self.dirty = False
+        if self.worker is not None:
+            self.worker.join()
+        if os.path.exists(AutosaveHandler.AUTOSAVE_PATH):
+            os.remove(AutosaveHandler.AUTOSAVE_PATH)
+        self.owns_file = False
+
+    def close(self) -> None:
+        """
+        Cancel the scheduled autosave and, as the board is closed cleanly, remove the autosave file if it holds
+        this board. An autosave file left by another session is kept for recovery.
+        """
+        self.stop()
+        if self.worker is not None:
+            self.worker.join()
+        if self.owns_file:
+            self.discard()
+
+    def stop(self) -> None:
+        """
+        Cancel the scheduled autosave.
+        """
+        if self.after_id is not None:
+            self.board.app.get_root().after_cancel(self.after_id)
+            self.after_id = None
+
+    @staticmethod
+    def has_recovery_file() -> bool:
+        """
+        Check whether an autosave from a previous session is available.
+
+        :return: True if an autosave file exists, False otherwise.
+        """
+        return os.path.exists(AutosaveHandler.AUTOSAVE_PATH)
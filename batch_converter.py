@@ -0,0 +1,204 @@
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image
+
+from autosave_handler import AutosaveHandler
+from board_reader import BoardReader
+from file_handler import FileHandler
+from object_renderer import ObjectRenderer
+from svg_writer import SvgWriter
+
+ConversionJob = Tuple[str, str, str]
+SkippedJob = Tuple[str, str, str, str]
+
+
+class BatchConverter:
+    """
+    A class that converts every board file in a directory tree, for example to regenerate previews overnight.
+
+    Boards are read without a canvas and converted in worker processes, one per CPU by default. A conversion
+    is skipped if its output is newer than its board file. The "pcso" format writes the board as a single
+    snapshot, with its journal folded in.
+    """
+
+    FORMATS = {"png": ".png", "jpeg": ".jpg", "svg": ".svg", "pcso": ".pcso"}
+    BOARD_EXTENSION = ".pcso"
+    BACKGROUND_COLOR = "white"
+    STATUS_CONVERTED = "converted"
+    STATUS_SKIPPED = "skipped"
+    STATUS_FAILED = "failed"
+    REASON_UP_TO_DATE = "output is up to date"
+    REASON_SAME_FILE = "output would overwrite the board"
+
+    def __init__(self, input_dir: str, output_dir: Optional[str] = None, formats: Sequence[str] = ("png",),
+                 workers: Optional[int] = None, force: bool = False) -> None:
+        """
+        Initialize the BatchConverter.
+
+        :param input_dir: The directory searched for board files, including its subdirectories.
+        :param output_dir: The directory the outputs are written to, mirroring the layout of the input
+                           directory, or None to write them next to the board files.
+        :param formats: The output formats, out of FORMATS.
+        :param workers: The number of worker processes, the CPU count if None. With one worker, the boards are
+                        converted in this process.
+        :param force: True to convert boards whose outputs are up to date as well.
+        :raises ValueError: If a format is not supported.
+        """
+        unknown = [output_format for output_format in formats if output_format not in BatchConverter.FORMATS]
+        if unknown:
+            raise ValueError(f"Unsupported formats: {', '.join(unknown)}")
+        self.input_dir = input_dir
+        self.output_dir = output_dir if output_dir is not None else input_dir
+        self.formats = list(formats)
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.force = force
+
+    def find_jobs(self) -> Tuple[List[ConversionJob], List[SkippedJob]]:
+        """
+        Find the board files and the outputs to write for them. Hidden directories, such as the export cache,
+        and the output directory are not searched, and the autosave file is not converted.
+
+        :return: The conversions to run, and the conversions skipped along with the reason they are skipped.
+        """
+        output_dir = os.path.abspath(self.output_dir)
+        autosave_path = os.path.abspath(AutosaveHandler.AUTOSAVE_PATH)
+        jobs: List[ConversionJob] = []
+        skipped: List[SkippedJob] = []
+        for root, dirs, files in os.walk(self.input_dir):
+            dirs[:] = sorted(name for name in dirs if not name.startswith(".")
+                             and os.path.abspath(os.path.join(root, name)) != output_dir)
+            for name in sorted(files):
+                if not name.lower().endswith(BatchConverter.BOARD_EXTENSION):
+                    continue
+                input_path = os.path.join(root, name)
+                if os.path.abspath(input_path) == autosave_path:
+                    continue
+                relative_root = os.path.splitext(os.path.relpath(input_path, self.input_dir))[0]
+                for output_format in self.formats:
+                    output_path = os.path.join(self.output_dir, relative_root + BatchConverter.FORMATS[output_format])
+                    if os.path.abspath(output_path) == os.path.abspath(input_path):
+                        # A board is never overwritten by its own conversion
+                        skipped.append((input_path, output_path, output_format, BatchConverter.REASON_SAME_FILE))
+                    elif not self.force and BatchConverter._is_up_to_date(input_path, output_path):
+                        skipped.append((input_path, output_path, output_format, BatchConverter.REASON_UP_TO_DATE))
+                    else:
+                        jobs.append((input_path, output_path, output_format))
+        return jobs, skipped
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Convert the boards.
+
+        :return: The summary, with the number of converted, skipped and failed conversions, the total time, and
+                 the status and time of every conversion, with the reason for skipped conversions.
+        """
+        start = time.perf_counter()
+        jobs, skipped = self.find_jobs()
+        if self.workers > 1 and len(jobs) > 1:
+            # Several boards per task, so that thousands of small boards do not wait on inter-process calls
+            chunk_size = max(1, math.ceil(len(jobs) / (self.workers * 4)))
+            with ProcessPoolExecutor(min(self.workers, len(jobs))) as executor:
+                results = list(executor.map(BatchConverter.convert, jobs, chunksize=chunk_size))
+        else:
+            results = [BatchConverter.convert(job) for job in jobs]
+        results.extend({'input': input_path, 'output': output_path, 'format': output_format,
+                        'status': BatchConverter.STATUS_SKIPPED, 'reason': reason, 'seconds': 0.0}
+                       for input_path, output_path, output_format, reason in skipped)
+        return {
+            BatchConverter.STATUS_CONVERTED: sum(result['status'] == BatchConverter.STATUS_CONVERTED
+                                                 for result in results),
+            BatchConverter.STATUS_SKIPPED: len(skipped),
+            BatchConverter.STATUS_FAILED: sum(result['status'] == BatchConverter.STATUS_FAILED for result in results),
+            'seconds': round(time.perf_counter() - start, 3),
+            'files': results,
+        }
+
+    @staticmethod
+    def convert(job: ConversionJob) -> Dict[str, Any]:
+        """
+        Convert a single board. This runs in the worker processes. A board that cannot be converted is reported
+        as failed rather than stopping the batch.
+
+        :param job: The board file, the output file and the output format.
+        :return: The result of the conversion, with the time it took.
+        """
+        input_path, output_path, output_format = job
+        result: Dict[str, Any] = {'input': input_path, 'output': output_path, 'format': output_format}
+        start = time.perf_counter()
+        try:
+            reader = BoardReader(input_path)
+            output_parent = os.path.dirname(output_path)
+            if output_parent:
+                os.makedirs(output_parent, exist_ok=True)
+            # The output is written under a temporary name, so that a failed conversion never leaves an output
+            # that looks up to date
+            temporary_path = output_path + ".tmp"
+            if output_format == "pcso":
+                with open(temporary_path, 'w') as f:
+                    f.write(json.dumps(reader.get_board_state()) + "\n")
+            elif output_format == "svg":
+                BatchConverter._write_svg(reader, temporary_path)
+            else:
+                BatchConverter._write_image(reader, temporary_path, output_format)
+            os.replace(temporary_path, output_path)
+            result['status'] = BatchConverter.STATUS_CONVERTED
+        except Exception as e:
+            result['status'] = BatchConverter.STATUS_FAILED
+            result['error'] = f"{type(e).__name__}: {e}"
+            if os.path.exists(output_path + ".tmp"):
+                os.remove(output_path + ".tmp")
+        result['seconds'] = round(time.perf_counter() - start, 3)
+        return result
+
+    @staticmethod
+    def _write_image(reader: BoardReader, file_path: str, output_format: str) -> None:
+        """
+        Render the visible objects of a board to a PNG or JPEG file, the same way as exporting it as an image.
+
+        :param reader: The board.
+        :param file_path: The path of the image file.
+        :param output_format: The output format, "png" or "jpeg".
+        """
+        objects_state = reader.get_visible_objects()
+        min_x, min_y, max_x, max_y = BoardReader.get_bounds(objects_state, FileHandler.MAX_COORDINATE_VALUE)
+        image = Image.new("RGBA", (max(1, int(max_x - min_x)), max(1, int(max_y - min_y))),
+                          BatchConverter.BACKGROUND_COLOR)
+        ObjectRenderer(image, min_x, min_y, images=reader.get_images(),
+                       full_resolution=True).draw_objects(objects_state)
+        if output_format == "jpeg":
+            image = image.convert("RGB")
+        image.save(file_path, output_format.upper())
+
+    @staticmethod
+    def _write_svg(reader: BoardReader, file_path: str) -> None:
+        """
+        Write the visible objects of a board to an SVG file.
+
+        :param reader: The board.
+        :param file_path: The path of the SVG file.
+        """
+        objects_state = reader.get_visible_objects()
+        min_x, min_y, max_x, max_y = BoardReader.get_bounds(objects_state, FileHandler.MAX_COORDINATE_VALUE)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            writer = SvgWriter(f, min_x, min_y, max_x - min_x, max_y - min_y)
+            writer.write_objects(objects_state)
+            writer.close()
+
+    @staticmethod
+    def _is_up_to_date(input_path: str, output_path: str) -> bool:
+        """
+        Check if an output is newer than its board file.
+
+        :param input_path: The board file.
+        :param output_path: The output file.
+        :return: True if the output exists and is newer, False otherwise.
+        """
+        try:
+            return os.stat(output_path).st_mtime_ns > os.stat(input_path).st_mtime_ns
+        except OSError:
+            return False
@@ -0,0 +1,406 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+import tkinter as tk
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from board import Board
+from export_cache import ExportCache
+from toolbox import Toolbox
+
+
+class BoardGenerator:
+    """
+    A class that generates reproducible synthetic boards made of pen strokes, shapes and text.
+    """
+
+    DEFAULT_EXTENT = (-2000, -2000, 2000, 2000)
+    PEN_STROKE_SHARE = 0.6
+    SHAPE_SHARE = 0.3
+    COLORS = ["black", "red", "green", "blue", "orange", "purple", "gray"]
+    FONT_SIZES = [8, 12, 16, 24]
+    STROKE_POINTS = (10, 40)
+    STROKE_STEP = 15
+    SHAPE_SIZE = (10, 200)
+
+    def __init__(self, seed: int = 0, extent: Tuple[int, int, int, int] = DEFAULT_EXTENT) -> None:
+        """
+        Initialize the BoardGenerator.
+
+        :param seed: The seed of the random generator.
+        :param extent: The board region the objects are placed in, as (x1, y1, x2, y2).
+        """
+        self.seed = seed
+        self.extent = extent
+
+    def generate(self, count: int) -> List[Dict[str, Any]]:
+        """
+        Generate the object states of a board. The same seed and count always give the same board.
+
+        :param count: The number of objects.
+        :return: The object states, in the format of the board file.
+        """
+        rng = random.Random(f"{self.seed}-{count}")
+        objects_state: List[Dict[str, Any]] = []
+        for z_index in range(count):
+            kind = rng.random()
+            if kind < BoardGenerator.PEN_STROKE_SHARE:
+                obj_state = self._pen_stroke(rng)
+            elif kind < BoardGenerator.PEN_STROKE_SHARE + BoardGenerator.SHAPE_SHARE:
+                obj_state = self._shape(rng)
+            else:
+                obj_state = self._text(rng)
+            obj_state['z-index'] = z_index
+            objects_state.append(obj_state)
+        return objects_state
+
+    def _random_point(self, rng: random.Random) -> Tuple[float, float]:
+        """
+        Pick a random point inside the extent.
+
+        :param rng: The random generator.
+        :return: The point as (x, y).
+        """
+        x1, y1, x2, y2 = self.extent
+        return rng.uniform(x1, x2), rng.uniform(y1, y2)
+
+    def _pen_stroke(self, rng: random.Random) -> Dict[str, Any]:
+        """
+        Generate a freehand pen stroke as a random walk.
+
+        :param rng: The random generator.
+        :return: The state of the line object.
+        """
+        x, y = self._random_point(rng)
+        coords = [x, y]
+        for _ in range(rng.randint(*BoardGenerator.STROKE_POINTS) - 1):
+            x += rng.uniform(-BoardGenerator.STROKE_STEP, BoardGenerator.STROKE_STEP)
+            y += rng.uniform(-BoardGenerator.STROKE_STEP, BoardGenerator.STROKE_STEP)
+            coords.extend([x, y])
+        return {'type': 'line', 'coords': coords, 'fill': rng.choice(BoardGenerator.COLORS),
+                'width': rng.randint(1, 10)}
+
+    def _shape(self, rng: random.Random) -> Dict[str, Any]:
+        """
+        Generate a rectangle, oval or triangle.
+
+        :param rng: The random generator.
+        :return: The state of the shape object.
+        """
+        x, y = self._random_point(rng)
+        width = rng.uniform(*BoardGenerator.SHAPE_SIZE)
+        height = rng.uniform(*BoardGenerator.SHAPE_SIZE)
+        item_type = rng.choice(['rectangle', 'oval', 'polygon'])
+        if item_type == 'polygon':
+            coords = [x, y + height, x + width / 2, y, x + width, y + height]
+        else:
+            coords = [x, y, x + width, y + height]
+        return {'type': item_type, 'coords': coords, 'fill': rng.choice(BoardGenerator.COLORS + [""]),
+                'outline': rng.choice(BoardGenerator.COLORS), 'width': rng.randint(1, 5)}
+
+    def _text(self, rng: random.Random) -> Dict[str, Any]:
+        """
+        Generate a text object.
+
+        :param rng: The random generator.
+        :return: The state of the text object.
+        """
+        x, y = self._random_point(rng)
+        words = rng.randint(1, 5)
+        return {'type': 'text', 'coords': [x, y], 'fill': rng.choice(BoardGenerator.COLORS), 'width': 0,
+                'font': f"{Toolbox.DEFAULT_TEXT_FONT_NAME} {rng.choice(BoardGenerator.FONT_SIZES)}",
+                'text': " ".join(f"word{rng.randint(0, 999)}" for _ in range(words))}
+
+
+class BenchmarkApp:
+    """
+    A minimal stand-in for the App that hosts a board without the menu window and the font loading.
+    """
+
+    def __init__(self, root: tk.Tk) -> None:
+        """
+        Initialize the BenchmarkApp.
+
+        :param root: The root Tk instance.
+        """
+        self.__root = root
+
+    def get_root(self) -> tk.Tk:
+        """
+        Get the root Tk instance.
+
+        :return: The root Tk instance.
+        """
+        return self.__root
+
+
+class Benchmark:
+    """
+    A class that times board operations on synthetic boards of different sizes against a real canvas.
+    """
+
+    DEFAULT_SIZES = [1000, 10000, 100000]
+    DEFAULT_REPEAT = 3
+    DEFAULT_OUTPUT = "benchmark_results.json"
+    ERASE_SWEEP_STEPS = 100
+    MOVE_STEPS = 20
+    SELECTION_FRACTION = 0.25
+
+    def __init__(self, root: tk.Tk, seed: int = 0, repeat: int = DEFAULT_REPEAT) -> None:
+        """
+        Initialize the Benchmark.
+
+        :param root: The root Tk instance.
+        :param seed: The seed of the board generator.
+        :param repeat: The number of timed runs per operation.
+        """
+        self.root = root
+        self.seed = seed
+        self.repeat = repeat
+        self.generator = BoardGenerator(seed)
+        self.results: List[Dict[str, Any]] = []
+        self.work_dir = tempfile.mkdtemp(prefix="picasso_benchmark_")
+        self.board_path = os.path.join(self.work_dir, "board.pcso")
+        self.source_path = os.path.join(self.work_dir, "source.pcso")
+        self.export_cache_dir = os.path.join(self.work_dir, "export_cache")
+        self.app = BenchmarkApp(root)
+        self.toolbox = Toolbox(self.app)  # type: ignore
+        self.board = Board(self.app, self.toolbox, {})  # type: ignore
+        # Synthetic boards must never replace the autosave file of the user's own board
+        self.board.autosave_handler.stop()
+        # Exports are cached apart from the user's cache, and the cache is cleared before every timed export
+        self.board.file_handler.export_cache = ExportCache(self.export_cache_dir)
+
+    def run(self, sizes: List[int]) -> List[Dict[str, Any]]:
+        """
+        Run all benchmarks for the given board sizes.
+
+        :param sizes: The numbers of objects of the generated boards.
+        :return: The results of all benchmarks.
+        """
+        for count in sizes:
+            self.run_size(count)
+        return self.results
+
+    def run_size(self, count: int) -> None:
+        """
+        Run all benchmarks for a single board size.
+
+        :param count: The number of objects of the generated board.
+        """
+        with open(self.source_path, 'w') as f:
+            json.dump({'objects': self.generator.generate(count)}, f)
+            f.write("\n")
+
+        self.time_operation("load", count, lambda: None, self.load_source)
+        self.time_operation("save", count, self._prepare_save,
+                            lambda: self.board.file_handler.save_board(self.board_path))
+        export_path = os.path.join(self.work_dir, "export.png")
+        self.time_operation("export", count, self._prepare_export,
+                            lambda: self.board.file_handler._export_board_as_image(export_path))
+        self.time_operation("erase_sweep", count, self.load_source, self.erase_sweep)
+        self.time_operation("rubber_band_select", count, self.load_source, self.rubber_band_select)
+        self.time_operation("move_selection", count, self._prepare_move, self.move_selection)
+
+    def time_operation(self, operation: str, count: int, setup: Callable[[], Any],
+                       operation_func: Callable[[], Any]) -> Dict[str, Any]:
+        """
+        Time an operation several times, including the redraw of the canvas it causes.
+
+        :param operation: The name of the operation.
+        :param count: The number of objects on the board.
+        :param setup: The untimed preparation run before every timed run.
+        :param operation_func: The operation to time.
+        :return: The result of the benchmark.
+        """
+        runs: List[float] = []
+        for _ in range(self.repeat):
+            setup()
+            self.root.update()
+            start = time.perf_counter()
+            operation_func()
+            self.root.update()
+            runs.append(time.perf_counter() - start)
+        result = {'operation': operation, 'objects': count, 'best': min(runs),
+                  'mean': sum(runs) / len(runs), 'runs': runs}
+        self.results.append(result)
+        print(f"{operation:<20} {count:>8} objects  best {result['best']:.4f}s  mean {result['mean']:.4f}s")
+        return result
+
+    def load_source(self) -> None:
+        """
+        Load the generated board.
+        """
+        self.board.file_handler.load_board(self.source_path)
+
+    def erase_sweep(self) -> None:
+        """
+        Drag the eraser once across the middle of the board.
+        """
+        x1, y1, x2, y2 = self.generator.extent
+        y = (y1 + y2) / 2
+        self.board.undo_handler.begin_group()
+        for step in range(Benchmark.ERASE_SWEEP_STEPS + 1):
+            self.board.canvas_utils.erase_objects(x1 + (x2 - x1) * step / Benchmark.ERASE_SWEEP_STEPS, y)
+        self.board.undo_handler.end_group()
+
+    def rubber_band_select(self) -> None:
+        """
+        Drag a selection frame over the central part of the board.
+        """
+        x1, y1, x2, y2 = self._selection_area()
+        selector = self.board.object_selector
+        selector.handle_select_tool_click(self._event_at(x1, y1))
+        selector.handle_select_tool_drag(self._event_at(x2, y2))
+        selector.handle_select_tool_release(self._event_at(x2, y2))
+
+    def move_selection(self) -> None:
+        """
+        Drag the selected objects in several steps.
+        """
+        x1, y1, _, _ = self._selection_area()
+        mover = self.board.object_mover
+        mover.start_move(self._event_at(x1, y1))
+        for step in range(1, Benchmark.MOVE_STEPS + 1):
+            mover.continue_move(self._event_at(x1 + step, y1 + step))
+        mover.end_move()
+
+    def write_results(self, filename: str) -> None:
+        """
+        Write the results together with the environment they were measured in.
+
+        :param filename: The name of the results file.
+        """
+        with open(filename, 'w') as f:
+            json.dump({
+                'commit': Benchmark.get_commit(),
+                'python': platform.python_version(),
+                'tk': self.root.tk.call('info', 'patchlevel'),
+                'platform': platform.platform(),
+                'seed': self.seed,
+                'repeat': self.repeat,
+                'results': self.results,
+            }, f, indent=4)
+
+    def destroy(self) -> None:
+        """
+        Destroy the board and the toolbox, and remove the generated files.
+        """
+        self.board.destroy()
+        self.toolbox.frame.destroy()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _prepare_save(self) -> None:
+        """
+        Remove the previously saved file so that every run writes a full snapshot.
+        """
+        if os.path.exists(self.board_path):
+            os.remove(self.board_path)
+
+    def _prepare_export(self) -> None:
+        """
+        Clear the export cache so that every run renders the whole board.
+        """
+        shutil.rmtree(self.export_cache_dir, ignore_errors=True)
+
+    def _prepare_move(self) -> None:
+        """
+        Reload the board and select the objects in the central part of the board.
+        """
+        self.load_source()
+        self.rubber_band_select()
+
+    def _selection_area(self) -> Tuple[float, float, float, float]:
+        """
+        Get the central part of the board used for selections.
+
+        :return: The area as (x1, y1, x2, y2).
+        """
+        x1, y1, x2, y2 = self.generator.extent
+        margin_x = (x2 - x1) * (1 - Benchmark.SELECTION_FRACTION) / 2
+        margin_y = (y2 - y1) * (1 - Benchmark.SELECTION_FRACTION) / 2
+        return x1 + margin_x, y1 + margin_y, x2 - margin_x, y2 - margin_y
+
+    def _event_at(self, x: float, y: float) -> 'tk.Event[tk.Misc]':
+        """
+        Create a mouse event at a board position.
+
+        :param x: The x-coordinate on the board.
+        :param y: The y-coordinate on the board.
+        :return: The event with window coordinates.
+        """
+        event: 'tk.Event[tk.Misc]' = tk.Event()
+        event.x = int(x - self.board.canvas.canvasx(0))
+        event.y = int(y - self.board.canvas.canvasy(0))
+        return event
+
+    @staticmethod
+    def get_commit() -> Optional[str]:
+        """
+        Get the commit the benchmark runs on.
+
+        :return: The commit hash, or None if it is not available.
+        """
+        try:
+            return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Tuple[str, int, float]]:
+    """
+    Compare the best times of two benchmark result files.
+
+    :param baseline: The results to compare against.
+    :param current: The new results.
+    :return: The operation, object count and ratio of current to baseline time for every common benchmark.
+    """
+    baseline_times = {(result['operation'], result['objects']): result['best'] for result in baseline['results']}
+    ratios: List[Tuple[str, int, float]] = []
+    for result in current['results']:
+        baseline_time = baseline_times.get((result['operation'], result['objects']))
+        if baseline_time:
+            ratios.append((result['operation'], result['objects'], result['best'] / baseline_time))
+    return ratios
+
+
+def main() -> None:
+    """
+    Run the benchmark suite from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark board operations on synthetic boards.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=Benchmark.DEFAULT_SIZES,
+                        help="the numbers of objects of the generated boards")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the board generator")
+    parser.add_argument("--repeat", type=int, default=Benchmark.DEFAULT_REPEAT, help="the timed runs per operation")
+    parser.add_argument("--output", default=Benchmark.DEFAULT_OUTPUT, help="the JSON file to write the results to")
+    parser.add_argument("--compare", help="a previous results file to compare against")
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    benchmark = Benchmark(root, args.seed, args.repeat)
+    try:
+        benchmark.run(args.sizes)
+        benchmark.write_results(args.output)
+    finally:
+        benchmark.destroy()
+        root.destroy()
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        with open(args.output, 'r') as f:
+            current = json.load(f)
+        for operation, count, ratio in compare_results(baseline, current):
+            print(f"{operation:<20} {count:>8} objects  {ratio:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,12 @@
 import tkinter as tk
-from typing import List, Optional, Dict, Any, TYPE_CHECKING
+from typing import Callable, List, Optional, Dict, Any, TYPE_CHECKING
 from shape_handler import ShapeHandler
+from group_handler import GroupHandler
+from symbol_handler import SymbolHandler
+from layer_handler import LayerHandler
+from image_handler import ImageHandler
 from object_selector import ObjectSelector
+from selection_transformer import SelectionTransformer
 from object_mover import ObjectMover
 from object_editor import ObjectEditor
 from fill_handler import FillHandler
@@ -9,6 +14,13 @@ from canvas_utils import CanvasUtils
 from menu_handler import MenuHandler
 from text_entry_handler import TextEntryHandler
 from file_handler import FileHandler
+from autosave_handler import AutosaveHandler
+from undo_handler import UndoHandler
+from minimap import Minimap
+from latency_monitor import LatencyMonitor
+from canvas_profiler import CanvasProfiler
+from trace_recorder import TraceRecorder
+from event_recorder import EventRecorder
 from toolbox import Toolbox
 
 if TYPE_CHECKING:
@@ -22,6 +34,12 @@ class Board:
 
     CANVAS_SCROLLREGION = (-5000, -5000, 5000, 5000)
 
+    CHANGE_CREATE = "create"
+    CHANGE_MOVE = "move"
+    CHANGE_RESTYLE = "restyle"
+    CHANGE_REORDER = "reorder"
+    CHANGE_DELETE = "delete"
+
     def __init__(self, app: 'App', toolbox: 'Toolbox', loaded_fonts: Dict[tuple[str, int], Any]) -> None:
         """
         Initialize the Board.
@@ -42,6 +60,7 @@ class Board:
         self.eraser_frame: Optional[int] = None
         self.right_click_x: float = 0
         self.right_click_y: float = 0
+        self.objects_changed_listeners: List[Callable[[str, List[int]], None]] = []
 
         self.x_scrollbar = tk.Scrollbar(self.app.get_root(), orient=tk.HORIZONTAL)
         self.y_scrollbar = tk.Scrollbar(self.app.get_root(), orient=tk.VERTICAL)
@@ -49,14 +68,28 @@ class Board:
                                            yscrollcommand=self.y_scrollbar.set)
         self.setup_canvas()
         self.shape_handler: ShapeHandler = ShapeHandler(self)
+        self.group_handler: GroupHandler = GroupHandler(self)
+        self.symbol_handler: SymbolHandler = SymbolHandler(self)
+        self.layer_handler: LayerHandler = LayerHandler(self)
+        self.image_handler: ImageHandler = ImageHandler(self)
         self.object_selector: ObjectSelector = ObjectSelector(self)
+        self.selection_transformer: SelectionTransformer = SelectionTransformer(self)
         self.object_mover: ObjectMover = ObjectMover(self)
         self.object_editor: ObjectEditor = ObjectEditor(self)
         self.flood_fill: FillHandler = FillHandler(self)
         self.canvas_utils: CanvasUtils = CanvasUtils(self)
         self.text_entry_handler: TextEntryHandler = TextEntryHandler(self)
         self.file_handler: FileHandler = FileHandler(self)
+        self.autosave_handler: AutosaveHandler = AutosaveHandler(self)
+        self.undo_handler: UndoHandler = UndoHandler(self)
         self.menu_handler: MenuHandler = MenuHandler(self)
+        self.minimap: Minimap = Minimap(self)
+        self.latency_monitor: Optional[LatencyMonitor] = LatencyMonitor(self) if LatencyMonitor.ENABLED else None
+        self.canvas_profiler: Optional[CanvasProfiler] = CanvasProfiler(self) if CanvasProfiler.ENABLED else None
+        if TraceRecorder.active is not None:
+            TraceRecorder.active.install(self)
+        self.event_recorder: Optional[EventRecorder] = (EventRecorder(self, EventRecorder.RECORD_PATH)
+                                                        if EventRecorder.RECORD_PATH else None)
 
         self.setup_bindings()
         self.on_tool_selected(self.toolbox.current_tool)
@@ -91,7 +124,9 @@ class Board:
         self.last_y = self.canvas.canvasy(event.y)
         if self.toolbox.current_tool == "Select":
             current = self.canvas.find_withtag(tk.CURRENT)
-            if current:
+            if current and self.selection_transformer.is_handle(current[0]):
+                self.selection_transformer.start_transform(event, current[0])
+            elif current:
                 clicked_object = current[0]
                 if clicked_object not in self.object_selector.selected_objects:
                     self.object_selector.select_object(clicked_object)
@@ -105,6 +140,7 @@ class Board:
         elif self.toolbox.current_tool == "Text":
             self.text_entry_handler.create_text_entry(event)
         elif self.toolbox.current_tool == "Erase":
+            self.undo_handler.begin_group()
             self.canvas_utils.erase_objects(self.last_x, self.last_y)
         else:
             self.drawing = True
@@ -126,7 +162,9 @@ class Board:
                     selected_object = self.object_selector.selected_objects[0]
                     item_type = self.canvas.type(selected_object)  # type: ignore
                     self.menu_handler.display_context_menu(event, item_type)
-            elif self.object_editor.copied_object is not None:
+                elif self.object_selector.selected_objects:
+                    self.menu_handler.display_selection_context_menu(event, self.object_selector.selected_types)
+            elif self.object_editor.clipboard is not None:
                 self.menu_handler.paste_context_menu(event)
         else:
             item_type = self.canvas.type(current_object[0])  # type: ignore
@@ -134,6 +172,8 @@ class Board:
                 self.object_selector.select_object(current_object[0])
             if len(self.object_selector.selected_objects) == 1:
                 self.menu_handler.display_context_menu(event, item_type)
+            elif self.object_selector.selected_objects:
+                self.menu_handler.display_selection_context_menu(event, self.object_selector.selected_types)
 
     def handle_drag_event(self, event: 'tk.Event[tk.Misc]') -> None:
         """
@@ -149,7 +189,9 @@ class Board:
         elif self.toolbox.current_tool == "Pen":
             self.shape_handler.draw_pen(canvas_x, canvas_y)
         elif self.toolbox.current_tool == "Select":
-            if self.object_mover.is_moving:
+            if self.selection_transformer.is_transforming:
+                self.selection_transformer.continue_transform(event)
+            elif self.object_mover.is_moving:
                 self.object_mover.continue_move(event)
             elif self.object_selector.is_click_inside_selection_frame(event):
                 self.object_mover.start_move(event)
@@ -172,16 +214,41 @@ class Board:
         elif self.toolbox.current_tool == "Pen":
             self.shape_handler.pen_points = []
         elif self.toolbox.current_tool == "Select":
+            self.selection_transformer.end_transform()
             self.object_selector.handle_select_tool_release(event)
             self.object_mover.end_move()
+        elif self.toolbox.current_tool == "Erase":
+            self.undo_handler.end_group()
 
         if self.shape_handler.current_object:
             self.objects.append(self.shape_handler.current_object)
+            self.notify_objects_changed(Board.CHANGE_CREATE, [self.shape_handler.current_object])
+            self.undo_handler.record_create([self.shape_handler.current_object])
 
         self.drawing = False
         self.shape_handler.current_object = 0
         self.shape_handler.current_object_tag = ""
 
+    def add_objects_changed_listener(self, listener: Callable[[str, List[int]], None]) -> None:
+        """
+        Add a listener to be called when board objects are created, moved, restyled, reordered or deleted.
+
+        :param listener: The listener function, called with the change type and the affected object IDs.
+        """
+        self.objects_changed_listeners.append(listener)
+
+    def notify_objects_changed(self, change: str, objects: List[int]) -> None:
+        """
+        Notify the listeners that board objects have changed.
+        Deletions are reported before the objects are removed from the canvas.
+
+        :param change: The change type, one of the Board.CHANGE_* constants.
+        :param objects: The IDs of the affected objects.
+        """
+        if objects:
+            for listener in self.objects_changed_listeners:
+                listener(change, objects)
+
     def on_tool_selected(self, tool: str) -> None:
         """
         Handle the tool selection event.
@@ -219,6 +286,14 @@ class Board:
         """
         Destroy the board and its associated widgets.
         """
+        self.autosave_handler.close()
+        if self.latency_monitor is not None:
+            self.latency_monitor.stop()
+        if self.canvas_profiler is not None:
+            self.canvas_profiler.stop()
+        if self.event_recorder is not None:
+            self.event_recorder.stop()
+        self.minimap.destroy()
         self.canvas.destroy()
         self.x_scrollbar.destroy()
         self.y_scrollbar.destroy()
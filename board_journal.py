@@ -0,0 +1,220 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class BoardJournal:
+    """
+    A class that tracks board changes since the last save and replays the operation journal of a board file.
+
+    A board file starts with a snapshot line holding the board state. Every incremental save appends one
+    JSON record per line. Objects are referenced by their position in the snapshot, and objects created
+    later get the next free ID.
+    """
+
+    COMPACTION_RATIO = 0.5
+
+    OP_CREATE = "create"
+    OP_MOVE = "move"
+    OP_RESTYLE = "restyle"
+    OP_REORDER = "reorder"
+    OP_DELETE = "delete"
+
+    _BOTTOM = -1
+
+    def __init__(self) -> None:
+        """
+        Initialize the BoardJournal.
+        """
+        self.filename: Optional[str] = None
+        self.base_size: int = 0
+        self.journal_size: int = 0
+        self.object_ids: Dict[int, int] = {}
+        self.next_id: int = 0
+        self.pending: Dict[int, Set[str]] = {}
+        self.snapshot_required: bool = False
+
+    def reset(self, filename: Optional[str] = None, base_size: int = 0, journal_size: int = 0,
+              object_ids: Optional[Dict[int, int]] = None) -> None:
+        """
+        Start tracking changes against a freshly written or loaded board file.
+
+        :param filename: The board file, or None if the board is not backed by a file.
+        :param base_size: The size of the snapshot in the board file.
+        :param journal_size: The size of the journal records already in the board file.
+        :param object_ids: The mapping of canvas object IDs to journal object IDs.
+        """
+        self.filename = filename
+        self.base_size = base_size
+        self.journal_size = journal_size
+        self.object_ids = object_ids if object_ids is not None else {}
+        self.next_id = max(self.object_ids.values(), default=-1) + 1
+        self.pending = {}
+        self.snapshot_required = False
+
+    def on_objects_changed(self, change: str, objects: List[int]) -> None:
+        """
+        Record that objects have changed since the last save.
+
+        :param change: The change type, which matches the journal operation names.
+        :param objects: The IDs of the changed objects.
+        """
+        for obj in objects:
+            ops = self.pending.setdefault(obj, set())
+            if change == BoardJournal.OP_DELETE:
+                if BoardJournal.OP_CREATE in ops:
+                    del self.pending[obj]
+                else:
+                    self.pending[obj] = {BoardJournal.OP_DELETE}
+            elif BoardJournal.OP_CREATE not in ops:
+                ops.add(change)
+
+    def has_pending_changes(self) -> bool:
+        """
+        Check whether there are changes since the last save, including changes that need a new snapshot.
+
+        :return: True if there are unsaved changes, False otherwise.
+        """
+        return bool(self.pending) or self.snapshot_required
+
+    def can_append(self, filename: str, size: int) -> bool:
+        """
+        Check whether records of the given size can be appended to the board file without compaction.
+
+        :param filename: The board file being saved.
+        :param size: The size of the records to append.
+        :return: True if the records should be appended, False if a new snapshot should be written.
+        """
+        return (self.is_tracking(filename) and not self.snapshot_required
+                and self.journal_size + size <= self.base_size * BoardJournal.COMPACTION_RATIO)
+
+    def is_tracking(self, filename: str) -> bool:
+        """
+        Check whether changes are tracked against the given board file, however its path is written.
+
+        :param filename: The board file.
+        :return: True if the file exists and is the tracked board file, False otherwise.
+        """
+        if self.filename is None or not os.path.exists(filename):
+            return False
+        try:
+            return os.path.samefile(filename, self.filename)
+        except OSError:
+            return os.path.abspath(filename) == os.path.abspath(self.filename)
+
+    def require_snapshot(self) -> None:
+        """
+        Make the next save write a new snapshot, for example when the board gets state that the journal
+        records cannot hold, such as a new symbol definition.
+        """
+        self.snapshot_required = True
+
+    def allocate_id(self, obj: int) -> int:
+        """
+        Assign a journal ID to a newly created object.
+
+        :param obj: The canvas ID of the object.
+        :return: The journal ID.
+        """
+        object_id = self.next_id
+        self.next_id += 1
+        self.object_ids[obj] = object_id
+        return object_id
+
+    @staticmethod
+    def read_board_file(filename: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]], int, int]:
+        """
+        Read the snapshot and the journal records of a board file.
+
+        :param filename: The name of the board file.
+        :return: The board state, the journal records, the snapshot size and the journal size. The snapshot
+                 size is 0 if records cannot be appended to the file, as for files written by older versions
+                 without a trailing newline, so that the next save writes a new snapshot.
+        """
+        with open(filename, 'r') as f:
+            snapshot_line = f.readline()
+            try:
+                board_state = json.loads(snapshot_line)
+            except json.JSONDecodeError:
+                f.seek(0)
+                return json.load(f), [], 0, 0
+            records: List[Dict[str, Any]] = []
+            journal_size = 0
+            for line in f:
+                journal_size += len(line)
+                if line.strip():
+                    records.append(json.loads(line))
+        if not snapshot_line.endswith("\n"):
+            return board_state, records, 0, journal_size
+        return board_state, records, len(snapshot_line), journal_size
+
+    @staticmethod
+    def replay(objects_state: List[Dict[str, Any]],
+               records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        Apply journal records to the snapshot objects without touching the canvas.
+
+        :param objects_state: The object states of the snapshot.
+        :param records: The journal records, oldest first.
+        :return: The resulting object states and their journal IDs.
+        """
+        if not records:
+            return objects_state, list(range(len(objects_state)))
+
+        states: Dict[int, Dict[str, Any]] = dict(enumerate(objects_state))
+        # The stacking order is kept as a doubly linked list so that every record is applied in constant time.
+        above: Dict[int, Optional[int]] = {BoardJournal._BOTTOM: None}
+        below: Dict[int, int] = {}
+
+        def link(object_id: int, below_id: Optional[int]) -> None:
+            lower = below_id if below_id in above else BoardJournal._BOTTOM
+            upper = above[lower]
+            above[lower] = object_id
+            below[object_id] = lower
+            above[object_id] = upper
+            if upper is not None:
+                below[upper] = object_id
+
+        def unlink(object_id: int) -> None:
+            lower = below.pop(object_id)
+            upper = above.pop(object_id)
+            above[lower] = upper
+            if upper is not None:
+                below[upper] = lower
+
+        previous: Optional[int] = None
+        for object_id in sorted(states, key=lambda x: states[x]['z-index']):
+            link(object_id, previous)
+            previous = object_id
+
+        for record in records:
+            op = record['op']
+            object_id = record['id']
+            if op == BoardJournal.OP_CREATE:
+                if object_id in states:
+                    unlink(object_id)
+                states[object_id] = dict(record['state'])
+                link(object_id, record.get('below'))
+            elif object_id not in states:
+                continue
+            elif op == BoardJournal.OP_DELETE:
+                unlink(object_id)
+                del states[object_id]
+            elif op == BoardJournal.OP_MOVE:
+                states[object_id]['coords'] = record['coords']
+            elif op == BoardJournal.OP_RESTYLE:
+                states[object_id].update(record['state'])
+            elif op == BoardJournal.OP_REORDER:
+                unlink(object_id)
+                link(object_id, record.get('below'))
+
+        replayed_states: List[Dict[str, Any]] = []
+        object_ids: List[int] = []
+        current = above[BoardJournal._BOTTOM]
+        while current is not None:
+            obj_state = states[current]
+            obj_state['z-index'] = len(replayed_states)
+            replayed_states.append(obj_state)
+            object_ids.append(current)
+            current = above[current]
+        return replayed_states, object_ids
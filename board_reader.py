@@ -0,0 +1,108 @@
+import base64
+from typing import Any, Dict, List, Optional, Tuple
+
+from board_journal import BoardJournal
+from clipboard import Clipboard
+from deep_zoom_writer import DeepZoomWriter
+from image_pyramid import ImagePyramid
+from layer_handler import LayerHandler
+from symbol_handler import SymbolHandler
+
+
+class BoardReader:
+    """
+    A class that reads a board file into object states without a canvas, so that boards can be converted and
+    rendered outside the application, for example in worker processes.
+
+    The journal of the file is replayed onto its snapshot and symbol instances are expanded, the same way as
+    when a board is loaded, and the objects are stacked layer by layer.
+    """
+
+    EMPTY_BOUNDS = (-100.0, -100.0, 100.0, 100.0)
+
+    def __init__(self, filename: str) -> None:
+        """
+        Initialize the BoardReader and read the board file.
+
+        :param filename: The name of the board file.
+        :raises OSError: If the file cannot be read.
+        :raises ValueError: If the file is not a board file.
+        """
+        self.filename = filename
+        board_state, records, _, _ = BoardJournal.read_board_file(filename)
+        self.layers: List[Dict[str, Any]] = board_state.get('layers', [])
+        self.symbols_state: Dict[str, List[Dict[str, Any]]] = board_state.get('symbols', {})
+        self.images_state: Dict[str, str] = board_state.get('images', {})
+        self.symbols = {symbol: Clipboard.from_states(objects_state)
+                        for symbol, objects_state in self.symbols_state.items()}
+        objects_state, _ = BoardJournal.replay(
+            SymbolHandler.expand_instances(board_state['objects'], self.symbols), records)
+        self.objects_state = sorted(objects_state, key=lambda obj_state: (
+            self._get_rank(obj_state.get('layer')), obj_state['z-index']))
+        for z_index, obj_state in enumerate(self.objects_state):
+            obj_state['z-index'] = z_index
+        self._images: Dict[str, ImagePyramid] = {}
+
+    def get_visible_objects(self) -> List[Dict[str, Any]]:
+        """
+        Get the objects of the visible layers.
+
+        :return: The object states, bottom-most first.
+        """
+        hidden = {info['id'] for info in self.layers if not info['visible']}
+        return [obj_state for obj_state in self.objects_state
+                if obj_state.get('layer', LayerHandler.DEFAULT_LAYER) not in hidden]
+
+    def get_images(self) -> Dict[str, ImagePyramid]:
+        """
+        Get the images of the board. They are decoded from the file data the first time they are asked for.
+
+        :return: The images, by content hash.
+        """
+        if not self._images and self.images_state:
+            self._images = {key: ImagePyramid(base64.b64decode(encoded)) for key, encoded in self.images_state.items()}
+        return self._images
+
+    def get_board_state(self) -> Dict[str, Any]:
+        """
+        Get the board in the form of a board file snapshot, with the journal folded in.
+
+        :return: The board state.
+        """
+        board_state: Dict[str, Any] = {'objects': self.objects_state}
+        if self.symbols_state:
+            board_state['symbols'] = self.symbols_state
+        if self.images_state:
+            board_state['images'] = self.images_state
+        if self.layers:
+            board_state['layers'] = self.layers
+        return board_state
+
+    @staticmethod
+    def get_bounds(objects_state: List[Dict[str, Any]], limit: float) -> Tuple[float, float, float, float]:
+        """
+        Get the bounding box of objects, including line widths and an estimate of text size.
+
+        :param objects_state: The object states.
+        :param limit: The largest absolute coordinate of the bounding box.
+        :return: The bounding box as (min x, min y, max x, max y), or a small area around the origin if there
+                 are no objects.
+        """
+        objects_state = [obj_state for obj_state in objects_state if obj_state['coords']]
+        if not objects_state:
+            return BoardReader.EMPTY_BOUNDS
+        bounds = DeepZoomWriter.get_bounds(objects_state)
+        min_x, min_y = bounds[:, :2].min(axis=0)
+        max_x, max_y = bounds[:, 2:].max(axis=0)
+        return (max(float(min_x), -limit), max(float(min_y), -limit),
+                min(float(max_x), limit), min(float(max_y), limit))
+
+    def _get_rank(self, layer: Optional[str]) -> int:
+        """
+        Get the position of a layer in the stacking order.
+
+        :param layer: The layer tag, or None for the default layer.
+        :return: The position of the layer, 0 for the bottom-most layer.
+        """
+        layer = layer or LayerHandler.DEFAULT_LAYER
+        return next((rank for rank, info in enumerate(self.layers) if info['id'] == layer), 0)
@@ -0,0 +1,176 @@
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from latency_monitor import LatencyMonitor
+
+if TYPE_CHECKING:
+    from board import Board
+
+
+class CanvasProfiler:
+    """
+    A class that counts and times the Tcl round trips made through the board canvas.
+
+    Every profiled canvas method is replaced on the canvas instance by a counting wrapper, so the canvas
+    stays a real widget. Each call is attributed to the board event handler that is running and to the
+    line of code that made the call. The profiler is opt-in: it is only created when ENABLED is set, for
+    example with the --profile-canvas option.
+    """
+
+    ENABLED = False
+    REPORT_PATH: Optional[str] = None
+
+    PROFILED_METHODS = [
+        "coords", "itemcget", "itemconfig", "itemconfigure", "type", "gettags", "bbox",
+        "find_all", "find_withtag", "find_overlapping", "find_enclosed", "find_closest", "find_above", "find_below",
+        "create_line", "create_rectangle", "create_oval", "create_polygon", "create_text", "create_image",
+        "move", "delete", "tag_raise", "tag_lower", "addtag_withtag", "dtag", "canvasx", "canvasy",
+    ]
+    REPORT_HOTKEY = "<F4>"
+    TOP_CALL_SITES = 5
+    IDLE_HANDLER = "idle"
+
+    def __init__(self, board: 'Board') -> None:
+        """
+        Initialize the CanvasProfiler and wrap the canvas methods and the event entry points of the board.
+        Must be created before the board sets up its bindings.
+
+        :param board: The board instance.
+        """
+        self.board = board
+        self.canvas = board.canvas
+        self.current_handler: str = CanvasProfiler.IDLE_HANDLER
+        self.operations: Dict[str, List[float]] = {}
+        self.call_sites: Dict[Tuple[str, str], List[float]] = {}
+        self.handler_calls: Dict[Tuple[str, str], int] = {}
+
+        for method in CanvasProfiler.PROFILED_METHODS:
+            setattr(self.canvas, method, self.wrap_method(method, getattr(self.canvas, method)))
+        for handler in LatencyMonitor.EVENT_HANDLERS:
+            setattr(board, handler, self.wrap_handler(handler, getattr(board, handler)))
+        board.object_mover.smooth_scroll = self.wrap_handler(  # type: ignore
+            LatencyMonitor.SCROLL_HANDLER, board.object_mover.smooth_scroll)
+        board.app.get_root().bind(CanvasProfiler.REPORT_HOTKEY, lambda _: self.dump_report())
+        atexit.register(self.stop)
+
+    def wrap_method(self, method: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap a canvas method so that every call is counted and timed.
+
+        :param method: The name of the canvas method.
+        :param func: The bound canvas method.
+        :return: The counting canvas method.
+        """
+        @functools.wraps(func)
+        def counted_method(*args: Any, **kwargs: Any) -> Any:
+            caller = sys._getframe(1)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(method, caller.f_code.co_filename, caller.f_lineno, caller.f_code.co_name,
+                            time.perf_counter() - start)
+        return counted_method
+
+    def wrap_handler(self, handler: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap an event handler so that the canvas calls made while it runs are attributed to it.
+
+        :param handler: The name of the handler.
+        :param func: The handler function.
+        :return: The attributing handler function.
+        """
+        @functools.wraps(func)
+        def attributed_handler(*args: Any, **kwargs: Any) -> Any:
+            previous_handler = self.current_handler
+            self.current_handler = handler
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.current_handler = previous_handler
+        return attributed_handler
+
+    def record(self, method: str, filename: str, line: int, function: str, duration: float) -> None:
+        """
+        Record a canvas call.
+
+        :param method: The name of the canvas method.
+        :param filename: The file of the calling code.
+        :param line: The line of the calling code.
+        :param function: The name of the calling function.
+        :param duration: The time the call took in seconds.
+        """
+        operation = self.operations.get(method)
+        if operation is None:
+            operation = self.operations[method] = [0, 0.0]
+        operation[0] += 1
+        operation[1] += duration
+
+        site = f"{os.path.basename(filename)}:{line} ({function})"
+        call_site = self.call_sites.get((method, site))
+        if call_site is None:
+            call_site = self.call_sites[(method, site)] = [0, 0.0]
+        call_site[0] += 1
+        call_site[1] += duration
+
+        key = (self.current_handler, method)
+        self.handler_calls[key] = self.handler_calls.get(key, 0) + 1
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Summarize the recorded canvas calls.
+
+        :return: The calls per operation with their top call sites, most expensive first, and the calls per
+                 handler.
+        """
+        operations: List[Dict[str, Any]] = []
+        for method, (count, total_time) in sorted(self.operations.items(), key=lambda item: -item[1][1]):
+            sites = sorted(((site, stats) for (site_method, site), stats in self.call_sites.items()
+                            if site_method == method), key=lambda item: -item[1][1])
+            operations.append({
+                'method': method,
+                'count': int(count),
+                'time': total_time,
+                'call_sites': [{'site': site, 'count': int(site_count), 'time': site_time}
+                               for site, (site_count, site_time) in sites[:CanvasProfiler.TOP_CALL_SITES]],
+            })
+        handlers = [{'handler': handler, 'method': method, 'count': count}
+                    for (handler, method), count in sorted(self.handler_calls.items())]
+        return {'operations': operations, 'handlers': handlers}
+
+    def format_report(self) -> str:
+        """
+        Format the report as a table.
+
+        :return: The report text.
+        """
+        lines = [f"{'method':<20} {'calls':>10} {'time (ms)':>12}"]
+        for operation in self.report()['operations']:
+            lines.append(f"{operation['method']:<20} {operation['count']:>10} {operation['time'] * 1000:>12.2f}")
+            for call_site in operation['call_sites']:
+                lines.append(f"    {call_site['site']:<40} {call_site['count']:>8} "
+                             f"{call_site['time'] * 1000:>10.2f}")
+        return "\n".join(lines)
+
+    def dump_report(self) -> None:
+        """
+        Write the report to the report file, or print it if no report file is configured.
+        """
+        if CanvasProfiler.REPORT_PATH:
+            with open(CanvasProfiler.REPORT_PATH, 'w') as f:
+                json.dump(self.report(), f, indent=4)
+        else:
+            print(self.format_report())
+
+    def stop(self) -> None:
+        """
+        Dump the final report. Called when the board is destroyed or the application exits, whichever
+        comes first.
+        """
+        atexit.unregister(self.stop)
+        self.dump_report()
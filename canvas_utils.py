@@ -1,6 +1,9 @@
-from typing import TYPE_CHECKING
+from typing import List, TYPE_CHECKING
 import tkinter as tk
 
+from image_handler import ImageHandler
+from layer_handler import LayerHandler
+
 if TYPE_CHECKING:
     from board import Board
 
@@ -22,7 +25,7 @@ class CanvasUtils:
 
     def erase_objects(self, x: float, y: float) -> None:
         """
-        Erase objects at the given coordinates using the eraser tool.
+        Erase objects at the given coordinates using the eraser tool. Objects on locked layers are skipped.
 
         :param x: The x-coordinate of the eraser position.
         :param y: The y-coordinate of the eraser position.
@@ -32,11 +35,14 @@ class CanvasUtils:
                        x + eraser_size // 2, y + eraser_size // 2)
         overlapping_objects = self.canvas.find_overlapping(*eraser_bbox)
         for obj in overlapping_objects:
-            if obj in self.canvas.find_all() and "eraser_frame" not in self.canvas.gettags(obj):
+            if (obj in self.canvas.find_all() and "eraser_frame" not in (tags := self.canvas.gettags(obj))
+                    and LayerHandler.LOCKED_TAG not in tags):
                 item_type = self.canvas.type(obj)  # type: ignore
                 if item_type == "line":
+                    layer = next((tag for tag in tags if LayerHandler.is_layer_tag(tag)), LayerHandler.DEFAULT_LAYER)
                     coords = self.canvas.coords(obj)
                     new_coords = []
+                    new_objects: List[int] = []
                     i = 0
                     while i < len(coords):
                         px, py = coords[i], coords[i + 1]
@@ -45,37 +51,47 @@ class CanvasUtils:
                             new_coords.append(py)
                         else:
                             if len(new_coords) >= 4:
-                                new_obj = self.new_object(obj, new_coords)
+                                new_obj = self.new_object(obj, new_coords, layer)
                                 self.board.objects.append(new_obj)
+                                new_objects.append(new_obj)
                             new_coords = []
                         i += 2
                     if len(new_coords) >= 4:
-                        new_obj = self.new_object(obj, new_coords)
+                        new_obj = self.new_object(obj, new_coords, layer)
                         self.board.objects.append(new_obj)
+                        new_objects.append(new_obj)
+                    self.board.undo_handler.record_delete([obj])
+                    self.board.undo_handler.record_create(new_objects)
+                    self.board.notify_objects_changed(self.board.CHANGE_DELETE, [obj])
+                    self.board.notify_objects_changed(self.board.CHANGE_CREATE, new_objects)
                     self.canvas.delete(obj)
                     if obj in self.board.objects:
                         self.board.objects.remove(obj)
                         break
-                elif item_type == "rectangle" or item_type == "oval" or item_type == "polygon" or item_type == "text":
+                elif item_type in ["rectangle", "oval", "polygon", "text", ImageHandler.IMAGE_TYPE]:
+                    self.board.undo_handler.record_delete([obj])
+                    self.board.notify_objects_changed(self.board.CHANGE_DELETE, [obj])
                     self.canvas.delete(obj)
                     if obj in self.board.objects:
                         self.board.objects.remove(obj)
                         break
 
-    def new_object(self, obj: int, new_coords: list[float]) -> int:
+    def new_object(self, obj: int, new_coords: list[float], layer: str = LayerHandler.DEFAULT_LAYER) -> int:
         """
-        Create a new object with the given coordinates and properties.
+        Create a new object with the given coordinates and properties, directly above the original object.
 
         :param obj: The original object.
         :param new_coords: The new coordinates for the object.
+        :param layer: The layer of the original object.
         :return: The ID of the new object.
         """
         fill = self.canvas.itemcget(obj, "fill")  # type: ignore
         width = self.canvas.itemcget(obj, "width")  # type: ignore
         new_obj = self.canvas.create_line(*new_coords, fill=fill,
                                           width=width,
-                                          tags=(f"object{len(self.board.objects)}",),
+                                          tags=(f"object{len(self.board.objects)}", layer),
                                           smooth=True)
+        self.canvas.tag_raise(new_obj, obj)
         return new_obj
 
     def move_eraser_frame(self, event: 'tk.Event[tk.Misc]') -> None:
@@ -0,0 +1,109 @@
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+
+class Clipboard:
+    """
+    A class that holds copied objects in a compact form.
+
+    The coordinates of all objects are packed into a single array, with the offset of each object's first
+    coordinate, and every object refers to an entry of a style table holding its item type and options.
+    Objects drawn with the same tool settings share a style, so a copied drawing of thousands of strokes
+    holds one array of numbers and a handful of styles. The groups of the objects are kept apart from the
+    styles, so that grouped and ungrouped objects still share them. Symbol definitions are kept in the same
+    form.
+    """
+
+    def __init__(self, coords: np.ndarray, offsets: np.ndarray, style_indices: List[int],
+                 styles: List[Dict[str, Any]], object_groups: List[List[str]]) -> None:
+        """
+        Initialize the Clipboard.
+
+        :param coords: The coordinates of all objects, one after the other.
+        :param offsets: The index of the first coordinate of every object, followed by the number of coordinates.
+        :param style_indices: The index in the style table of every object.
+        :param styles: The style table. Each style holds the item type and the creation options.
+        :param object_groups: The group tags of every object, from the outermost to the innermost group.
+        """
+        self.coords = coords
+        self.offsets = offsets
+        self.style_indices = style_indices
+        self.styles = styles
+        self.object_groups = object_groups
+        points = coords.reshape(-1, 2)
+        if len(points):
+            self.center_x, self.center_y = (points.min(axis=0) + points.max(axis=0)) / 2
+        else:
+            self.center_x = self.center_y = 0.0
+
+    def __len__(self) -> int:
+        """
+        Get the number of copied objects.
+
+        :return: The number of objects.
+        """
+        return len(self.style_indices)
+
+    @staticmethod
+    def from_states(objects_state: List[Dict[str, Any]]) -> 'Clipboard':
+        """
+        Pack object states into a clipboard.
+
+        :param objects_state: The states of the objects, bottom-most first.
+        :return: The clipboard.
+        """
+        style_table: Dict[Tuple[Any, ...], int] = {}
+        styles: List[Dict[str, Any]] = []
+        style_indices: List[int] = []
+        object_groups: List[List[str]] = []
+        coords: List[float] = []
+        offsets = [0]
+        for obj_state in objects_state:
+            style = Clipboard.get_style(obj_state)
+            key = tuple(sorted(style.items()))
+            if key not in style_table:
+                style_table[key] = len(styles)
+                styles.append(style)
+            style_indices.append(style_table[key])
+            object_groups.append(obj_state.get('groups', []))
+            coords.extend(obj_state['coords'])
+            offsets.append(len(coords))
+        return Clipboard(np.array(coords, dtype=float), np.array(offsets), style_indices, styles, object_groups)
+
+    @staticmethod
+    def get_style(obj_state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get the style of an object state: its item type and creation options. The layer is left out, so that
+        pasted objects go to the current layer.
+
+        :param obj_state: The object state.
+        :return: The style.
+        """
+        style = {option: value for option, value in obj_state.items()
+                 if option not in ('coords', 'groups', 'layer', 'z-index')}
+        if style['type'] == 'text':
+            style.pop('width', None)
+        return style
+
+    def get_objects_at(self, x: float, y: float) -> Iterator[Tuple[Dict[str, Any], List[float], List[str]]]:
+        """
+        Get the copied objects moved so that the center of their bounding box is at the given position.
+
+        :param x: The x-coordinate of the position.
+        :param y: The y-coordinate of the position.
+        :return: The style, the moved coordinates and the groups of every object, bottom-most first.
+        """
+        return self.get_transformed_objects(np.array([[1, 0, x - self.center_x], [0, 1, y - self.center_y]]))
+
+    def get_transformed_objects(self, matrix: np.ndarray) -> Iterator[Tuple[Dict[str, Any], List[float], List[str]]]:
+        """
+        Get the copied objects with an affine transform applied to all of their coordinates at once.
+
+        :param matrix: The 2x3 affine transform matrix.
+        :return: The style, the transformed coordinates and the groups of every object, bottom-most first.
+        """
+        coords = (self.coords.reshape(-1, 2) @ matrix[:, :2].T + matrix[:, 2]).ravel().tolist()
+        offsets = self.offsets.tolist()
+        for i, style_index in enumerate(self.style_indices):
+            yield self.styles[style_index], coords[offsets[i]:offsets[i + 1]], self.object_groups[i]
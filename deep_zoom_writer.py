@@ -0,0 +1,256 @@
+import hashlib
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from clipboard import Clipboard
+from image_pyramid import ImagePyramid
+from object_renderer import ObjectRenderer
+from symbol_handler import SymbolHandler
+
+TileTask = Tuple[str, float, float, float, int, int, List[Dict[str, Any]]]
+
+
+class DeepZoomWriter:
+    """
+    A class that exports board objects as a Deep Zoom tile pyramid, for pannable viewers such as OpenSeadragon.
+
+    The pyramid is described by a .dzi file, next to a directory holding one directory of 256-pixel tiles per
+    level, where the most detailed level shows the board at one pixel per board unit. Objects are culled by
+    bounding box for every tile, and the tiles of each level are rendered in worker processes. Tiles without
+    objects are not written. The hash of the content of every written tile is kept in a manifest, so that
+    exporting again only renders the tiles whose content changed.
+    """
+
+    TILE_SIZE = 256
+    TILE_FORMAT = "png"
+    MANIFEST_NAME = "tiles.json"
+    BACKGROUND_COLOR = "white"
+    TILES_PER_TASK = 16
+    TEXT_WIDTH_FACTOR = 0.7
+
+    _worker_images: Dict[str, ImagePyramid] = {}
+
+    def __init__(self, file_path: str, origin_x: float, origin_y: float, width: float, height: float,
+                 symbols: Optional[Dict[str, Clipboard]] = None, images: Optional[Dict[str, ImagePyramid]] = None,
+                 workers: Optional[int] = None) -> None:
+        """
+        Initialize the DeepZoomWriter.
+
+        :param file_path: The path of the .dzi file. The tiles are written to the "_files" directory next to it.
+        :param origin_x: The board x-coordinate of the left edge of the exported area.
+        :param origin_y: The board y-coordinate of the top edge of the exported area.
+        :param width: The width of the exported area in board units.
+        :param height: The height of the exported area in board units.
+        :param symbols: The packed symbol definitions used by instance states, if any.
+        :param images: The images used by image states, by content hash, if any.
+        :param workers: The number of worker processes, the CPU count if None. With one worker, the tiles are
+                        rendered in this process.
+        """
+        self.file_path = file_path
+        self.tiles_dir = os.path.splitext(file_path)[0] + "_files"
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.width = max(1, math.ceil(width))
+        self.height = max(1, math.ceil(height))
+        self.symbols = symbols if symbols is not None else {}
+        self.images = images if images is not None else {}
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.max_level = math.ceil(math.log2(max(self.width, self.height))) if max(self.width, self.height) > 1 else 0
+
+    def write(self, objects_state: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Write the tile pyramid of the given objects, and remove the tiles of a previous export that are now
+        empty.
+
+        :param objects_state: The states of the objects, bottom-most first.
+        :return: The number of tiles that were 'rendered', left 'unchanged' and 'removed'.
+        """
+        objects_state = [obj_state for obj_state in SymbolHandler.expand_instances(objects_state, self.symbols)
+                         if obj_state['coords']]
+        bounds = self.get_bounds(objects_state)
+        old_manifest = self._read_manifest()
+        manifest: Dict[str, str] = {}
+        counts = {'rendered': 0, 'unchanged': 0, 'removed': 0}
+        executor = (ProcessPoolExecutor(self.workers, initializer=DeepZoomWriter._init_worker,
+                                        initargs=(self.images,)) if self.workers > 1 else None)
+        try:
+            for level in range(self.max_level + 1):
+                tasks: List[TileTask] = []
+                for tile, tile_task in self._get_level_tasks(level, objects_state, bounds):
+                    tile_hash = self._hash_tile(tile_task)
+                    manifest[tile] = tile_hash
+                    if old_manifest.get(tile) == tile_hash and os.path.exists(tile_task[0]):
+                        counts['unchanged'] += 1
+                    else:
+                        tasks.append(tile_task)
+                if not tasks:
+                    continue
+                os.makedirs(os.path.join(self.tiles_dir, str(level)), exist_ok=True)
+                # The tiles of a level are rendered before the next level is started
+                if executor is None:
+                    DeepZoomWriter._worker_images = self.images
+                    DeepZoomWriter.render_tiles(tasks)
+                else:
+                    chunks = [tasks[i:i + DeepZoomWriter.TILES_PER_TASK]
+                              for i in range(0, len(tasks), DeepZoomWriter.TILES_PER_TASK)]
+                    list(executor.map(DeepZoomWriter.render_tiles, chunks))
+                counts['rendered'] += len(tasks)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        for tile in old_manifest.keys() - manifest.keys():
+            level_name, _, tile_name = tile.partition("/")
+            tile_path = os.path.join(self.tiles_dir, level_name, f"{tile_name}.{DeepZoomWriter.TILE_FORMAT}")
+            if os.path.exists(tile_path):
+                os.remove(tile_path)
+                counts['removed'] += 1
+        self._write_descriptor(manifest)
+        return counts
+
+    @staticmethod
+    def render_tiles(tasks: List[TileTask]) -> None:
+        """
+        Render and save tiles. This runs in the worker processes.
+
+        :param tasks: The path, board origin, scale, pixel size and culled object states of every tile.
+        """
+        for tile_path, origin_x, origin_y, scale, width, height, objects_state in tasks:
+            tile_image = Image.new("RGB", (width, height), DeepZoomWriter.BACKGROUND_COLOR)
+            ObjectRenderer(tile_image, origin_x, origin_y, scale,
+                           images=DeepZoomWriter._worker_images).draw_objects(objects_state)
+            tile_image.save(tile_path)
+
+    @staticmethod
+    def _init_worker(images: Dict[str, ImagePyramid]) -> None:
+        """
+        Keep the images in a worker process, so that they are sent once rather than with every task.
+
+        :param images: The images used by image states, by content hash.
+        """
+        DeepZoomWriter._worker_images = images
+
+    def _get_level_tasks(self, level: int, objects_state: List[Dict[str, Any]],
+                         bounds: np.ndarray) -> List[Tuple[str, TileTask]]:
+        """
+        Get the tiles of a level that hold objects, with the objects culled by bounding box.
+
+        :param level: The level, from 0 for the single-pixel level to max_level for full resolution.
+        :param objects_state: The states of the objects, bottom-most first.
+        :param bounds: The bounding box of every object in board units, one per row.
+        :return: The manifest key and the rendering task of every tile that holds objects.
+        """
+        scale = 2.0 ** (level - self.max_level)
+        tile_board_size = DeepZoomWriter.TILE_SIZE / scale
+        level_width = max(1, math.ceil(self.width * scale))
+        level_height = max(1, math.ceil(self.height * scale))
+        columns = math.ceil(level_width / DeepZoomWriter.TILE_SIZE)
+        rows = math.ceil(level_height / DeepZoomWriter.TILE_SIZE)
+
+        # Every object is added to the tiles its bounding box overlaps
+        first = np.floor((bounds[:, :2] - (self.origin_x, self.origin_y)) / tile_board_size).astype(int)
+        last = np.floor((bounds[:, 2:] - (self.origin_x, self.origin_y)) / tile_board_size).astype(int)
+        first = np.maximum(first, 0)
+        last = np.minimum(last, (columns - 1, rows - 1))
+        tiles: Dict[Tuple[int, int], List[int]] = {}
+        for index in np.flatnonzero(np.all(first <= last, axis=1)):
+            for column in range(first[index, 0], last[index, 0] + 1):
+                for row in range(first[index, 1], last[index, 1] + 1):
+                    tiles.setdefault((column, row), []).append(int(index))
+
+        level_tasks: List[Tuple[str, TileTask]] = []
+        for (column, row), indices in sorted(tiles.items()):
+            left = column * DeepZoomWriter.TILE_SIZE
+            top = row * DeepZoomWriter.TILE_SIZE
+            tile_width = min(DeepZoomWriter.TILE_SIZE, level_width - left)
+            tile_height = min(DeepZoomWriter.TILE_SIZE, level_height - top)
+            level_tasks.append((f"{level}/{column}_{row}", (
+                self._get_tile_path(level, column, row), self.origin_x + left / scale, self.origin_y + top / scale,
+                scale, tile_width, tile_height, [objects_state[index] for index in indices])))
+        return level_tasks
+
+    @staticmethod
+    def get_bounds(objects_state: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Get the bounding boxes of objects from their states, including line widths and an estimate of text size.
+
+        :param objects_state: The states of the objects, each with at least one point.
+        :return: The bounding box (left, top, right, bottom) of every object, one per row.
+        """
+        bounds = np.empty((len(objects_state), 4))
+        for i, obj_state in enumerate(objects_state):
+            points = np.asarray(obj_state['coords'], dtype=float).reshape(-1, 2)
+            low, high = points.min(axis=0), points.max(axis=0)
+            if obj_state['type'] == "text":
+                font_parts = obj_state.get('font', "").split()
+                font_size = float(font_parts[-1]) if font_parts else 1.0
+                lines = obj_state.get('text', "").split("\n")
+                half_size = np.array([max(map(len, lines)) * font_size * DeepZoomWriter.TEXT_WIDTH_FACTOR,
+                                      len(lines) * font_size * 2]) / 2
+                low, high = low - half_size, high + half_size
+            else:
+                try:
+                    padding = float(obj_state.get('width', 0)) / 2 + 1
+                except (TypeError, ValueError):
+                    padding = 1
+                low, high = low - padding, high + padding
+            bounds[i] = (*low, *high)
+        return bounds
+
+    @staticmethod
+    def _hash_tile(tile_task: TileTask) -> str:
+        """
+        Hash everything a tile is rendered from.
+
+        :param tile_task: The rendering task of the tile.
+        :return: The content hash.
+        """
+        _, origin_x, origin_y, scale, width, height, objects_state = tile_task
+        content = json.dumps([origin_x, origin_y, scale, width, height, objects_state], sort_keys=True)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def _get_tile_path(self, level: int, column: int, row: int) -> str:
+        """
+        Get the path of a tile in the Deep Zoom layout.
+
+        :param level: The level of the tile.
+        :param column: The column of the tile.
+        :param row: The row of the tile.
+        :return: The path of the tile.
+        """
+        return os.path.join(self.tiles_dir, str(level), f"{column}_{row}.{DeepZoomWriter.TILE_FORMAT}")
+
+    def _read_manifest(self) -> Dict[str, str]:
+        """
+        Read the tile hashes of a previous export.
+
+        :return: The content hash of every tile, or an empty manifest if there is no readable previous export.
+        """
+        try:
+            with open(os.path.join(self.tiles_dir, DeepZoomWriter.MANIFEST_NAME), 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return manifest if isinstance(manifest, dict) else {}
+
+    def _write_descriptor(self, manifest: Dict[str, str]) -> None:
+        """
+        Write the .dzi descriptor and the tile manifest.
+
+        :param manifest: The content hash of every tile.
+        """
+        os.makedirs(self.tiles_dir, exist_ok=True)
+        with open(os.path.join(self.tiles_dir, DeepZoomWriter.MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f)
+        with open(self.file_path, 'w', encoding='utf-8') as f:
+            f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n'
+                    f'<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" '
+                    f'Format="{DeepZoomWriter.TILE_FORMAT}" Overlap="0" TileSize="{DeepZoomWriter.TILE_SIZE}">\n'
+                    f'  <Size Width="{self.width}" Height="{self.height}"/>\n'
+                    f'</Image>\n')
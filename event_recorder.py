@@ -0,0 +1,143 @@
+import atexit
+import functools
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from board import Board
+
+
+class EventRecorder:
+    """
+    A class that records the input reaching a board so that the session can be replayed by the EventReplayer.
+
+    The recording is a JSON lines file: a header with the initial view, tool and tool settings, followed by
+    one compact array per event holding the time in milliseconds, the event kind and its data. Text typed
+    into text entries and the choices made in context menus and dialogs are not recorded. Right clicks are
+    not recorded either, since all they do is open a context menu whose choice would be missing on replay.
+    """
+
+    RECORD_PATH: Optional[str] = None
+    FORMAT_VERSION = 1
+
+    EVENT_CLICK = "c"
+    EVENT_DRAG = "d"
+    EVENT_RELEASE = "r"
+    EVENT_TOOL = "t"
+    EVENT_SETTINGS = "s"
+
+    RECORDED_HANDLERS = {
+        "handle_click_event": EVENT_CLICK,
+        "handle_drag_event": EVENT_DRAG,
+        "stop_drawing": EVENT_RELEASE,
+    }
+    SETTINGS = ["pen_width", "pen_color", "fill_color", "eraser_width", "text_color", "text_font_name",
+                "text_font_size"]
+
+    def __init__(self, board: 'Board', filename: str) -> None:
+        """
+        Initialize the EventRecorder and wrap the event entry points of the board.
+        Must be created before the board sets up its bindings.
+
+        :param board: The board instance.
+        :param filename: The name of the recording file, written when the board is destroyed or the
+                         application exits.
+        """
+        self.board = board
+        self.canvas = board.canvas
+        self.toolbox = board.toolbox
+        self.filename = filename
+        self.start_time = time.perf_counter()
+        self.settings = self.get_settings()
+        self.header: Dict[str, Any] = {
+            'version': EventRecorder.FORMAT_VERSION,
+            'view': [self.canvas.canvasx(0), self.canvas.canvasy(0)],
+            'tool': self.toolbox.current_tool,
+            'settings': self.settings,
+        }
+        self.events: List[List[Any]] = []
+
+        for handler, kind in EventRecorder.RECORDED_HANDLERS.items():
+            setattr(board, handler, self.wrap(kind, getattr(board, handler)))
+        self.toolbox.add_tool_selected_listener(self.on_tool_selected)
+        atexit.register(self.stop)
+
+    def wrap(self, kind: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap an event handler so that every event it receives is recorded.
+
+        :param kind: The event kind, one of the EVENT_* constants.
+        :param func: The handler function.
+        :return: The recording handler function.
+        """
+        @functools.wraps(func)
+        def recorded_handler(event: Any) -> Any:
+            self.record_settings()
+            self.events.append([self._timestamp(), kind, event.x, event.y])
+            return func(event)
+        return recorded_handler
+
+    def on_tool_selected(self, tool: str) -> None:
+        """
+        Record a tool change.
+
+        :param tool: The selected tool.
+        """
+        self.record_settings()
+        self.events.append([self._timestamp(), EventRecorder.EVENT_TOOL, tool])
+
+    def get_settings(self) -> Dict[str, Any]:
+        """
+        Get the current tool settings of the toolbox.
+
+        :return: The settings by attribute name.
+        """
+        return {setting: getattr(self.toolbox, setting) for setting in EventRecorder.SETTINGS}
+
+    def record_settings(self) -> None:
+        """
+        Record the tool settings if they changed since they were last recorded.
+        """
+        settings = self.get_settings()
+        if settings != self.settings:
+            self.events.append([self._timestamp(), EventRecorder.EVENT_SETTINGS, settings])
+            self.settings = settings
+
+    def write(self) -> None:
+        """
+        Write the recording file.
+        """
+        with open(self.filename, 'w') as f:
+            f.write(json.dumps(self.header) + "\n")
+            for event in self.events:
+                f.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+    def stop(self) -> None:
+        """
+        Write the recording. Called when the board is destroyed or the application exits, whichever comes
+        first.
+        """
+        atexit.unregister(self.stop)
+        self.write()
+
+    @staticmethod
+    def read(filename: str) -> Tuple[Dict[str, Any], List[List[Any]]]:
+        """
+        Read a recording file.
+
+        :param filename: The name of the recording file.
+        :return: The header and the events.
+        """
+        with open(filename, 'r') as f:
+            header = json.loads(f.readline())
+            events = [json.loads(line) for line in f if line.strip()]
+        return header, events
+
+    def _timestamp(self) -> float:
+        """
+        Get the time since the recording started.
+
+        :return: The time in milliseconds.
+        """
+        return round((time.perf_counter() - self.start_time) * 1000, 1)
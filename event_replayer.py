@@ -0,0 +1,180 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tkinter as tk
+from typing import Any, Dict, List, Optional
+
+from benchmark import Benchmark, BenchmarkApp
+from board import Board
+from event_recorder import EventRecorder
+from latency_monitor import LatencyMonitor
+from toolbox import Toolbox
+
+
+class EventReplayer:
+    """
+    A class that replays a recording made by the EventRecorder on a fresh board.
+
+    Pointer events are generated through Tk, so they go through the same bindings and item picking as
+    real input. The session is replayed as fast as possible or at the recorded timing. Replaying needs a
+    display even when the window is hidden; on a headless machine run it under a virtual X server, for
+    example with 'xvfb-run python event_replayer.py recording.jsonl --hidden'.
+    """
+
+    RETURN_TO_MIDDLE = "Return to Middle"
+    BUTTON1_MASK = 0x100
+
+    def __init__(self, root: tk.Tk, filename: str, realtime: bool = False) -> None:
+        """
+        Initialize the EventReplayer.
+
+        :param root: The root Tk instance.
+        :param filename: The name of the recording file.
+        :param realtime: True to replay at the recorded timing, False to replay as fast as possible.
+        """
+        self.root = root
+        self.realtime = realtime
+        self.header, self.events = EventRecorder.read(filename)
+        self.app = BenchmarkApp(root)
+        self.toolbox = Toolbox(self.app)  # type: ignore
+        self.board = Board(self.app, self.toolbox, {})  # type: ignore
+        # A replayed session must never replace the autosave file of the user's own board
+        self.board.autosave_handler.stop()
+
+    def replay(self) -> Dict[str, Any]:
+        """
+        Replay the recorded session.
+
+        :return: The number of events, the total replay time and the handler latencies if they were measured.
+        """
+        self.apply_header()
+        self.root.update()
+        start = time.perf_counter()
+        for event in self.events:
+            if self.realtime:
+                self._wait_until(start + event[0] / 1000)
+            self.dispatch(event)
+            self.root.update()
+        elapsed = time.perf_counter() - start
+        monitor = self.board.latency_monitor
+        return {
+            'events': len(self.events),
+            'elapsed': elapsed,
+            'realtime': self.realtime,
+            'handlers': monitor.report() if monitor is not None else [],
+        }
+
+    def apply_header(self) -> None:
+        """
+        Restore the view, the tool and the tool settings the recording started with.
+        """
+        self.apply_settings(self.header['settings'])
+        self.select_tool(self.header['tool'])
+        min_x, min_y, max_x, max_y = Board.CANVAS_SCROLLREGION
+        view_x, view_y = self.header['view']
+        self.board.canvas.xview_moveto((view_x - min_x) / (max_x - min_x))
+        self.board.canvas.yview_moveto((view_y - min_y) / (max_y - min_y))
+
+    def dispatch(self, event: List[Any]) -> None:
+        """
+        Feed a single recorded event into the board.
+
+        :param event: The recorded event.
+        """
+        kind = event[1]
+        canvas = self.board.canvas
+        if kind == EventRecorder.EVENT_TOOL:
+            self.select_tool(event[2])
+        elif kind == EventRecorder.EVENT_SETTINGS:
+            self.apply_settings(event[2])
+        elif kind == EventRecorder.EVENT_CLICK:
+            canvas.event_generate("<Motion>", x=event[2], y=event[3])
+            canvas.event_generate("<ButtonPress-1>", x=event[2], y=event[3])
+        elif kind == EventRecorder.EVENT_DRAG:
+            canvas.event_generate("<Motion>", x=event[2], y=event[3], state=EventReplayer.BUTTON1_MASK)
+        elif kind == EventRecorder.EVENT_RELEASE:
+            canvas.event_generate("<ButtonRelease-1>", x=event[2], y=event[3], state=EventReplayer.BUTTON1_MASK)
+
+    def select_tool(self, tool: str) -> None:
+        """
+        Select a tool without opening the dialogs the toolbox buttons may open.
+
+        :param tool: The tool to select.
+        """
+        if tool != EventReplayer.RETURN_TO_MIDDLE:
+            self.toolbox.current_tool = tool
+        for listener in self.toolbox.tool_selected_listeners:
+            listener(tool)
+
+    def apply_settings(self, settings: Dict[str, Any]) -> None:
+        """
+        Apply recorded tool settings to the toolbox.
+
+        :param settings: The settings by attribute name.
+        """
+        for setting, value in settings.items():
+            setattr(self.toolbox, setting, value)
+
+    def destroy(self) -> None:
+        """
+        Destroy the board and the toolbox.
+        """
+        self.board.destroy()
+        self.toolbox.frame.destroy()
+
+    def _wait_until(self, deadline: float) -> None:
+        """
+        Keep the event loop running until the recorded time of the next event.
+
+        :param deadline: The time to wait for, as a perf_counter value.
+        """
+        while time.perf_counter() < deadline:
+            self.root.update()
+            time.sleep(min(0.001, max(0.0, deadline - time.perf_counter())))
+
+
+def main() -> None:
+    """
+    Replay a recorded session from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Replay a session recorded with 'python main.py --record-events'.")
+    parser.add_argument("recording", help="the recording file")
+    parser.add_argument("--board", help="a board file to load before replaying")
+    parser.add_argument("--realtime", action="store_true", help="replay at the recorded timing")
+    parser.add_argument("--hidden", action="store_true",
+                        help="do not show the window while replaying (a display, such as Xvfb, is still needed)")
+    parser.add_argument("--output", help="a JSON file to write the results to")
+    args = parser.parse_args()
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        parser.error("no display found, the replay needs one even with --hidden; run it under Xvfb, "
+                     "for example with 'xvfb-run python event_replayer.py ...'")
+
+    LatencyMonitor.ENABLED = True
+    root = tk.Tk()
+    if args.hidden:
+        root.withdraw()
+    replayer: Optional[EventReplayer] = None
+    try:
+        replayer = EventReplayer(root, args.recording, args.realtime)
+        if args.board:
+            replayer.board.file_handler.load_board(args.board)
+        results = replayer.replay()
+    finally:
+        if replayer is not None:
+            replayer.destroy()
+        root.destroy()
+
+    print(f"Replayed {results['events']} events in {results['elapsed']:.3f}s")
+    for handler in results['handlers']:
+        print(f"{handler['tool']:<12} {handler['handler']:<26} {handler['count']:>6} calls  "
+              f"p50 {handler['p50'] * 1000:.2f} ms  p99 {handler['p99'] * 1000:.2f} ms")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(dict(results, commit=Benchmark.get_commit(), python=platform.python_version()), f, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, List, Optional, Tuple
+
+from PIL import Image
+
+
+class ExportCache:
+    """
+    A class that keeps exported files and tiles on disk, addressed by a hash of everything they are rendered
+    from, so that exporting an unchanged board again only copies the cached file.
+
+    Every entry is a file named after its key. Reading an entry refreshes its modification time, and the
+    least recently used entries are removed once the cache grows past its size budget.
+    """
+
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Initialize the ExportCache. The cache directory is created when the first entry is stored.
+
+        :param cache_dir: The directory holding the cached files.
+        :param max_bytes: The size budget of the cache in bytes.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def get_key(*parts: Any) -> str:
+        """
+        Hash the parts an export is rendered from.
+
+        :param parts: JSON-serializable parts, such as object states, the export region and the format.
+        :return: The key.
+        """
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def get_font_set(font_dir: str) -> List[Tuple[str, int, int]]:
+        """
+        Describe the font files used for rendering, so that changing a font invalidates the cached exports.
+
+        :param font_dir: The directory of the font files.
+        :return: The name, size and modification time of every font file.
+        """
+        try:
+            entries = list(os.scandir(font_dir))
+        except OSError:
+            return []
+        return sorted((entry.name, entry.stat().st_size, entry.stat().st_mtime_ns) for entry in entries
+                      if entry.is_file())
+
+    def lookup(self, key: str, extension: str) -> Optional[str]:
+        """
+        Find a cached file and mark it as recently used.
+
+        :param key: The key of the file.
+        :param extension: The file extension, including the dot.
+        :return: The path of the cached file, or None if it is not cached.
+        """
+        path = self._get_path(key, extension)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def store_file(self, key: str, extension: str, source_path: str) -> None:
+        """
+        Copy an exported file into the cache. Failing to cache a file does not fail the export.
+
+        :param key: The key of the file.
+        :param extension: The file extension, including the dot.
+        :param source_path: The path of the exported file.
+        """
+        if not os.path.isfile(source_path):
+            return
+        path = self._get_path(key, extension)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            shutil.copyfile(source_path, path + ".tmp")
+            os.replace(path + ".tmp", path)
+        except OSError:
+            return
+        self.evict()
+
+    def load_image(self, key: str) -> Optional[Image.Image]:
+        """
+        Load a cached tile and mark it as recently used.
+
+        :param key: The key of the tile.
+        :return: The tile, or None if it is not cached or cannot be read.
+        """
+        path = self.lookup(key, ".png")
+        if path is None:
+            return None
+        try:
+            with Image.open(path) as image:
+                image.load()
+                return image
+        except OSError:
+            return None
+
+    def store_image(self, key: str, image: Image.Image) -> None:
+        """
+        Store a tile in the cache, without evicting entries, so that the tiles of one export are stored before
+        evict is called once.
+
+        :param key: The key of the tile.
+        :param image: The tile.
+        """
+        path = self._get_path(key, ".png")
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            image.save(path + ".tmp", "PNG")
+            os.replace(path + ".tmp", path)
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache fits its size budget.
+        """
+        try:
+            entries = [(entry.stat().st_mtime_ns, entry.stat().st_size, entry.path)
+                       for entry in os.scandir(self.cache_dir) if entry.is_file()]
+        except OSError:
+            return
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+
+    def _get_path(self, key: str, extension: str) -> str:
+        """
+        Get the path of a cache entry.
+
+        :param key: The key of the entry.
+        :param extension: The file extension, including the dot.
+        :return: The path.
+        """
+        return os.path.join(self.cache_dir, key + extension)
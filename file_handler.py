@@ -1,12 +1,26 @@
+import itertools
 import json
+import math
 import os
+import shutil
 import tkinter as tk
+import xml.etree.ElementTree as ElementTree
 from tkinter import filedialog
-from typing import Any, Dict, List, TYPE_CHECKING, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, TYPE_CHECKING, Tuple
 
-from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+from PIL import Image
 
+from board_journal import BoardJournal
+from deep_zoom_writer import DeepZoomWriter
+from export_cache import ExportCache
 from fallback_font import FallbackFont
+from image_handler import ImageHandler
+from layer_handler import LayerHandler
+from object_renderer import ObjectRenderer
+from svg_reader import SvgReader
+from svg_writer import SvgWriter
+from symbol_handler import SymbolHandler
 
 if TYPE_CHECKING:
     from board import Board
@@ -18,7 +32,14 @@ class FileHandler:
     """
 
     DEFAULT_DIR = "./boards"
+    EXPORT_CACHE_DIR = os.path.join(DEFAULT_DIR, ".export_cache")
     MAX_COORDINATE_VALUE = 5000
+    HELPER_TAGS = ["selection_frame", "eraser_frame", "polygon_point"]
+    POSTSCRIPT_EXTENSIONS = [".ps", ".eps"]
+    POSTSCRIPT_TILE_SIZE = 2000
+    IMAGE_TILE_SIZE = 1024
+    SVG_PRECISION = SvgWriter.DEFAULT_PRECISION
+    SVG_IMPORT_BATCH_SIZE = 2000
 
     def __init__(self, board: 'Board') -> None:
         """
@@ -29,15 +50,31 @@ class FileHandler:
         self.board = board
         self.canvas = board.canvas
         self.loaded_fonts = board.loaded_fonts
+        self.journal = BoardJournal()
+        self.import_after_id: Optional[str] = None
+        self.import_layer: Optional[str] = None
+        self.imported_objects: List[int] = []
+        self.saved_images: Set[str] = set()
+        self.export_cache = ExportCache(FileHandler.EXPORT_CACHE_DIR)
+        board.add_objects_changed_listener(self.journal.on_objects_changed)
 
     def new_board(self) -> None:
         """
         Create a new board by clearing the canvas and resetting the objects.
         """
+        self.cancel_svg_import()
+        self.board.notify_objects_changed(self.board.CHANGE_DELETE, self.board.objects)
         self.canvas.delete("all")
         self.board.objects = []
         self.board.drawing = False
         self.board.canvas_utils.return_to_middle()
+        self.journal.reset()
+        self.board.undo_handler.clear()
+        self.board.group_handler.clear()
+        self.board.symbol_handler.clear()
+        self.board.layer_handler.clear()
+        self.board.image_handler.clear()
+        self.saved_images = set()
 
     def save_board_dialog(self) -> None:
         """
@@ -50,6 +87,7 @@ class FileHandler:
                                                 filetypes=[("Picasso Board", "*.pcso")])
         if filename:
             self.save_board(filename)
+            self.board.autosave_handler.discard()
 
     def open_board_dialog(self) -> None:
         """
@@ -62,55 +100,208 @@ class FileHandler:
     def save_board(self, filename: str) -> None:
         """
         Save the current board state to a file.
+        Saving again to the same file appends only the changes since the last save, until the journal
+        grows past BoardJournal.COMPACTION_RATIO of the snapshot and a new snapshot is written.
 
         :param filename: The name of the file to save the board state to.
         """
-        objects_state = self._get_objects_state()
-        board_state = {
+        if self.journal.is_tracking(filename):
+            if not self.journal.has_pending_changes():
+                return
+            records = self._get_journal_records()
+            journal_data = "".join(json.dumps(record) + "\n" for record in records)
+            # Images are only written with snapshots, so new images need a new snapshot
+            new_images = ImageHandler.get_image_keys(record['state'] for record in records
+                                                     if record['op'] == BoardJournal.OP_CREATE) - self.saved_images
+            if not new_images and self.journal.can_append(filename, len(journal_data)):
+                with open(filename, 'a') as f:
+                    f.write(journal_data)
+                self.journal.journal_size += len(journal_data)
+                self.journal.pending = {}
+                return
+
+        objects_state, object_ids = self._get_objects_state()
+        board_state: Dict[str, Any] = {
             'objects': objects_state,
         }
-
+        symbols = {obj_state['symbol'] for obj_state in objects_state
+                   if obj_state['type'] == SymbolHandler.INSTANCE_TYPE}
+        for hidden_obj, obj_state in self.board.layer_handler.get_hidden_objects():
+            # Hidden objects keep their symbol tag as is, so their symbols are kept along with them
+            if obj_state.get('symbol') in self.board.symbol_handler.symbols:
+                symbols.add(obj_state['symbol'])
+            object_ids[hidden_obj] = len(object_ids)
+            objects_state.append(obj_state)
+        if symbols:
+            board_state['symbols'] = self.board.symbol_handler.get_definitions(symbols)
+        images = ImageHandler.get_image_keys(objects_state + [member_state for members_state
+                                                              in board_state.get('symbols', {}).values()
+                                                              for member_state in members_state])
+        if images:
+            board_state['images'] = ImageHandler.encode_images(self.board.image_handler.get_images_data(images))
+        layers_state = self.board.layer_handler.get_layers_state()
+        if layers_state:
+            board_state['layers'] = layers_state
+
+        snapshot_data = json.dumps(board_state) + "\n"
         with open(filename, 'w') as f:
-            json.dump(board_state, f)
+            f.write(snapshot_data)
+        self.journal.reset(filename, len(snapshot_data), 0, object_ids)
+        self.saved_images = set(board_state.get('images', {}))
+
+    def _get_journal_records(self) -> List[Dict[str, Any]]:
+        """
+        Get the journal records for the changes since the last save, assigning IDs to new objects.
+
+        :return: A list of journal records, in the order they have to be replayed.
+        """
+        records: List[Dict[str, Any]] = []
+        stacking_order = self.canvas.find_all()
+        positions = {obj: position for position, obj in enumerate(stacking_order)}
+        changed_objects = []
+        for obj, ops in self.journal.pending.items():
+            if BoardJournal.OP_DELETE in ops:
+                object_id = self.journal.object_ids.pop(obj, None)
+                if object_id is not None:
+                    records.append({'op': BoardJournal.OP_DELETE, 'id': object_id})
+            elif obj in positions:
+                changed_objects.append(obj)
+
+        # Objects are journaled bottom-most first, so the object below each one already has an ID.
+        for obj in sorted(changed_objects, key=lambda x: positions[x]):
+            ops = self.journal.pending[obj]
+            if BoardJournal.OP_CREATE in ops:
+                object_id = self.journal.allocate_id(obj)
+                records.append({'op': BoardJournal.OP_CREATE, 'id': object_id,
+                                'below': self._get_journal_id_below(stacking_order, positions[obj]),
+                                'state': self.get_object_state(obj)})
+                continue
+            object_id = self.journal.object_ids.get(obj)
+            if object_id is None:
+                continue
+            if BoardJournal.OP_MOVE in ops:
+                coords = self.canvas.coords(obj)
+                if len(coords) == 2 and self.canvas.type(obj) == ImageHandler.IMAGE_TYPE:  # type: ignore
+                    # The canvas only holds the corner of an image, while its state also holds its size
+                    coords = self.board.image_handler.get_image_state(obj)['coords']
+                records.append({'op': BoardJournal.OP_MOVE, 'id': object_id, 'coords': coords})
+            if BoardJournal.OP_RESTYLE in ops:
+                obj_state = self.get_object_state(obj)
+                del obj_state['type']
+                del obj_state['coords']
+                obj_state.setdefault('groups', [])
+                obj_state.setdefault('symbol', None)
+                records.append({'op': BoardJournal.OP_RESTYLE, 'id': object_id, 'state': obj_state})
+            if BoardJournal.OP_REORDER in ops:
+                records.append({'op': BoardJournal.OP_REORDER, 'id': object_id,
+                                'below': self._get_journal_id_below(stacking_order, positions[obj])})
+        return records
+
+    def _get_journal_id_below(self, stacking_order: Tuple[int, ...], position: int) -> Optional[int]:
+        """
+        Get the journal ID of the nearest saved object below the given stacking position.
 
-    def _get_objects_state(self) -> List[Dict[str, Any]]:
+        :param stacking_order: All canvas items, bottom-most first.
+        :param position: The stacking position to search below.
+        :return: The journal ID, or None if there is no saved object below.
         """
-        Get the state of all objects on the canvas.
+        for obj in reversed(stacking_order[:position]):
+            object_id = self.journal.object_ids.get(obj)
+            if object_id is not None:
+                return object_id
+        return None
 
-        :return: A list of object states.
+    def _get_objects_state(self) -> Tuple[List[Dict[str, Any]], Dict[int, int]]:
         """
+        Get the state of all objects on the canvas. Each complete symbol instance is stored as a single entry.
+
+        :return: A list of object states, and the mapping of canvas object IDs to journal object IDs. The
+                 journal IDs number the objects in the order they are listed, with every instance counting
+                 as its objects.
+        """
+        positions = {obj: position for position, obj in enumerate(self.canvas.find_all())}
         objects_state: List[Dict[str, Any]] = []
+        object_ids: Dict[int, int] = {}
         for obj in self.board.objects:
-            item_type = self.canvas.type(obj)  # type: ignore
-            obj_state: Dict[str, Any] = {
+            if obj in object_ids:
+                continue
+            obj_state = self.get_object_state(obj)
+            members = self.board.symbol_handler.find_instance(obj_state)
+            if not members:
+                obj_state.pop('symbol', None)
+                obj_state['z-index'] = positions[obj]
+                objects_state.append(obj_state)
+                object_ids[obj] = len(object_ids)
+                continue
+
+            members_state = [obj_state if member == obj else self.get_object_state(member) for member in members]
+            instance_state = None
+            if all(positions[member] == positions[members[0]] + i for i, member in enumerate(members)):
+                instance_state = self.board.symbol_handler.get_instance_state(members_state)
+            if instance_state is not None:
+                instance_state['z-index'] = positions[members[0]]
+                objects_state.append(instance_state)
+            else:
+                for member, member_state in zip(members, members_state):
+                    member_state.pop('symbol', None)
+                    member_state['z-index'] = positions[member]
+                    objects_state.append(member_state)
+            for member in members:
+                object_ids[member] = len(object_ids)
+        return objects_state, object_ids
+
+    def get_object_state(self, obj: int) -> Dict[str, Any]:
+        """
+        Get the state of a single object on the canvas, without its z-index.
+
+        :param obj: The ID of the object.
+        :return: The object state.
+        """
+        item_type = self.canvas.type(obj)  # type: ignore
+        if item_type == ImageHandler.IMAGE_TYPE:
+            obj_state = self.board.image_handler.get_image_state(obj)
+        else:
+            obj_state = {
                 'type': item_type,
                 'coords': self.canvas.coords(obj),
                 'fill': self.canvas.itemcget(obj, 'fill'),  # type: ignore
                 'width': self.canvas.itemcget(obj, 'width'),  # type: ignore
-                'z-index': self.canvas.find_all().index(obj),
             }
-            if item_type not in ["line", "text"]:
-                obj_state['outline'] = self.canvas.itemcget(obj, 'outline')  # type: ignore
-            if item_type == "text":
-                obj_state['font'] = self.canvas.itemcget(obj, 'font')  # type: ignore
-                obj_state['text'] = self.canvas.itemcget(obj, 'text')  # type: ignore
-            objects_state.append(obj_state)
-        return objects_state
-
-    def load_objects(self, objects_state: List[Dict[str, Any]]) -> None:
+        if item_type not in ["line", "text", ImageHandler.IMAGE_TYPE]:
+            obj_state['outline'] = self.canvas.itemcget(obj, 'outline')  # type: ignore
+        if item_type == "text":
+            obj_state['font'] = self.canvas.itemcget(obj, 'font')  # type: ignore
+            obj_state['text'] = self.canvas.itemcget(obj, 'text')  # type: ignore
+        groups = self.board.group_handler.get_groups(obj)
+        if groups:
+            obj_state['groups'] = groups
+        symbol = self.board.symbol_handler.get_symbol(obj)
+        if symbol:
+            obj_state['symbol'] = symbol
+        layer = self.board.layer_handler.get_layer(obj)
+        if layer and layer != LayerHandler.DEFAULT_LAYER:
+            obj_state['layer'] = layer
+        return obj_state
+
+    def load_objects(self, objects_state: List[Dict[str, Any]]) -> List[int]:
         """
         Load the objects from the given objects state onto the canvas.
 
         :param objects_state: The state of the objects to be loaded.
+        :return: The IDs of the created objects, in the order of the given states (0 for unsupported types).
         """
-        sorted_objects_state = sorted(objects_state, key=lambda x: x['z-index'])
-        for obj_state in sorted_objects_state:
-            obj = self._create_object_from_state(obj_state)
+        created_objects = [0] * len(objects_state)
+        sorted_indices = sorted(range(len(objects_state)), key=lambda i: objects_state[i]['z-index'])
+        for i in sorted_indices:
+            obj = self.create_object_from_state(objects_state[i])
             if obj != 0:
-                self.canvas.itemconfig(obj, tags=f"object{len(self.board.objects)}")
+                self.canvas.addtag_withtag(f"object{len(self.board.objects)}", obj)
+                created_objects[i] = obj
             self.board.objects.insert(0, obj)
+        self.board.notify_objects_changed(self.board.CHANGE_CREATE, [obj for obj in created_objects if obj != 0])
+        return created_objects
 
-    def _create_object_from_state(self, obj_state: Dict[str, Any]) -> int:
+    def create_object_from_state(self, obj_state: Dict[str, Any]) -> int:
         """
         Create an object on the canvas based on the given object state.
 
@@ -138,6 +329,14 @@ class FileHandler:
             obj = self.canvas.create_text(*obj_state['coords'], text=obj_state['text'],
                                           font=(pyglet_font.name, pyglet_font.size),
                                           fill=obj_state['fill'])
+        elif obj_state['type'] == ImageHandler.IMAGE_TYPE:
+            obj = self.board.image_handler.create_image(obj_state)
+        if obj != 0 and obj_state.get('groups'):
+            self.board.group_handler.add_to_groups(obj, obj_state['groups'], obj_state['type'])
+        if obj != 0 and obj_state.get('symbol'):
+            self.canvas.addtag_withtag(obj_state['symbol'], obj)
+        if obj != 0:
+            self.canvas.addtag_withtag(obj_state.get('layer', LayerHandler.DEFAULT_LAYER), obj)
         return obj
 
     def load_board(self, filename: str) -> None:
@@ -148,24 +347,217 @@ class FileHandler:
         """
         self.new_board()
 
-        with open(filename, 'r') as f:
-            board_state = json.load(f)
+        board_state, records, base_size, journal_size = BoardJournal.read_board_file(filename)
+        layer_handler = self.board.layer_handler
+        layer_handler.load_layers(board_state.get('layers', []))
+        self.board.symbol_handler.add_symbols(board_state.get('symbols', {}))
+        self.board.image_handler.add_images(board_state.get('images', {}))
+        snapshot_state = SymbolHandler.expand_instances(board_state['objects'], self.board.symbol_handler.symbols)
+        objects_state, object_ids = BoardJournal.replay(snapshot_state, records)
+
+        # Objects are stacked layer by layer, and the objects of hidden layers are not created on the canvas
+        ordered = sorted(zip(objects_state, object_ids), key=lambda entry: (
+            layer_handler.get_rank(entry[0].get('layer')), entry[0]['z-index']))
+        for z_index, (obj_state, _) in enumerate(ordered):
+            obj_state['z-index'] = z_index
+        visible = [entry for entry in ordered if layer_handler.is_visible(entry[0].get('layer'))]
+        hidden = [entry for entry in ordered if not layer_handler.is_visible(entry[0].get('layer'))]
+        created_objects = self.load_objects([obj_state for obj_state, _ in visible])
+        placeholders = layer_handler.add_hidden_objects([obj_state for obj_state, _ in hidden])
+        self.journal.reset(filename, base_size, journal_size,
+                           {obj: object_id for obj, (_, object_id)
+                            in zip(created_objects + placeholders, visible + hidden) if obj != 0})
+        self.saved_images = set(board_state.get('images', {}))
+        self.board.autosave_handler.mark_clean()
+
+    def import_svg_dialog(self) -> None:
+        """
+        Open a file dialog to import the elements of an SVG file as board objects.
+        """
+        filename = filedialog.askopenfilename(filetypes=[("SVG", "*.svg")])
+        if filename:
+            self.import_svg(filename)
+
+    def import_svg(self, filename: str, batch_size: int = SVG_IMPORT_BATCH_SIZE) -> None:
+        """
+        Import the elements of an SVG file as objects on top of the current layer.
+        The file is read while importing, and the objects are created in batches scheduled on the event loop,
+        so that large files neither freeze the board nor need to be held in memory as a whole.
+
+        :param filename: The name of the SVG file.
+        :param batch_size: The number of objects created per batch.
+        """
+        self.cancel_svg_import()
+        objects_state = SvgReader().read_objects(filename)
+        self.import_layer = self.board.layer_handler.current_layer
+        self.imported_objects = []
+        self._import_svg_batch(objects_state, self.import_layer, batch_size)
+
+    def _import_svg_batch(self, objects_state: Iterator[Dict[str, Any]], layer: str, batch_size: int) -> None:
+        """
+        Create the next batch of imported objects, and schedule the batch after it.
+        Once the file has been read, the whole import is recorded as a single undo step.
+
+        :param objects_state: The object states that are still to be read from the SVG file.
+        :param layer: The layer tag of the imported objects.
+        :param batch_size: The number of objects created per batch.
+        """
+        self.import_after_id = None
+        batch: List[Dict[str, Any]] = []
+        try:
+            batch.extend(itertools.islice(objects_state, batch_size))
+            finished = len(batch) < batch_size
+        except ElementTree.ParseError:
+            # The objects read before the malformed part of the file are kept
+            finished = True
+        new_objects = []
+        for obj_state in batch:
+            obj_state['layer'] = layer
+            obj = self.create_object_from_state(obj_state)
+            if obj != 0:
+                self.canvas.addtag_withtag(f"object{len(self.board.objects)}", obj)
+                self.board.objects.append(obj)
+                new_objects.append(obj)
+        if new_objects:
+            # New items are created on top of the canvas, so the layer is put back below the layers above it
+            self.board.layer_handler.raise_to_layer_top(layer, layer)
+            self.board.notify_objects_changed(self.board.CHANGE_CREATE, new_objects)
+            self.imported_objects.extend(new_objects)
+        if not finished:
+            self.import_after_id = self.board.app.get_root().after(1, self._import_svg_batch, objects_state, layer,
+                                                                   batch_size)
+        else:
+            self._finish_svg_import()
+
+    def cancel_svg_import(self, layer: Optional[str] = None) -> None:
+        """
+        Stop an SVG import that is still running, for example before its layer is hidden. The objects imported
+        so far stay on the board and are recorded as a single undo step.
+
+        :param layer: The layer tag, to only stop an import into that layer, or None to stop any import.
+        """
+        if self.import_after_id is None or (layer is not None and layer != self.import_layer):
+            return
+        self.board.app.get_root().after_cancel(self.import_after_id)
+        self.import_after_id = None
+        self._finish_svg_import()
 
-        self.load_objects(board_state['objects'])
+    def _finish_svg_import(self) -> None:
+        """
+        Record the objects of an SVG import as a single undo step.
+        """
+        if self.imported_objects:
+            self.board.undo_handler.record_create(self.imported_objects)
+        self.import_layer = None
+        self.imported_objects = []
 
     def export_board(self) -> None:
         """
-        Export the board as an image file.
+        Export the board as an image file, or as SVG or PostScript vector output.
         """
-        file_path = filedialog.asksaveasfilename(filetypes=[("PNG", "*.png"), ("JPEG", "*.jpg"), ("GIF", "*.gif")])
+        file_path = filedialog.asksaveasfilename(filetypes=[("PNG", "*.png"), ("JPEG", "*.jpg"), ("GIF", "*.gif"),
+                                                            ("SVG", "*.svg"), ("PostScript", "*.ps"),
+                                                            ("EPS", "*.eps"), ("Deep Zoom", "*.dzi")])
         if file_path:
-            self._export_board_as_image(file_path)
+            extension = os.path.splitext(file_path)[1].lower()
+            if extension == ".svg":
+                self._export_board_as_svg(file_path)
+            elif extension in FileHandler.POSTSCRIPT_EXTENSIONS:
+                self._export_board_as_postscript(file_path)
+            elif extension == ".dzi":
+                self._export_board_as_deep_zoom(file_path)
+            else:
+                self._export_board_as_image(file_path, FileHandler.IMAGE_TILE_SIZE)
+
+    def _export_board_as_svg(self, file_path: str, precision: int = SVG_PRECISION) -> None:
+        """
+        Export the board as an SVG file, streaming every object to the file as it is read from the canvas.
+
+        :param file_path: The path of the file to save the exported board.
+        :param precision: The number of decimals written for coordinates.
+        """
+        min_x, min_y, max_x, max_y = self._get_objects_bounds()
+        with open(file_path, 'w', encoding='utf-8') as f:
+            writer = SvgWriter(f, min_x, min_y, max_x - min_x, max_y - min_y, precision)
+            for obj in self.canvas.find_withtag(self.board.layer_handler.get_objects_tag()):
+                writer.write_object(self.get_object_state(obj))
+            writer.close()
+
+    def _export_board_as_deep_zoom(self, file_path: str, workers: Optional[int] = None) -> Dict[str, int]:
+        """
+        Export the board as a Deep Zoom tile pyramid for web viewers. Exporting again to the same file only
+        renders the tiles whose content changed.
+
+        :param file_path: The path of the .dzi file to save the exported board.
+        :param workers: The number of worker processes rendering the tiles, the CPU count if None.
+        :return: The number of tiles that were 'rendered', left 'unchanged' and 'removed'.
+        """
+        min_x, min_y, max_x, max_y = self._get_objects_bounds()
+        objects_state = [self.get_object_state(obj)
+                         for obj in self.canvas.find_withtag(self.board.layer_handler.get_objects_tag())]
+        images = self.board.image_handler.images
+        # Only the images in use are sent to the worker processes
+        writer = DeepZoomWriter(file_path, min_x, min_y, max_x - min_x, max_y - min_y,
+                                images={key: images[key] for key in ImageHandler.get_image_keys(objects_state)
+                                        if key in images}, workers=workers)
+        return writer.write(objects_state)
+
+    def _export_board_as_postscript(self, file_path: str) -> List[str]:
+        """
+        Export the board as PostScript with the canvas's own renderer. A board larger than
+        POSTSCRIPT_TILE_SIZE is split into tiles, each written to its own file named after its row and column,
+        and tiles without any objects are left out.
+
+        :param file_path: The path of the file to save the exported board.
+        :return: The paths of the written files.
+        """
+        min_x, min_y, max_x, max_y = self._get_objects_bounds()
+        tile_size = FileHandler.POSTSCRIPT_TILE_SIZE
+        rows = max(1, math.ceil((max_y - min_y) / tile_size))
+        columns = max(1, math.ceil((max_x - min_x) / tile_size))
+        root, extension = os.path.splitext(file_path)
+        helpers = "||".join(FileHandler.HELPER_TAGS)
+        written_files: List[str] = []
+        # Hidden items are neither found nor rendered, so the helper items are hidden while exporting
+        self.canvas.itemconfig(helpers, state=tk.HIDDEN)
+        try:
+            for row in range(rows):
+                for column in range(columns):
+                    x = min_x + column * tile_size
+                    y = min_y + row * tile_size
+                    width = max(1, min(tile_size, max_x - x))
+                    height = max(1, min(tile_size, max_y - y))
+                    if rows * columns > 1 and not self.canvas.find_overlapping(x, y, x + width, y + height):
+                        continue
+                    tile_path = file_path if rows * columns == 1 else f"{root}-{row + 1}-{column + 1}{extension}"
+                    self.canvas.postscript(file=tile_path, x=x, y=y, width=width, height=height, colormode="color")
+                    written_files.append(tile_path)
+        finally:
+            self.canvas.itemconfig(helpers, state=tk.NORMAL)
+        return written_files
+
+    def _get_objects_bounds(self) -> Tuple[float, float, float, float]:
+        """
+        Get the bounding box of the board objects in a single canvas query, leaving out the helper items.
 
-    def _export_board_as_image(self, file_path: str) -> None:
+        :return: A tuple containing the minimum and maximum coordinates of the objects, limited to
+                 MAX_COORDINATE_VALUE, or a small area around the origin if the board is empty.
         """
-        Export the board as an image file.
+        bbox = self.canvas.bbox(self.board.layer_handler.get_objects_tag())
+        if not bbox:
+            return -100, -100, 100, 100
+        limit = FileHandler.MAX_COORDINATE_VALUE
+        return max(bbox[0], -limit), max(bbox[1], -limit), min(bbox[2], limit), min(bbox[3], limit)
+
+    def _export_board_as_image(self, file_path: str, tile_size: Optional[int] = None) -> None:
+        """
+        Export the board as an image file. Exporting a board whose content, region and fonts have been exported
+        to the same format before copies the cached file instead of rendering it again.
 
         :param file_path: The path of the file to save the exported image.
+        :param tile_size: The size in pixels of the tiles rendered and cached separately, so that a small edit
+                          only renders the tiles it touches, or None to render and cache the image as a whole.
+                          An image that fits in a single tile is always rendered as a whole.
         """
         all_objects = self.canvas.find_all()
         min_x, min_y, max_x, max_y = self._get_board_dimensions(all_objects)
@@ -173,20 +565,69 @@ class FileHandler:
         width = int(max_x - min_x)
         height = int(max_y - min_y)
 
-        image = Image.new("RGBA", (width, height), "white")
-        drawable = ImageDraw.Draw(image)
-
-        for obj in self.canvas.find_all():
+        objects_state = []
+        for obj in all_objects:
             obj_tags = self.canvas.itemcget(obj, "tags")  # type: ignore
-            if obj_tags in ["selection_frame", "eraser_frame"]:
-                continue
-
-            self._draw_object_on_image(obj, drawable, min_x, min_y)
+            if obj_tags not in ["selection_frame", "eraser_frame"]:
+                objects_state.append(self.get_object_state(obj))
+        extension = os.path.splitext(file_path)[1].lower()
+        font_set = ExportCache.get_font_set(ObjectRenderer.FONT_DIR)
+        key = ExportCache.get_key(objects_state, [min_x, min_y, width, height], extension, font_set)
+        cached_path = self.export_cache.lookup(key, extension)
+        if cached_path is not None:
+            shutil.copyfile(cached_path, file_path)
+            return
+
+        if tile_size is None or (width <= tile_size and height <= tile_size):
+            image = Image.new("RGBA", (width, height), "white")
+            ObjectRenderer(image, min_x, min_y, images=self.board.image_handler.images,
+                           full_resolution=True).draw_objects(objects_state)
+        else:
+            image = self._render_image_tiles(objects_state, min_x, min_y, width, height, tile_size, font_set)
 
         if file_path.lower().endswith(".jpg"):
             image = image.convert("RGB")
 
         image.save(file_path)
+        self.export_cache.store_file(key, extension, file_path)
+
+    def _render_image_tiles(self, objects_state: List[Dict[str, Any]], min_x: float, min_y: float, width: int,
+                            height: int, tile_size: int, font_set: List[Tuple[str, int, int]]) -> Image.Image:
+        """
+        Render the board image tile by tile, reusing the cached tiles whose culled objects have not changed.
+
+        :param objects_state: The states of the objects, bottom-most first.
+        :param min_x: The board x-coordinate of the left edge of the image.
+        :param min_y: The board y-coordinate of the top edge of the image.
+        :param width: The width of the image in pixels.
+        :param height: The height of the image in pixels.
+        :param tile_size: The size of the tiles in pixels.
+        :param font_set: The font files the text is rendered with.
+        :return: The rendered image.
+        """
+        image = Image.new("RGBA", (width, height), "white")
+        bounds = DeepZoomWriter.get_bounds(objects_state)
+        for top in range(0, height, tile_size):
+            for left in range(0, width, tile_size):
+                tile_width = min(tile_size, width - left)
+                tile_height = min(tile_size, height - top)
+                x = min_x + left
+                y = min_y + top
+                visible = np.flatnonzero((bounds[:, 0] < x + tile_width) & (bounds[:, 2] > x)
+                                         & (bounds[:, 1] < y + tile_height) & (bounds[:, 3] > y))
+                if not len(visible):
+                    continue
+                tile_states = [objects_state[index] for index in visible]
+                tile_key = ExportCache.get_key(tile_states, [x, y, tile_width, tile_height], font_set)
+                tile = self.export_cache.load_image(tile_key)
+                if tile is None:
+                    tile = Image.new("RGBA", (tile_width, tile_height), "white")
+                    ObjectRenderer(tile, x, y, images=self.board.image_handler.images,
+                                   full_resolution=True).draw_objects(tile_states)
+                    self.export_cache.store_image(tile_key, tile)
+                image.paste(tile, (left, top))
+        self.export_cache.evict()
+        return image
 
     def _get_board_dimensions(self, all_objects: Tuple[int, ...]) -> Tuple[float, float, float, float]:
         """
@@ -217,63 +658,3 @@ class FileHandler:
         max_y = min(max_y, FileHandler.MAX_COORDINATE_VALUE)
 
         return min_x, min_y, max_x, max_y
-
-    def _draw_object_on_image(self, obj: int, drawable: ImageDraw.Draw, min_x: float, min_y: float) -> None:
-        """
-        Draw an object on the image.
-
-        :param obj: The ID of the object to be drawn.
-        :param drawable: The ImageDraw object for drawing on the image.
-        :param min_x: The minimum x-coordinate of the board.
-        :param min_y: The minimum y-coordinate of the board.
-        """
-        item_type = self.canvas.type(obj)  # type: ignore
-        coords = self.canvas.coords(obj)
-
-        adjusted_coords = [coord - min_x if i % 2 == 0 else coord - min_y for i, coord in enumerate(coords)]
-
-        width = self.canvas.itemcget(obj, "width")  # type: ignore
-        if isinstance(width, tuple):
-            width = width[0]
-        elif isinstance(width, str):
-            width = int(float(width))
-
-        fill_color = self.canvas.itemcget(obj, "fill")  # type: ignore
-        if item_type == "rectangle":
-            outline_color = self.canvas.itemcget(obj, "outline")  # type: ignore
-            coords_tuple = (adjusted_coords[0], adjusted_coords[1], adjusted_coords[2], adjusted_coords[3])
-            drawable.rectangle(coords_tuple, fill=fill_color, outline=outline_color, width=width)
-        elif item_type == "oval":
-            outline_color = self.canvas.itemcget(obj, "outline")  # type: ignore
-            drawable.ellipse(adjusted_coords, fill=fill_color, outline=outline_color, width=width)
-        elif item_type == "polygon":
-            drawable.polygon(adjusted_coords, fill=fill_color, width=width)
-        elif item_type == "line":
-            drawable.line(adjusted_coords, fill=fill_color, width=width)
-        elif item_type == "text":
-            self._draw_text_on_image(obj, drawable, adjusted_coords, fill_color)
-
-    def _draw_text_on_image(self, obj: int, drawable: ImageDraw.Draw, adjusted_coords: List[float], fill_color: str) -> None:
-        """
-        Draw a text object on the image.
-
-        :param obj: The ID of the text object to be drawn.
-        :param drawable: The ImageDraw object for drawing on the image.
-        :param adjusted_coords: The adjusted coordinates of the text object.
-        :param fill_color: The fill color of the text object.
-        """
-        text = self.canvas.itemcget(obj, "text")  # type: ignore
-        font_name, font_size = self.canvas.itemcget(obj, "font").split()  # type: ignore
-        font_path = os.path.join("fonts", font_name + ".ttf")
-        try:
-            font = ImageFont.truetype(font_path, int(font_size))
-        except (OSError, IOError):
-            font_path = os.path.join("fonts", "Arial.ttf")
-            font = ImageFont.truetype(font_path, int(font_size))
-
-        text_width, text_height = font.getbbox(text)[2:4]
-
-        text_x = adjusted_coords[0] - text_width // 2
-        text_y = adjusted_coords[1] - text_height // 2
-
-        drawable.text((text_x, text_y), text, fill=fill_color, font=font)
@@ -1,5 +1,9 @@
-from typing import TYPE_CHECKING
+import math
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 import tkinter as tk
+
+from region_filler import RegionFiller
+
 if TYPE_CHECKING:
     from board import Board
 
@@ -10,6 +14,7 @@ class FillHandler:
     """
 
     FILL_TOLERANCE = 5
+    REGION_WINDOW_SIZES = [256, 1024, 4096]
 
     def __init__(self, board: 'Board') -> None:
         """
@@ -23,18 +28,83 @@ class FillHandler:
 
     def fill_area(self, event: 'tk.Event[tk.Misc]') -> None:
         """
-        Fill the area of the clicked object with the selected fill color.
+        Fill the clicked object with the selected fill color, or the region enclosed around the click if no
+        object was clicked. Objects on locked layers are never filled, but they still enclose regions, so that
+        a locked layer of outlines can be colored in on the layers above it.
 
         :param event: The event that triggered the fill action.
         """
         x = self.canvas.canvasx(event.x)
         y = self.canvas.canvasy(event.y)
-        clicked_items = self.canvas.find_overlapping(x - FillHandler.FILL_TOLERANCE, y - FillHandler.FILL_TOLERANCE,
-                                                     x + FillHandler.FILL_TOLERANCE, y + FillHandler.FILL_TOLERANCE)
+        clicked_items = self.board.layer_handler.without_locked(list(self.canvas.find_overlapping(
+            x - FillHandler.FILL_TOLERANCE, y - FillHandler.FILL_TOLERANCE,
+            x + FillHandler.FILL_TOLERANCE, y + FillHandler.FILL_TOLERANCE)))
         if clicked_items:
             clicked_item = clicked_items[-1]
             item_type = self.canvas.type(clicked_item)  # type: ignore
             if item_type in ["line", "text", "polygon"]:
+                self.board.undo_handler.record_restyle([clicked_item], {'fill': self.toolbox.fill_color})
                 self.canvas.itemconfig(clicked_item, fill=self.toolbox.fill_color)
             elif item_type in ["rectangle", "oval"]:
+                self.board.undo_handler.record_restyle([clicked_item], {'fill': self.toolbox.fill_color,
+                                                                        'outline': self.toolbox.fill_color})
                 self.canvas.itemconfig(clicked_item, fill=self.toolbox.fill_color, outline=self.toolbox.fill_color)
+            self.board.notify_objects_changed(self.board.CHANGE_RESTYLE, [clicked_item])
+        else:
+            self.fill_region(x, y)
+
+    def fill_region(self, x: float, y: float) -> Optional[int]:
+        """
+        Fill the region enclosed by the objects around a point with a polygon in the selected fill color.
+        The search area grows until the region fits in it; a region that is not enclosed within the largest
+        area is not filled.
+
+        :param x: The x-coordinate of the point.
+        :param y: The y-coordinate of the point.
+        :return: The ID of the created polygon, or None if the region is not enclosed.
+        """
+        for window_size in FillHandler.REGION_WINDOW_SIZES:
+            origin_x = math.floor(x) - window_size // 2
+            origin_y = math.floor(y) - window_size // 2
+            objects_state = self._get_objects_state(origin_x, origin_y, window_size)
+            free = RegionFiller.rasterize(objects_state, origin_x, origin_y, window_size, window_size)
+            filled = RegionFiller.flood_fill(free, math.floor(x) - origin_x, math.floor(y) - origin_y)
+            if filled is not None:
+                outline = RegionFiller.trace_outline(filled)
+                coords: List[float] = [coord for corner_x, corner_y in outline
+                                       for coord in (origin_x + corner_x, origin_y + corner_y)]
+                return self._create_region(coords)
+            if not free[math.floor(y) - origin_y, math.floor(x) - origin_x]:
+                return None
+        return None
+
+    def _get_objects_state(self, origin_x: int, origin_y: int, window_size: int) -> List[Dict[str, Any]]:
+        """
+        Get the states of the board objects overlapping a square area, bottom-most first.
+
+        :param origin_x: The x-coordinate of the left edge of the area.
+        :param origin_y: The y-coordinate of the top edge of the area.
+        :param window_size: The size of the area.
+        :return: The object states.
+        """
+        board_objects = set(self.board.objects)
+        return [self.board.file_handler.get_object_state(obj)
+                for obj in self.canvas.find_overlapping(origin_x, origin_y,
+                                                        origin_x + window_size, origin_y + window_size)
+                if obj in board_objects]
+
+    def _create_region(self, coords: List[float]) -> int:
+        """
+        Create the polygon of a filled region below all other items of the current layer.
+
+        :param coords: The flat list of the polygon coordinates.
+        :return: The ID of the polygon.
+        """
+        layer_handler = self.board.layer_handler
+        region = self.canvas.create_polygon(*coords, fill=self.toolbox.fill_color, outline="", width=0,
+                                            tags=(f"object{len(self.board.objects)}", layer_handler.current_layer))
+        layer_handler.lower_to_layer_bottom(region, layer_handler.current_layer)
+        self.board.objects.append(region)
+        self.board.notify_objects_changed(self.board.CHANGE_CREATE, [region])
+        self.board.undo_handler.record_create([region])
+        return region
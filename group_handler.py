@@ -0,0 +1,144 @@
+from typing import Dict, Iterable, List, Optional, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from board import Board
+
+
+class GroupHandler:
+    """
+    A class that keeps track of the object groups of the board.
+
+    A group is a canvas tag shared by all of its objects, so that a whole group is selected, moved, restyled
+    or deleted with a single canvas call. Groups nest: an object carries the tag of every group it is in, and
+    since a new group always wraps whole groups, the tags of an object are in order from the innermost to the
+    outermost group. Group members also carry a tag for their kind, so that the selection tags of a group
+    can be set without looking at every member.
+    """
+
+    GROUP_TAG_PREFIX = "group:"
+    OUTLINED_MEMBER_TAG = "member:outlined"
+    TEXT_MEMBER_TAG = "member:text"
+    IMAGE_MEMBER_TAG = "member:image"
+    OUTLINED_TYPES = ["rectangle", "oval"]
+
+    def __init__(self, board: 'Board') -> None:
+        """
+        Initialize the GroupHandler.
+
+        :param board: The board instance.
+        """
+        self.board = board
+        self.canvas = board.canvas
+        self.next_group: int = 0
+        self.group_types: Dict[str, Set[str]] = {}
+        board.add_objects_changed_listener(self.on_objects_changed)
+
+    @staticmethod
+    def is_group_tag(tag: str) -> bool:
+        """
+        Check if a canvas tag is a group tag.
+
+        :param tag: The tag.
+        :return: True if the tag names a group, False otherwise.
+        """
+        return tag.startswith(GroupHandler.GROUP_TAG_PREFIX)
+
+    def get_groups(self, obj: int) -> List[str]:
+        """
+        Get the groups an object is in.
+
+        :param obj: The object ID.
+        :return: The group tags, from the outermost to the innermost group.
+        """
+        return [tag for tag in reversed(self.canvas.gettags(obj)) if GroupHandler.is_group_tag(tag)]
+
+    def get_outermost_group(self, obj: int) -> Optional[str]:
+        """
+        Get the outermost group of an object.
+
+        :param obj: The object ID.
+        :return: The group tag, or None if the object is not grouped.
+        """
+        groups = self.get_groups(obj)
+        return groups[0] if groups else None
+
+    def get_group_types(self, group: str) -> Set[str]:
+        """
+        Get the item types of the objects in a group.
+
+        :param group: The group tag.
+        :return: The item types.
+        """
+        if group not in self.group_types:
+            self.group_types[group] = {self.canvas.type(obj) for obj in self.canvas.find_withtag(group)}  # type: ignore
+        return self.group_types[group]
+
+    def expand_to_groups(self, objects: Iterable[int]) -> List[int]:
+        """
+        Extend a list of objects with the other objects of their outermost groups.
+
+        :param objects: The object IDs.
+        :return: The object IDs, each whole group taking the place of its first object.
+        """
+        expanded: List[int] = []
+        seen_objects: Set[int] = set()
+        seen_groups: Set[str] = set()
+        for obj in objects:
+            group = self.get_outermost_group(obj)
+            if group is None:
+                members = [obj]
+            elif group in seen_groups:
+                continue
+            else:
+                seen_groups.add(group)
+                members = list(self.canvas.find_withtag(group))
+            for member in members:
+                if member not in seen_objects:
+                    seen_objects.add(member)
+                    expanded.append(member)
+        return expanded
+
+    def create_group(self) -> str:
+        """
+        Allocate the tag of a new group.
+
+        :return: The group tag.
+        """
+        group = f"{GroupHandler.GROUP_TAG_PREFIX}{self.next_group}"
+        self.next_group += 1
+        return group
+
+    def add_to_groups(self, obj: int, groups: List[str], item_type: str) -> None:
+        """
+        Put an object created from a saved state back into its groups.
+
+        :param obj: The object ID.
+        :param groups: The group tags, from the outermost to the innermost group.
+        :param item_type: The item type of the object.
+        """
+        for group in reversed(groups):
+            self.canvas.addtag_withtag(group, obj)
+            self.next_group = max(self.next_group, int(group[len(GroupHandler.GROUP_TAG_PREFIX):]) + 1)
+        if item_type in GroupHandler.OUTLINED_TYPES:
+            self.canvas.addtag_withtag(GroupHandler.OUTLINED_MEMBER_TAG, obj)
+        elif item_type == "text":
+            self.canvas.addtag_withtag(GroupHandler.TEXT_MEMBER_TAG, obj)
+        elif item_type == "image":
+            self.canvas.addtag_withtag(GroupHandler.IMAGE_MEMBER_TAG, obj)
+
+    def on_objects_changed(self, change: str, _: List[int]) -> None:
+        """
+        Forget the cached item types of the groups when objects are created or deleted.
+
+        :param change: The change type.
+        :param _: The IDs of the affected objects (unused).
+        """
+        if change in (self.board.CHANGE_CREATE, self.board.CHANGE_DELETE):
+            self.group_types = {}
+
+    def clear(self) -> None:
+        """
+        Forget all groups, for example when a new board is loaded.
+        """
+        self.next_group = 0
+        self.group_types = {}
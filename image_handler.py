@@ -0,0 +1,173 @@
+import base64
+import hashlib
+import tkinter as tk
+from tkinter import filedialog
+from typing import Any, Dict, Iterable, Set, TYPE_CHECKING, Tuple
+
+from PIL import ImageTk
+
+from image_pyramid import ImagePyramid
+
+if TYPE_CHECKING:
+    from board import Board
+
+
+class ImageHandler:
+    """
+    A class that handles the raster images of the board.
+
+    Images are kept once per content hash, as their original file data and an ImagePyramid, so that the same
+    screenshot placed many times is stored once in memory and in the board file. An image object refers to its
+    image by hash and keeps its board size in its coordinates. Its canvas item shows a PhotoImage of the
+    pyramid level matching that size, shared by all items of the same image and size.
+    """
+
+    IMAGE_TYPE = "image"
+    FILE_TYPES = [("Images", "*.png *.jpg *.jpeg *.gif *.bmp *.webp")]
+
+    def __init__(self, board: 'Board') -> None:
+        """
+        Initialize the ImageHandler.
+
+        :param board: The board instance.
+        """
+        self.board = board
+        self.canvas = board.canvas
+        self.images: Dict[str, ImagePyramid] = {}
+        self.photos: Dict[Tuple[str, int, int], ImageTk.PhotoImage] = {}
+        self.photo_keys: Dict[str, Tuple[str, int, int]] = {}
+
+    def add_image_data(self, data: bytes) -> str:
+        """
+        Add an image from its file data, unless an image with the same content has been added already.
+
+        :param data: The image file data.
+        :return: The content hash of the image.
+        :raises OSError: If the data is not an image that PIL can read.
+        """
+        key = hashlib.sha256(data).hexdigest()
+        if key not in self.images:
+            self.images[key] = ImagePyramid(data)
+        return key
+
+    def add_images(self, definitions: Dict[str, str]) -> None:
+        """
+        Add images in the form they are stored in the board file.
+
+        :param definitions: The base64-encoded file data of every image, by content hash.
+        """
+        for key, encoded in definitions.items():
+            if key not in self.images:
+                self.images[key] = ImagePyramid(base64.b64decode(encoded))
+
+    def get_images_data(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """
+        Get the file data of images. The data is never modified, so it can be shared with a worker thread.
+
+        :param keys: The content hashes of the images.
+        :return: The file data of every known image, by content hash.
+        """
+        return {key: self.images[key].data for key in keys if key in self.images}
+
+    @staticmethod
+    def encode_images(images_data: Dict[str, bytes]) -> Dict[str, str]:
+        """
+        Encode image file data in the form it is stored in the board file.
+
+        :param images_data: The file data of every image, by content hash.
+        :return: The base64-encoded file data of every image, by content hash.
+        """
+        return {key: base64.b64encode(data).decode('ascii') for key, data in images_data.items()}
+
+    @staticmethod
+    def get_image_keys(objects_state: Iterable[Dict[str, Any]]) -> Set[str]:
+        """
+        Get the images used by object states.
+
+        :param objects_state: The object states.
+        :return: The content hashes of the images.
+        """
+        return {obj_state[ImageHandler.IMAGE_TYPE] for obj_state in objects_state
+                if obj_state['type'] == ImageHandler.IMAGE_TYPE}
+
+    def import_image_dialog(self) -> None:
+        """
+        Open a file dialog to place an image file on the board.
+        """
+        filename = filedialog.askopenfilename(filetypes=ImageHandler.FILE_TYPES)
+        if filename:
+            self.import_image(filename)
+
+    def import_image(self, filename: str) -> int:
+        """
+        Place an image file at its original size in the middle of the view, on top of the current layer.
+
+        :param filename: The name of the image file.
+        :return: The ID of the created object.
+        :raises OSError: If the file cannot be read or is not an image that PIL can read.
+        """
+        with open(filename, 'rb') as f:
+            key = self.add_image_data(f.read())
+        pyramid = self.images[key]
+        pyramid.build()
+        x = self.canvas.canvasx(self.canvas.winfo_width() / 2) - pyramid.width / 2
+        y = self.canvas.canvasy(self.canvas.winfo_height() / 2) - pyramid.height / 2
+        layer = self.board.layer_handler.current_layer
+        obj = self.board.file_handler.create_object_from_state({
+            'type': ImageHandler.IMAGE_TYPE, 'coords': [x, y, x + pyramid.width, y + pyramid.height],
+            ImageHandler.IMAGE_TYPE: key, 'layer': layer})
+        self.canvas.addtag_withtag(f"object{len(self.board.objects)}", obj)
+        self.board.layer_handler.raise_to_layer_top(obj, layer)
+        self.board.objects.append(obj)
+        self.board.notify_objects_changed(self.board.CHANGE_CREATE, [obj])
+        self.board.undo_handler.record_create([obj])
+        return obj
+
+    def create_image(self, obj_state: Dict[str, Any]) -> int:
+        """
+        Create the canvas item of an image object.
+
+        :param obj_state: The state of the image object.
+        :return: The ID of the created item, or 0 if the image is unknown.
+        """
+        key = obj_state.get(ImageHandler.IMAGE_TYPE)
+        if key not in self.images:
+            return 0
+        x1, y1, x2, y2 = obj_state['coords'][:4]
+        photo = self.get_photo(key, max(1, round(abs(x2 - x1))), max(1, round(abs(y2 - y1))))
+        return self.canvas.create_image(min(x1, x2), min(y1, y2), image=photo, anchor=tk.NW)
+
+    def get_image_state(self, obj: int) -> Dict[str, Any]:
+        """
+        Get the state of the canvas item of an image object.
+
+        :param obj: The ID of the item.
+        :return: The object state, with the corners of the image as coordinates.
+        """
+        key, width, height = self.photo_keys[str(self.canvas.itemcget(obj, 'image'))]  # type: ignore
+        x, y = self.canvas.coords(obj)[:2]
+        return {'type': ImageHandler.IMAGE_TYPE, 'coords': [x, y, x + width, y + height], ImageHandler.IMAGE_TYPE: key}
+
+    def get_photo(self, key: str, width: int, height: int) -> ImageTk.PhotoImage:
+        """
+        Get the PhotoImage showing an image at the given size, creating it from the matching pyramid level.
+
+        :param key: The content hash of the image.
+        :param width: The width in pixels.
+        :param height: The height in pixels.
+        :return: The PhotoImage.
+        """
+        photo = self.photos.get((key, width, height))
+        if photo is None:
+            photo = ImageTk.PhotoImage(self.images[key].get_image(width, height))
+            self.photos[(key, width, height)] = photo
+            self.photo_keys[str(photo)] = (key, width, height)
+        return photo
+
+    def clear(self) -> None:
+        """
+        Remove all images.
+        """
+        self.images = {}
+        self.photos = {}
+        self.photo_keys = {}
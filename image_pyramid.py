@@ -0,0 +1,76 @@
+import io
+from typing import List, Optional
+
+from PIL import Image
+
+
+class ImagePyramid:
+    """
+    A class that holds a raster image as its original file data, with a pyramid of downscaled copies.
+
+    Every level of the pyramid halves the size of the level below it, down to MIN_LEVEL_SIZE pixels. The
+    downscaled levels stay decoded, while the full-resolution pixels are only decoded from the file data when
+    the pyramid is built or an image at least as large as the original is asked for, so that showing an image
+    smaller than its original size never decodes it again. Images too small for any downscaled level keep
+    their original pixels decoded instead.
+    """
+
+    MIN_LEVEL_SIZE = 32
+
+    def __init__(self, data: bytes) -> None:
+        """
+        Initialize the ImagePyramid. Only the header of the image is read.
+
+        :param data: The image file data.
+        :raises OSError: If the data is not an image that PIL can read.
+        """
+        self.data = data
+        with Image.open(io.BytesIO(data)) as image:
+            self.width, self.height = image.size
+        self.levels: List[Image.Image] = []
+        self.original: Optional[Image.Image] = None
+        self.built = False
+
+    def build(self) -> None:
+        """
+        Build the downscaled levels of the pyramid, if they have not been built yet.
+        """
+        if self.built:
+            return
+        self.built = True
+        image = self.decode()
+        if min(image.size) // 2 < ImagePyramid.MIN_LEVEL_SIZE:
+            self.original = image
+            return
+        while min(image.size) // 2 >= ImagePyramid.MIN_LEVEL_SIZE:
+            image = image.reduce(2)
+            self.levels.append(image)
+
+    def decode(self) -> Image.Image:
+        """
+        Decode the full-resolution pixels of the image.
+
+        :return: The image, in RGBA mode.
+        """
+        with Image.open(io.BytesIO(self.data)) as image:
+            return image.convert("RGBA")
+
+    def get_image(self, width: int, height: int, full_resolution: bool = False) -> Image.Image:
+        """
+        Get the image resized to the given size, from the smallest pyramid level that is at least as large.
+
+        :param width: The width in pixels.
+        :param height: The height in pixels.
+        :param full_resolution: True to resize from the original pixels, as when exporting.
+        :return: The resized image, in RGBA mode.
+        """
+        source = None
+        if not full_resolution:
+            self.build()
+            source = next((level for level in reversed(self.levels)
+                           if level.width >= width and level.height >= height), None)
+        if source is None:
+            source = self.original if self.original is not None else self.decode()
+        if source.size == (width, height):
+            return source
+        return source.resize((max(1, width), max(1, height)), Image.Resampling.LANCZOS)
@@ -0,0 +1,91 @@
+import math
+from typing import Any, Dict
+
+
+class LatencyHistogram:
+    """
+    A class representing a histogram of latencies with logarithmic buckets.
+
+    Every power of two is split into SUB_BUCKETS buckets, so percentiles are accurate to about 9 percent
+    while the memory used does not grow with the number of recorded latencies.
+    """
+
+    MIN_LATENCY = 1e-6
+    SUB_BUCKETS = 8
+
+    def __init__(self) -> None:
+        """
+        Initialize the LatencyHistogram.
+        """
+        self.buckets: Dict[int, int] = {}
+        self.count: int = 0
+        self.total: float = 0
+        self.max: float = 0
+
+    def record(self, latency: float) -> None:
+        """
+        Add a latency to the histogram.
+
+        :param latency: The latency in seconds.
+        """
+        index = LatencyHistogram.bucket_index(latency)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+
+    def percentile(self, percent: float) -> float:
+        """
+        Get an upper bound of the given percentile.
+
+        :param percent: The percentile, between 0 and 100.
+        :return: The latency in seconds, or 0 if the histogram is empty.
+        """
+        if self.count == 0:
+            return 0
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(LatencyHistogram.bucket_upper_bound(index), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Summarize the histogram.
+
+        :return: The count, mean, percentiles and maximum in seconds, and the non-empty buckets.
+        """
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max,
+            'buckets': {f"{LatencyHistogram.bucket_upper_bound(index):.6g}": count
+                        for index, count in sorted(self.buckets.items())},
+        }
+
+    @staticmethod
+    def bucket_index(latency: float) -> int:
+        """
+        Get the bucket a latency falls into.
+
+        :param latency: The latency in seconds.
+        :return: The bucket index.
+        """
+        if latency <= LatencyHistogram.MIN_LATENCY:
+            return 0
+        return math.ceil(math.log2(latency / LatencyHistogram.MIN_LATENCY) * LatencyHistogram.SUB_BUCKETS)
+
+    @staticmethod
+    def bucket_upper_bound(index: int) -> float:
+        """
+        Get the largest latency of a bucket.
+
+        :param index: The bucket index.
+        :return: The latency in seconds.
+        """
+        return LatencyHistogram.MIN_LATENCY * 2 ** (index / LatencyHistogram.SUB_BUCKETS)
@@ -0,0 +1,172 @@
+import atexit
+import functools
+import json
+import time
+import tkinter as tk
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from latency_histogram import LatencyHistogram
+
+if TYPE_CHECKING:
+    from board import Board
+
+
+class LatencyMonitor:
+    """
+    A class that measures how long the board event handlers take and shows the numbers in an overlay.
+
+    The monitor is opt-in: it is only created when ENABLED is set, for example with the --latency option.
+    """
+
+    ENABLED = False
+    REPORT_PATH: Optional[str] = None
+
+    EVENT_HANDLERS = ["handle_click_event", "handle_drag_event", "stop_drawing", "handle_right_click_event"]
+    SCROLL_HANDLER = "smooth_scroll"
+    OVERLAY_TOGGLE_KEY = "<F3>"
+    OVERLAY_REFRESH_MS = 500
+    OVERLAY_WINDOW = 2.0
+    OVERLAY_BACKGROUND = "black"
+    OVERLAY_FOREGROUND = "lime"
+    OVERLAY_FONT = ("Courier", 10)
+
+    def __init__(self, board: 'Board') -> None:
+        """
+        Initialize the LatencyMonitor and wrap the event entry points of the board.
+        Must be created before the board sets up its bindings.
+
+        :param board: The board instance.
+        """
+        self.board = board
+        self.canvas = board.canvas
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.recent: Deque[Tuple[float, float]] = deque()
+        self.overlay: Optional[tk.Label] = None
+        self.after_id: Optional[str] = None
+
+        for handler in LatencyMonitor.EVENT_HANDLERS:
+            setattr(board, handler, self.wrap(handler, getattr(board, handler)))
+        board.object_mover.smooth_scroll = self.wrap(  # type: ignore
+            LatencyMonitor.SCROLL_HANDLER, board.object_mover.smooth_scroll)
+        board.app.get_root().bind(LatencyMonitor.OVERLAY_TOGGLE_KEY, lambda _: self.toggle_overlay())
+        atexit.register(self.stop)
+
+    def wrap(self, handler: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap a handler so that every call is timed.
+
+        :param handler: The name the handler is reported under.
+        :param func: The handler function.
+        :return: The timed handler function.
+        """
+        @functools.wraps(func)
+        def timed_handler(*args: Any, **kwargs: Any) -> Any:
+            tool = self.board.toolbox.current_tool
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(tool, handler, time.perf_counter() - start)
+        return timed_handler
+
+    def record(self, tool: str, handler: str, latency: float) -> None:
+        """
+        Record the latency of a handler call.
+
+        :param tool: The tool that was active during the call.
+        :param handler: The name of the handler.
+        :param latency: The latency in seconds.
+        """
+        histogram = self.histograms.get((tool, handler))
+        if histogram is None:
+            histogram = self.histograms[(tool, handler)] = LatencyHistogram()
+        histogram.record(latency)
+        now = time.perf_counter()
+        self.recent.append((now, latency))
+        self._trim_recent(now)
+
+    def toggle_overlay(self) -> None:
+        """
+        Show or hide the overlay.
+        """
+        if self.overlay is None:
+            self.overlay = tk.Label(self.canvas, justify=tk.LEFT, font=LatencyMonitor.OVERLAY_FONT,
+                                    bg=LatencyMonitor.OVERLAY_BACKGROUND, fg=LatencyMonitor.OVERLAY_FOREGROUND)
+            self.overlay.place(x=5, y=5)
+            self.update_overlay()
+        else:
+            self._hide_overlay()
+
+    def update_overlay(self) -> None:
+        """
+        Refresh the overlay text and schedule the next refresh.
+        """
+        if self.overlay is not None:
+            self.overlay.config(text=self.get_overlay_text())
+            self.after_id = self.board.app.get_root().after(LatencyMonitor.OVERLAY_REFRESH_MS, self.update_overlay)
+
+    def get_overlay_text(self) -> str:
+        """
+        Get the live statistics of the recent handler calls.
+
+        :return: The p50 and p99 handler time, the event rate and the item count.
+        """
+        self._trim_recent(time.perf_counter())
+        recent = LatencyHistogram()
+        for _, latency in self.recent:
+            recent.record(latency)
+        return (f"p50 {recent.percentile(50) * 1000:.2f} ms  p99 {recent.percentile(99) * 1000:.2f} ms\n"
+                f"{len(self.recent) / LatencyMonitor.OVERLAY_WINDOW:.0f} events/s  "
+                f"{len(self.canvas.find_all())} items")
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Summarize the latency histograms.
+
+        :return: The statistics per tool and handler.
+        """
+        return [dict(histogram.to_dict(), tool=tool, handler=handler)
+                for (tool, handler), histogram in sorted(self.histograms.items())]
+
+    def write_report(self, filename: str) -> None:
+        """
+        Write the latency histograms to a JSON file.
+
+        :param filename: The name of the report file.
+        """
+        with open(filename, 'w') as f:
+            json.dump(self.report(), f, indent=4)
+
+    def stop(self) -> None:
+        """
+        Hide the overlay and write the report if a report path is configured.
+        Called when the board is destroyed or the application exits, whichever comes first.
+        """
+        atexit.unregister(self.stop)
+        self._hide_overlay()
+        if LatencyMonitor.REPORT_PATH:
+            self.write_report(LatencyMonitor.REPORT_PATH)
+
+    def _hide_overlay(self) -> None:
+        """
+        Destroy the overlay and cancel its refresh.
+        """
+        try:
+            if self.after_id is not None:
+                self.board.app.get_root().after_cancel(self.after_id)
+            if self.overlay is not None:
+                self.overlay.destroy()
+        except tk.TclError:
+            pass  # The application window is already gone
+        self.after_id = None
+        self.overlay = None
+
+    def _trim_recent(self, now: float) -> None:
+        """
+        Forget handler calls that are older than the overlay window.
+
+        :param now: The current time.
+        """
+        while self.recent and self.recent[0][0] < now - LatencyMonitor.OVERLAY_WINDOW:
+            self.recent.popleft()
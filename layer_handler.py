@@ -0,0 +1,383 @@
+import tkinter as tk
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING, Union
+
+import numpy as np
+
+from clipboard import Clipboard
+
+if TYPE_CHECKING:
+    from board import Board
+
+
+class LayerHandler:
+    """
+    A class that manages the layers of the board.
+
+    Every object carries the tag of its layer, and the items of a layer are kept together in the stacking
+    order, in the order of the layers. Hiding a layer evicts its items from the canvas: their states are packed
+    like the clipboard and kept in the model, so that Tk neither draws nor hit-tests them, and showing the layer
+    creates them again in one batch. The items of locked layers carry the locked tag and are disabled, so that
+    the select, eraser and fill tools skip them. The current layer, which new objects go to, is always visible
+    and unlocked.
+    """
+
+    LAYER_TAG_PREFIX = "layer:"
+    DEFAULT_LAYER = "layer:0"
+    LOCKED_TAG = "locked"
+
+    def __init__(self, board: 'Board') -> None:
+        """
+        Initialize the LayerHandler.
+
+        :param board: The board instance.
+        """
+        self.board = board
+        self.canvas = board.canvas
+        self.layers: List[Dict[str, Any]] = []
+        self.hidden_objects: Dict[str, Tuple[List[int], Clipboard]] = {}
+        self.current_layer: str = LayerHandler.DEFAULT_LAYER
+        self.next_layer: int = 1
+        self.next_placeholder: int = -1
+        self.clear()
+        board.add_objects_changed_listener(self.on_objects_changed)
+
+    @staticmethod
+    def is_layer_tag(tag: str) -> bool:
+        """
+        Check if a canvas tag is a layer tag.
+
+        :param tag: The tag.
+        :return: True if the tag names a layer, False otherwise.
+        """
+        return tag.startswith(LayerHandler.LAYER_TAG_PREFIX)
+
+    def get_layer(self, obj: int) -> Optional[str]:
+        """
+        Get the layer of an object.
+
+        :param obj: The object ID.
+        :return: The layer tag, or None if the item is not a board object.
+        """
+        return next((tag for tag in self.canvas.gettags(obj) if LayerHandler.is_layer_tag(tag)), None)
+
+    def get_objects_tag(self) -> str:
+        """
+        Get a tag expression matching every board object on the canvas, but none of the helper items.
+
+        :return: The tag expression.
+        """
+        return "||".join(info['id'] for info in self.layers if info['visible'])
+
+    def get_rank(self, layer: Optional[str]) -> int:
+        """
+        Get the position of a layer in the stacking order.
+
+        :param layer: The layer tag, or None for the default layer.
+        :return: The position of the layer, 0 for the bottom-most layer.
+        """
+        return next((rank for rank, info in enumerate(self.layers) if info['id'] == layer), 0)
+
+    def is_visible(self, layer: Optional[str]) -> bool:
+        """
+        Check if a layer is visible.
+
+        :param layer: The layer tag, or None for the default layer.
+        :return: True if the layer is visible, False if it is hidden.
+        """
+        return bool(self.layers[self.get_rank(layer)]['visible'])
+
+    def is_locked(self, layer: Optional[str]) -> bool:
+        """
+        Check if a layer is locked.
+
+        :param layer: The layer tag, or None for the default layer.
+        :return: True if the layer is locked, False otherwise.
+        """
+        return bool(self.layers[self.get_rank(layer)]['locked'])
+
+    def add_layer(self, name: Optional[str] = None) -> str:
+        """
+        Add a new layer on top of the others and make it the current layer.
+
+        :param name: The name of the layer, or None for a numbered name.
+        :return: The layer tag.
+        """
+        layer = f"{LayerHandler.LAYER_TAG_PREFIX}{self.next_layer}"
+        self.next_layer += 1
+        self.layers.append({'id': layer, 'name': name or f"Layer {len(self.layers) + 1}",
+                            'visible': True, 'locked': False})
+        self.current_layer = layer
+        self.board.file_handler.journal.require_snapshot()
+        return layer
+
+    def rename_layer(self, layer: str, name: str) -> None:
+        """
+        Rename a layer.
+
+        :param layer: The layer tag.
+        :param name: The new name.
+        """
+        self.layers[self.get_rank(layer)]['name'] = name
+        self.board.file_handler.journal.require_snapshot()
+
+    def set_current_layer(self, layer: str) -> None:
+        """
+        Make a layer the one new objects are added to. Hidden and locked layers cannot be made current.
+
+        :param layer: The layer tag.
+        """
+        if self.is_visible(layer) and not self.is_locked(layer):
+            self.current_layer = layer
+
+    def set_visible(self, layer: str, visible: bool, record: bool = True) -> None:
+        """
+        Show or hide a layer. The current layer cannot be hidden.
+
+        :param layer: The layer tag.
+        :param visible: True to show the layer, False to hide it.
+        :param record: True to record the change for undo.
+        """
+        info = self.layers[self.get_rank(layer)]
+        if info['visible'] == visible or (not visible and layer == self.current_layer):
+            return
+        self.board.object_selector.deselect_current_objects()
+        if visible:
+            info['visible'] = True
+            self._materialize(layer)
+        else:
+            # Batches of a running SVG import must not create items on the layer once it is evicted
+            self.board.file_handler.cancel_svg_import(layer)
+            self._evict(layer)
+            info['visible'] = False
+        if record:
+            self.board.undo_handler.record_visibility(layer, visible)
+        self.board.file_handler.journal.require_snapshot()
+
+    def set_locked(self, layer: str, locked: bool) -> None:
+        """
+        Lock or unlock a layer. The current layer cannot be locked.
+
+        :param layer: The layer tag.
+        :param locked: True to lock the layer, False to unlock it.
+        """
+        info = self.layers[self.get_rank(layer)]
+        if info['locked'] == locked or (locked and layer == self.current_layer):
+            return
+        info['locked'] = locked
+        self.board.object_selector.deselect_current_objects()
+        if locked:
+            self.canvas.addtag_withtag(LayerHandler.LOCKED_TAG, layer)
+            self.canvas.itemconfig(layer, state=tk.DISABLED)
+        else:
+            self.canvas.dtag(layer, LayerHandler.LOCKED_TAG)
+            self.canvas.itemconfig(layer, state=tk.NORMAL)
+        self.board.file_handler.journal.require_snapshot()
+
+    def without_locked(self, objects: List[int]) -> List[int]:
+        """
+        Leave out the objects of locked layers.
+
+        :param objects: The object IDs.
+        :return: The IDs of the objects that are not locked.
+        """
+        locked_objects = set(self.canvas.find_withtag(LayerHandler.LOCKED_TAG))
+        return [obj for obj in objects if obj not in locked_objects]
+
+    def raise_to_layer_top(self, item: Union[int, str], layer: Optional[str]) -> None:
+        """
+        Move items to the top of their layer, just below the items of the layers above it.
+
+        :param item: The object ID, or a tag or tag expression matching items of the layer.
+        :param layer: The layer tag, or None for the default layer.
+        """
+        for info in self.layers[self.get_rank(layer) + 1:]:
+            try:
+                self.canvas.tag_lower(item, info['id'])
+                return
+            except tk.TclError:
+                pass  # The layer has no items on the canvas
+        self.canvas.tag_raise(item)
+
+    def lower_to_layer_bottom(self, item: Union[int, str], layer: Optional[str]) -> None:
+        """
+        Move items to the bottom of their layer, just above the items of the layers below it.
+
+        :param item: The object ID, or a tag or tag expression matching items of the layer.
+        :param layer: The layer tag, or None for the default layer.
+        """
+        for info in reversed(self.layers[:self.get_rank(layer)]):
+            try:
+                self.canvas.tag_raise(item, info['id'])
+                return
+            except tk.TclError:
+                pass  # The layer has no items on the canvas
+        self.canvas.tag_lower(item)
+
+    def raise_within_layers(self, tag: str) -> None:
+        """
+        Move the items with a tag to the top of their layers, keeping their order among themselves.
+
+        :param tag: The tag.
+        """
+        for info in self.layers:
+            self.raise_to_layer_top(f"{tag}&&{info['id']}", info['id'])
+
+    def lower_within_layers(self, tag: str) -> None:
+        """
+        Move the items with a tag to the bottom of their layers, keeping their order among themselves.
+
+        :param tag: The tag.
+        """
+        for info in self.layers:
+            self.lower_to_layer_bottom(f"{tag}&&{info['id']}", info['id'])
+
+    def on_objects_changed(self, change: str, objects: List[int]) -> None:
+        """
+        Put newly drawn objects on top of the current layer, and lock objects recreated on locked layers.
+
+        :param change: The change type.
+        :param objects: The IDs of the affected objects.
+        """
+        if change != self.board.CHANGE_CREATE:
+            return
+        locked_layers = {info['id'] for info in self.layers if info['locked']}
+        for obj in objects:
+            tags = self.canvas.gettags(obj)
+            layer = next((tag for tag in tags if LayerHandler.is_layer_tag(tag)), None)
+            if layer is None:
+                self.canvas.addtag_withtag(self.current_layer, obj)
+                self.raise_to_layer_top(obj, self.current_layer)
+            elif layer in locked_layers and LayerHandler.LOCKED_TAG not in tags:
+                self.canvas.addtag_withtag(LayerHandler.LOCKED_TAG, obj)
+                self.canvas.itemconfig(obj, state=tk.DISABLED)
+
+    def get_layers_state(self) -> List[Dict[str, Any]]:
+        """
+        Get the layers in the form they are stored in the board file.
+
+        :return: The layers, bottom-most first, or an empty list if the board only has the default layer.
+        """
+        if self.layers == [LayerHandler._get_default_layer()]:
+            return []
+        return [dict(info) for info in self.layers]
+
+    def load_layers(self, layers_state: List[Dict[str, Any]]) -> None:
+        """
+        Restore the layers read from a board file. The current layer becomes the top-most visible unlocked one.
+
+        :param layers_state: The layers, bottom-most first.
+        """
+        if not layers_state:
+            return
+        self.layers = [dict(info) for info in layers_state]
+        self.next_layer = max(int(info['id'][len(LayerHandler.LAYER_TAG_PREFIX):]) for info in self.layers) + 1
+        self.current_layer = next((info['id'] for info in reversed(self.layers)
+                                   if info['visible'] and not info['locked']), self.layers[-1]['id'])
+
+    def get_hidden_objects(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Get the objects of the hidden layers.
+
+        :return: The former ID of every object paired with its state, bottom-most first within each layer.
+                 Objects that were loaded into a hidden layer have negative IDs. Each state has its layer and its
+                 z-index within the layer.
+        """
+        hidden_objects: List[Tuple[int, Dict[str, Any]]] = []
+        for layer, (objects, packed_states) in self.hidden_objects.items():
+            for z_index, (obj, obj_state) in enumerate(zip(objects, self._unpack(layer, packed_states))):
+                obj_state['z-index'] = z_index
+                hidden_objects.append((obj, obj_state))
+        return hidden_objects
+
+    def add_hidden_objects(self, objects_state: List[Dict[str, Any]]) -> List[int]:
+        """
+        Keep objects read from a board file in their hidden layers without creating them on the canvas.
+
+        :param objects_state: The states of the objects, bottom-most first.
+        :return: The placeholder IDs of the objects, which are negative so that they never match a canvas item.
+        """
+        placeholders = list(range(self.next_placeholder, self.next_placeholder - len(objects_state), -1))
+        self.next_placeholder -= len(objects_state)
+        layers_states: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        for placeholder, obj_state in zip(placeholders, objects_state):
+            layers_states.setdefault(obj_state.get('layer', LayerHandler.DEFAULT_LAYER), []).append(
+                (placeholder, obj_state))
+        for layer, layer_objects in layers_states.items():
+            self.hidden_objects[layer] = ([obj for obj, _ in layer_objects],
+                                          Clipboard.from_states([obj_state for _, obj_state in layer_objects]))
+        return placeholders
+
+    def clear(self) -> None:
+        """
+        Reset the layers to the single default layer, for example when a new board is loaded.
+        """
+        self.layers = [LayerHandler._get_default_layer()]
+        self.hidden_objects = {}
+        self.current_layer = LayerHandler.DEFAULT_LAYER
+        self.next_layer = 1
+
+    def _evict(self, layer: str) -> None:
+        """
+        Remove the items of a layer from the canvas, keeping their packed states.
+
+        :param layer: The layer tag.
+        """
+        objects = list(self.canvas.find_withtag(layer))
+        objects_state = [self.board.file_handler.get_object_state(obj) for obj in objects]
+        self.hidden_objects[layer] = (objects, Clipboard.from_states(objects_state))
+        self.board.notify_objects_changed(self.board.CHANGE_DELETE, objects)
+        self.canvas.delete(layer)
+        evicted = set(objects)
+        self.board.objects = [obj for obj in self.board.objects if obj not in evicted]
+
+    def _materialize(self, layer: str) -> None:
+        """
+        Create the items of a hidden layer again and put them back in place in one batch.
+
+        :param layer: The layer tag.
+        """
+        old_objects, packed_states = self.hidden_objects.pop(layer, ([], Clipboard.from_states([])))
+        new_objects: List[int] = []
+        file_handler = self.board.file_handler
+        for obj_state in self._unpack(layer, packed_states):
+            obj = file_handler.create_object_from_state(obj_state)
+            if obj != 0:
+                self.canvas.addtag_withtag(f"object{len(self.board.objects) + len(new_objects)}", obj)
+            new_objects.append(obj)
+        created_objects = [obj for obj in new_objects if obj != 0]
+        if created_objects:
+            self.raise_to_layer_top(layer, layer)
+            if self.is_locked(layer):
+                self.canvas.addtag_withtag(LayerHandler.LOCKED_TAG, layer)
+                self.canvas.itemconfig(layer, state=tk.DISABLED)
+        self.board.undo_handler.alias_objects(old_objects, new_objects)
+        self.board.objects.extend(created_objects)
+        self.board.notify_objects_changed(self.board.CHANGE_CREATE, created_objects)
+
+    @staticmethod
+    def _get_default_layer() -> Dict[str, Any]:
+        """
+        Get the layer a new board starts with.
+
+        :return: The default layer.
+        """
+        return {'id': LayerHandler.DEFAULT_LAYER, 'name': "Layer 1", 'visible': True, 'locked': False}
+
+    @staticmethod
+    def _unpack(layer: str, packed_states: Clipboard) -> List[Dict[str, Any]]:
+        """
+        Get the states of the packed objects of a layer.
+
+        :param layer: The layer tag.
+        :param packed_states: The packed states.
+        :return: The object states, bottom-most first.
+        """
+        objects_state = []
+        for style, coords, groups in packed_states.get_transformed_objects(np.eye(2, 3)):
+            obj_state = dict(style, coords=coords)
+            if groups:
+                obj_state['groups'] = groups
+            if layer != LayerHandler.DEFAULT_LAYER:
+                obj_state['layer'] = layer
+            objects_state.append(obj_state)
+        return objects_state
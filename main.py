@@ -1,6 +1,14 @@
 import argparse
+import json
 import tkinter
 from app import App
+from batch_converter import BatchConverter
+from file_handler import FileHandler
+from latency_monitor import LatencyMonitor
+from canvas_profiler import CanvasProfiler
+from trace_recorder import TraceRecorder
+from event_recorder import EventRecorder
+from stall_watchdog import StallWatchdog
 
 
 def main() -> None:
@@ -11,11 +19,56 @@ def main() -> None:
                                                  "RUN 'LANG=en_US' BEFORE RUNNING THE APPLICATION!\n"
                                                  "!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!\n"
                                                  "Run 'python main.py' to start the GUI application.", formatter_class=argparse.RawTextHelpFormatter)
-    parser.parse_known_args()
+    parser.add_argument("--latency", action="store_true",
+                        help="measure event handler latency (press F3 on the board to show the overlay)")
+    parser.add_argument("--latency-report", metavar="FILE",
+                        help="write the latency histograms to FILE when a board is closed (implies --latency)")
+    parser.add_argument("--profile-canvas", action="store_true",
+                        help="count the canvas calls per handler and call site (press F4 on the board to print "
+                             "the report)")
+    parser.add_argument("--profile-canvas-report", metavar="FILE",
+                        help="write the canvas call report to FILE instead of printing it (implies "
+                             "--profile-canvas)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="record a timeline of the session to FILE in the Chrome trace-event format")
+    parser.add_argument("--record-events", metavar="FILE",
+                        help="record the board input to FILE for replaying with event_replayer.py")
+    parser.add_argument("--stall-log", metavar="FILE",
+                        help="log UI stalls with the blocking code location to FILE")
+    parser.add_argument("--stall-threshold", metavar="MS", type=int, default=StallWatchdog.DEFAULT_THRESHOLD_MS,
+                        help="how long the UI must be blocked to count as a stall (default: %(default)s ms)")
+    parser.add_argument("--convert", metavar="DIR", nargs="?", const=FileHandler.DEFAULT_DIR,
+                        help="convert every board in DIR (default: %(const)s) instead of starting the GUI")
+    parser.add_argument("--convert-format", metavar="FORMAT", action="append",
+                        choices=list(BatchConverter.FORMATS),
+                        help="an output format of --convert, out of %(choices)s; may be repeated (default: png)")
+    parser.add_argument("--convert-output", metavar="DIR",
+                        help="write the --convert outputs to DIR instead of next to the boards")
+    parser.add_argument("--convert-workers", metavar="N", type=int,
+                        help="the number of --convert worker processes (default: the CPU count)")
+    parser.add_argument("--convert-force", action="store_true",
+                        help="convert boards whose outputs are newer than the boards as well")
+    parser.add_argument("--convert-summary", metavar="FILE",
+                        help="write the --convert summary to FILE instead of printing it")
+    args, _ = parser.parse_known_args()
+    if args.convert is not None:
+        convert(args)
+        return
+
+    LatencyMonitor.ENABLED = args.latency or args.latency_report is not None
+    LatencyMonitor.REPORT_PATH = args.latency_report
+    CanvasProfiler.ENABLED = args.profile_canvas or args.profile_canvas_report is not None
+    CanvasProfiler.REPORT_PATH = args.profile_canvas_report
+    EventRecorder.RECORD_PATH = args.record_events
+    if args.trace:
+        TraceRecorder.start(args.trace)
 
     # Create a new tkinter window
     root = tkinter.Tk()
 
+    if args.stall_log:
+        StallWatchdog(root, args.stall_log, args.stall_threshold).start()
+
     # Create a new App instance
     App(root)
 
@@ -23,5 +76,21 @@ def main() -> None:
     root.mainloop()
 
 
+def convert(args: argparse.Namespace) -> None:
+    """
+    Convert a directory of boards and report the summary as JSON.
+
+    :param args: The parsed command-line arguments.
+    """
+    converter = BatchConverter(args.convert, args.convert_output, args.convert_format or ["png"],
+                               args.convert_workers, args.convert_force)
+    summary = json.dumps(converter.run(), indent=2)
+    if args.convert_summary:
+        with open(args.convert_summary, 'w') as f:
+            f.write(summary + "\n")
+    else:
+        print(summary)
+
+
 if __name__ == '__main__':
     main()
@@ -1,8 +1,15 @@
+import functools
+import os
+import queue
+import threading
 import tkinter as tk
 from tkinter import messagebox, filedialog
 from PIL import Image, ImageTk
-from typing import TYPE_CHECKING
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from autosave_handler import AutosaveHandler
 from file_handler import FileHandler
+from recent_boards import RecentBoards
+from thumbnail_cache import ThumbnailCache
 
 if TYPE_CHECKING:
     from app import App
@@ -11,10 +18,15 @@ if TYPE_CHECKING:
 class Menu:
     """
     A class representing the main menu of the application.
+
+    The menu lists the recent and nearby boards with previews. The previews are read or rendered on a worker
+    thread and handed to the Tk thread through a queue, so showing the menu never reads a board on the Tk thread.
     """
 
     LOGO_IMAGE_PATH = "images/logo-color.png"
     LOGO_RESIZE_DIMENSIONS = (200, 200)
+    BOARD_COLUMNS = 4
+    THUMBNAIL_POLL_MS = 50
 
     def __init__(self, app: 'App') -> None:
         """
@@ -42,6 +54,16 @@ class Menu:
         open_board_button = tk.Button(self.frame, text="Open Board", command=self.open_board)
         open_board_button.pack()
 
+        self.boards_frame = tk.Frame(self.frame)
+        self.boards_frame.pack(pady=10)
+        self.board_buttons: Dict[str, tk.Button] = {}
+        self.thumbnails: Dict[str, ImageTk.PhotoImage] = {}
+        self.thumbnail_cache = ThumbnailCache()
+        self.thumbnail_queue: queue.Queue[Tuple[str, Optional[Image.Image]]] = queue.Queue()
+        self.worker: Optional[threading.Thread] = None
+        self.worker_stop = threading.Event()
+        self.after_id: Optional[str] = None
+
     def new_board(self) -> None:
         """
         Create a new board after user confirmation.
@@ -58,14 +80,98 @@ class Menu:
         if filename:
             self.app.load_board(filename)
 
+    def prompt_recovery(self) -> None:
+        """
+        Offer to recover the autosaved board if the previous session did not close cleanly.
+        """
+        if AutosaveHandler.has_recovery_file():
+            response = messagebox.askyesno("Recover Board",
+                                           "Picasso did not close cleanly. Recover the autosaved board?")
+            if response:
+                self.app.load_board(AutosaveHandler.AUTOSAVE_PATH)
+            else:
+                os.remove(AutosaveHandler.AUTOSAVE_PATH)
+
     def show(self) -> None:
         """
         Show the menu frame.
         """
         self.frame.pack()
+        self.refresh_boards()
 
     def hide(self) -> None:
         """
         Hide the menu frame.
         """
         self.frame.pack_forget()
+        self.stop_thumbnails()
+
+    def refresh_boards(self) -> None:
+        """
+        List the recent and nearby boards, and start loading their previews on a worker thread.
+        """
+        self.stop_thumbnails()
+        for button in self.board_buttons.values():
+            button.destroy()
+        self.board_buttons = {}
+        self.thumbnails = {}
+        filenames = RecentBoards.get_boards()
+        for i, filename in enumerate(filenames):
+            button = tk.Button(self.boards_frame, text=os.path.splitext(os.path.basename(filename))[0],
+                               compound="top", command=functools.partial(self.app.load_board, filename))
+            button.grid(row=i // Menu.BOARD_COLUMNS, column=i % Menu.BOARD_COLUMNS, padx=4, pady=4)
+            self.board_buttons[filename] = button
+        if filenames:
+            self.worker_stop = threading.Event()
+            self.worker = threading.Thread(target=self.load_thumbnails,
+                                           args=(filenames, self.worker_stop, self.thumbnail_queue), daemon=True)
+            self.worker.start()
+            self.after_id = self.app.get_root().after(Menu.THUMBNAIL_POLL_MS, self.poll_thumbnails)
+
+    def load_thumbnails(self, filenames: List[str], stop: threading.Event,
+                        results: 'queue.Queue[Tuple[str, Optional[Image.Image]]]') -> None:
+        """
+        Get the previews of boards and queue them for the Tk thread. This runs on the worker thread.
+
+        :param filenames: The names of the board files.
+        :param stop: The event that is set when the previews are no longer needed.
+        :param results: The queue the previews are put on, None for a board that cannot be read.
+        """
+        for filename in filenames:
+            if stop.is_set():
+                return
+            try:
+                image: Optional[Image.Image] = self.thumbnail_cache.get_thumbnail(filename)
+            except Exception:
+                # A board that cannot be read is listed without a preview
+                image = None
+            results.put((filename, image))
+
+    def poll_thumbnails(self) -> None:
+        """
+        Show the previews queued by the worker thread, and keep polling while it is running.
+        """
+        self.after_id = None
+        # Checked before draining, so that previews queued just before the worker finished are not missed
+        running = self.worker is not None and self.worker.is_alive()
+        while True:
+            try:
+                filename, image = self.thumbnail_queue.get_nowait()
+            except queue.Empty:
+                break
+            button = self.board_buttons.get(filename)
+            if image is not None and button is not None:
+                self.thumbnails[filename] = ImageTk.PhotoImage(image)
+                button.config(image=self.thumbnails[filename])  # type: ignore
+        if running:
+            self.after_id = self.app.get_root().after(Menu.THUMBNAIL_POLL_MS, self.poll_thumbnails)
+
+    def stop_thumbnails(self) -> None:
+        """
+        Stop loading previews and drop the previews that have not been shown yet.
+        """
+        self.worker_stop.set()
+        if self.after_id is not None:
+            self.app.get_root().after_cancel(self.after_id)
+            self.after_id = None
+        self.thumbnail_queue = queue.Queue()
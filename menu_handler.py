@@ -1,5 +1,7 @@
 import tkinter as tk
-from typing import TYPE_CHECKING
+from functools import partial
+from tkinter import simpledialog
+from typing import Set, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from board import Board
@@ -33,7 +35,61 @@ class MenuHandler:
         file_menu.add_command(label="New", command=self.board.file_handler.new_board)
         file_menu.add_command(label="Save", command=self.board.file_handler.save_board_dialog)
         file_menu.add_command(label="Open", command=self.board.file_handler.open_board_dialog)
+        file_menu.add_command(label="Import SVG", command=self.board.file_handler.import_svg_dialog)
+        file_menu.add_command(label="Import Image", command=self.board.image_handler.import_image_dialog)
         file_menu.add_command(label="Export", command=self.board.file_handler.export_board)
+        edit_menu = tk.Menu(self.menu)
+        self.menu.add_cascade(label="Edit", menu=edit_menu)
+        edit_menu.add_command(label="Undo", accelerator="Ctrl+Z", command=self.board.undo_handler.undo)
+        edit_menu.add_command(label="Redo", accelerator="Ctrl+Y", command=self.board.undo_handler.redo)
+        layers_menu = tk.Menu(self.menu)
+        layers_menu.config(postcommand=lambda: self.populate_layers_menu(layers_menu))
+        self.menu.add_cascade(label="Layers", menu=layers_menu)
+
+    def populate_layers_menu(self, layers_menu: tk.Menu) -> None:
+        """
+        Fill the layers menu with the current layers, top-most first. The current layer cannot be hidden or
+        locked, and hidden or locked layers cannot be made current.
+
+        :param layers_menu: The layers menu.
+        """
+        layer_handler = self.board.layer_handler
+        layers_menu.delete(0, tk.END)
+        layers_menu.add_command(label="New Layer", command=layer_handler.add_layer)
+        layers_menu.add_separator()
+        for info in reversed(layer_handler.layers):
+            layer = info['id']
+            is_current = layer == layer_handler.current_layer
+            layer_menu = tk.Menu(layers_menu, tearoff=0)
+            layer_menu.add_command(label="Make Current",
+                                   state=tk.DISABLED if is_current or not info['visible'] or info['locked']
+                                   else tk.NORMAL,
+                                   command=partial(layer_handler.set_current_layer, layer))
+            layer_menu.add_command(label="Show" if not info['visible'] else "Hide",
+                                   state=tk.DISABLED if is_current else tk.NORMAL,
+                                   command=partial(layer_handler.set_visible, layer, not info['visible']))
+            layer_menu.add_command(label="Unlock" if info['locked'] else "Lock",
+                                   state=tk.DISABLED if is_current else tk.NORMAL,
+                                   command=partial(layer_handler.set_locked, layer, not info['locked']))
+            layer_menu.add_command(label="Rename", command=partial(self.rename_layer, layer))
+            label = f"{'● ' if is_current else ''}{info['name']}"
+            if not info['visible']:
+                label += " (hidden)"
+            elif info['locked']:
+                label += " (locked)"
+            layers_menu.add_cascade(label=label, menu=layer_menu)
+
+    def rename_layer(self, layer: str) -> None:
+        """
+        Ask for a new name for a layer and rename it.
+
+        :param layer: The layer tag.
+        """
+        layer_handler = self.board.layer_handler
+        name = simpledialog.askstring("Rename Layer", "Layer name:", parent=self.board.app.get_root(),
+                                      initialvalue=layer_handler.layers[layer_handler.get_rank(layer)]['name'])
+        if name:
+            layer_handler.rename_layer(layer, name)
 
     def display_context_menu(self, event: 'tk.Event[tk.Misc]', item_type: str) -> None:
         """
@@ -48,6 +104,22 @@ class MenuHandler:
             self.display_text_context_menu(event)
         elif item_type in ["rectangle", "oval", "polygon"]:
             self.display_shape_context_menu(event)
+        elif item_type == "image":
+            self.display_image_context_menu(event)
+
+    def display_selection_context_menu(self, event: 'tk.Event[tk.Misc]', item_types: Set[str]) -> None:
+        """
+        Display the context menu for a selection of several objects based on their item types.
+
+        :param event: The event that triggered the context menu.
+        :param item_types: The item types of the selected objects.
+        """
+        if item_types <= {"rectangle", "oval", "polygon"}:
+            self.display_shape_context_menu(event)
+        elif len(item_types) == 1:
+            self.display_context_menu(event, next(iter(item_types)))
+        else:
+            self.display_mixed_context_menu(event)
 
     def paste_context_menu(self, event: 'tk.Event[tk.Misc]') -> None:
         """
@@ -72,6 +144,13 @@ class MenuHandler:
         line_context_menu.add_command(label="Change Width", command=self.object_editor.change_selected_object_width)
         line_context_menu.add_command(label="Move to Front", command=self.object_editor.move_selected_object_to_front)
         line_context_menu.add_command(label="Move to Back", command=self.object_editor.move_selected_object_to_back)
+        line_context_menu.add_command(label="Flip Horizontal",
+                                      command=self.board.selection_transformer.flip_horizontal)
+        line_context_menu.add_command(label="Flip Vertical", command=self.board.selection_transformer.flip_vertical)
+        line_context_menu.add_command(label="Group", command=self.object_editor.group_selected_objects)
+        line_context_menu.add_command(label="Ungroup", command=self.object_editor.ungroup_selected_objects)
+        line_context_menu.add_command(label="Create Symbol",
+                                      command=self.object_editor.create_symbol_from_selection)
         line_context_menu.post(event.x_root, event.y_root)
 
     def display_text_context_menu(self, event: 'tk.Event[tk.Misc]') -> None:
@@ -89,8 +168,49 @@ class MenuHandler:
                                       command=self.object_editor.change_selected_object_font_size)
         text_context_menu.add_command(label="Move to Front", command=self.object_editor.move_selected_object_to_front)
         text_context_menu.add_command(label="Move to Back", command=self.object_editor.move_selected_object_to_back)
+        text_context_menu.add_command(label="Group", command=self.object_editor.group_selected_objects)
+        text_context_menu.add_command(label="Ungroup", command=self.object_editor.ungroup_selected_objects)
+        text_context_menu.add_command(label="Create Symbol",
+                                      command=self.object_editor.create_symbol_from_selection)
         text_context_menu.post(event.x_root, event.y_root)
 
+    def display_mixed_context_menu(self, event: 'tk.Event[tk.Misc]') -> None:
+        """
+        Display the context menu for a selection of objects of different kinds.
+
+        :param event: The event that triggered the context menu.
+        """
+        mixed_context_menu = tk.Menu(self.canvas, tearoff=0)
+        mixed_context_menu.add_command(label="Copy", command=self.object_editor.copy_selected_object)
+        mixed_context_menu.add_command(label="Delete", command=self.object_editor.delete_selected_object)
+        mixed_context_menu.add_command(label="Change Color", command=self.object_editor.change_selected_object_color)
+        mixed_context_menu.add_command(label="Change Width", command=self.object_editor.change_selected_object_width)
+        mixed_context_menu.add_command(label="Move to Front", command=self.object_editor.move_selected_object_to_front)
+        mixed_context_menu.add_command(label="Move to Back", command=self.object_editor.move_selected_object_to_back)
+        mixed_context_menu.add_command(label="Flip Horizontal",
+                                       command=self.board.selection_transformer.flip_horizontal)
+        mixed_context_menu.add_command(label="Flip Vertical", command=self.board.selection_transformer.flip_vertical)
+        mixed_context_menu.add_command(label="Group", command=self.object_editor.group_selected_objects)
+        mixed_context_menu.add_command(label="Ungroup", command=self.object_editor.ungroup_selected_objects)
+        mixed_context_menu.add_command(label="Create Symbol",
+                                       command=self.object_editor.create_symbol_from_selection)
+        mixed_context_menu.post(event.x_root, event.y_root)
+
+    def display_image_context_menu(self, event: 'tk.Event[tk.Misc]') -> None:
+        """
+        Display the context menu for image objects.
+
+        :param event: The event that triggered the context menu.
+        """
+        image_context_menu = tk.Menu(self.canvas, tearoff=0)
+        image_context_menu.add_command(label="Copy", command=self.object_editor.copy_selected_object)
+        image_context_menu.add_command(label="Delete", command=self.object_editor.delete_selected_object)
+        image_context_menu.add_command(label="Move to Front", command=self.object_editor.move_selected_object_to_front)
+        image_context_menu.add_command(label="Move to Back", command=self.object_editor.move_selected_object_to_back)
+        image_context_menu.add_command(label="Group", command=self.object_editor.group_selected_objects)
+        image_context_menu.add_command(label="Ungroup", command=self.object_editor.ungroup_selected_objects)
+        image_context_menu.post(event.x_root, event.y_root)
+
     def display_shape_context_menu(self, event: 'tk.Event[tk.Misc]') -> None:
         """
         Display the context menu for shape objects.
@@ -103,4 +223,11 @@ class MenuHandler:
         shape_context_menu.add_command(label="Change Color", command=self.object_editor.change_selected_object_color)
         shape_context_menu.add_command(label="Move to Front", command=self.object_editor.move_selected_object_to_front)
         shape_context_menu.add_command(label="Move to Back", command=self.object_editor.move_selected_object_to_back)
+        shape_context_menu.add_command(label="Flip Horizontal",
+                                       command=self.board.selection_transformer.flip_horizontal)
+        shape_context_menu.add_command(label="Flip Vertical", command=self.board.selection_transformer.flip_vertical)
+        shape_context_menu.add_command(label="Group", command=self.object_editor.group_selected_objects)
+        shape_context_menu.add_command(label="Ungroup", command=self.object_editor.ungroup_selected_objects)
+        shape_context_menu.add_command(label="Create Symbol",
+                                       command=self.object_editor.create_symbol_from_selection)
         shape_context_menu.post(event.x_root, event.y_root)
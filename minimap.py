@@ -0,0 +1,192 @@
+import math
+import tkinter as tk
+from typing import Dict, List, Tuple, TYPE_CHECKING
+
+from PIL import Image, ImageTk
+
+from object_renderer import ObjectRenderer
+
+if TYPE_CHECKING:
+    from board import Board
+
+
+class Minimap:
+    """
+    A class representing a downscaled overview of the whole board with a viewport rectangle.
+    """
+
+    MINIMAP_SIZE = 200
+    MAX_DIRTY_REGIONS = 8
+    BACKGROUND_COLOR = "white"
+    VIEWPORT_OUTLINE = "red"
+
+    def __init__(self, board: 'Board') -> None:
+        """
+        Initialize the Minimap.
+
+        :param board: The board instance.
+        """
+        self.board = board
+        self.canvas = board.canvas
+        min_x, min_y, max_x, max_y = board.CANVAS_SCROLLREGION
+        self.origin_x: float = min_x
+        self.origin_y: float = min_y
+        self.scale: float = Minimap.MINIMAP_SIZE / max(max_x - min_x, max_y - min_y)
+        self.object_bboxes: Dict[int, Tuple[int, int, int, int]] = {}
+        self.dirty_regions: List[Tuple[float, float, float, float]] = []
+        self.render_scheduled: bool = False
+
+        self.image = Image.new("RGB", (Minimap.MINIMAP_SIZE, Minimap.MINIMAP_SIZE), Minimap.BACKGROUND_COLOR)
+        self.photo = ImageTk.PhotoImage(self.image)
+        self.minimap_canvas = tk.Canvas(board.app.get_root(), width=Minimap.MINIMAP_SIZE,
+                                        height=Minimap.MINIMAP_SIZE, highlightthickness=0)
+        self.minimap_canvas.create_image(0, 0, image=self.photo, anchor=tk.NW)
+        self.viewport = self.minimap_canvas.create_rectangle(0, 0, 0, 0, outline=Minimap.VIEWPORT_OUTLINE)
+        self.minimap_canvas.pack(side=tk.LEFT, anchor=tk.N)
+
+        self.minimap_canvas.bind("<Button-1>", self.jump_to)
+        self.minimap_canvas.bind("<B1-Motion>", self.jump_to)
+        self.canvas.config(xscrollcommand=self.handle_x_scroll, yscrollcommand=self.handle_y_scroll)
+        board.add_objects_changed_listener(self.on_objects_changed)
+
+    def on_objects_changed(self, change: str, objects: List[int]) -> None:
+        """
+        Mark the regions touched by changed objects as dirty and schedule a re-render.
+
+        :param change: The change type.
+        :param objects: The IDs of the changed objects.
+        """
+        for obj in objects:
+            old_bbox = self.object_bboxes.pop(obj, None)
+            if old_bbox is not None:
+                self.mark_dirty(old_bbox)
+            if change != self.board.CHANGE_DELETE:
+                bbox = self.canvas.bbox(obj)
+                if bbox:
+                    self.object_bboxes[obj] = bbox
+                    self.mark_dirty(bbox)
+        self.schedule_render()
+
+    def mark_dirty(self, bbox: Tuple[float, float, float, float]) -> None:
+        """
+        Add a board region to the dirty regions. Regions are only merged with the regions they overlap, so that
+        edits far apart do not re-render everything between them. Past MAX_DIRTY_REGIONS regions, they are all
+        merged into one.
+
+        :param bbox: The board region as (x1, y1, x2, y2).
+        """
+        x1, y1, x2, y2 = bbox
+        merged = True
+        while merged:
+            merged = False
+            for region in self.dirty_regions:
+                if region[0] <= x2 and x1 <= region[2] and region[1] <= y2 and y1 <= region[3]:
+                    self.dirty_regions.remove(region)
+                    x1, y1, x2, y2 = min(x1, region[0]), min(y1, region[1]), max(x2, region[2]), max(y2, region[3])
+                    merged = True
+                    break
+        self.dirty_regions.append((x1, y1, x2, y2))
+        if len(self.dirty_regions) > Minimap.MAX_DIRTY_REGIONS:
+            self.dirty_regions = [(min(region[0] for region in self.dirty_regions),
+                                   min(region[1] for region in self.dirty_regions),
+                                   max(region[2] for region in self.dirty_regions),
+                                   max(region[3] for region in self.dirty_regions))]
+
+    def schedule_render(self) -> None:
+        """
+        Schedule rendering of the dirty regions once the event loop is idle.
+        """
+        if not self.render_scheduled and self.dirty_regions:
+            self.render_scheduled = True
+            self.minimap_canvas.after_idle(self.render_dirty_region)
+
+    def render_dirty_region(self) -> None:
+        """
+        Re-render only the dirty parts of the minimap from the object data.
+        """
+        self.render_scheduled = False
+        dirty_regions = self.dirty_regions
+        self.dirty_regions = []
+        if any([self.render_region(region) for region in dirty_regions]):
+            self.photo.paste(self.image)
+
+    def render_region(self, bbox: Tuple[float, float, float, float]) -> bool:
+        """
+        Re-render a board region of the minimap image.
+
+        :param bbox: The board region as (x1, y1, x2, y2).
+        :return: True if the region is on the minimap, False otherwise.
+        """
+        x1, y1, x2, y2 = bbox
+        left = max(0, math.floor((x1 - self.origin_x) * self.scale))
+        top = max(0, math.floor((y1 - self.origin_y) * self.scale))
+        right = min(Minimap.MINIMAP_SIZE, math.ceil((x2 - self.origin_x) * self.scale) + 1)
+        bottom = min(Minimap.MINIMAP_SIZE, math.ceil((y2 - self.origin_y) * self.scale) + 1)
+        if right <= left or bottom <= top:
+            return False
+
+        region_x = self.origin_x + left / self.scale
+        region_y = self.origin_y + top / self.scale
+        region_image = Image.new("RGB", (right - left, bottom - top), Minimap.BACKGROUND_COLOR)
+        renderer = ObjectRenderer(region_image, region_x, region_y, self.scale,
+                                  images=self.board.image_handler.images)
+        for obj in self.canvas.find_overlapping(region_x, region_y,
+                                                self.origin_x + right / self.scale,
+                                                self.origin_y + bottom / self.scale):
+            if obj in self.object_bboxes:
+                renderer.draw_object(self.board.file_handler.get_object_state(obj))
+
+        self.image.paste(region_image, (left, top))
+        return True
+
+    def update_viewport(self) -> None:
+        """
+        Move the viewport rectangle to the part of the board currently shown.
+        """
+        min_x, min_y, max_x, max_y = self.board.CANVAS_SCROLLREGION
+        width = (max_x - min_x) * self.scale
+        height = (max_y - min_y) * self.scale
+        x_first, x_last = self.canvas.xview()
+        y_first, y_last = self.canvas.yview()
+        self.minimap_canvas.coords(self.viewport, x_first * width, y_first * height,
+                                   x_last * width, y_last * height)
+
+    def handle_x_scroll(self, first: float, last: float) -> None:
+        """
+        Forward horizontal scrolling to the scrollbar and update the viewport.
+
+        :param first: The fraction of the board left of the view.
+        :param last: The fraction of the board up to the right edge of the view.
+        """
+        self.board.x_scrollbar.set(first, last)
+        self.update_viewport()
+
+    def handle_y_scroll(self, first: float, last: float) -> None:
+        """
+        Forward vertical scrolling to the scrollbar and update the viewport.
+
+        :param first: The fraction of the board above the view.
+        :param last: The fraction of the board up to the bottom edge of the view.
+        """
+        self.board.y_scrollbar.set(first, last)
+        self.update_viewport()
+
+    def jump_to(self, event: 'tk.Event[tk.Misc]') -> None:
+        """
+        Center the board view on the clicked minimap position.
+
+        :param event: The mouse event on the minimap.
+        """
+        min_x, min_y, max_x, max_y = self.board.CANVAS_SCROLLREGION
+        x_first, x_last = self.canvas.xview()
+        y_first, y_last = self.canvas.yview()
+        x_fraction = event.x / ((max_x - min_x) * self.scale)
+        y_fraction = event.y / ((max_y - min_y) * self.scale)
+        self.canvas.xview_moveto(x_fraction - (x_last - x_first) / 2)
+        self.canvas.yview_moveto(y_fraction - (y_last - y_first) / 2)
+
+    def destroy(self) -> None:
+        """
+        Destroy the minimap widget.
+        """
+        self.minimap_canvas.destroy()
@@ -1,9 +1,13 @@
 import tkinter as tk
 from tkinter import colorchooser
-from typing import Optional, Dict, Any, TYPE_CHECKING
+from typing import Dict, Optional, List, TYPE_CHECKING
 
+from clipboard import Clipboard
 from font_dialog import FontDialog
 from font_size_dialog import FontSizeDialog
+from group_handler import GroupHandler
+from image_handler import ImageHandler
+from object_selector import ObjectSelector
 from width_dialog import WidthDialog
 
 if TYPE_CHECKING:
@@ -13,8 +17,15 @@ if TYPE_CHECKING:
 class ObjectEditor:
     """
     A class that handles object editing functionality for the board.
+
+    The editing operations apply to the whole selection through the selection tags, so that each change is a
+    single canvas call and a single undo step however many objects are selected.
     """
 
+    # Images have neither a fill nor a width, so they are left out of restyling
+    WITHOUT_IMAGE_TAGS = f"{ObjectSelector.SELECTED_TAG}&&!{ObjectSelector.SELECTED_IMAGE_TAG}"
+    WITHOUT_TEXT_TAGS = f"{WITHOUT_IMAGE_TAGS}&&!{ObjectSelector.SELECTED_TEXT_TAG}"
+
     def __init__(self, board: 'Board') -> None:
         """
         Initialize the ObjectEditor.
@@ -25,203 +36,258 @@ class ObjectEditor:
         self.canvas: tk.Canvas = board.canvas
         self.toolbox = board.toolbox
         self.object_selector = board.object_selector
-        self.copied_object: Optional[Dict[str, Any]] = None
+        self.clipboard: Optional[Clipboard] = None
 
     def copy_selected_object(self) -> None:
         """
-        Copy the selected object.
+        Copy the selected objects to the clipboard, keeping their stacking order.
         """
         if self.object_selector.selected_objects:
-            selected_object = self.object_selector.selected_objects[0]
-            # Copy the selected object
-            copied_object_coords = self.canvas.coords(selected_object)
-            copied_object_type = self.canvas.type(selected_object)  # type: ignore
-            copied_object_fill = self.canvas.itemcget(selected_object, 'fill')  # type: ignore
-            copied_object_width = self.canvas.itemcget(selected_object, 'width')  # type: ignore
-
-            copied_object_outline = None
-            if copied_object_type in ['rectangle', 'oval']:
-                copied_object_outline = self.canvas.itemcget(selected_object, 'outline')  # type: ignore
-
-            copied_object_text = None
-            copied_object_font = None
-            if copied_object_type == 'text':
-                copied_object_text = self.canvas.itemcget(selected_object, 'text')  # type: ignore
-                copied_object_font = self.canvas.itemcget(selected_object, 'font')  # type: ignore
-
-            self.copied_object = {
-                'coords': copied_object_coords,
-                'type': copied_object_type,
-                'fill': copied_object_fill,
-                'outline': copied_object_outline,
-                'width': copied_object_width,
-                'text': copied_object_text,
-                'font': copied_object_font
-            }
+            self.clipboard = Clipboard.from_states([self.board.file_handler.get_object_state(obj)
+                                                    for obj in self._get_selection_in_stacking_order()])
 
     def paste_object_at_position(self) -> None:
         """
-        Paste the copied object at the current position.
-        """
-        if self.copied_object is not None:
-            # Paste the copied object
-            copied_object_coords = self.copied_object['coords']
-            copied_object_type = self.copied_object['type']
-            copied_object_fill = self.copied_object['fill']
-            copied_object_width = self.copied_object['width']
-            copied_object_outline = self.copied_object['outline']
-
-            if copied_object_type == 'line':
-                self.adjust_copied_object_center(copied_object_coords)
-
-            elif copied_object_type == 'text':
-                # Adjust the coordinates to the right-click position
-                copied_object_coords[0] = self.board.right_click_x
-                copied_object_coords[1] = self.board.right_click_y
-
-            elif copied_object_type == 'polygon':
-                self.adjust_copied_object_center(copied_object_coords)
-            else:
-                # Calculate the width and height of the copied object
-                width = copied_object_coords[2] - copied_object_coords[0]
-                height = copied_object_coords[3] - copied_object_coords[1]
-
-                # Adjust the coordinates to the right-click position
-                copied_object_coords[0] = self.board.right_click_x - width / 2
-                copied_object_coords[1] = self.board.right_click_y - height / 2
-                copied_object_coords[2] = self.board.right_click_x + width / 2
-                copied_object_coords[3] = self.board.right_click_y + height / 2
-
-            new_object: Optional[int] = None  # Initialize the new_object variable
-            if copied_object_type == 'rectangle':
-                new_object = self.canvas.create_rectangle(*copied_object_coords, fill=copied_object_fill,
-                                                          outline=copied_object_outline, width=copied_object_width,
-                                                          tags=(f"object{len(self.board.objects)}",))
-            elif copied_object_type == 'oval':
-                new_object = self.canvas.create_oval(*copied_object_coords, fill=copied_object_fill,
-                                                     outline=copied_object_outline, width=copied_object_width,
-                                                     tags=(f"object{len(self.board.objects)}",))
-            elif copied_object_type == 'line':
-                new_object = self.canvas.create_line(*copied_object_coords, fill=copied_object_fill,
-                                                     width=copied_object_width,
-                                                     tags=(f"object{len(self.board.objects)}",))
-            elif copied_object_type == 'text':
-                copied_object_text = self.copied_object['text']
-                copied_object_font = self.copied_object['font']
-                new_object = self.canvas.create_text(*copied_object_coords, text=copied_object_text,
-                                                     font=copied_object_font, fill=copied_object_fill,
-                                                     tags=(f"object{len(self.board.objects)}",))
-            elif copied_object_type == 'polygon':
-                new_object = self.canvas.create_polygon(*copied_object_coords, fill=copied_object_fill,
-                                                        outline=copied_object_outline, width=copied_object_width,
-                                                        tags=(f"object{len(self.board.objects)}",))
-
-            if new_object is not None:
-                self.board.objects.append(new_object)
-
-    def adjust_copied_object_center(self, copied_object_coords: Any) -> None:
-        copied_object_center_x = sum(
-            copied_object_coords[i] for i in range(0, len(copied_object_coords), 2)) / (
-                                         len(copied_object_coords) // 2)
-        copied_object_center_y = sum(
-            copied_object_coords[i] for i in range(1, len(copied_object_coords), 2)) / (
-                                         len(copied_object_coords) // 2)
-
-        # Calculate the difference between the center of the copied polygon and the right-click position
-        dx = self.board.right_click_x - copied_object_center_x
-        dy = self.board.right_click_y - copied_object_center_y
-
-        # Adjust the coordinates of the pasted polygon
-        for i in range(0, len(copied_object_coords), 2):
-            copied_object_coords[i] += dx
-            copied_object_coords[i + 1] += dy
+        Paste the copied objects centered at the right-click position.
+        """
+        if self.clipboard is not None:
+            new_objects: List[int] = []
+            new_groups: Dict[str, str] = {}
+            group_handler = self.board.group_handler
+            for style, coords, groups in self.clipboard.get_objects_at(self.board.right_click_x,
+                                                                       self.board.right_click_y):
+                object_tag = f"object{len(self.board.objects) + len(new_objects)}"
+                if style['type'] == ImageHandler.IMAGE_TYPE:
+                    new_object = self.board.image_handler.create_image(dict(style, coords=coords))
+                    if new_object == 0:
+                        continue
+                    self.canvas.addtag_withtag(object_tag, new_object)
+                else:
+                    options = {option: value for option, value in style.items() if option not in ('type', 'symbol')}
+                    create = getattr(self.canvas, f"create_{style['type']}")
+                    new_object = create(*coords, **options, tags=(object_tag,))
+                if 'symbol' in style:
+                    self.canvas.addtag_withtag(style['symbol'], new_object)
+                if groups:
+                    # The pasted objects form new groups with the same structure as the copied ones
+                    for group in groups:
+                        if group not in new_groups:
+                            new_groups[group] = group_handler.create_group()
+                    group_handler.add_to_groups(new_object, [new_groups[group] for group in groups], style['type'])
+                new_objects.append(new_object)
+            self.board.objects.extend(new_objects)
+            self.board.notify_objects_changed(self.board.CHANGE_CREATE, new_objects)
+            self.board.undo_handler.record_create(new_objects)
 
-    def delete_selected_object(self) -> None:
+    def group_selected_objects(self) -> None:
         """
-        Delete the selected object.
+        Group the selected objects, so that they are selected and edited together from now on.
+        """
+        selected_objects = self.object_selector.selected_objects
+        if len(selected_objects) > 1:
+            self._add_selection_to_new_group()
+            self.board.notify_objects_changed(self.board.CHANGE_RESTYLE, list(selected_objects))
+
+    def create_symbol_from_selection(self) -> None:
+        """
+        Define a new symbol from the selected objects, which become its first instance. Groups and symbols
+        inside the selection are dissolved, since an instance is selected and edited as a whole.
         """
         if self.object_selector.selected_objects:
-            selected_object = self.object_selector.selected_objects[0]
-            self.canvas.delete(selected_object)
+            ordered_objects = self._get_selection_in_stacking_order()
+            objects_state = [self.board.file_handler.get_object_state(obj) for obj in ordered_objects]
+            symbol = self.board.symbol_handler.create_symbol(objects_state)
+            undo_handler = self.board.undo_handler
+            undo_handler.begin_group()
+            old_tags = {tag for obj_state in objects_state for tag in obj_state.get('groups', [])}
+            old_tags.update(obj_state['symbol'] for obj_state in objects_state if 'symbol' in obj_state)
+            for tag in sorted(old_tags):
+                undo_handler.record_tag(list(self.canvas.find_withtag(f"{tag}&&{ObjectSelector.SELECTED_TAG}")),
+                                        tag, added=False)
+                self.canvas.dtag(ObjectSelector.SELECTED_TAG, tag)
+            self._add_selection_to_new_group()
+            self.canvas.addtag_withtag(symbol, ObjectSelector.SELECTED_TAG)
+            undo_handler.record_tag(ordered_objects, symbol, added=True)
+            undo_handler.end_group()
+            self.board.notify_objects_changed(self.board.CHANGE_RESTYLE, ordered_objects)
+
+    def _add_selection_to_new_group(self) -> None:
+        """
+        Put the selected objects into a new group.
+        """
+        group_handler = self.board.group_handler
+        group = group_handler.create_group()
+        self.canvas.addtag_withtag(group, ObjectSelector.SELECTED_TAG)
+        self.canvas.addtag_withtag(GroupHandler.OUTLINED_MEMBER_TAG, ObjectSelector.SELECTED_OUTLINED_TAG)
+        self.canvas.addtag_withtag(GroupHandler.TEXT_MEMBER_TAG, ObjectSelector.SELECTED_TEXT_TAG)
+        self.canvas.addtag_withtag(GroupHandler.IMAGE_MEMBER_TAG, ObjectSelector.SELECTED_IMAGE_TAG)
+        group_handler.group_types[group] = set(self.object_selector.selected_types)
+        self.board.undo_handler.record_tag(self.object_selector.selected_objects, group, added=True)
+
+    def _get_selection_in_stacking_order(self) -> List[int]:
+        """
+        Get the selected objects, bottom-most first.
+
+        :return: The IDs of the selected objects.
+        """
+        positions = {obj: position for position, obj in enumerate(self.canvas.find_all())}
+        return sorted(self.object_selector.selected_objects, key=lambda obj: positions.get(obj, -1))
+
+    def ungroup_selected_objects(self) -> None:
+        """
+        Split the outermost groups of the selected objects. Groups nested inside them are kept.
+        """
+        outermost_groups = (self.board.group_handler.get_outermost_group(obj)
+                            for obj in self.object_selector.selected_objects)
+        groups = sorted({group for group in outermost_groups if group is not None})
+        if groups:
+            undo_handler = self.board.undo_handler
+            undo_handler.begin_group()
+            for group in groups:
+                members = list(self.canvas.find_withtag(group))
+                undo_handler.record_tag(members, group, added=False)
+                self.canvas.dtag(group)
+                self.board.notify_objects_changed(self.board.CHANGE_RESTYLE, members)
+            undo_handler.end_group()
+
+    def delete_selected_object(self) -> None:
+        """
+        Delete the selected objects.
+        """
+        selected_objects = self.object_selector.selected_objects
+        if selected_objects:
+            self.board.undo_handler.record_delete(selected_objects)
+            self.board.notify_objects_changed(self.board.CHANGE_DELETE, list(selected_objects))
+            self.canvas.delete(ObjectSelector.SELECTED_TAG)
             self.canvas.delete("selection_frame")
-            self.board.objects.remove(selected_object)
-            self.object_selector.selected_objects = []
-            self.object_selector.selection_frame = None
+            deleted_objects = set(selected_objects)
+            self.board.objects = [obj for obj in self.board.objects if obj not in deleted_objects]
+            self.object_selector.deselect_current_objects()
 
     def change_selected_object_color(self) -> None:
         """
-        Change the color of the selected object.
+        Change the color of the selected objects. Rectangles and ovals get the color as their outline as well,
+        and images are left unchanged.
         """
-        if self.object_selector.selected_objects:
-            selected_object = self.object_selector.selected_objects[0]
+        selected_objects = self.get_selected_objects_without_image()
+        if selected_objects:
             color = colorchooser.askcolor()[1]
             if color is not None:
-                item_type = self.canvas.type(selected_object)  # type: ignore
-                if item_type in ["line", "text", "polygon"]:
-                    self.canvas.itemconfig(selected_object, fill=color)
-                else:
-                    self.canvas.itemconfig(selected_object, fill=color, outline=color)
-                if item_type == "text":
+                outlined_objects = set(self.canvas.find_withtag(ObjectSelector.SELECTED_OUTLINED_TAG))
+                undo_handler = self.board.undo_handler
+                undo_handler.begin_group()
+                undo_handler.record_restyle([obj for obj in selected_objects if obj not in outlined_objects],
+                                            {'fill': color})
+                undo_handler.record_restyle([obj for obj in selected_objects if obj in outlined_objects],
+                                            {'fill': color, 'outline': color})
+                undo_handler.end_group()
+                self.canvas.itemconfig(ObjectEditor.WITHOUT_IMAGE_TAGS, fill=color)
+                if outlined_objects:
+                    self.canvas.itemconfig(ObjectSelector.SELECTED_OUTLINED_TAG, outline=color)
+                if "text" in self.object_selector.selected_types:
                     self.toolbox.text_color = color
+                self.board.notify_objects_changed(self.board.CHANGE_RESTYLE, selected_objects)
 
     def change_selected_object_width(self) -> None:
         """
-        Change the width of the selected object.
+        Change the width of the selected lines and shapes. Text objects and images are left unchanged.
         """
-        if self.object_selector.selected_objects:
-            selected_object = self.object_selector.selected_objects[0]
-            selected_object_width = self.canvas.itemcget(selected_object, 'width')  # type: ignore
+        selected_objects = self.get_selected_objects_without_text()
+        if selected_objects:
+            selected_object_width = self.canvas.itemcget(selected_objects[0], 'width')  # type: ignore
             dialog = WidthDialog(self.board.app.get_root(), selected_object_width)
             self.board.app.get_root().wait_window(dialog)
             width = dialog.result
             if width is not None:
-                self.canvas.itemconfig(selected_object, width=width)
+                self.board.undo_handler.record_restyle(selected_objects, {'width': width})
+                self.canvas.itemconfig(ObjectEditor.WITHOUT_TEXT_TAGS, width=width)
+                self.board.notify_objects_changed(self.board.CHANGE_RESTYLE, selected_objects)
 
     def change_selected_object_font(self) -> None:
         """
-        Change the font of the selected object.
+        Change the font of the selected text objects. The size of the first selected text is kept and applied
+        to all of them.
         """
-        if self.object_selector.selected_objects:
-            selected_object = self.object_selector.selected_objects[0]
-            selected_object_type = self.canvas.type(selected_object)  # type: ignore
-            if selected_object_type == "text":
-                current_font = self.canvas.itemcget(selected_object, "font")  # type: ignore
-                font_name, font_size = current_font.split()
-                font_dialog = FontDialog(self.board.app.get_root(), font_name)
-                self.board.app.get_root().wait_window(font_dialog)
-                if font_dialog.result:
-                    self.canvas.itemconfig(selected_object, font=(font_dialog.result, font_size))
+        selected_texts = self.get_selected_texts()
+        if selected_texts:
+            current_font = self.canvas.itemcget(selected_texts[0], "font")  # type: ignore
+            font_name, font_size = current_font.split()
+            font_dialog = FontDialog(self.board.app.get_root(), font_name)
+            self.board.app.get_root().wait_window(font_dialog)
+            if font_dialog.result:
+                self.board.undo_handler.record_restyle(selected_texts, {'font': (font_dialog.result, font_size)})
+                self.canvas.itemconfig(ObjectSelector.SELECTED_TEXT_TAG, font=(font_dialog.result, font_size))
+                self.board.notify_objects_changed(self.board.CHANGE_RESTYLE, selected_texts)
 
     def change_selected_object_font_size(self) -> None:
         """
-        Change the font size of the selected object.
+        Change the font size of the selected text objects. The font of the first selected text is kept and
+        applied to all of them.
         """
-        if self.object_selector.selected_objects:
-            selected_object = self.object_selector.selected_objects[0]
-            selected_object_type = self.canvas.type(selected_object)  # type: ignore
-            if selected_object_type == "text":
-                current_font = self.canvas.itemcget(selected_object, "font")  # type: ignore
-                font_parts = current_font.split()
-                font_name = " ".join(font_parts[:-1])  # Join all parts except the last one
-                font_size = font_parts[-1]  # Get the last part as the font size
-                size_dialog = FontSizeDialog(self.board.app.get_root(), font_size)
-                self.board.app.get_root().wait_window(size_dialog)
-                if size_dialog.result:
-                    self.canvas.itemconfig(selected_object, font=(font_name, size_dialog.result))
-                    self.object_selector.draw_selection_frame()
+        selected_texts = self.get_selected_texts()
+        if selected_texts:
+            current_font = self.canvas.itemcget(selected_texts[0], "font")  # type: ignore
+            font_parts = current_font.split()
+            font_name = " ".join(font_parts[:-1])  # Join all parts except the last one
+            font_size = font_parts[-1]  # Get the last part as the font size
+            size_dialog = FontSizeDialog(self.board.app.get_root(), font_size)
+            self.board.app.get_root().wait_window(size_dialog)
+            if size_dialog.result:
+                self.board.undo_handler.record_restyle(selected_texts, {'font': (font_name, size_dialog.result)})
+                self.canvas.itemconfig(ObjectSelector.SELECTED_TEXT_TAG, font=(font_name, size_dialog.result))
+                self.board.notify_objects_changed(self.board.CHANGE_RESTYLE, selected_texts)
+                self.object_selector.draw_selection_frame()
 
     def move_selected_object_to_front(self) -> None:
         """
-        Move the selected object to the front.
+        Move the selected objects to the front of their layers, keeping their order among themselves.
         """
-        if self.object_selector.selected_objects:
-            selected_object = self.object_selector.selected_objects[0]
-            self.canvas.tag_raise(selected_object)
+        selected_objects = self.object_selector.selected_objects
+        if selected_objects:
+            self.board.undo_handler.record_reorder(selected_objects, to_front=True)
+            self.board.layer_handler.raise_within_layers(ObjectSelector.SELECTED_TAG)
+            self.board.notify_objects_changed(self.board.CHANGE_REORDER, list(selected_objects))
 
     def move_selected_object_to_back(self) -> None:
         """
-        Move the selected object to the back.
+        Move the selected objects to the back of their layers, keeping their order among themselves.
         """
-        if self.object_selector.selected_objects:
-            selected_object = self.object_selector.selected_objects[0]
-            self.canvas.tag_lower(selected_object)
+        selected_objects = self.object_selector.selected_objects
+        if selected_objects:
+            self.board.undo_handler.record_reorder(selected_objects, to_front=False)
+            self.board.layer_handler.lower_within_layers(ObjectSelector.SELECTED_TAG)
+            self.board.notify_objects_changed(self.board.CHANGE_REORDER, list(selected_objects))
+
+    def get_selected_texts(self) -> List[int]:
+        """
+        Get the selected text objects.
+
+        :return: The IDs of the selected text objects, in selection order.
+        """
+        if "text" not in self.object_selector.selected_types:
+            return []
+        texts = set(self.canvas.find_withtag(ObjectSelector.SELECTED_TEXT_TAG))
+        return [obj for obj in self.object_selector.selected_objects if obj in texts]
+
+    def get_selected_objects_without_image(self) -> List[int]:
+        """
+        Get the selected objects that are not images.
+
+        :return: The IDs of the selected lines, shapes and texts, in selection order.
+        """
+        if "image" not in self.object_selector.selected_types:
+            return list(self.object_selector.selected_objects)
+        images = set(self.canvas.find_withtag(ObjectSelector.SELECTED_IMAGE_TAG))
+        return [obj for obj in self.object_selector.selected_objects if obj not in images]
+
+    def get_selected_objects_without_text(self) -> List[int]:
+        """
+        Get the selected objects that are neither text objects nor images.
+
+        :return: The IDs of the selected lines and shapes, in selection order.
+        """
+        if self.object_selector.selected_types <= {"text", "image"}:
+            return []
+        excluded = set(self.canvas.find_withtag(ObjectSelector.SELECTED_TEXT_TAG))
+        excluded.update(self.canvas.find_withtag(ObjectSelector.SELECTED_IMAGE_TAG))
+        return [obj for obj in self.object_selector.selected_objects if obj not in excluded]
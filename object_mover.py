@@ -1,6 +1,8 @@
 import tkinter as tk
 from typing import Optional, TYPE_CHECKING
 
+from object_selector import ObjectSelector
+
 if TYPE_CHECKING:
     from board import Board
 
@@ -31,6 +33,8 @@ class ObjectMover:
         self.is_moving: bool = False
         self.drag_start_x: Optional[int] = None
         self.drag_start_y: Optional[int] = None
+        self.move_dx: float = 0
+        self.move_dy: float = 0
 
     def start_move(self, event: 'tk.Event[tk.Misc]') -> None:
         """
@@ -43,6 +47,8 @@ class ObjectMover:
             self.is_moving = True
             self.drag_start_x = event.x
             self.drag_start_y = event.y
+            self.move_dx = 0
+            self.move_dy = 0
 
     def continue_move(self, event: 'tk.Event[tk.Misc]') -> None:
         """
@@ -53,9 +59,10 @@ class ObjectMover:
         if self.is_moving and self.drag_start_x is not None and self.drag_start_y is not None:
             dx = event.x - self.drag_start_x
             dy = event.y - self.drag_start_y
-            for obj in self.object_selector.selected_objects:
-                self.canvas.move(obj, dx, dy)
+            self.canvas.move(ObjectSelector.SELECTED_TAG, dx, dy)
             self.canvas.move("selection_frame", dx, dy)
+            self.move_dx += dx
+            self.move_dy += dy
             self.drag_start_x = event.x
             self.drag_start_y = event.y
 
@@ -63,6 +70,11 @@ class ObjectMover:
         """
         End the object movement.
         """
+        if self.is_moving and (self.move_dx or self.move_dy):
+            self.board.notify_objects_changed(self.board.CHANGE_MOVE, list(self.object_selector.selected_objects))
+            self.board.undo_handler.record_move(self.object_selector.selected_objects, self.move_dx, self.move_dy)
+        self.move_dx = 0
+        self.move_dy = 0
         self.is_moving = False
         self.drag_start_x = None
         self.drag_start_y = None
@@ -77,9 +89,10 @@ class ObjectMover:
             x, y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
             dx = x - self.board.last_x
             dy = y - self.board.last_y
-            for obj in self.object_selector.selected_objects:
-                self.canvas.move(obj, dx, dy)
+            self.canvas.move(ObjectSelector.SELECTED_TAG, dx, dy)
             self.canvas.move("selection_frame", dx, dy)
+            self.board.notify_objects_changed(self.board.CHANGE_MOVE, list(self.object_selector.selected_objects))
+            self.board.undo_handler.record_move(self.object_selector.selected_objects, dx, dy)
             self.board.last_x = x
             self.board.last_y = y
 
@@ -0,0 +1,175 @@
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from clipboard import Clipboard
+from image_pyramid import ImagePyramid
+from symbol_handler import SymbolHandler
+
+
+class ObjectRenderer:
+    """
+    A class that draws board objects onto a PIL image from their saved state, including symbol instances.
+    Image objects are drawn from the pyramid level matching the scale, so small renderings never decode the
+    full-resolution pixels.
+    """
+
+    FONT_DIR = "fonts"
+    FALLBACK_FONT_NAME = "Arial"
+
+    def __init__(self, image: Image.Image, origin_x: float, origin_y: float, scale: float = 1.0,
+                 symbols: Optional[Dict[str, Clipboard]] = None,
+                 images: Optional[Dict[str, ImagePyramid]] = None, full_resolution: bool = False) -> None:
+        """
+        Initialize the ObjectRenderer.
+
+        :param image: The image to draw on.
+        :param origin_x: The board x-coordinate mapped to the left edge of the image.
+        :param origin_y: The board y-coordinate mapped to the top edge of the image.
+        :param scale: The number of image pixels per board unit.
+        :param symbols: The packed symbol definitions used by instance states, if any.
+        :param images: The images used by image states, by content hash, if any.
+        :param full_resolution: True to draw image objects from their original pixels, as when exporting.
+        """
+        self.image = image
+        self.drawable = ImageDraw.Draw(image)
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.scale = scale
+        self.fonts: Dict[Tuple[str, int], Any] = {}
+        self.symbols = symbols if symbols is not None else {}
+        self.images = images if images is not None else {}
+        self.full_resolution = full_resolution
+
+    def draw_objects(self, objects_state: List[Dict[str, Any]]) -> None:
+        """
+        Draw several objects in the given order.
+
+        :param objects_state: The states of the objects to draw, bottom-most first.
+        """
+        for obj_state in objects_state:
+            self.draw_object(obj_state)
+
+    def draw_object(self, obj_state: Dict[str, Any]) -> None:
+        """
+        Draw a single object.
+
+        :param obj_state: The state of the object, as stored in the board file.
+        """
+        item_type = obj_state['type']
+        if item_type == SymbolHandler.INSTANCE_TYPE:
+            if obj_state['symbol'] in self.symbols:
+                self.draw_objects(SymbolHandler.expand_instance(obj_state, self.symbols[obj_state['symbol']]))
+            return
+        coords = self.transform_coords(obj_state['coords'])
+        if not coords:
+            return
+        fill = self._color(obj_state.get('fill'))
+        outline = self._color(obj_state.get('outline'))
+        width = self._scaled_width(obj_state.get('width'))
+
+        if item_type == "rectangle":
+            self.drawable.rectangle(self._normalized_box(coords), fill=fill, outline=outline, width=width)
+        elif item_type == "oval":
+            self.drawable.ellipse(self._normalized_box(coords), fill=fill, outline=outline, width=width)
+        elif item_type == "polygon" and len(coords) >= 6:
+            self.drawable.polygon(coords, fill=fill, outline=outline, width=width)
+        elif item_type == "line" and len(coords) >= 4:
+            self.drawable.line(coords, fill=fill, width=width, joint="curve")
+        elif item_type == "text":
+            self._draw_text(obj_state, coords, fill)
+        elif item_type == "image" and obj_state.get('image') in self.images:
+            self._draw_image(obj_state, coords)
+
+    def transform_coords(self, coords: List[float]) -> List[float]:
+        """
+        Map board coordinates to image coordinates.
+
+        :param coords: The flat list of board coordinates.
+        :return: The flat list of image coordinates.
+        """
+        return [(coord - self.origin_x) * self.scale if i % 2 == 0 else (coord - self.origin_y) * self.scale
+                for i, coord in enumerate(coords)]
+
+    def get_font(self, font_name: str, font_size: int) -> Any:
+        """
+        Get a cached TrueType font, falling back to Arial if the font file is missing.
+
+        :param font_name: The name of the font.
+        :param font_size: The size of the font in image pixels.
+        :return: The loaded font.
+        """
+        key = (font_name, font_size)
+        if key not in self.fonts:
+            try:
+                font = ImageFont.truetype(os.path.join(ObjectRenderer.FONT_DIR, font_name + ".ttf"), font_size)
+            except (OSError, IOError):
+                font = ImageFont.truetype(
+                    os.path.join(ObjectRenderer.FONT_DIR, ObjectRenderer.FALLBACK_FONT_NAME + ".ttf"), font_size)
+            self.fonts[key] = font
+        return self.fonts[key]
+
+    def _draw_text(self, obj_state: Dict[str, Any], coords: List[float], fill: Optional[str]) -> None:
+        """
+        Draw a text object centered on its anchor point.
+
+        :param obj_state: The state of the text object.
+        :param coords: The image coordinates of the text anchor.
+        :param fill: The text color.
+        """
+        text = obj_state.get('text', "")
+        if not text:
+            return
+        font_parts = obj_state.get('font', "").split()
+        font_name = " ".join(font_parts[:-1]) or ObjectRenderer.FALLBACK_FONT_NAME
+        font_size = max(1, round(int(font_parts[-1]) * self.scale)) if font_parts else 1
+        font = self.get_font(font_name, font_size)
+        text_width, text_height = font.getbbox(text)[2:4]
+        self.drawable.text((coords[0] - text_width // 2, coords[1] - text_height // 2), text, fill=fill, font=font)
+
+    def _draw_image(self, obj_state: Dict[str, Any], coords: List[float]) -> None:
+        """
+        Draw an image object from the pyramid level matching its size in image pixels.
+
+        :param obj_state: The state of the image object.
+        :param coords: The image coordinates of the corners of the image object.
+        """
+        left, top, right, bottom = (round(coord) for coord in self._normalized_box(coords))
+        if right <= left or bottom <= top:
+            return
+        pixels = self.images[obj_state['image']].get_image(right - left, bottom - top, self.full_resolution)
+        self.image.paste(pixels, (left, top), pixels)
+
+    def _scaled_width(self, width: Any) -> int:
+        """
+        Convert a stored width to a line width in image pixels.
+
+        :param width: The stored width (string or number).
+        :return: The scaled width, at least one pixel.
+        """
+        try:
+            return max(1, round(float(width) * self.scale))
+        except (TypeError, ValueError):
+            return 1
+
+    @staticmethod
+    def _color(color: Optional[str]) -> Optional[str]:
+        """
+        Convert a Tk color to a PIL color, mapping the empty color to transparent.
+
+        :param color: The Tk color.
+        :return: The PIL color, or None for no color.
+        """
+        return color or None
+
+    @staticmethod
+    def _normalized_box(coords: List[float]) -> Tuple[float, float, float, float]:
+        """
+        Order the corners of a bounding box as PIL expects.
+
+        :param coords: The two corners of the box.
+        :return: The box as (left, top, right, bottom).
+        """
+        x1, y1, x2, y2 = coords[:4]
+        return min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
@@ -1,5 +1,8 @@
 import tkinter as tk
-from typing import Optional, List, TYPE_CHECKING
+from typing import Optional, List, Set, TYPE_CHECKING
+
+from group_handler import GroupHandler
+from layer_handler import LayerHandler
 
 if TYPE_CHECKING:
     from board import Board
@@ -14,6 +17,12 @@ class ObjectSelector:
     SELECTION_FRAME_DASH = (4, 2)
     SELECTION_FRAME_OUTLINE = "black"
 
+    # Tags kept on the selected objects so that editing the selection takes a single canvas call
+    SELECTED_TAG = "selected"
+    SELECTED_OUTLINED_TAG = "selected_outlined"
+    SELECTED_TEXT_TAG = "selected_text"
+    SELECTED_IMAGE_TAG = "selected_image"
+
     def __init__(self, board: 'Board') -> None:
         """
         Initialize the ObjectSelector.
@@ -24,6 +33,7 @@ class ObjectSelector:
         self.canvas = board.canvas
         self.toolbox = board.toolbox
         self.selected_objects: List[int] = []
+        self.selected_types: Set[str] = set()
         self.selection_frame_padding: int = ObjectSelector.SELECTION_FRAME_PADDING
         self.selection_frame: Optional[int] = None
         self.selection_start_x: float = 0
@@ -78,9 +88,10 @@ class ObjectSelector:
                 x1, x2 = x2, x1
             if y1 > y2:
                 y1, y2 = y2, y1
-            selected_objects = self.canvas.find_enclosed(x1, y1, x2, y2)
+            selected_objects = self.board.layer_handler.without_locked(
+                self.board.group_handler.expand_to_groups(self.canvas.find_enclosed(x1, y1, x2, y2)))
             if selected_objects:
-                self.select_multiple_objects(list(selected_objects))
+                self.select_multiple_objects(selected_objects)
             else:
                 self.deselect_current_objects()
             self.selection_start_x = 0
@@ -89,17 +100,40 @@ class ObjectSelector:
 
     def select_object(self, obj: int) -> None:
         """
-        Select a single object.
+        Select a single object, or the outermost group it is in.
 
         :param obj: The ID of the object to select.
         """
         if obj not in self.selected_objects:
+            group = self.board.group_handler.get_outermost_group(obj)
+            if group is not None:
+                self.select_group(group)
+                return
             self.deselect_current_objects()
             self.selected_objects = [obj]
+            self.tag_selected_objects()
             self.draw_selection_frame()
         else:
             self.deselect_current_objects()
 
+    def select_group(self, group: str) -> None:
+        """
+        Select all objects of a group, setting the selection tags through the group tag. Members on locked
+        layers are left out.
+
+        :param group: The group tag.
+        """
+        self.deselect_current_objects()
+        members = f"{group}&&!{LayerHandler.LOCKED_TAG}"
+        self.selected_objects = list(self.canvas.find_withtag(members))
+        self.canvas.addtag_withtag(ObjectSelector.SELECTED_TAG, members)
+        self.canvas.addtag_withtag(ObjectSelector.SELECTED_OUTLINED_TAG,
+                                   f"{members}&&{GroupHandler.OUTLINED_MEMBER_TAG}")
+        self.canvas.addtag_withtag(ObjectSelector.SELECTED_TEXT_TAG, f"{members}&&{GroupHandler.TEXT_MEMBER_TAG}")
+        self.canvas.addtag_withtag(ObjectSelector.SELECTED_IMAGE_TAG, f"{members}&&{GroupHandler.IMAGE_MEMBER_TAG}")
+        self.selected_types = set(self.board.group_handler.get_group_types(group))
+        self.draw_selection_frame()
+
     def select_multiple_objects(self, objects: List[int]) -> None:
         """
         Select multiple objects.
@@ -107,6 +141,7 @@ class ObjectSelector:
         :param objects: The list of object IDs to select.
         """
         self.selected_objects = objects
+        self.tag_selected_objects()
         self.draw_selection_frame()
 
     def deselect_current_objects(self) -> None:
@@ -114,9 +149,36 @@ class ObjectSelector:
         Deselect the currently selected objects.
         """
         self.selected_objects = []
+        self.untag_selected_objects()
         self.canvas.delete("selection_frame")
         self.selection_frame = None
 
+    def tag_selected_objects(self) -> None:
+        """
+        Tag the selected objects with the selection tags and collect their item types.
+        """
+        self.untag_selected_objects()
+        for obj in self.selected_objects:
+            item_type = self.canvas.type(obj)  # type: ignore
+            self.canvas.addtag_withtag(ObjectSelector.SELECTED_TAG, obj)
+            if item_type in GroupHandler.OUTLINED_TYPES:
+                self.canvas.addtag_withtag(ObjectSelector.SELECTED_OUTLINED_TAG, obj)
+            elif item_type == "text":
+                self.canvas.addtag_withtag(ObjectSelector.SELECTED_TEXT_TAG, obj)
+            elif item_type == "image":
+                self.canvas.addtag_withtag(ObjectSelector.SELECTED_IMAGE_TAG, obj)
+            self.selected_types.add(item_type)
+
+    def untag_selected_objects(self) -> None:
+        """
+        Remove the selection tags from every object.
+        """
+        self.canvas.dtag(ObjectSelector.SELECTED_TAG)
+        self.canvas.dtag(ObjectSelector.SELECTED_OUTLINED_TAG)
+        self.canvas.dtag(ObjectSelector.SELECTED_TEXT_TAG)
+        self.canvas.dtag(ObjectSelector.SELECTED_IMAGE_TAG)
+        self.selected_types = set()
+
     def draw_selection_frame(self) -> None:
         """
         Draw the selection frame around the selected objects.
@@ -134,6 +196,7 @@ class ObjectSelector:
                                                                     outline=ObjectSelector.SELECTION_FRAME_OUTLINE,
                                                                     dash=ObjectSelector.SELECTION_FRAME_DASH,
                                                                     tags="selection_frame")
+                self.board.selection_transformer.draw_handles(x1, y1, x2, y2)
 
     def is_click_inside_selection_frame(self, event: 'tk.Event[tk.Misc]') -> bool:
         """
@@ -0,0 +1,76 @@
+import json
+import os
+from typing import List
+
+from autosave_handler import AutosaveHandler
+from file_handler import FileHandler
+
+
+class RecentBoards:
+    """
+    A class that keeps the list of recently opened board files, and finds the boards to offer in the start menu.
+
+    Boards are found from the file system only, without reading them.
+    """
+
+    RECENT_PATH = os.path.join(FileHandler.DEFAULT_DIR, ".recent.json")
+    BOARD_EXTENSION = ".pcso"
+    MAX_RECENT = 10
+
+    @staticmethod
+    def add(filename: str) -> None:
+        """
+        Move a board file to the top of the recent boards. Failing to update the list is ignored. The autosave
+        file is never added.
+
+        :param filename: The name of the board file.
+        """
+        path = os.path.abspath(filename)
+        if path == os.path.abspath(AutosaveHandler.AUTOSAVE_PATH):
+            return
+        recent = [path] + [other for other in RecentBoards.get_recent() if other != path]
+        temp_path = RecentBoards.RECENT_PATH + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(RecentBoards.RECENT_PATH), exist_ok=True)
+            with open(temp_path, 'w') as f:
+                json.dump(recent[:RecentBoards.MAX_RECENT], f)
+            os.replace(temp_path, RecentBoards.RECENT_PATH)
+        except OSError:
+            pass
+
+    @staticmethod
+    def get_recent() -> List[str]:
+        """
+        Get the recent boards.
+
+        :return: The absolute paths of the recent board files, most recent first, including missing files.
+        """
+        try:
+            with open(RecentBoards.RECENT_PATH, 'r') as f:
+                recent = json.load(f)
+        except (OSError, ValueError):
+            return []
+        return [path for path in recent if isinstance(path, str)] if isinstance(recent, list) else []
+
+    @staticmethod
+    def get_boards(directory: str = FileHandler.DEFAULT_DIR, limit: int = 12) -> List[str]:
+        """
+        Get the boards to offer: the recent boards that still exist, followed by the other boards in a directory,
+        most recently modified first.
+
+        :param directory: The directory searched for nearby boards, without its subdirectories.
+        :param limit: The largest number of boards.
+        :return: The absolute paths of the board files.
+        """
+        excluded = {os.path.abspath(AutosaveHandler.AUTOSAVE_PATH)}
+        boards = [path for path in RecentBoards.get_recent() if path not in excluded and os.path.isfile(path)]
+        try:
+            nearby = sorted(((entry.stat().st_mtime_ns, os.path.abspath(entry.path)) for entry in os.scandir(directory)
+                             if entry.is_file() and entry.name.lower().endswith(RecentBoards.BOARD_EXTENSION)),
+                            reverse=True)
+        except OSError:
+            nearby = []
+        for _, path in nearby:
+            if path not in excluded and path not in boards:
+                boards.append(path)
+        return boards[:limit]
@@ -0,0 +1,162 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from object_renderer import ObjectRenderer
+
+
+class RegionFiller:
+    """
+    A class that finds the region enclosed around a point by rasterizing the board objects.
+
+    The objects are drawn as barriers into a mask, the free pixels connected to the seed are found with a
+    scanline flood fill that works on whole runs of pixels with NumPy, and the outline of the filled pixels
+    is traced back into a polygon. The work is bounded by the size of the region: a fill that reaches the
+    border of the mask is abandoned as soon as it gets there.
+    """
+
+    BARRIER_COLOR = "black"
+    BACKGROUND = 255
+    SEARCH_CHUNK = 64
+
+    # For every direction (right, down, left, up): the offsets of the pixels ahead on the left and on the right
+    # of a pixel corner, and the step to the next corner.
+    AHEAD_PIXELS = [((0, -1), (0, 0)), ((0, 0), (-1, 0)), ((-1, 0), (-1, -1)), ((-1, -1), (0, -1))]
+    STEPS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+
+    @staticmethod
+    def rasterize(objects_state: List[Dict[str, Any]], origin_x: float, origin_y: float,
+                  width: int, height: int) -> np.ndarray:
+        """
+        Draw objects as barriers and get the pixels that are free to fill.
+
+        :param objects_state: The states of the objects overlapping the area.
+        :param origin_x: The board x-coordinate of the left edge of the area.
+        :param origin_y: The board y-coordinate of the top edge of the area.
+        :param width: The width of the area in pixels.
+        :param height: The height of the area in pixels.
+        :return: A boolean array that is True for free pixels, indexed by row and column.
+        """
+        image = Image.new("L", (width, height), RegionFiller.BACKGROUND)
+        renderer = ObjectRenderer(image, origin_x, origin_y)
+        for obj_state in objects_state:
+            renderer.draw_object(RegionFiller._as_barrier(obj_state))
+        return np.asarray(image) == RegionFiller.BACKGROUND
+
+    @staticmethod
+    def flood_fill(free: np.ndarray, seed_x: int, seed_y: int) -> Optional[np.ndarray]:
+        """
+        Find the free pixels 4-connected to the seed.
+
+        :param free: The free pixels, as returned by rasterize.
+        :param seed_x: The column of the seed pixel.
+        :param seed_y: The row of the seed pixel.
+        :return: A boolean array of the filled pixels, or None if the seed is not free or the region reaches
+                 the border and may continue outside the area.
+        """
+        height, width = free.shape
+        if not free[seed_y, seed_x]:
+            return None
+        filled = np.zeros_like(free)
+        spans = [(seed_y, seed_x, seed_x)]
+        while spans:
+            y, x1, x2 = spans.pop()
+            row_free = free[y]
+            row_filled = filled[y]
+            candidates = np.concatenate(([False], row_free[x1:x2 + 1] & ~row_filled[x1:x2 + 1], [False]))
+            edges = np.flatnonzero(candidates[1:] != candidates[:-1])
+            for start, end in zip(edges[0::2] + x1, edges[1::2] + x1 - 1):
+                if row_filled[start]:
+                    continue
+                left = RegionFiller._extend_left(row_free, int(start))
+                right = RegionFiller._extend_right(row_free, int(end))
+                if left == 0 or right == width - 1 or y == 0 or y == height - 1:
+                    return None
+                row_filled[left:right + 1] = True
+                spans.append((y - 1, left, right))
+                spans.append((y + 1, left, right))
+        return filled
+
+    @staticmethod
+    def trace_outline(filled: np.ndarray) -> List[Tuple[int, int]]:
+        """
+        Trace the outer outline of a filled region along the pixel edges.
+
+        :param filled: The filled pixels, which must not touch the border of the array.
+        :return: The corners of the outline polygon in pixel coordinates.
+        """
+        rows = np.flatnonzero(filled.any(axis=1))
+        if rows.size == 0:
+            return []
+        start_y = int(rows[0])
+        start_x = int(np.flatnonzero(filled[start_y])[0])
+
+        x, y, direction = start_x, start_y, 0
+        outline: List[Tuple[int, int]] = []
+        while True:
+            (left_dx, left_dy), (right_dx, right_dy) = RegionFiller.AHEAD_PIXELS[direction]
+            if filled[y + left_dy, x + left_dx]:
+                new_direction = (direction + 3) % 4
+            elif filled[y + right_dy, x + right_dx]:
+                new_direction = direction
+            else:
+                new_direction = (direction + 1) % 4
+            if new_direction != direction or not outline:
+                outline.append((x, y))
+            direction = new_direction
+            step_x, step_y = RegionFiller.STEPS[direction]
+            x += step_x
+            y += step_y
+            if (x, y) == (start_x, start_y):
+                break
+        return outline
+
+    @staticmethod
+    def _extend_left(row_free: np.ndarray, x: int) -> int:
+        """
+        Find where the run of free pixels containing x starts, looking at the row in small chunks.
+
+        :param row_free: The free pixels of the row.
+        :param x: A free column.
+        :return: The first column of the run.
+        """
+        while x > 0:
+            chunk_start = max(0, x - RegionFiller.SEARCH_CHUNK)
+            blocked = np.flatnonzero(~row_free[chunk_start:x])
+            if blocked.size:
+                return chunk_start + int(blocked[-1]) + 1
+            x = chunk_start
+        return 0
+
+    @staticmethod
+    def _extend_right(row_free: np.ndarray, x: int) -> int:
+        """
+        Find where the run of free pixels containing x ends, looking at the row in small chunks.
+
+        :param row_free: The free pixels of the row.
+        :param x: A free column.
+        :return: The last column of the run.
+        """
+        width = row_free.shape[0]
+        while x < width - 1:
+            chunk_end = min(width, x + 1 + RegionFiller.SEARCH_CHUNK)
+            blocked = np.flatnonzero(~row_free[x + 1:chunk_end])
+            if blocked.size:
+                return x + int(blocked[0])
+            x = chunk_end - 1
+        return width - 1
+
+    @staticmethod
+    def _as_barrier(obj_state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get a copy of an object state drawn entirely in the barrier color.
+
+        :param obj_state: The object state.
+        :return: The barrier state.
+        """
+        barrier = dict(obj_state)
+        for option in ('fill', 'outline'):
+            if barrier.get(option):
+                barrier[option] = RegionFiller.BARRIER_COLOR
+        return barrier
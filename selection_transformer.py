@@ -0,0 +1,347 @@
+import math
+import tkinter as tk
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from group_handler import GroupHandler
+from object_selector import ObjectSelector
+
+if TYPE_CHECKING:
+    from board import Board
+
+
+class SelectionTransformer:
+    """
+    A class that scales, rotates and flips the selected objects.
+
+    The selection frame gets a handle on every corner for scaling and one above it for rotating. While a
+    handle is dragged only an outline of the transformed frame is updated; on release the affine transform is
+    applied to the coordinates of all selected objects at once with NumPy. Rectangles and ovals that are
+    rotated by an angle that is not a multiple of 90 degrees become polygons. Text objects and images only
+    move, so that their centers follow the transform while their size and orientation are kept, and line
+    widths are kept.
+    """
+
+    HANDLE_SIZE = 4
+    HANDLE_FILL = "white"
+    HANDLE_OUTLINE = "black"
+    ROTATE_HANDLE_OFFSET = 20
+    PREVIEW_DASH = (2, 2)
+    OVAL_SEGMENTS = 36
+    MIN_SCALE_DISTANCE = 1e-6
+    AXIS_ALIGNED_TOLERANCE = 1e-9
+
+    HANDLE_ROTATE = "rotate"
+    # The corner handles, with the corner of the frame each one is on as indices into the frame coordinates
+    CORNER_HANDLES = {"nw": (0, 1), "ne": (2, 1), "sw": (0, 3), "se": (2, 3)}
+
+    def __init__(self, board: 'Board') -> None:
+        """
+        Initialize the SelectionTransformer.
+
+        :param board: The board instance.
+        """
+        self.board = board
+        self.canvas = board.canvas
+        self.object_selector = board.object_selector
+        self.handles: Dict[int, str] = {}
+        self.is_transforming: bool = False
+        self.handle: Optional[str] = None
+        self.frame: Tuple[float, float, float, float] = (0, 0, 0, 0)
+        self.pivot: Tuple[float, float] = (0, 0)
+        self.start: Tuple[float, float] = (0, 0)
+        self.matrix: np.ndarray = np.eye(2, 3)
+        self.preview: Optional[int] = None
+
+    def draw_handles(self, x1: float, y1: float, x2: float, y2: float) -> None:
+        """
+        Draw the transform handles around the selection frame. The handles share the selection frame tag, so
+        that they are moved and deleted along with it.
+
+        :param x1: The left edge of the selection frame.
+        :param y1: The top edge of the selection frame.
+        :param x2: The right edge of the selection frame.
+        :param y2: The bottom edge of the selection frame.
+        """
+        size = SelectionTransformer.HANDLE_SIZE
+        frame = (x1, y1, x2, y2)
+        self.handles = {}
+        for handle, (x_index, y_index) in SelectionTransformer.CORNER_HANDLES.items():
+            x, y = frame[x_index], frame[y_index]
+            item = self.canvas.create_rectangle(x - size, y - size, x + size, y + size,
+                                                fill=SelectionTransformer.HANDLE_FILL,
+                                                outline=SelectionTransformer.HANDLE_OUTLINE, tags="selection_frame")
+            self.handles[item] = handle
+        x, y = (x1 + x2) / 2, y1 - SelectionTransformer.ROTATE_HANDLE_OFFSET
+        item = self.canvas.create_oval(x - size, y - size, x + size, y + size, fill=SelectionTransformer.HANDLE_FILL,
+                                       outline=SelectionTransformer.HANDLE_OUTLINE, tags="selection_frame")
+        self.handles[item] = SelectionTransformer.HANDLE_ROTATE
+
+    def is_handle(self, item: int) -> bool:
+        """
+        Check if a canvas item is one of the transform handles.
+
+        :param item: The ID of the canvas item.
+        :return: True if the item is a handle, False otherwise.
+        """
+        return item in self.handles
+
+    def start_transform(self, event: 'tk.Event[tk.Misc]', item: int) -> None:
+        """
+        Start dragging a transform handle.
+
+        :param event: The mouse event.
+        :param item: The ID of the handle that was clicked.
+        """
+        if not self.object_selector.selected_objects or self.object_selector.selection_frame is None:
+            return
+        x1, y1, x2, y2 = self.canvas.coords(self.object_selector.selection_frame)
+        self.frame = (x1, y1, x2, y2)
+        self.handle = self.handles[item]
+        if self.handle == SelectionTransformer.HANDLE_ROTATE:
+            self.pivot = ((x1 + x2) / 2, (y1 + y2) / 2)
+        else:
+            x_index, y_index = SelectionTransformer.CORNER_HANDLES[self.handle]
+            self.pivot = (self.frame[2 - x_index], self.frame[4 - y_index])
+        self.start = (self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        self.matrix = np.eye(2, 3)
+        self.preview = self.canvas.create_polygon(*self._get_frame_corners().ravel().tolist(), fill="",
+                                                  outline=ObjectSelector.SELECTION_FRAME_OUTLINE,
+                                                  dash=SelectionTransformer.PREVIEW_DASH, tags="selection_frame")
+        self.is_transforming = True
+
+    def continue_transform(self, event: 'tk.Event[tk.Misc]') -> None:
+        """
+        Update the transform while a handle is dragged and show the transformed frame.
+
+        :param event: The mouse event.
+        """
+        if self.is_transforming and self.preview is not None:
+            x, y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+            if self.handle == SelectionTransformer.HANDLE_ROTATE:
+                angle = (math.atan2(y - self.pivot[1], x - self.pivot[0]) -
+                         math.atan2(self.start[1] - self.pivot[1], self.start[0] - self.pivot[0]))
+                self.matrix = SelectionTransformer.rotation(angle, *self.pivot)
+            else:
+                self.matrix = SelectionTransformer.scaling(self._get_scale(x, self.start[0], self.pivot[0]),
+                                                           self._get_scale(y, self.start[1], self.pivot[1]),
+                                                           *self.pivot)
+            corners = SelectionTransformer.transform_points(self._get_frame_corners(), self.matrix)
+            self.canvas.coords(self.preview, *corners.ravel().tolist())
+
+    def end_transform(self) -> None:
+        """
+        Finish dragging a handle and apply the transform to the selected objects.
+        """
+        if self.is_transforming:
+            if self.preview is not None:
+                self.canvas.delete(self.preview)
+                self.preview = None
+            self.is_transforming = False
+            self.handle = None
+            if not np.allclose(self.matrix, np.eye(2, 3)):
+                self.apply_transform(self.matrix)
+
+    def flip_horizontal(self) -> None:
+        """
+        Mirror the selected objects left to right.
+        """
+        self.flip_selection(True)
+
+    def flip_vertical(self) -> None:
+        """
+        Mirror the selected objects top to bottom.
+        """
+        self.flip_selection(False)
+
+    def flip_selection(self, horizontal: bool) -> None:
+        """
+        Mirror the selected objects around the center of the selection.
+
+        :param horizontal: True to flip left to right, False to flip top to bottom.
+        """
+        selected_objects = self.object_selector.selected_objects
+        if selected_objects:
+            bbox = self.canvas.bbox(*selected_objects)
+            if bbox is not None:
+                x1, y1, x2, y2 = bbox
+                self.apply_transform(SelectionTransformer.scaling(-1 if horizontal else 1, 1 if horizontal else -1,
+                                                                  (x1 + x2) / 2, (y1 + y2) / 2))
+
+    def apply_transform(self, matrix: np.ndarray) -> None:
+        """
+        Apply an affine transform to the coordinates of all selected objects, as a single undo step.
+
+        :param matrix: The 2x3 affine transform matrix.
+        """
+        selected_objects = list(self.object_selector.selected_objects)
+        outlined_objects = set(self.canvas.find_withtag(ObjectSelector.SELECTED_OUTLINED_TAG))
+        axis_aligned = SelectionTransformer.is_axis_aligned(matrix)
+        converted_objects = [] if axis_aligned else [obj for obj in selected_objects if obj in outlined_objects]
+        converted = set(converted_objects)
+        images = (set(self.canvas.find_withtag(ObjectSelector.SELECTED_IMAGE_TAG))
+                  if "image" in self.object_selector.selected_types else set())
+        image_offsets: Dict[int, np.ndarray] = {}
+
+        shapes: List[np.ndarray] = []
+        for obj in selected_objects:
+            coords = self.canvas.coords(obj)
+            if obj in converted:
+                shapes.append(self._get_outline_points(obj, coords))
+            elif obj in images:
+                # Images are anchored at their top left corner, so their center is transformed instead
+                x1, y1, x2, y2 = self.canvas.bbox(obj)
+                center = np.array([[(x1 + x2) / 2, (y1 + y2) / 2]], dtype=float)
+                image_offsets[obj] = np.array(coords[:2], dtype=float) - center
+                shapes.append(center)
+            else:
+                shapes.append(np.array(coords, dtype=float).reshape(-1, 2))
+        offsets = np.cumsum([0] + [len(points) for points in shapes])
+        transformed = SelectionTransformer.transform_points(np.concatenate(shapes), matrix)
+
+        reshaped_objects: List[int] = []
+        reshaped_coords: List[List[float]] = []
+        converted_coords: List[List[float]] = []
+        for i, obj in enumerate(selected_objects):
+            points = transformed[offsets[i]:offsets[i + 1]]
+            if obj in converted:
+                converted_coords.append(points.ravel().tolist())
+                continue
+            if obj in outlined_objects:
+                points = np.concatenate((points.min(axis=0), points.max(axis=0)))
+            elif obj in images:
+                points = points + image_offsets[obj]
+            reshaped_objects.append(obj)
+            reshaped_coords.append(points.ravel().tolist())
+
+        undo_handler = self.board.undo_handler
+        undo_handler.begin_group()
+        undo_handler.record_reshape(reshaped_objects, reshaped_coords)
+        for obj, coords in zip(reshaped_objects, reshaped_coords):
+            self.canvas.coords(obj, *coords)
+        self.board.notify_objects_changed(self.board.CHANGE_MOVE, reshaped_objects)
+        polygons = self._convert_to_polygons(converted_objects, converted_coords)
+        undo_handler.end_group()
+
+        replacements = dict(zip(converted_objects, polygons))
+        self.object_selector.select_multiple_objects([replacements.get(obj, obj) for obj in selected_objects])
+
+    def _convert_to_polygons(self, objects: List[int], objects_coords: List[List[float]]) -> List[int]:
+        """
+        Replace rectangles and ovals by polygons with the same style and stacking position.
+
+        :param objects: The IDs of the objects to replace.
+        :param objects_coords: The coordinates of the polygons.
+        :return: The IDs of the polygons.
+        """
+        if not objects:
+            return []
+        polygons: List[int] = []
+        for obj, coords in zip(objects, objects_coords):
+            tags = [tag for tag in self.canvas.gettags(obj)
+                    if tag not in (ObjectSelector.SELECTED_OUTLINED_TAG, GroupHandler.OUTLINED_MEMBER_TAG)]
+            polygon = self.canvas.create_polygon(*coords, fill=self.canvas.itemcget(obj, 'fill'),  # type: ignore
+                                                 outline=self.canvas.itemcget(obj, 'outline'),  # type: ignore
+                                                 width=self.canvas.itemcget(obj, 'width'),  # type: ignore
+                                                 tags=tags)
+            self.canvas.tag_raise(polygon, obj)
+            polygons.append(polygon)
+        self.board.undo_handler.record_delete(objects)
+        self.board.notify_objects_changed(self.board.CHANGE_DELETE, objects)
+        for obj in objects:
+            self.canvas.delete(obj)
+        replacements = dict(zip(objects, polygons))
+        self.board.objects = [replacements.get(obj, obj) for obj in self.board.objects]
+        self.board.notify_objects_changed(self.board.CHANGE_CREATE, polygons)
+        self.board.undo_handler.record_create(polygons)
+        return polygons
+
+    def _get_outline_points(self, obj: int, coords: List[float]) -> np.ndarray:
+        """
+        Get the outline of a rectangle or an oval as polygon points.
+
+        :param obj: The ID of the object.
+        :param coords: The coordinates of the object.
+        :return: The points of the outline.
+        """
+        x1, y1, x2, y2 = coords
+        if self.canvas.type(obj) == "oval":  # type: ignore
+            angles = np.linspace(0, 2 * np.pi, SelectionTransformer.OVAL_SEGMENTS, endpoint=False)
+            return np.column_stack(((x1 + x2) / 2 + (x2 - x1) / 2 * np.cos(angles),
+                                    (y1 + y2) / 2 + (y2 - y1) / 2 * np.sin(angles)))
+        return np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], dtype=float)
+
+    def _get_frame_corners(self) -> np.ndarray:
+        """
+        Get the corners of the selection frame at the start of the transform.
+
+        :return: The four corners, clockwise from the top left.
+        """
+        x1, y1, x2, y2 = self.frame
+        return np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], dtype=float)
+
+    @staticmethod
+    def _get_scale(position: float, start: float, pivot: float) -> float:
+        """
+        Get the scale factor along one axis from the handle position.
+
+        :param position: The current position of the pointer.
+        :param start: The position of the pointer when the drag started.
+        :param pivot: The position of the fixed corner.
+        :return: The scale factor, negative if the handle was dragged past the fixed corner.
+        """
+        if abs(start - pivot) < SelectionTransformer.MIN_SCALE_DISTANCE:
+            return 1.0
+        return (position - pivot) / (start - pivot)
+
+    @staticmethod
+    def scaling(scale_x: float, scale_y: float, pivot_x: float, pivot_y: float) -> np.ndarray:
+        """
+        Build a transform that scales around a fixed point. Negative factors mirror.
+
+        :param scale_x: The horizontal scale factor.
+        :param scale_y: The vertical scale factor.
+        :param pivot_x: The x-coordinate of the fixed point.
+        :param pivot_y: The y-coordinate of the fixed point.
+        :return: The 2x3 affine transform matrix.
+        """
+        return np.array([[scale_x, 0, pivot_x * (1 - scale_x)],
+                         [0, scale_y, pivot_y * (1 - scale_y)]], dtype=float)
+
+    @staticmethod
+    def rotation(angle: float, pivot_x: float, pivot_y: float) -> np.ndarray:
+        """
+        Build a transform that rotates around a fixed point.
+
+        :param angle: The angle in radians, clockwise on the screen.
+        :param pivot_x: The x-coordinate of the fixed point.
+        :param pivot_y: The y-coordinate of the fixed point.
+        :return: The 2x3 affine transform matrix.
+        """
+        cos, sin = math.cos(angle), math.sin(angle)
+        return np.array([[cos, -sin, pivot_x - cos * pivot_x + sin * pivot_y],
+                         [sin, cos, pivot_y - sin * pivot_x - cos * pivot_y]], dtype=float)
+
+    @staticmethod
+    def transform_points(points: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        """
+        Apply an affine transform to points.
+
+        :param points: The points, one per row.
+        :param matrix: The 2x3 affine transform matrix.
+        :return: The transformed points.
+        """
+        return points @ matrix[:, :2].T + matrix[:, 2]
+
+    @staticmethod
+    def is_axis_aligned(matrix: np.ndarray) -> bool:
+        """
+        Check if a transform keeps axis-aligned rectangles axis-aligned.
+
+        :param matrix: The 2x3 affine transform matrix.
+        :return: True for scaling, mirroring and rotations by multiples of 90 degrees.
+        """
+        tolerance = SelectionTransformer.AXIS_ALIGNED_TOLERANCE
+        return bool((abs(matrix[0, 1]) < tolerance and abs(matrix[1, 0]) < tolerance) or
+                    (abs(matrix[0, 0]) < tolerance and abs(matrix[1, 1]) < tolerance))
@@ -0,0 +1,138 @@
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+import tkinter as tk
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class StallWatchdog:
+    """
+    A class that detects when the Tk event loop stops responding and logs where the main thread was stuck.
+
+    A heartbeat after callback runs on the main thread at a fixed interval. A daemon thread checks that the
+    heartbeat keeps running; while it is late by more than the threshold, the thread samples the Python stack
+    of the main thread. When the event loop recovers, the stall duration and the most frequently sampled
+    location are appended to the log file as a JSON line. The watchdog is opt-in, for example with the
+    --stall-log option.
+    """
+
+    DEFAULT_THRESHOLD_MS = 500
+    HEARTBEAT_MS = 100
+    STACK_DEPTH = 20
+
+    def __init__(self, root: tk.Tk, log_path: Optional[str] = None,
+                 threshold_ms: int = DEFAULT_THRESHOLD_MS) -> None:
+        """
+        Initialize the StallWatchdog.
+
+        :param root: The root Tk instance.
+        :param log_path: The file the stalls are appended to, or None to print them to stderr.
+        :param threshold_ms: How late the heartbeat must be to count as a stall, in milliseconds.
+        """
+        self.root = root
+        self.log_path = log_path
+        self.threshold = threshold_ms / 1000
+        self.heartbeat_interval = StallWatchdog.HEARTBEAT_MS / 1000
+        self.main_thread_id = threading.main_thread().ident
+        self.last_heartbeat: float = time.monotonic()
+        self.stall_start: Optional[float] = None
+        self.samples: List[List[str]] = []
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="StallWatchdog", daemon=True)
+        self.after_id: Optional[str] = None
+
+    def start(self) -> None:
+        """
+        Start the heartbeat and the watchdog thread.
+        """
+        self.last_heartbeat = time.monotonic()
+        self.after_id = self.root.after(StallWatchdog.HEARTBEAT_MS, self.heartbeat)
+        self.thread.start()
+        atexit.register(self.stop)
+
+    def heartbeat(self) -> None:
+        """
+        Record that the event loop is responsive and schedule the next heartbeat.
+        """
+        self.last_heartbeat = time.monotonic()
+        self.after_id = self.root.after(StallWatchdog.HEARTBEAT_MS, self.heartbeat)
+
+    def run(self) -> None:
+        """
+        Check the heartbeat until the watchdog is stopped. Runs on the watchdog thread.
+        """
+        while not self.stop_event.wait(self.threshold / 4):
+            self.check()
+
+    def check(self) -> None:
+        """
+        Detect the start and the end of a stall and sample the main thread stack while it lasts.
+        """
+        last_heartbeat = self.last_heartbeat
+        expected_heartbeat = last_heartbeat + self.heartbeat_interval
+        if self.stall_start is None:
+            if time.monotonic() - expected_heartbeat > self.threshold:
+                self.stall_start = expected_heartbeat
+                self.samples = [self.capture_main_stack()]
+        elif last_heartbeat >= self.stall_start:
+            self.log_stall(last_heartbeat - self.stall_start, self.samples)
+            self.stall_start = None
+            self.samples = []
+        else:
+            self.samples.append(self.capture_main_stack())
+
+    def capture_main_stack(self) -> List[str]:
+        """
+        Capture the Python stack of the main thread.
+
+        :return: The innermost frames as "file:line (function)", outermost first.
+        """
+        frame = sys._current_frames().get(self.main_thread_id or 0)
+        if frame is None:
+            return []
+        return [f"{os.path.basename(summary.filename)}:{summary.lineno} ({summary.name})"
+                for summary in traceback.extract_stack(frame, limit=StallWatchdog.STACK_DEPTH)]
+
+    def log_stall(self, duration: float, samples: List[List[str]]) -> None:
+        """
+        Log a finished stall.
+
+        :param duration: How long the event loop was blocked, in seconds.
+        :param samples: The main thread stacks sampled during the stall.
+        """
+        locations = Counter(stack[-1] for stack in samples if stack)
+        location = locations.most_common(1)[0][0] if locations else None
+        stack = next((stack for stack in samples if stack and stack[-1] == location), [])
+        record: Dict[str, Any] = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'duration_ms': round(duration * 1000),
+            'location': location,
+            'samples': len(samples),
+            'stack': stack,
+        }
+        if self.log_path:
+            with open(self.log_path, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+        else:
+            print(f"UI stalled for {record['duration_ms']} ms at {location}", file=sys.stderr)
+
+    def stop(self) -> None:
+        """
+        Stop the watchdog thread and the heartbeat.
+        """
+        atexit.unregister(self.stop)
+        self.stop_event.set()
+        if self.thread.is_alive():
+            self.thread.join()
+        if self.after_id is not None:
+            try:
+                self.root.after_cancel(self.after_id)
+            except tk.TclError:
+                pass  # The application window is already gone
+            self.after_id = None
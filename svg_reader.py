@@ -0,0 +1,549 @@
+import math
+import re
+import xml.etree.ElementTree as ElementTree
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+class SvgReader:
+    """
+    A class that reads the elements of an SVG file as board object states.
+
+    The file is read with iterparse, and every element is dropped as soon as it has been turned into object
+    states, so that the memory used does not grow with the size of the file. Curves and arcs of paths are
+    flattened into points, with a number of points that follows the curvature so that the flattened curve
+    stays within the tolerance, and transforms are applied to all points of an element at once. Style sheets
+    are read in a first pass, since they may come after the elements that use them.
+    """
+
+    DEFAULT_TOLERANCE = 0.25
+    MAX_CURVE_SEGMENTS = 256
+    COORDINATE_DECIMALS = 2
+    DEFAULT_FONT_SIZE = 16
+    FALLBACK_FONT_NAME = "Arial"
+    SHAPE_TAGS = ["path", "rect", "circle", "ellipse", "line", "polyline", "polygon"]
+    SKIPPED_TAGS = ["defs", "symbol", "clipPath", "mask", "pattern", "marker", "metadata", "title", "desc", "style"]
+    INHERITED_PROPERTIES = ["fill", "stroke", "stroke-width", "font-family", "font-size"]
+    DEFAULT_STYLE = {'fill': "black", 'stroke': "none", 'stroke-width': "1", 'font-family': FALLBACK_FONT_NAME,
+                     'font-size': str(DEFAULT_FONT_SIZE)}
+
+    _NUMBER = re.compile(r"\s*,?\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)")
+    _FLAG = re.compile(r"\s*,?\s*([01])")
+    _COMMAND = re.compile(r"\s*([MmLlHhVvCcSsQqTtAaZz])")
+    _TRANSFORM = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+    _CSS_RULE = re.compile(r"([^{}]+)\{([^}]*)\}")
+
+    def __init__(self, tolerance: float = DEFAULT_TOLERANCE) -> None:
+        """
+        Initialize the SvgReader.
+
+        :param tolerance: The largest distance in board units between a flattened curve and the true curve.
+        """
+        self.tolerance = tolerance
+        self.class_styles: Dict[str, Dict[str, str]] = {}
+
+    def read_objects(self, filename: str) -> Iterator[Dict[str, Any]]:
+        """
+        Read the board object states of an SVG file, one element at a time.
+
+        :param filename: The name of the SVG file.
+        :return: The object states, bottom-most first.
+        :raises ElementTree.ParseError: If the file is malformed, once the elements before the error have been read.
+        """
+        self.class_styles = self._read_class_styles(filename)
+        elements: List[ElementTree.Element] = []
+        transforms: List[np.ndarray] = [np.eye(3)]
+        styles: List[Dict[str, str]] = [dict(SvgReader.DEFAULT_STYLE)]
+        skipped_depth = 0
+        text_depth = 0
+        for event, element in ElementTree.iterparse(filename, events=("start", "end")):
+            tag = SvgReader._local_name(element.tag)
+            if event == "start":
+                elements.append(element)
+                if skipped_depth or tag in SvgReader.SKIPPED_TAGS or element.get('display') == "none":
+                    skipped_depth += 1
+                text_depth += tag == "text"
+                transforms.append(transforms[-1] @ SvgReader._parse_transform(element.get('transform', "")))
+                styles.append(self._get_style(element, styles[-1]))
+                continue
+
+            if not skipped_depth:
+                if tag in SvgReader.SHAPE_TAGS:
+                    yield from self._read_shape(tag, element, transforms[-1], styles[-1])
+                elif tag == "text":
+                    text_state = self._read_text(element, transforms[-1], styles[-1])
+                    if text_state is not None:
+                        yield text_state
+            skipped_depth = max(0, skipped_depth - 1) if skipped_depth else 0
+            text_depth -= tag == "text"
+            elements.pop()
+            transforms.pop()
+            styles.pop()
+            if not text_depth:
+                # The text of a text element is read from its children when the element ends
+                element.clear()
+                if elements:
+                    elements[-1].remove(element)
+
+    def _read_class_styles(self, filename: str) -> Dict[str, Dict[str, str]]:
+        """
+        Read the rules of the style sheets of an SVG file that style elements by class.
+
+        :param filename: The name of the SVG file.
+        :return: The style properties of every class.
+        """
+        class_styles: Dict[str, Dict[str, str]] = {}
+        try:
+            for _, element in ElementTree.iterparse(filename, events=("end",)):
+                if SvgReader._local_name(element.tag) == "style" and element.text:
+                    for selectors, declarations in SvgReader._CSS_RULE.findall(element.text):
+                        properties = SvgReader._parse_declarations(declarations)
+                        for selector in selectors.split(","):
+                            selector = selector.strip()
+                            if selector.startswith(".") and selector[1:].isidentifier():
+                                class_styles.setdefault(selector[1:], {}).update(properties)
+                element.clear()
+        except ElementTree.ParseError:
+            # Malformed files are reported by the second pass, once the elements before the error have been read
+            pass
+        return class_styles
+
+    def _get_style(self, element: ElementTree.Element, parent_style: Dict[str, str]) -> Dict[str, str]:
+        """
+        Get the inherited style properties of an element.
+
+        :param element: The element.
+        :param parent_style: The style properties of its parent.
+        :return: The style properties of the element.
+        """
+        style = dict(parent_style)
+        for name in element.get('class', "").split():
+            style.update(self.class_styles.get(name, {}))
+        style.update({name: element.get(name, "") for name in SvgReader.INHERITED_PROPERTIES if element.get(name)})
+        style.update(SvgReader._parse_declarations(element.get('style', "")))
+        return style
+
+    def _read_shape(self, tag: str, element: ElementTree.Element, transform: np.ndarray,
+                    style: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+        """
+        Read the object states of a shape element.
+
+        :param tag: The element name, without its namespace.
+        :param element: The element.
+        :param transform: The transform from the element's coordinates to board coordinates.
+        :param style: The style properties of the element.
+        :return: The object states.
+        """
+        fill = SvgReader._color(style['fill'])
+        stroke = SvgReader._color(style['stroke'])
+        scale = SvgReader._scale(transform)
+        width = round(SvgReader._float(style['stroke-width'], 1.0) * scale, SvgReader.COORDINATE_DECIMALS)
+        axis_aligned = transform[0, 1] == 0 and transform[1, 0] == 0
+
+        if tag in ("rect", "circle", "ellipse"):
+            if tag == "rect":
+                x, y = SvgReader._float(element.get('x')), SvgReader._float(element.get('y'))
+                corners = np.array([[x, y], [x + SvgReader._float(element.get('width')),
+                                             y + SvgReader._float(element.get('height'))]])
+            else:
+                cx, cy = SvgReader._float(element.get('cx')), SvgReader._float(element.get('cy'))
+                rx = SvgReader._float(element.get('r' if tag == "circle" else 'rx'))
+                ry = SvgReader._float(element.get('r' if tag == "circle" else 'ry'))
+                corners = np.array([[cx - rx, cy - ry], [cx + rx, cy + ry]])
+            if np.any(corners[1] - corners[0] <= 0) or (not fill and not stroke):
+                return
+            if axis_aligned:
+                box = SvgReader._apply(corners, transform)
+                coords = np.concatenate((box.min(axis=0), box.max(axis=0))).tolist()
+                yield {'type': "rectangle" if tag == "rect" else "oval", 'coords': coords, 'fill': fill,
+                       'outline': stroke, 'width': width}
+                return
+            if tag == "rect":
+                (x1, y1), (x2, y2) = corners
+                points = np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]])
+            else:
+                points = self._ellipse_points(corners, scale)
+            yield {'type': "polygon", 'coords': SvgReader._apply(points, transform).ravel().tolist(), 'fill': fill,
+                   'outline': stroke, 'width': width}
+            return
+
+        if tag == "line":
+            subpaths = [(np.array([[SvgReader._float(element.get('x1')), SvgReader._float(element.get('y1'))],
+                                   [SvgReader._float(element.get('x2')), SvgReader._float(element.get('y2'))]]),
+                         False)]
+            fill = ""
+        elif tag in ("polyline", "polygon"):
+            numbers = [float(number) for number in SvgReader._NUMBER.findall(element.get('points', ""))]
+            subpaths = [(np.array(numbers[:len(numbers) // 2 * 2]).reshape(-1, 2), tag == "polygon")]
+        else:
+            subpaths = self._flatten_path(element.get('d', ""), scale)
+
+        for points, closed in subpaths:
+            if len(points) < 2:
+                continue
+            coords = SvgReader._apply(points, transform).ravel().tolist()
+            if fill and len(points) >= 3:
+                yield {'type': "polygon", 'coords': coords, 'fill': fill, 'outline': stroke, 'width': width}
+            elif stroke:
+                if closed:
+                    coords += coords[:2]
+                yield {'type': "line", 'coords': coords, 'fill': stroke, 'width': width}
+
+    def _read_text(self, element: ElementTree.Element, transform: np.ndarray,
+                   style: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Read the object state of a text element.
+
+        :param element: The element.
+        :param transform: The transform from the element's coordinates to board coordinates.
+        :param style: The style properties of the element.
+        :return: The object state, or None if the element has no text.
+        """
+        text = "".join(element.itertext()).strip()
+        fill = SvgReader._color(style['fill'])
+        if not text or not fill:
+            return None
+        point = np.array([[SvgReader._float(element.get('x', "").split(",")[0].split()[0]
+                                            if element.get('x', "").strip() else None),
+                           SvgReader._float(element.get('y', "").split(",")[0].split()[0]
+                                            if element.get('y', "").strip() else None)]])
+        font_name = style['font-family'].split(",")[0].strip().strip("'\"").replace(" ", "")
+        font_size = SvgReader._float(re.sub(r"[a-z%]+$", "", style['font-size'].strip()),
+                                     SvgReader.DEFAULT_FONT_SIZE)
+        font_size = max(1, round(font_size * SvgReader._scale(transform)))
+        return {'type': "text", 'coords': SvgReader._apply(point, transform).ravel().tolist(), 'fill': fill,
+                'width': "0", 'font': f"{font_name or SvgReader.FALLBACK_FONT_NAME} {font_size}", 'text': text}
+
+    def _flatten_path(self, path_data: str, scale: float) -> List[Tuple[np.ndarray, bool]]:
+        """
+        Flatten the path data of a path element into lists of points.
+
+        :param path_data: The path data.
+        :param scale: The scale of the transform of the element, used to keep the tolerance in board units.
+        :return: The points of every subpath, and whether the subpath is closed.
+        """
+        tolerance = self.tolerance / scale
+        subpaths: List[Tuple[np.ndarray, bool]] = []
+        points: List[np.ndarray] = []
+        current = start = np.zeros(2)
+        last_control: Optional[np.ndarray] = None
+        last_command = ""
+
+        def finish(closed: bool) -> None:
+            if len(points) > 1:
+                subpaths.append((np.vstack(points), closed))
+            points.clear()
+
+        position = 0
+        command = ""
+        while True:
+            match = SvgReader._COMMAND.match(path_data, position)
+            if match:
+                command = match.group(1)
+                position = match.end()
+            elif not command or command in "Zz" or not SvgReader._NUMBER.match(path_data, position):
+                break
+            elif command == "M":
+                command = "L"
+            elif command == "m":
+                command = "l"
+            relative = command.islower()
+            origin = current if relative else np.zeros(2)
+            upper = command.upper()
+            try:
+                if upper == "Z":
+                    finish(True)
+                    current = start
+                elif upper == "M":
+                    finish(False)
+                    position, (x, y) = SvgReader._read_numbers(path_data, position, 2)
+                    current = start = origin + (x, y)
+                    points.append(current[None, :])
+                elif upper in "LHV":
+                    if upper == "L":
+                        position, (x, y) = SvgReader._read_numbers(path_data, position, 2)
+                        target = origin + (x, y)
+                    elif upper == "H":
+                        position, (x,) = SvgReader._read_numbers(path_data, position, 1)
+                        target = np.array([origin[0] + x, current[1]])
+                    else:
+                        position, (y,) = SvgReader._read_numbers(path_data, position, 1)
+                        target = np.array([current[0], origin[1] + y])
+                    if not points:
+                        points.append(current[None, :])
+                    points.append(target[None, :])
+                    current = target
+                elif upper in "CSQT":
+                    if upper in "CQ":
+                        count = 6 if upper == "C" else 4
+                        position, numbers = SvgReader._read_numbers(path_data, position, count)
+                        controls = origin + np.array(numbers).reshape(-1, 2)
+                    else:
+                        count = 4 if upper == "S" else 2
+                        position, numbers = SvgReader._read_numbers(path_data, position, count)
+                        reflected = (2 * current - last_control if last_control is not None
+                                     and last_command.upper() in ("CS" if upper == "S" else "QT") else current)
+                        controls = np.vstack((reflected, origin + np.array(numbers).reshape(-1, 2)))
+                    bezier = np.vstack((current, controls))
+                    if not points:
+                        points.append(current[None, :])
+                    points.append(self._flatten_bezier(bezier, tolerance))
+                    last_control = bezier[-2]
+                    current = bezier[-1]
+                elif upper == "A":
+                    position, (rx, ry, angle) = SvgReader._read_numbers(path_data, position, 3)
+                    position, large_arc = SvgReader._read_flag(path_data, position)
+                    position, sweep = SvgReader._read_flag(path_data, position)
+                    position, (x, y) = SvgReader._read_numbers(path_data, position, 2)
+                    target = origin + (x, y)
+                    if not points:
+                        points.append(current[None, :])
+                    points.append(self._arc_points(current, target, rx, ry, angle, large_arc, sweep, tolerance))
+                    current = target
+            except ValueError:
+                break
+            if upper not in "CSQT":
+                last_control = None
+            last_command = command
+        finish(False)
+        return subpaths
+
+    def _flatten_bezier(self, bezier: np.ndarray, tolerance: float) -> np.ndarray:
+        """
+        Flatten a quadratic or cubic Bézier curve. The number of points follows from the largest second
+        difference of the control points (Wang's formula), so that the flattened curve stays within tolerance.
+
+        :param bezier: The start point followed by the control points and the end point.
+        :param tolerance: The tolerance in the coordinates of the curve.
+        :return: The points of the curve, without the start point.
+        """
+        degree = len(bezier) - 1
+        second_differences = bezier[2:] - 2 * bezier[1:-1] + bezier[:-2]
+        curvature = float(np.linalg.norm(second_differences, axis=1).max())
+        segments = math.ceil(math.sqrt(degree * (degree - 1) / 8 * curvature / tolerance)) if curvature else 1
+        t = np.linspace(0, 1, min(max(segments, 1), SvgReader.MAX_CURVE_SEGMENTS) + 1)[1:, None]
+        if degree == 2:
+            return (1 - t) ** 2 * bezier[0] + 2 * (1 - t) * t * bezier[1] + t ** 2 * bezier[2]
+        return ((1 - t) ** 3 * bezier[0] + 3 * (1 - t) ** 2 * t * bezier[1] + 3 * (1 - t) * t ** 2 * bezier[2]
+                + t ** 3 * bezier[3])
+
+    def _arc_points(self, start: np.ndarray, end: np.ndarray, rx: float, ry: float, angle: float,
+                    large_arc: bool, sweep: bool, tolerance: float) -> np.ndarray:
+        """
+        Flatten an elliptical arc given by its end points, as in the SVG path data.
+
+        :param start: The start point.
+        :param end: The end point.
+        :param rx: The x-radius.
+        :param ry: The y-radius.
+        :param angle: The rotation of the ellipse in degrees.
+        :param large_arc: True for the larger of the two possible arcs.
+        :param sweep: True for the arc drawn in the positive angle direction.
+        :param tolerance: The tolerance in the coordinates of the arc.
+        :return: The points of the arc, without the start point.
+        """
+        rx, ry = abs(rx), abs(ry)
+        if rx == 0 or ry == 0 or np.array_equal(start, end):
+            return end[None, :]
+        phi = math.radians(angle)
+        cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+        dx, dy = (start - end) / 2
+        x1 = cos_phi * dx + sin_phi * dy
+        y1 = -sin_phi * dx + cos_phi * dy
+        radii_scale = x1 ** 2 / rx ** 2 + y1 ** 2 / ry ** 2
+        if radii_scale > 1:
+            rx, ry = rx * math.sqrt(radii_scale), ry * math.sqrt(radii_scale)
+        numerator = rx ** 2 * ry ** 2 - rx ** 2 * y1 ** 2 - ry ** 2 * x1 ** 2
+        denominator = rx ** 2 * y1 ** 2 + ry ** 2 * x1 ** 2
+        factor = math.sqrt(max(0.0, numerator / denominator)) * (-1 if large_arc == sweep else 1)
+        center_x1, center_y1 = factor * rx * y1 / ry, -factor * ry * x1 / rx
+        center = np.array([cos_phi * center_x1 - sin_phi * center_y1,
+                           sin_phi * center_x1 + cos_phi * center_y1]) + (start + end) / 2
+        start_angle = math.atan2((y1 - center_y1) / ry, (x1 - center_x1) / rx)
+        sweep_angle = math.atan2((-y1 - center_y1) / ry, (-x1 - center_x1) / rx) - start_angle
+        if not sweep and sweep_angle > 0:
+            sweep_angle -= 2 * math.pi
+        elif sweep and sweep_angle < 0:
+            sweep_angle += 2 * math.pi
+        t = start_angle + sweep_angle * np.linspace(0, 1, self._arc_segments(max(rx, ry), sweep_angle,
+                                                                             tolerance) + 1)[1:]
+        points = np.column_stack((center[0] + rx * np.cos(t) * cos_phi - ry * np.sin(t) * sin_phi,
+                                  center[1] + rx * np.cos(t) * sin_phi + ry * np.sin(t) * cos_phi))
+        points[-1] = end
+        return points
+
+    def _ellipse_points(self, corners: np.ndarray, scale: float) -> np.ndarray:
+        """
+        Flatten a whole ellipse.
+
+        :param corners: The corners of the bounding box of the ellipse.
+        :param scale: The scale of the transform of the element, used to keep the tolerance in board units.
+        :return: The points of the ellipse.
+        """
+        center = corners.mean(axis=0)
+        rx, ry = (corners[1] - corners[0]) / 2
+        segments = self._arc_segments(max(rx, ry), 2 * math.pi, self.tolerance / scale)
+        t = np.linspace(0, 2 * math.pi, segments, endpoint=False)
+        return np.column_stack((center[0] + rx * np.cos(t), center[1] + ry * np.sin(t)))
+
+    @staticmethod
+    def _arc_segments(radius: float, sweep_angle: float, tolerance: float) -> int:
+        """
+        Get the number of segments that keep a flattened circular arc within tolerance.
+
+        :param radius: The radius of the arc.
+        :param sweep_angle: The angle of the arc in radians.
+        :param tolerance: The tolerance.
+        :return: The number of segments.
+        """
+        if radius <= tolerance:
+            return 4
+        step = 2 * math.acos(1 - tolerance / radius)
+        return min(max(math.ceil(abs(sweep_angle) / step), 4), SvgReader.MAX_CURVE_SEGMENTS)
+
+    @staticmethod
+    def _read_numbers(path_data: str, position: int, count: int) -> Tuple[int, List[float]]:
+        """
+        Read numbers from path data.
+
+        :param path_data: The path data.
+        :param position: The position to read from.
+        :param count: The number of numbers to read.
+        :return: The position after the numbers, and the numbers.
+        :raises ValueError: If the path data does not have enough numbers at the position.
+        """
+        numbers = []
+        for _ in range(count):
+            match = SvgReader._NUMBER.match(path_data, position)
+            if not match:
+                raise ValueError(f"Expected a number at position {position} of the path data")
+            numbers.append(float(match.group(1)))
+            position = match.end()
+        return position, numbers
+
+    @staticmethod
+    def _read_flag(path_data: str, position: int) -> Tuple[int, bool]:
+        """
+        Read an arc flag from path data. Flags may be written without a separator, as in "a1 1 0 01 5 5".
+
+        :param path_data: The path data.
+        :param position: The position to read from.
+        :return: The position after the flag, and the flag.
+        :raises ValueError: If the path data does not have a flag at the position.
+        """
+        match = SvgReader._FLAG.match(path_data, position)
+        if not match:
+            raise ValueError(f"Expected a flag at position {position} of the path data")
+        return match.end(), match.group(1) == "1"
+
+    @staticmethod
+    def _parse_transform(transform: str) -> np.ndarray:
+        """
+        Parse the transform attribute of an element.
+
+        :param transform: The transform attribute.
+        :return: The 3x3 affine transform matrix.
+        """
+        matrix = np.eye(3)
+        for name, arguments in SvgReader._TRANSFORM.findall(transform):
+            values = [float(value) for value in SvgReader._NUMBER.findall(arguments)]
+            step = np.eye(3)
+            if name == "matrix" and len(values) == 6:
+                step[:2] = np.array(values).reshape(3, 2).T
+            elif name == "translate" and values:
+                step[:2, 2] = values[0], values[1] if len(values) > 1 else 0
+            elif name == "scale" and values:
+                step[0, 0], step[1, 1] = values[0], values[1] if len(values) > 1 else values[0]
+            elif name == "rotate" and values:
+                angle = math.radians(values[0])
+                cx, cy = (values[1], values[2]) if len(values) == 3 else (0, 0)
+                rotation = np.array([[math.cos(angle), -math.sin(angle), 0],
+                                     [math.sin(angle), math.cos(angle), 0], [0, 0, 1]])
+                step = np.array([[1, 0, cx], [0, 1, cy], [0, 0, 1]]) @ rotation @ \
+                    np.array([[1, 0, -cx], [0, 1, -cy], [0, 0, 1]])
+            elif name == "skewX" and values:
+                step[0, 1] = math.tan(math.radians(values[0]))
+            elif name == "skewY" and values:
+                step[1, 0] = math.tan(math.radians(values[0]))
+            matrix = matrix @ step
+        return matrix
+
+    @staticmethod
+    def _parse_declarations(declarations: str) -> Dict[str, str]:
+        """
+        Parse CSS declarations, keeping the inherited properties that board objects use.
+
+        :param declarations: The declarations, as in a style attribute.
+        :return: The properties.
+        """
+        properties = {}
+        for declaration in declarations.split(";"):
+            name, _, value = declaration.partition(":")
+            if name.strip() in SvgReader.INHERITED_PROPERTIES and value.strip():
+                properties[name.strip()] = value.strip()
+        return properties
+
+    @staticmethod
+    def _apply(points: np.ndarray, transform: np.ndarray) -> np.ndarray:
+        """
+        Apply an affine transform to points and round them.
+
+        :param points: The points, one per row.
+        :param transform: The 3x3 affine transform matrix.
+        :return: The transformed points.
+        """
+        return (points @ transform[:2, :2].T + transform[:2, 2]).round(SvgReader.COORDINATE_DECIMALS)
+
+    @staticmethod
+    def _scale(transform: np.ndarray) -> float:
+        """
+        Get the largest scale factor of an affine transform.
+
+        :param transform: The 3x3 affine transform matrix.
+        :return: The scale factor, or 1 if the transform collapses everything.
+        """
+        scale = float(np.linalg.norm(transform[:2, :2], 2))
+        return scale if scale > 0 else 1.0
+
+    @staticmethod
+    def _color(color: str) -> str:
+        """
+        Convert an SVG paint to a Tk color, mapping no paint to the empty color.
+
+        :param color: The SVG paint.
+        :return: The Tk color.
+        """
+        color = color.strip()
+        if color in ("none", "transparent") or color.startswith("url("):
+            return ""
+        if color == "currentColor":
+            return "black"
+        match = re.fullmatch(r"rgb\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)", color)
+        if match:
+            return "#" + "".join(f"{min(int(value), 255):02x}" for value in match.groups())
+        return color
+
+    @staticmethod
+    def _float(value: Optional[str], default: float = 0.0) -> float:
+        """
+        Read a length, ignoring its unit.
+
+        :param value: The attribute value.
+        :param default: The value used if the attribute is missing or cannot be read.
+        :return: The length.
+        """
+        if value is None:
+            return default
+        match = SvgReader._NUMBER.match(value)
+        return float(match.group(1)) if match else default
+
+    @staticmethod
+    def _local_name(tag: str) -> str:
+        """
+        Get the name of an element without its namespace.
+
+        :param tag: The element tag.
+        :return: The local name.
+        """
+        return tag.rsplit("}", 1)[-1]
@@ -0,0 +1,170 @@
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from clipboard import Clipboard
+from symbol_handler import SymbolHandler
+
+
+class SvgWriter:
+    """
+    A class that streams board objects to an SVG file from their saved state, including symbol instances.
+
+    Every object is written as one element as soon as it is given, so only the style table is kept in memory.
+    Objects with the same style share a CSS class, and the style sheet is written at the end of the document,
+    once all styles are known.
+    """
+
+    DEFAULT_PRECISION = 2
+    FALLBACK_FONT_NAME = "Arial"
+    CLASS_PREFIX = "s"
+
+    def __init__(self, file: TextIO, origin_x: float, origin_y: float, width: float, height: float,
+                 precision: int = DEFAULT_PRECISION, symbols: Optional[Dict[str, Clipboard]] = None) -> None:
+        """
+        Initialize the SvgWriter and write the start of the document.
+
+        :param file: The text file to write to.
+        :param origin_x: The board x-coordinate of the left edge of the document.
+        :param origin_y: The board y-coordinate of the top edge of the document.
+        :param width: The width of the document in board units.
+        :param height: The height of the document in board units.
+        :param precision: The number of decimals written for coordinates.
+        :param symbols: The packed symbol definitions used by instance states, if any.
+        """
+        self.file = file
+        self.precision = precision
+        self.symbols = symbols if symbols is not None else {}
+        self.styles: Dict[Tuple[str, ...], str] = {}
+        self.file.write(f'<svg xmlns="http://www.w3.org/2000/svg" '
+                        f'viewBox="{self._number(origin_x)} {self._number(origin_y)} '
+                        f'{self._number(width)} {self._number(height)}" '
+                        f'width="{self._number(width)}" height="{self._number(height)}">\n')
+
+    def write_objects(self, objects_state: List[Dict[str, Any]]) -> None:
+        """
+        Write several objects in the given order.
+
+        :param objects_state: The states of the objects to write, bottom-most first.
+        """
+        for obj_state in objects_state:
+            self.write_object(obj_state)
+
+    def write_object(self, obj_state: Dict[str, Any]) -> None:
+        """
+        Write a single object.
+
+        :param obj_state: The state of the object, as stored in the board file.
+        """
+        item_type = obj_state['type']
+        if item_type == SymbolHandler.INSTANCE_TYPE:
+            if obj_state['symbol'] in self.symbols:
+                self.write_objects(SymbolHandler.expand_instance(obj_state, self.symbols[obj_state['symbol']]))
+            return
+        coords = obj_state['coords']
+        fill = self._paint(obj_state.get('fill'))
+        outline = self._paint(obj_state.get('outline'))
+        width = self._number(self._width(obj_state.get('width')))
+
+        if item_type == "rectangle" and len(coords) >= 4:
+            x1, y1, x2, y2 = coords[:4]
+            style = self._get_class(f"fill:{fill}", f"stroke:{outline}", f"stroke-width:{width}")
+            self.file.write(f'<rect class="{style}" x="{self._number(min(x1, x2))}" y="{self._number(min(y1, y2))}" '
+                            f'width="{self._number(abs(x2 - x1))}" height="{self._number(abs(y2 - y1))}"/>\n')
+        elif item_type == "oval" and len(coords) >= 4:
+            x1, y1, x2, y2 = coords[:4]
+            style = self._get_class(f"fill:{fill}", f"stroke:{outline}", f"stroke-width:{width}")
+            self.file.write(f'<ellipse class="{style}" cx="{self._number((x1 + x2) / 2)}" '
+                            f'cy="{self._number((y1 + y2) / 2)}" rx="{self._number(abs(x2 - x1) / 2)}" '
+                            f'ry="{self._number(abs(y2 - y1) / 2)}"/>\n')
+        elif item_type == "polygon" and len(coords) >= 6:
+            style = self._get_class(f"fill:{fill}", f"stroke:{outline}", f"stroke-width:{width}")
+            self.file.write(f'<polygon class="{style}" points="{self._points(coords)}"/>\n')
+        elif item_type == "line" and len(coords) >= 4:
+            style = self._get_class("fill:none", f"stroke:{fill}", f"stroke-width:{width}",
+                                    "stroke-linejoin:round")
+            self.file.write(f'<path class="{style}" d="M{self._points(coords[:2])}L{self._points(coords[2:])}"/>\n')
+        elif item_type == "text" and len(coords) >= 2 and obj_state.get('text'):
+            self._write_text(obj_state, coords, fill)
+
+    def close(self) -> None:
+        """
+        Write the style sheet and the end of the document. The file itself is left open.
+        """
+        self.file.write("<style>\n")
+        for declarations, style in self.styles.items():
+            self.file.write(f".{style}{{{escape(';'.join(declarations))}}}\n")
+        self.file.write("</style>\n</svg>\n")
+
+    def _write_text(self, obj_state: Dict[str, Any], coords: List[float], fill: str) -> None:
+        """
+        Write a text object centered on its anchor point.
+
+        :param obj_state: The state of the text object.
+        :param coords: The board coordinates of the text anchor.
+        :param fill: The text color.
+        """
+        font_parts = obj_state.get('font', "").split()
+        font_name = " ".join(font_parts[:-1]) or SvgWriter.FALLBACK_FONT_NAME
+        font_size = font_parts[-1] if font_parts else "1"
+        style = self._get_class(f"fill:{fill}", f"font-family:{quoteattr(font_name)}", f"font-size:{font_size}px",
+                                "text-anchor:middle", "dominant-baseline:central", "white-space:pre")
+        self.file.write(f'<text class="{style}" x="{self._number(coords[0])}" y="{self._number(coords[1])}">'
+                        f'{escape(obj_state["text"])}</text>\n')
+
+    def _get_class(self, *declarations: str) -> str:
+        """
+        Get the CSS class of a style, adding it to the style table if it is new.
+
+        :param declarations: The CSS declarations of the style.
+        :return: The class name.
+        """
+        style = self.styles.get(declarations)
+        if style is None:
+            style = f"{SvgWriter.CLASS_PREFIX}{len(self.styles)}"
+            self.styles[declarations] = style
+        return style
+
+    def _points(self, coords: List[float]) -> str:
+        """
+        Format a flat list of coordinates as SVG points.
+
+        :param coords: The flat list of coordinates.
+        :return: The points, separated by spaces.
+        """
+        return " ".join(f"{self._number(coords[i])},{self._number(coords[i + 1])}"
+                        for i in range(0, len(coords) - 1, 2))
+
+    def _number(self, value: float) -> str:
+        """
+        Format a number with the configured precision, without trailing zeros.
+
+        :param value: The number.
+        :return: The formatted number.
+        """
+        text = f"{value:.{self.precision}f}"
+        if "." in text:
+            text = text.rstrip("0").rstrip(".")
+        return "0" if text == "-0" else text
+
+    @staticmethod
+    def _width(width: Any) -> float:
+        """
+        Convert a stored width to a number.
+
+        :param width: The stored width (string or number).
+        :return: The width, or 1 if it cannot be read.
+        """
+        try:
+            return float(width)
+        except (TypeError, ValueError):
+            return 1.0
+
+    @staticmethod
+    def _paint(color: Optional[str]) -> str:
+        """
+        Convert a Tk color to an SVG paint, mapping the empty color to no paint.
+
+        :param color: The Tk color.
+        :return: The SVG paint.
+        """
+        return color or "none"
@@ -0,0 +1,206 @@
+from typing import Any, Dict, Iterable, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from clipboard import Clipboard
+
+if TYPE_CHECKING:
+    from board import Board
+
+
+class SymbolHandler:
+    """
+    A class that keeps the symbol definitions of the board and recognizes their instances.
+
+    A symbol definition is a set of objects stored once, centered on the origin. On the canvas, an instance
+    is a group whose members carry the tag of their symbol. In the board file, an instance is a single entry
+    holding the symbol and the affine transform from the definition to the instance. The transform is found
+    again when the board is saved, so instances can be moved, scaled or rotated freely; an instance whose
+    objects no longer match its definition, for example after a restyle, is saved as plain objects.
+    """
+
+    SYMBOL_TAG_PREFIX = "symbol:"
+    INSTANCE_TYPE = "instance"
+    POSITION_TOLERANCE = 0.01
+    TRANSFORM_DECIMALS = 6
+
+    def __init__(self, board: 'Board') -> None:
+        """
+        Initialize the SymbolHandler.
+
+        :param board: The board instance.
+        """
+        self.board = board
+        self.canvas = board.canvas
+        self.symbols: Dict[str, Clipboard] = {}
+        self.next_symbol: int = 0
+
+    @staticmethod
+    def is_symbol_tag(tag: str) -> bool:
+        """
+        Check if a canvas tag is a symbol tag.
+
+        :param tag: The tag.
+        :return: True if the tag names a symbol, False otherwise.
+        """
+        return tag.startswith(SymbolHandler.SYMBOL_TAG_PREFIX)
+
+    def get_symbol(self, obj: int) -> Optional[str]:
+        """
+        Get the symbol an object was instantiated from.
+
+        :param obj: The object ID.
+        :return: The symbol tag, or None if the object is not part of an instance.
+        """
+        return next((tag for tag in self.canvas.gettags(obj) if SymbolHandler.is_symbol_tag(tag)), None)
+
+    def create_symbol(self, objects_state: List[Dict[str, Any]]) -> str:
+        """
+        Define a new symbol from the states of its objects.
+
+        :param objects_state: The states of the objects, bottom-most first.
+        :return: The symbol tag.
+        """
+        objects = Clipboard.from_states([dict(SymbolHandler._get_definition_style(obj_state),
+                                              coords=obj_state['coords']) for obj_state in objects_state])
+        symbol = f"{SymbolHandler.SYMBOL_TAG_PREFIX}{self.next_symbol}"
+        self.next_symbol += 1
+        self.symbols[symbol] = Clipboard.from_states([dict(style, coords=coords)
+                                                      for style, coords, _ in objects.get_objects_at(0, 0)])
+        self.board.file_handler.journal.require_snapshot()
+        return symbol
+
+    def add_symbols(self, definitions: Dict[str, List[Dict[str, Any]]]) -> None:
+        """
+        Add the symbol definitions read from a board file.
+
+        :param definitions: The object states of every symbol, centered on the origin.
+        """
+        self.symbols.update({symbol: Clipboard.from_states(objects_state)
+                             for symbol, objects_state in definitions.items()})
+        for symbol in definitions:
+            self.next_symbol = max(self.next_symbol, int(symbol[len(SymbolHandler.SYMBOL_TAG_PREFIX):]) + 1)
+
+    def get_definitions(self, symbols: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get symbol definitions in the form they are stored in the board file.
+
+        :param symbols: The symbol tags.
+        :return: The object states of every symbol, centered on the origin.
+        """
+        return {symbol: [dict(style, coords=coords)
+                         for style, coords, _ in self.symbols[symbol].get_transformed_objects(np.eye(2, 3))]
+                for symbol in sorted(symbols)}
+
+    def find_instance(self, obj_state: Dict[str, Any]) -> List[int]:
+        """
+        Find the members of the instance an object belongs to.
+
+        :param obj_state: The state of the object.
+        :return: The IDs of the members, bottom-most first, or an empty list if the object is not part of a
+                 complete instance of a known symbol.
+        """
+        symbol = obj_state.get('symbol')
+        groups = obj_state.get('groups')
+        if not symbol or not groups or symbol not in self.symbols:
+            return []
+        instance_group = groups[-1]
+        members = self.canvas.find_withtag(instance_group)
+        if (len(members) != len(self.symbols[symbol])
+                or len(self.canvas.find_withtag(f"{instance_group}&&{symbol}")) != len(members)):
+            return []
+        return list(members)
+
+    def get_instance_state(self, members_state: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Get the board file entry of an instance, if its objects still match the symbol definition.
+
+        :param members_state: The states of the members, bottom-most first.
+        :return: The instance state without its z-index, or None if the objects do not match the definition.
+        """
+        definition = self.symbols.get(members_state[0].get('symbol', ""))
+        if definition is None or len(definition) != len(members_state):
+            return None
+        if any(obj_state.get('layer') != members_state[0].get('layer') for obj_state in members_state):
+            return None
+        offsets = definition.offsets.tolist()
+        for i, obj_state in enumerate(members_state):
+            style = definition.styles[definition.style_indices[i]]
+            if (len(obj_state['coords']) != offsets[i + 1] - offsets[i]
+                    or SymbolHandler._get_definition_style(obj_state) != style):
+                return None
+
+        points = np.array([coord for obj_state in members_state for coord in obj_state['coords']],
+                          dtype=float).reshape(-1, 2)
+        local_points = np.column_stack((definition.coords.reshape(-1, 2), np.ones(len(points))))
+        matrix = np.linalg.lstsq(local_points, points, rcond=None)[0].T.round(SymbolHandler.TRANSFORM_DECIMALS)
+        if len(points) and np.abs(local_points @ matrix.T - points).max() > SymbolHandler.POSITION_TOLERANCE:
+            return None
+        instance_state: Dict[str, Any] = {
+            'type': SymbolHandler.INSTANCE_TYPE,
+            'symbol': members_state[0]['symbol'],
+            'transform': matrix.ravel().tolist(),
+            'groups': members_state[0].get('groups', []),
+        }
+        if 'layer' in members_state[0]:
+            instance_state['layer'] = members_state[0]['layer']
+        return instance_state
+
+    def clear(self) -> None:
+        """
+        Forget all symbols, for example when a new board is loaded.
+        """
+        self.symbols = {}
+        self.next_symbol = 0
+
+    @staticmethod
+    def expand_instance(instance_state: Dict[str, Any], definition: Clipboard) -> List[Dict[str, Any]]:
+        """
+        Get the states of the objects of an instance.
+
+        :param instance_state: The instance state, as stored in the board file.
+        :param definition: The packed definition of the symbol.
+        :return: The object states, bottom-most first. They get consecutive z-indices starting at the z-index
+                 of the instance.
+        """
+        matrix = np.array(instance_state['transform'], dtype=float).reshape(2, 3)
+        groups = instance_state.get('groups', [])
+        z_index = instance_state.get('z-index', 0)
+        objects_state = []
+        for i, (style, coords, _) in enumerate(definition.get_transformed_objects(matrix)):
+            obj_state = dict(style, coords=coords, symbol=instance_state['symbol'], **{'z-index': z_index + i})
+            if groups:
+                obj_state['groups'] = list(groups)
+            if 'layer' in instance_state:
+                obj_state['layer'] = instance_state['layer']
+            objects_state.append(obj_state)
+        return objects_state
+
+    @staticmethod
+    def expand_instances(objects_state: List[Dict[str, Any]],
+                         definitions: Dict[str, Clipboard]) -> List[Dict[str, Any]]:
+        """
+        Replace the instances among object states by the states of their objects.
+
+        :param objects_state: The object states, as stored in the board file.
+        :param definitions: The packed definition of every symbol.
+        :return: The object states, each instance expanded in place.
+        """
+        expanded: List[Dict[str, Any]] = []
+        for obj_state in objects_state:
+            if obj_state['type'] == SymbolHandler.INSTANCE_TYPE:
+                if obj_state['symbol'] in definitions:
+                    expanded.extend(SymbolHandler.expand_instance(obj_state, definitions[obj_state['symbol']]))
+            else:
+                expanded.append(obj_state)
+        return expanded
+
+    @staticmethod
+    def _get_definition_style(obj_state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get the style of an object as it is stored in a symbol definition, without the tags of the instance.
+
+        :param obj_state: The object state.
+        :return: The style.
+        """
+        return Clipboard.get_style({option: value for option, value in obj_state.items() if option != 'symbol'})
@@ -1,10 +1,11 @@
 import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock, patch
 
 import tkinter as tk
 import pytest
 
 from app import App
+from autosave_handler import AutosaveHandler
 
 
 @pytest.fixture(scope="session")
@@ -64,22 +65,38 @@ def test_load_fonts(app):
 
 
 def test_load_board(app):
-    filename = "board.json"
-    board_state = {
-        "objects": [
-            {"type": "rect", "x": 100, "y": 200, "width": 300, "height": 400},
-            {"type": "circle", "x": 500, "y": 600, "radius": 150}
-        ]
-    }
-
-    with patch('builtins.open', MagicMock()), \
-            patch('json.load', return_value=board_state), \
-            patch.object(app.menu, 'hide') as mock_hide, \
+    filename = "board.pcso"
+
+    with patch.object(app.menu, 'hide') as mock_hide, \
             patch('app.Toolbox') as mock_toolbox, \
-            patch('app.Board') as mock_board:
+            patch('app.Board') as mock_board, \
+            patch('app.RecentBoards.add') as mock_add:
         app.load_board(filename)
 
         mock_hide.assert_called_once()
         mock_toolbox.assert_called_once_with(app)
         mock_board.assert_called_once_with(app, mock_toolbox.return_value, app.loaded_fonts)
-        mock_board.return_value.file_handler.load_objects.assert_called_once_with(board_state['objects'])
+        mock_board.return_value.file_handler.load_board.assert_called_once_with(filename)
+        mock_add.assert_called_once_with(filename)
+
+
+def test_load_board_from_autosave_owns_autosave_file(app):
+    with patch.object(app.menu, 'hide'), \
+            patch('app.Toolbox'), \
+            patch('app.Board') as mock_board, \
+            patch('app.RecentBoards.add'):
+        mock_board.return_value.autosave_handler.owns_file = False
+        app.load_board(AutosaveHandler.AUTOSAVE_PATH)
+
+        assert mock_board.return_value.autosave_handler.owns_file is True
+
+
+def test_close_destroys_board_and_root(app):
+    board = Mock()
+    app.board = board
+    with patch.object(app.get_root(), 'destroy') as mock_destroy:
+        app.close()
+
+        board.destroy.assert_called_once()
+        mock_destroy.assert_called_once()
+        assert app.board is None
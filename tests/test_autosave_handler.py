@@ -0,0 +1,144 @@
+import json
+import os
+import tkinter as tk
+from unittest.mock import Mock, patch
+
+import pytest
+
+from autosave_handler import AutosaveHandler
+from symbol_handler import SymbolHandler
+
+
+@pytest.fixture
+def autosave_handler(tmp_path):
+    board = Mock()
+    board.canvas = Mock(spec=tk.Canvas)
+    board.objects = []
+    board.layer_handler.get_hidden_objects.return_value = []
+    board.layer_handler.get_layers_state.return_value = []
+    board.image_handler.get_images_data.return_value = {}
+    board.symbol_handler.symbols = {}
+    board.symbol_handler.get_definitions.return_value = {}
+    with patch.object(AutosaveHandler, 'AUTOSAVE_PATH', str(tmp_path / "autosave.pcso")):
+        yield AutosaveHandler(board, interval_ms=1000)
+
+
+def test_init_schedules_autosave(autosave_handler):
+    autosave_handler.board.add_objects_changed_listener.assert_called_once_with(autosave_handler.on_objects_changed)
+    autosave_handler.board.app.get_root().after.assert_called_once_with(1000, autosave_handler.autosave)
+
+
+def test_on_objects_changed_marks_dirty_and_invalidates_cache(autosave_handler):
+    autosave_handler.state_cache = {1: {'type': 'line'}, 2: {'type': 'oval'}}
+
+    autosave_handler.on_objects_changed("move", [1])
+
+    assert autosave_handler.dirty is True
+    assert autosave_handler.state_cache == {2: {'type': 'oval'}}
+
+
+def test_autosave_skips_clean_board(autosave_handler):
+    autosave_handler.capture_snapshot = Mock()
+
+    autosave_handler.autosave()
+
+    autosave_handler.capture_snapshot.assert_not_called()
+    assert not os.path.exists(AutosaveHandler.AUTOSAVE_PATH)
+
+
+def test_capture_snapshot_reads_only_changed_objects(autosave_handler):
+    cached_state = {'type': 'line', 'coords': [0, 0, 1, 1]}
+    autosave_handler.state_cache = {1: cached_state}
+    autosave_handler.board.objects = [1, 2]
+    autosave_handler.canvas.find_all = Mock(return_value=(2, 1))
+    autosave_handler.board.file_handler.get_object_state = Mock(return_value={'type': 'oval'})
+
+    snapshot = autosave_handler.capture_snapshot()
+
+    autosave_handler.board.file_handler.get_object_state.assert_called_once_with(2)
+    assert snapshot == [(cached_state, 1), ({'type': 'oval'}, 0)]
+    assert snapshot[0][0] is cached_state
+
+
+def test_autosave_writes_dirty_board_on_worker(autosave_handler):
+    autosave_handler.board.objects = [1]
+    autosave_handler.canvas.find_all = Mock(return_value=(1,))
+    autosave_handler.board.file_handler.get_object_state = Mock(return_value={'type': 'line'})
+    autosave_handler.dirty = True
+
+    autosave_handler.autosave()
+    autosave_handler.worker.join()
+
+    assert autosave_handler.dirty is False
+    with open(AutosaveHandler.AUTOSAVE_PATH, 'r') as f:
+        assert json.load(f) == {'objects': [{'type': 'line', 'z-index': 0}]}
+    assert autosave_handler.state_cache == {1: {'type': 'line'}}
+
+
+def test_write_snapshot_includes_images(autosave_handler):
+    autosave_handler.write_snapshot([({'type': 'image', 'coords': [0, 0, 2, 2], 'image': "abc"}, 0)],
+                                    images_data={"abc": b"png"})
+
+    with open(AutosaveHandler.AUTOSAVE_PATH, 'r') as f:
+        assert json.load(f)['images'] == {"abc": "cG5n"}
+
+
+def test_autosave_recovers_symbol_instances(autosave_handler):
+    symbol_handler = SymbolHandler(Mock())
+    symbol = symbol_handler.create_symbol([{'type': 'rectangle', 'coords': [0, 0, 10, 20], 'fill': 'yellow'},
+                                           {'type': 'line', 'coords': [0, 0, 10, 0], 'fill': 'black'}])
+    instance_state = {'type': 'instance', 'symbol': symbol, 'transform': [1, 0, 100, 0, 1, 50],
+                      'groups': ["group:0"], 'z-index': 0}
+    members_state = SymbolHandler.expand_instance(instance_state, symbol_handler.symbols[symbol])
+    autosave_handler.board.symbol_handler = symbol_handler
+    autosave_handler.board.objects = [1, 2]
+    autosave_handler.canvas.find_all = Mock(return_value=(1, 2))
+    autosave_handler.board.file_handler.get_object_state = Mock(side_effect=members_state)
+    autosave_handler.dirty = True
+
+    autosave_handler.autosave()
+    autosave_handler.worker.join()
+
+    with open(AutosaveHandler.AUTOSAVE_PATH, 'r') as f:
+        board_state = json.load(f)
+    recovered = SymbolHandler(Mock())
+    recovered.add_symbols(board_state['symbols'])
+    assert recovered.get_instance_state(board_state['objects'])['transform'] == [1, 0, 100, 0, 1, 50]
+
+
+def test_discard_removes_autosave_file(autosave_handler):
+    with open(AutosaveHandler.AUTOSAVE_PATH, 'w') as f:
+        f.write("{}")
+    autosave_handler.dirty = True
+
+    autosave_handler.discard()
+
+    assert autosave_handler.dirty is False
+    assert not AutosaveHandler.has_recovery_file()
+
+
+def test_close_removes_own_autosave_file(autosave_handler):
+    autosave_handler.write_snapshot([({'type': 'line'}, 0)])
+
+    autosave_handler.close()
+
+    assert not AutosaveHandler.has_recovery_file()
+    assert autosave_handler.after_id is None
+
+
+def test_close_keeps_autosave_file_of_other_session(autosave_handler):
+    with open(AutosaveHandler.AUTOSAVE_PATH, 'w') as f:
+        f.write("{}")
+
+    autosave_handler.close()
+
+    assert AutosaveHandler.has_recovery_file()
+
+
+def test_stop_cancels_scheduled_autosave(autosave_handler):
+    after_id = autosave_handler.after_id
+
+    autosave_handler.stop()
+
+    autosave_handler.board.app.get_root().after_cancel.assert_called_once_with(after_id)
+    assert autosave_handler.after_id is None
@@ -0,0 +1,111 @@
+import json
+import os
+
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from autosave_handler import AutosaveHandler
+from batch_converter import BatchConverter
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    boards = tmp_path / "boards"
+    (boards / "nested").mkdir(parents=True)
+    (boards / ".export_cache").mkdir()
+    board_state = {'objects': [{'type': 'rectangle', 'coords': [0, 0, 50, 40], 'z-index': 0,
+                                'fill': 'red', 'outline': 'black', 'width': 2}]}
+    for path in (boards / "a.pcso", boards / "nested" / "b.pcso", boards / ".export_cache" / "c.pcso"):
+        path.write_text(json.dumps(board_state) + "\n")
+    (boards / "notes.txt").write_text("not a board")
+    return str(boards)
+
+
+def test_unsupported_format_raises(input_dir):
+    with pytest.raises(ValueError):
+        BatchConverter(input_dir, formats=["gif"])
+
+
+def test_find_jobs_mirrors_input_layout(input_dir, tmp_path):
+    output_dir = str(tmp_path / "out")
+    jobs, skipped = BatchConverter(input_dir, output_dir, ["png", "svg"]).find_jobs()
+
+    assert [(os.path.relpath(output_path, output_dir), output_format) for _, output_path, output_format in jobs] == [
+        ("a.png", "png"), ("a.svg", "svg"),
+        (os.path.join("nested", "b.png"), "png"), (os.path.join("nested", "b.svg"), "svg"),
+    ]
+    assert skipped == []
+
+
+def test_find_jobs_never_overwrites_boards(input_dir):
+    jobs, skipped = BatchConverter(input_dir, formats=["pcso"]).find_jobs()
+
+    assert jobs == []
+    assert [(os.path.relpath(input_path, input_dir), reason) for input_path, _, _, reason in skipped] == [
+        ("a.pcso", BatchConverter.REASON_SAME_FILE),
+        (os.path.join("nested", "b.pcso"), BatchConverter.REASON_SAME_FILE),
+    ]
+
+
+def test_find_jobs_skips_autosave_file(input_dir, tmp_path):
+    autosave_path = os.path.join(input_dir, "autosave.pcso")
+    with open(autosave_path, 'w') as f:
+        f.write(json.dumps({'objects': []}) + "\n")
+
+    with patch.object(AutosaveHandler, 'AUTOSAVE_PATH', autosave_path):
+        jobs, skipped = BatchConverter(input_dir, str(tmp_path / "out")).find_jobs()
+
+    assert [os.path.basename(input_path) for input_path, _, _ in jobs] == ["a.pcso", "b.pcso"]
+    assert skipped == []
+
+
+def test_run_converts_every_format(input_dir, tmp_path):
+    output_dir = tmp_path / "out"
+    summary = BatchConverter(input_dir, str(output_dir), ["png", "jpeg", "svg", "pcso"], workers=1).run()
+
+    assert summary['converted'] == 8 and summary['skipped'] == 0 and summary['failed'] == 0
+    with Image.open(output_dir / "a.png") as image:
+        assert image.size[0] >= 50 and image.size[1] >= 40
+    with Image.open(output_dir / "nested" / "b.jpg") as image:
+        assert image.format == "JPEG"
+    assert (output_dir / "a.svg").read_text().startswith("<svg")
+    assert json.loads((output_dir / "a.pcso").read_text())['objects'][0]['type'] == 'rectangle'
+    assert all(result['seconds'] >= 0 for result in summary['files'])
+
+
+def test_run_skips_up_to_date_outputs(input_dir, tmp_path):
+    output_dir = str(tmp_path / "out")
+    BatchConverter(input_dir, output_dir, workers=1).run()
+
+    summary = BatchConverter(input_dir, output_dir, workers=1).run()
+    assert summary['converted'] == 0 and summary['skipped'] == 2
+    assert {result['reason'] for result in summary['files']} == {BatchConverter.REASON_UP_TO_DATE}
+
+    os.utime(os.path.join(input_dir, "a.pcso"), ns=(2 ** 62, 2 ** 62))
+    summary = BatchConverter(input_dir, output_dir, workers=1).run()
+    assert summary['converted'] == 1 and summary['skipped'] == 1
+
+    summary = BatchConverter(input_dir, output_dir, workers=1, force=True).run()
+    assert summary['converted'] == 2 and summary['skipped'] == 0
+
+
+def test_run_reports_failures(input_dir, tmp_path):
+    with open(os.path.join(input_dir, "broken.pcso"), 'w') as f:
+        f.write("not json")
+    output_dir = tmp_path / "out"
+
+    summary = BatchConverter(input_dir, str(output_dir), workers=1).run()
+
+    assert summary['converted'] == 2 and summary['failed'] == 1
+    failure = next(result for result in summary['files'] if result['status'] == 'failed')
+    assert failure['input'].endswith("broken.pcso") and 'JSONDecodeError' in failure['error']
+    assert not os.path.exists(output_dir / "broken.png")
+    assert not os.path.exists(output_dir / "broken.png.tmp")
+
+
+def test_run_on_process_pool(input_dir, tmp_path):
+    summary = BatchConverter(input_dir, str(tmp_path / "out"), ["png", "svg"], workers=2).run()
+
+    assert summary['converted'] == 4 and summary['failed'] == 0
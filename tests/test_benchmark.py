@@ -0,0 +1,98 @@
+import json
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from benchmark import Benchmark, BoardGenerator, compare_results
+
+
+@pytest.fixture
+def benchmark():
+    with patch('benchmark.Toolbox'), patch('benchmark.Board'):
+        benchmark = Benchmark(Mock(), seed=1, repeat=2)
+        yield benchmark
+        benchmark.destroy()
+
+
+def test_generator_is_reproducible():
+    assert BoardGenerator(seed=3).generate(50) == BoardGenerator(seed=3).generate(50)
+    assert BoardGenerator(seed=3).generate(50) != BoardGenerator(seed=4).generate(50)
+
+
+def test_generator_creates_loadable_objects():
+    objects_state = BoardGenerator().generate(200)
+
+    assert [obj_state['z-index'] for obj_state in objects_state] == list(range(200))
+    assert {obj_state['type'] for obj_state in objects_state} == {'line', 'rectangle', 'oval', 'polygon', 'text'}
+    x1, y1, x2, y2 = BoardGenerator.DEFAULT_EXTENT
+    for obj_state in objects_state:
+        if obj_state['type'] == 'text':
+            assert x1 <= obj_state['coords'][0] <= x2 and y1 <= obj_state['coords'][1] <= y2
+            assert obj_state['font'].split()[1].isdigit()
+        elif obj_state['type'] == 'line':
+            assert len(obj_state['coords']) >= 4
+        else:
+            assert 'outline' in obj_state
+
+
+def test_init_stops_autosave(benchmark):
+    benchmark.board.autosave_handler.stop.assert_called_once()
+
+
+def test_export_cache_is_in_work_dir(benchmark):
+    export_cache = benchmark.board.file_handler.export_cache
+    assert os.path.dirname(export_cache.cache_dir) == benchmark.work_dir
+    os.makedirs(export_cache.cache_dir)
+
+    benchmark._prepare_export()
+
+    assert not os.path.exists(export_cache.cache_dir)
+
+
+def test_destroy_removes_work_dir(benchmark):
+    assert os.path.isdir(benchmark.work_dir)
+
+    benchmark.destroy()
+
+    benchmark.board.destroy.assert_called()
+    assert not os.path.exists(benchmark.work_dir)
+
+
+def test_time_operation_records_runs(benchmark):
+    setup = Mock()
+    operation = Mock()
+
+    result = benchmark.time_operation("save", 10, setup, operation)
+
+    assert setup.call_count == 2
+    assert operation.call_count == 2
+    assert result['operation'] == "save"
+    assert result['objects'] == 10
+    assert len(result['runs']) == 2
+    assert result['best'] == min(result['runs'])
+    assert benchmark.results == [result]
+
+
+def test_write_results(benchmark, tmp_path):
+    benchmark.results = [{'operation': "load", 'objects': 10, 'best': 0.1, 'mean': 0.2, 'runs': [0.1, 0.3]}]
+    benchmark.root.tk.call = Mock(return_value="8.6.12")
+    output = tmp_path / "results.json"
+
+    with patch.object(Benchmark, 'get_commit', return_value="abc123"):
+        benchmark.write_results(str(output))
+
+    written = json.loads(output.read_text())
+    assert written['commit'] == "abc123"
+    assert written['tk'] == "8.6.12"
+    assert written['seed'] == 1
+    assert written['results'] == benchmark.results
+
+
+def test_compare_results():
+    baseline = {'results': [{'operation': "load", 'objects': 10, 'best': 2.0},
+                            {'operation': "save", 'objects': 10, 'best': 1.0}]}
+    current = {'results': [{'operation': "load", 'objects': 10, 'best': 1.0},
+                           {'operation': "export", 'objects': 10, 'best': 1.0}]}
+
+    assert compare_results(baseline, current) == [("load", 10, 0.5)]
@@ -113,6 +113,22 @@ def test_handle_click_event_select_tool(board):
     board.object_mover.start_move.assert_called_once_with(event)
 
 
+def test_handle_click_event_select_tool_on_transform_handle(board):
+    event = Mock()
+    event.x = 100
+    event.y = 100
+    board.toolbox.current_tool = "Select"
+    board.canvas.find_withtag = Mock(return_value=[7])
+    board.selection_transformer.handles = {7: "se"}
+    board.selection_transformer.start_transform = Mock()
+    board.object_selector.select_object = Mock()
+
+    board.handle_click_event(event)
+
+    board.selection_transformer.start_transform.assert_called_once_with(event, 7)
+    board.object_selector.select_object.assert_not_called()
+
+
 def test_handle_click_event_shape_tool(board):
     event = Mock()
     event.x = 100
@@ -138,7 +154,7 @@ def test_handle_right_click_event(board):
     # Test when no object is clicked
     board.canvas.find_withtag = Mock(return_value=[])
     board.object_selector.is_click_inside_selection_frame = Mock(return_value=False)
-    board.object_editor.copied_object = None
+    board.object_editor.clipboard = None
     board.menu_handler.display_context_menu = Mock()
     board.menu_handler.paste_context_menu = Mock()
     board.handle_right_click_event(event)
@@ -190,13 +206,30 @@ def test_handle_right_click_event_click_inside_selection_frame(board):
     board.menu_handler.display_context_menu.assert_called_once_with(event, "rectangle")
 
 
-def test_handle_right_click_event_copied_object(board):
+def test_handle_right_click_event_multiple_selected_objects(board):
+    event = Mock()
+    event.x = 100
+    event.y = 100
+    board.canvas.find_withtag = Mock(return_value=[1])
+    board.canvas.type = Mock(return_value="rectangle")
+    board.object_selector.selected_objects = [1, 2]
+    board.object_selector.selected_types = {"rectangle", "line"}
+    board.menu_handler.display_context_menu = Mock()
+    board.menu_handler.display_selection_context_menu = Mock()
+
+    board.handle_right_click_event(event)
+
+    board.menu_handler.display_context_menu.assert_not_called()
+    board.menu_handler.display_selection_context_menu.assert_called_once_with(event, {"rectangle", "line"})
+
+
+def test_handle_right_click_event_clipboard(board):
     event = Mock()
     event.x = 100
     event.y = 100
     board.canvas.find_withtag = Mock(return_value=[])
     board.object_selector.is_click_inside_selection_frame = Mock(return_value=False)
-    board.object_editor.copied_object = "copied_object"
+    board.object_editor.clipboard = Mock()
     board.menu_handler.paste_context_menu = Mock()
 
     board.handle_right_click_event(event)
@@ -453,3 +486,21 @@ def test_destroy(board):
     assert board.canvas.winfo_exists() == 0
     assert board.x_scrollbar.winfo_exists() == 0
     assert board.y_scrollbar.winfo_exists() == 0
+
+
+def test_notify_objects_changed_calls_listeners(board):
+    listener = Mock()
+    board.add_objects_changed_listener(listener)
+
+    board.notify_objects_changed(Board.CHANGE_MOVE, [1, 2])
+
+    listener.assert_called_once_with(Board.CHANGE_MOVE, [1, 2])
+
+
+def test_notify_objects_changed_ignores_empty_changes(board):
+    listener = Mock()
+    board.add_objects_changed_listener(listener)
+
+    board.notify_objects_changed(Board.CHANGE_CREATE, [])
+
+    listener.assert_not_called()
@@ -0,0 +1,142 @@
+import json
+
+from board_journal import BoardJournal
+
+
+def test_on_objects_changed_tracks_operations():
+    journal = BoardJournal()
+
+    journal.on_objects_changed("move", [1])
+    journal.on_objects_changed("restyle", [1])
+    journal.on_objects_changed("create", [2])
+    journal.on_objects_changed("move", [2])
+
+    assert journal.pending == {1: {"move", "restyle"}, 2: {"create"}}
+
+
+def test_on_objects_changed_delete_cancels_unsaved_create():
+    journal = BoardJournal()
+
+    journal.on_objects_changed("create", [2])
+    journal.on_objects_changed("delete", [2])
+    journal.on_objects_changed("move", [1])
+    journal.on_objects_changed("delete", [1])
+
+    assert journal.pending == {1: {"delete"}}
+
+
+def test_reset_continues_ids_after_highest_id():
+    journal = BoardJournal()
+    journal.on_objects_changed("move", [1])
+
+    journal.reset("board.pcso", 100, 10, {5: 0, 6: 3})
+
+    assert journal.filename == "board.pcso"
+    assert journal.next_id == 4
+    assert journal.pending == {}
+    assert journal.allocate_id(7) == 4
+    assert journal.object_ids[7] == 4
+
+
+def test_can_append_respects_compaction_ratio(tmp_path):
+    file_path = tmp_path / "board.pcso"
+    file_path.write_text("{}\n")
+    journal = BoardJournal()
+    journal.reset(str(file_path), 100, 40)
+
+    assert journal.can_append(str(file_path), 10)
+    assert not journal.can_append(str(file_path), 11)
+    assert not journal.can_append(str(tmp_path / "other.pcso"), 1)
+
+
+def test_require_snapshot_prevents_append_until_reset(tmp_path):
+    file_path = tmp_path / "board.pcso"
+    file_path.write_text("{}\n")
+    journal = BoardJournal()
+    journal.reset(str(file_path), 100, 0)
+
+    journal.require_snapshot()
+    assert not journal.can_append(str(file_path), 1)
+
+    journal.reset(str(file_path), 100, 0)
+    assert journal.can_append(str(file_path), 1)
+
+
+def test_read_board_file_with_journal(tmp_path):
+    file_path = tmp_path / "board.pcso"
+    snapshot = json.dumps({'objects': []}) + "\n"
+    record = json.dumps({'op': 'delete', 'id': 0}) + "\n"
+    file_path.write_text(snapshot + record)
+
+    board_state, records, base_size, journal_size = BoardJournal.read_board_file(str(file_path))
+
+    assert board_state == {'objects': []}
+    assert records == [{'op': 'delete', 'id': 0}]
+    assert base_size == len(snapshot)
+    assert journal_size == len(record)
+
+
+def test_read_board_file_legacy_multiline_json(tmp_path):
+    file_path = tmp_path / "board.pcso"
+    file_path.write_text(json.dumps({'objects': []}, indent=2))
+
+    board_state, records, base_size, journal_size = BoardJournal.read_board_file(str(file_path))
+
+    assert board_state == {'objects': []}
+    assert records == []
+    assert base_size == 0
+
+
+def test_read_board_file_legacy_single_line_without_newline(tmp_path):
+    file_path = tmp_path / "board.pcso"
+    file_path.write_text(json.dumps({'objects': []}))
+
+    board_state, records, base_size, journal_size = BoardJournal.read_board_file(str(file_path))
+
+    assert board_state == {'objects': []}
+    assert records == []
+    assert base_size == 0
+
+
+def test_can_append_compares_paths(tmp_path):
+    file_path = tmp_path / "board.pcso"
+    file_path.write_text("{}\n")
+    journal = BoardJournal()
+    journal.reset(str(file_path), 100, 0)
+
+    assert journal.can_append(str(tmp_path / "." / "board.pcso"), 1)
+    assert journal.is_tracking(str(tmp_path / ".." / tmp_path.name / "board.pcso"))
+    assert not journal.is_tracking(str(tmp_path / "other.pcso"))
+
+
+def test_replay_without_records_returns_snapshot():
+    objects_state = [{'type': 'line', 'z-index': 1}, {'type': 'oval', 'z-index': 0}]
+
+    replayed, object_ids = BoardJournal.replay(objects_state, [])
+
+    assert replayed is objects_state
+    assert object_ids == [0, 1]
+
+
+def test_replay_applies_records_and_stacking_order():
+    objects_state = [
+        {'type': 'rectangle', 'coords': [0, 0, 1, 1], 'fill': 'red', 'z-index': 1},
+        {'type': 'line', 'coords': [0, 0, 5, 5], 'fill': 'black', 'z-index': 0},
+        {'type': 'oval', 'coords': [2, 2, 3, 3], 'fill': 'blue', 'z-index': 2},
+    ]
+    records = [
+        {'op': 'move', 'id': 0, 'coords': [10, 10, 11, 11]},
+        {'op': 'restyle', 'id': 1, 'state': {'fill': 'green'}},
+        {'op': 'delete', 'id': 2},
+        {'op': 'create', 'id': 3, 'below': 1, 'state': {'type': 'text', 'coords': [4, 4], 'text': 'Hi'}},
+        {'op': 'reorder', 'id': 1, 'below': None},
+        {'op': 'move', 'id': 2, 'coords': [0, 0, 0, 0]},
+    ]
+
+    replayed, object_ids = BoardJournal.replay(objects_state, records)
+
+    assert object_ids == [1, 3, 0]
+    assert [obj_state['type'] for obj_state in replayed] == ['line', 'text', 'rectangle']
+    assert [obj_state['z-index'] for obj_state in replayed] == [0, 1, 2]
+    assert replayed[0]['fill'] == 'green'
+    assert replayed[2]['coords'] == [10, 10, 11, 11]
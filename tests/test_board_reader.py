@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from board_reader import BoardReader
+
+
+def write_board(path, board_state, records=()):
+    with open(path, 'w') as f:
+        f.write(json.dumps(board_state) + "\n")
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+@pytest.fixture
+def board_file(tmp_path):
+    path = tmp_path / "board.pcso"
+    write_board(path, {
+        'objects': [
+            {'type': 'rectangle', 'coords': [0, 0, 10, 10], 'z-index': 0, 'layer': 'layer:1'},
+            {'type': 'line', 'coords': [20, 20, 40, 40], 'z-index': 1, 'width': 2},
+        ],
+        'layers': [
+            {'id': 'layer:0', 'name': 'Layer 1', 'visible': True, 'locked': False},
+            {'id': 'layer:1', 'name': 'Layer 2', 'visible': False, 'locked': False},
+        ],
+    })
+    return str(path)
+
+
+def test_objects_are_stacked_by_layer(board_file):
+    reader = BoardReader(board_file)
+
+    assert [obj_state['type'] for obj_state in reader.objects_state] == ['line', 'rectangle']
+    assert [obj_state['z-index'] for obj_state in reader.objects_state] == [0, 1]
+
+
+def test_get_visible_objects_skips_hidden_layers(board_file):
+    reader = BoardReader(board_file)
+
+    assert [obj_state['type'] for obj_state in reader.get_visible_objects()] == ['line']
+
+
+def test_get_board_state_keeps_layers(board_file):
+    board_state = BoardReader(board_file).get_board_state()
+
+    assert len(board_state['objects']) == 2
+    assert [info['id'] for info in board_state['layers']] == ['layer:0', 'layer:1']
+    assert 'symbols' not in board_state and 'images' not in board_state
+
+
+def test_get_bounds():
+    objects_state = [{'type': 'rectangle', 'coords': [0, 0, 10, 10], 'width': 2},
+                     {'type': 'line', 'coords': [-20, 5, 8000, 5], 'width': 2}]
+
+    min_x, min_y, max_x, max_y = BoardReader.get_bounds(objects_state, 5000)
+
+    assert min_x < -20 and min_y < 0 and max_y > 10
+    assert max_x == 5000
+    assert BoardReader.get_bounds([], 5000) == BoardReader.EMPTY_BOUNDS
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(OSError):
+        BoardReader(str(tmp_path / "missing.pcso"))
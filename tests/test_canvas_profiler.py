@@ -0,0 +1,88 @@
+import json
+import tkinter as tk
+from unittest.mock import Mock, patch
+
+import pytest
+
+from canvas_profiler import CanvasProfiler
+
+
+@pytest.fixture
+def canvas_profiler():
+    board = Mock()
+    board.canvas = Mock(spec=tk.Canvas)
+    with patch('canvas_profiler.atexit'):
+        yield CanvasProfiler(board)
+
+
+def test_canvas_calls_are_counted(canvas_profiler):
+    canvas = canvas_profiler.canvas
+    canvas.coords.__wrapped__.return_value = [1, 2, 3, 4]
+
+    assert canvas.coords(1) == [1, 2, 3, 4]
+    canvas.coords(2)
+    canvas.move(1, 5, 5)
+
+    assert canvas_profiler.operations["coords"][0] == 2
+    assert canvas_profiler.operations["move"][0] == 1
+
+
+def test_calls_are_attributed_to_call_site(canvas_profiler):
+    canvas_profiler.canvas.find_all()
+
+    (method, site), = canvas_profiler.call_sites
+    assert method == "find_all"
+    assert site.startswith("test_canvas_profiler.py:")
+    assert site.endswith("(test_calls_are_attributed_to_call_site)")
+
+
+def test_calls_are_attributed_to_running_handler(canvas_profiler):
+    board = canvas_profiler.board
+    board.handle_drag_event.__wrapped__.side_effect = lambda event: canvas_profiler.canvas.bbox(1)
+
+    board.handle_drag_event("event")
+    canvas_profiler.canvas.bbox(1)
+
+    assert canvas_profiler.handler_calls == {("handle_drag_event", "bbox"): 1, ("idle", "bbox"): 1}
+    assert canvas_profiler.current_handler == CanvasProfiler.IDLE_HANDLER
+
+
+def test_report_orders_operations_by_time(canvas_profiler):
+    canvas_profiler.record("coords", "a.py", 1, "f", 0.001)
+    canvas_profiler.record("move", "b.py", 2, "g", 0.005)
+    canvas_profiler.record("move", "b.py", 3, "g", 0.001)
+
+    report = canvas_profiler.report()
+
+    assert [operation['method'] for operation in report['operations']] == ["move", "coords"]
+    assert report['operations'][0]['count'] == 2
+    assert [call_site['site'] for call_site in report['operations'][0]['call_sites']] == ["b.py:2 (g)", "b.py:3 (g)"]
+    assert report['handlers'] == [{'handler': "idle", 'method': "coords", 'count': 1},
+                                  {'handler': "idle", 'method': "move", 'count': 2}]
+
+
+def test_report_keeps_top_call_sites(canvas_profiler):
+    for line in range(CanvasProfiler.TOP_CALL_SITES + 3):
+        canvas_profiler.record("coords", "a.py", line, "f", 0.001)
+
+    assert len(canvas_profiler.report()['operations'][0]['call_sites']) == CanvasProfiler.TOP_CALL_SITES
+
+
+def test_dump_report_prints_table(canvas_profiler, capsys):
+    canvas_profiler.record("coords", "a.py", 1, "f", 0.002)
+
+    canvas_profiler.dump_report()
+
+    output = capsys.readouterr().out
+    assert "coords" in output
+    assert "a.py:1 (f)" in output
+
+
+def test_dump_report_writes_file(canvas_profiler, tmp_path):
+    canvas_profiler.record("coords", "a.py", 1, "f", 0.002)
+    report_path = tmp_path / "canvas.json"
+
+    with patch.object(CanvasProfiler, 'REPORT_PATH', str(report_path)):
+        canvas_profiler.dump_report()
+
+    assert json.loads(report_path.read_text())['operations'][0]['method'] == "coords"
@@ -0,0 +1,38 @@
+from clipboard import Clipboard
+
+
+def test_from_states_shares_styles():
+    clipboard = Clipboard.from_states([
+        {'type': 'line', 'coords': [0, 0, 10, 10], 'fill': 'red', 'width': '2'},
+        {'type': 'line', 'coords': [5, 5, 6, 6, 7, 7], 'fill': 'red', 'width': '2'},
+        {'type': 'text', 'coords': [20, 20], 'fill': 'red', 'width': '0', 'font': 'Arial 12', 'text': 'Hi'},
+    ])
+
+    assert len(clipboard) == 3
+    assert clipboard.styles == [{'type': 'line', 'fill': 'red', 'width': '2'},
+                                {'type': 'text', 'fill': 'red', 'font': 'Arial 12', 'text': 'Hi'}]
+    assert clipboard.style_indices == [0, 0, 1]
+    assert clipboard.offsets.tolist() == [0, 4, 10, 12]
+    assert (clipboard.center_x, clipboard.center_y) == (10, 10)
+
+
+def test_get_objects_at_moves_the_center():
+    clipboard = Clipboard.from_states([
+        {'type': 'rectangle', 'coords': [0, 0, 10, 20], 'fill': 'red', 'width': '1', 'outline': 'red',
+         'groups': ['group:1']},
+        {'type': 'line', 'coords': [10, 20, 30, 40], 'fill': 'blue', 'width': '1'},
+    ])
+
+    objects = list(clipboard.get_objects_at(100, 100))
+
+    assert objects == [
+        ({'type': 'rectangle', 'fill': 'red', 'width': '1', 'outline': 'red'}, [85, 80, 95, 100], ['group:1']),
+        ({'type': 'line', 'fill': 'blue', 'width': '1'}, [95, 100, 115, 120], []),
+    ]
+
+
+def test_empty_clipboard():
+    clipboard = Clipboard.from_states([])
+
+    assert len(clipboard) == 0
+    assert list(clipboard.get_objects_at(10, 10)) == []
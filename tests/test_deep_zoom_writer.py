@@ -0,0 +1,80 @@
+import os
+import xml.etree.ElementTree as ElementTree
+
+from PIL import Image
+
+from clipboard import Clipboard
+from deep_zoom_writer import DeepZoomWriter
+
+RED_BOX = {'type': 'rectangle', 'coords': [10, 10, 20, 20], 'fill': 'red', 'outline': 'red', 'width': '1'}
+BLUE_BOX = {'type': 'rectangle', 'coords': [500, 300, 510, 310], 'fill': 'blue', 'outline': 'blue', 'width': '1'}
+
+
+def tile_files(tmp_path):
+    tiles_dir = tmp_path / "board_files"
+    return sorted(os.path.relpath(os.path.join(root, name), tiles_dir)
+                  for root, _, names in os.walk(tiles_dir) for name in names if name.endswith(".png"))
+
+
+def test_writes_descriptor_and_levels(tmp_path):
+    writer = DeepZoomWriter(str(tmp_path / "board.dzi"), 0, 0, 600, 400, workers=1)
+
+    writer.write([RED_BOX])
+
+    root = ElementTree.parse(tmp_path / "board.dzi").getroot()
+    assert root.get('TileSize') == "256"
+    size = root.find("{http://schemas.microsoft.com/deepzoom/2008}Size")
+    assert (size.get('Width'), size.get('Height')) == ("600", "400")
+    assert writer.max_level == 10
+    assert len(tile_files(tmp_path)) == 11
+    full_tile = Image.open(tmp_path / "board_files" / "10" / "0_0.png")
+    assert full_tile.size == (256, 256)
+    assert full_tile.getpixel((15, 15)) == (255, 0, 0)
+    assert Image.open(tmp_path / "board_files" / "0" / "0_0.png").size == (1, 1)
+
+
+def test_empty_tiles_are_skipped(tmp_path):
+    writer = DeepZoomWriter(str(tmp_path / "board.dzi"), 0, 0, 600, 400, workers=1)
+
+    writer.write([RED_BOX, BLUE_BOX])
+
+    assert [name for name in tile_files(tmp_path) if name.startswith("10/")] == ["10/0_0.png", "10/1_1.png"]
+    assert Image.open(tmp_path / "board_files" / "9" / "0_0.png").size == (256, 200)
+
+
+def test_export_again_renders_only_changed_tiles(tmp_path):
+    file_path = str(tmp_path / "board.dzi")
+    first = DeepZoomWriter(file_path, 0, 0, 600, 400, workers=1).write([RED_BOX, BLUE_BOX])
+    moved_box = dict(BLUE_BOX, coords=[520, 300, 530, 310])
+
+    second = DeepZoomWriter(file_path, 0, 0, 600, 400, workers=1).write([RED_BOX, moved_box])
+
+    assert first == {'rendered': 12, 'unchanged': 0, 'removed': 0}
+    # The full-resolution tile of the red box is kept, and the old tile of the blue box is now empty
+    assert second == {'rendered': 12, 'unchanged': 1, 'removed': 1}
+
+
+def test_tiles_left_empty_are_removed(tmp_path):
+    file_path = str(tmp_path / "board.dzi")
+    DeepZoomWriter(file_path, 0, 0, 600, 400, workers=1).write([RED_BOX, BLUE_BOX])
+
+    counts = DeepZoomWriter(file_path, 0, 0, 600, 400, workers=1).write([RED_BOX])
+
+    assert counts['removed'] == 1
+    assert "10/1_1.png" not in tile_files(tmp_path)
+
+
+def test_expands_symbol_instances(tmp_path):
+    symbols = {"symbol:0": Clipboard.from_states([dict(RED_BOX, coords=[-5, -5, 5, 5])])}
+    instance = {'type': 'instance', 'symbol': "symbol:0", 'transform': [1, 0, 300, 0, 1, 300], 'z-index': 0}
+    writer = DeepZoomWriter(str(tmp_path / "board.dzi"), 0, 0, 600, 400, symbols=symbols, workers=1)
+
+    writer.write([instance])
+
+    assert Image.open(tmp_path / "board_files" / "10" / "1_1.png").getpixel((300 - 256, 300 - 256)) == (255, 0, 0)
+
+
+def test_worker_processes_render_the_same_tiles(tmp_path):
+    DeepZoomWriter(str(tmp_path / "board.dzi"), 0, 0, 600, 400, workers=2).write([RED_BOX, BLUE_BOX])
+
+    assert len(tile_files(tmp_path)) == 12
@@ -0,0 +1,61 @@
+import tkinter as tk
+from unittest.mock import Mock, patch
+
+import pytest
+
+from event_recorder import EventRecorder
+
+
+@pytest.fixture
+def event_recorder(tmp_path):
+    board = Mock()
+    board.canvas = Mock(spec=tk.Canvas)
+    board.canvas.canvasx = Mock(return_value=-100.0)
+    board.canvas.canvasy = Mock(return_value=-50.0)
+    board.toolbox.current_tool = "Pen"
+    for setting in EventRecorder.SETTINGS:
+        setattr(board.toolbox, setting, "black")
+    board.toolbox.pen_width = 5
+    with patch('event_recorder.atexit'):
+        yield EventRecorder(board, str(tmp_path / "session.events"))
+
+
+def test_header(event_recorder):
+    assert event_recorder.header['view'] == [-100.0, -50.0]
+    assert event_recorder.header['tool'] == "Pen"
+    assert event_recorder.header['settings']['pen_width'] == 5
+    event_recorder.toolbox.add_tool_selected_listener.assert_called_once_with(event_recorder.on_tool_selected)
+
+
+def test_pointer_events_are_recorded(event_recorder):
+    board = event_recorder.board
+    handle_click_event = board.handle_click_event
+
+    board.handle_click_event(Mock(x=10, y=20))
+    board.handle_drag_event(Mock(x=11, y=21))
+    board.stop_drawing(Mock(x=12, y=22))
+
+    handle_click_event.__wrapped__.assert_called_once()
+    assert [event[1:] for event in event_recorder.events] == [["c", 10, 20], ["d", 11, 21], ["r", 12, 22]]
+
+
+def test_tool_and_setting_changes_are_recorded(event_recorder):
+    event_recorder.toolbox.pen_width = 8
+
+    event_recorder.on_tool_selected("Erase")
+    event_recorder.on_tool_selected("Pen")
+
+    assert [event[1] for event in event_recorder.events] == ["s", "t", "t"]
+    assert event_recorder.events[0][2]['pen_width'] == 8
+    assert event_recorder.events[1][2] == "Erase"
+
+
+def test_write_and_read(event_recorder):
+    event_recorder.board.handle_click_event(Mock(x=10, y=20))
+    event_recorder.on_tool_selected("Erase")
+
+    event_recorder.stop()
+    header, events = EventRecorder.read(event_recorder.filename)
+
+    assert header == event_recorder.header
+    assert events == event_recorder.events
@@ -0,0 +1,68 @@
+import json
+from unittest.mock import Mock, call, patch
+
+import pytest
+
+from event_replayer import EventReplayer, main
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = tmp_path / "session.events"
+    header = {'version': 1, 'view': [0, 0], 'tool': "Pen", 'settings': {'pen_width': 3}}
+    events = [[0.0, "c", 10, 20], [5.0, "d", 11, 21], [9.0, "r", 11, 21], [12.0, "s", {'pen_width': 7}],
+              [15.0, "t", "Erase"]]
+    path.write_text("\n".join(json.dumps(line) for line in [header] + events) + "\n")
+    return str(path)
+
+
+@pytest.fixture
+def event_replayer(recording):
+    with patch('event_replayer.Toolbox'), patch('event_replayer.Board') as mock_board:
+        mock_board.CANVAS_SCROLLREGION = (-5000, -5000, 5000, 5000)
+        replayer = EventReplayer(Mock(), recording)
+        replayer.toolbox.tool_selected_listeners = [Mock()]
+        yield replayer
+
+
+def test_init_stops_autosave(event_replayer):
+    event_replayer.board.autosave_handler.stop.assert_called_once()
+
+
+def test_replay_generates_events(event_replayer):
+    canvas = event_replayer.board.canvas
+
+    results = event_replayer.replay()
+
+    assert canvas.event_generate.call_args_list == [
+        call("<Motion>", x=10, y=20),
+        call("<ButtonPress-1>", x=10, y=20),
+        call("<Motion>", x=11, y=21, state=EventReplayer.BUTTON1_MASK),
+        call("<ButtonRelease-1>", x=11, y=21, state=EventReplayer.BUTTON1_MASK),
+    ]
+    canvas.xview_moveto.assert_called_once_with(0.5)
+    assert event_replayer.toolbox.pen_width == 7
+    assert event_replayer.toolbox.current_tool == "Erase"
+    assert results['events'] == 5
+    assert results['handlers'] == event_replayer.board.latency_monitor.report.return_value
+
+
+def test_select_tool_notifies_listeners(event_replayer):
+    listener = event_replayer.toolbox.tool_selected_listeners[0]
+
+    event_replayer.select_tool("Fill")
+    event_replayer.select_tool("Return to Middle")
+
+    assert event_replayer.toolbox.current_tool == "Fill"
+    assert listener.call_args_list == [call("Fill"), call("Return to Middle")]
+
+
+def test_main_fails_early_without_display(recording, monkeypatch):
+    monkeypatch.setattr('sys.platform', "linux")
+    monkeypatch.delenv("DISPLAY", raising=False)
+    monkeypatch.setattr('sys.argv', ["event_replayer.py", recording, "--hidden"])
+
+    with patch('event_replayer.tk.Tk') as tk_mock, pytest.raises(SystemExit):
+        main()
+
+    tk_mock.assert_not_called()
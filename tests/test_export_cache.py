@@ -0,0 +1,74 @@
+import os
+
+import pytest
+from PIL import Image
+
+from export_cache import ExportCache
+
+
+@pytest.fixture
+def export_cache(tmp_path):
+    return ExportCache(str(tmp_path / "cache"), max_bytes=1000)
+
+
+def test_get_key_depends_on_every_part():
+    key = ExportCache.get_key([{'type': 'line', 'coords': [0, 0, 1, 1]}], ".png")
+
+    assert key == ExportCache.get_key([{'coords': [0, 0, 1, 1], 'type': 'line'}], ".png")
+    assert key != ExportCache.get_key([{'type': 'line', 'coords': [0, 0, 1, 2]}], ".png")
+    assert key != ExportCache.get_key([{'type': 'line', 'coords': [0, 0, 1, 1]}], ".jpg")
+
+
+def test_get_font_set_changes_with_font_files(tmp_path):
+    (tmp_path / "Arial.ttf").write_bytes(b"font")
+    font_set = ExportCache.get_font_set(str(tmp_path))
+
+    (tmp_path / "Arial.ttf").write_bytes(b"other font")
+
+    assert font_set != ExportCache.get_font_set(str(tmp_path))
+    assert ExportCache.get_font_set(str(tmp_path / "missing")) == []
+
+
+def test_store_file_and_lookup(export_cache, tmp_path):
+    source = tmp_path / "board.png"
+    source.write_bytes(b"png")
+
+    assert export_cache.lookup("key", ".png") is None
+    export_cache.store_file("key", ".png", str(source))
+
+    with open(export_cache.lookup("key", ".png"), 'rb') as f:
+        assert f.read() == b"png"
+    assert export_cache.lookup("key", ".jpg") is None
+
+
+def test_store_file_ignores_missing_source(export_cache, tmp_path):
+    export_cache.store_file("key", ".png", str(tmp_path / "missing.png"))
+
+    assert export_cache.lookup("key", ".png") is None
+    assert not os.path.exists(export_cache.cache_dir)
+
+
+def test_store_and_load_image(export_cache):
+    export_cache.store_image("tile", Image.new("RGBA", (4, 4), "red"))
+
+    image = export_cache.load_image("tile")
+
+    assert image.size == (4, 4)
+    assert image.getpixel((0, 0)) == (255, 0, 0, 255)
+    assert export_cache.load_image("other") is None
+
+
+def test_evict_removes_least_recently_used_entries(export_cache, tmp_path):
+    for i, name in enumerate(["first", "second", "third"]):
+        source = tmp_path / f"{name}.bin"
+        source.write_bytes(b"x" * 300)
+        export_cache.store_file(name, ".bin", str(source))
+        os.utime(os.path.join(export_cache.cache_dir, f"{name}.bin"), (i, i))
+    export_cache.lookup("first", ".bin")
+    export_cache.max_bytes = 700
+
+    export_cache.evict()
+
+    assert export_cache.lookup("second", ".bin") is None
+    assert export_cache.lookup("first", ".bin") is not None
+    assert export_cache.lookup("third", ".bin") is not None
@@ -1,19 +1,37 @@
+import base64
+import io
 import json
 import tkinter as tk
 
 import pyglet
 import pytest
+from PIL import Image
 
 from unittest.mock import Mock, patch, call
+from board_journal import BoardJournal
+from export_cache import ExportCache
 from file_handler import FileHandler
+from image_handler import ImageHandler
+from image_pyramid import ImagePyramid
+from layer_handler import LayerHandler
+from object_renderer import ObjectRenderer
+from symbol_handler import SymbolHandler
 
 
 @pytest.fixture
-def file_handler():
+def file_handler(tmp_path):
     board = Mock()
     board.canvas = Mock(spec=tk.Canvas)
     board.loaded_fonts = {}
-    return FileHandler(board)
+    board.group_handler.get_groups.return_value = []
+    board.symbol_handler.get_symbol.return_value = None
+    board.symbol_handler.find_instance.return_value = []
+    board.symbol_handler.symbols = {}
+    board.canvas.gettags.return_value = ()
+    board.layer_handler = LayerHandler(board)
+    file_handler = FileHandler(board)
+    file_handler.export_cache = ExportCache(str(tmp_path / "export_cache"))
+    return file_handler
 
 
 def test_new_board(file_handler):
@@ -214,6 +232,16 @@ def test_export_board(file_handler, tmp_path):
         mock_image.save.assert_called_once_with(str(tmp_path / "test_export.png"))
 
 
+def test_export_board_as_png_uses_tiles(file_handler, tmp_path):
+    file_handler._export_board_as_image = Mock()
+
+    with patch('file_handler.filedialog.asksaveasfilename', return_value=str(tmp_path / "board.png")):
+        file_handler.export_board()
+
+    file_handler._export_board_as_image.assert_called_once_with(str(tmp_path / "board.png"),
+                                                                FileHandler.IMAGE_TILE_SIZE)
+
+
 def test_export_board_cancel(file_handler):
     with patch('file_handler.filedialog.asksaveasfilename', return_value=""):
         file_handler.canvas.postscript = Mock()
@@ -223,6 +251,66 @@ def test_export_board_cancel(file_handler):
         file_handler.canvas.postscript.assert_not_called()
 
 
+def test_export_board_as_eps(file_handler, tmp_path):
+    file_handler._export_board_as_postscript = Mock()
+    file_handler._export_board_as_image = Mock()
+
+    with patch('file_handler.filedialog.asksaveasfilename', return_value=str(tmp_path / "board.EPS")):
+        file_handler.export_board()
+
+    file_handler._export_board_as_postscript.assert_called_once_with(str(tmp_path / "board.EPS"))
+    file_handler._export_board_as_image.assert_not_called()
+
+
+def test_export_board_as_svg_streams_board_objects(file_handler, tmp_path):
+    file_handler.canvas.bbox = Mock(return_value=(0, 0, 100, 50))
+    file_handler.canvas.find_withtag = Mock(return_value=(1, 2))
+    file_handler.get_object_state = Mock(side_effect=lambda obj: {
+        'type': 'line', 'coords': [obj, 0, obj + 1, 1], 'fill': 'black', 'width': '1'})
+    file_path = tmp_path / "board.svg"
+
+    with patch('file_handler.filedialog.asksaveasfilename', return_value=str(file_path)):
+        file_handler.export_board()
+
+    file_handler.canvas.find_withtag.assert_called_once_with("layer:0")
+    svg = file_path.read_text()
+    assert svg.startswith('<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 50"')
+    assert '<path class="s0" d="M1,0L2,1"/>' in svg
+    assert '<path class="s0" d="M2,0L3,1"/>' in svg
+
+
+def test_export_board_as_postscript_hides_helper_items(file_handler, tmp_path):
+    file_handler.canvas.bbox = Mock(return_value=(10, 20, 110, 70))
+    file_handler.canvas.postscript = Mock(return_value="")
+    file_handler.canvas.itemconfig = Mock()
+    file_path = str(tmp_path / "board.eps")
+
+    assert file_handler._export_board_as_postscript(file_path) == [file_path]
+
+    file_handler.canvas.bbox.assert_called_once_with("layer:0")
+    file_handler.canvas.postscript.assert_called_once_with(file=file_path, x=10, y=20, width=100, height=50,
+                                                           colormode="color")
+    assert file_handler.canvas.itemconfig.call_args_list == [
+        call("selection_frame||eraser_frame||polygon_point", state=tk.HIDDEN),
+        call("selection_frame||eraser_frame||polygon_point", state=tk.NORMAL),
+    ]
+
+
+def test_export_board_as_postscript_tiles_large_boards(file_handler, tmp_path):
+    file_handler.canvas.bbox = Mock(return_value=(0, 0, 4500, 1000))
+    file_handler.canvas.find_overlapping = Mock(side_effect=[(1,), (), (2,)])
+    file_handler.canvas.postscript = Mock(return_value="")
+    file_handler.canvas.itemconfig = Mock()
+
+    written_files = file_handler._export_board_as_postscript(str(tmp_path / "board.ps"))
+
+    assert written_files == [str(tmp_path / "board-1-1.ps"), str(tmp_path / "board-1-3.ps")]
+    assert file_handler.canvas.find_overlapping.call_args_list == [
+        call(0, 0, 2000, 1000), call(2000, 0, 4000, 1000), call(4000, 0, 4500, 1000)]
+    file_handler.canvas.postscript.assert_called_with(file=str(tmp_path / "board-1-3.ps"), x=4000, y=0,
+                                                      width=500, height=1000, colormode="color")
+
+
 # @patch('file_handler.filedialog.asksaveasfilename', side_effect=[
 #     str(tmp_path / "test_export.jpg"),
 #     str(tmp_path / "test_export.gif")
@@ -352,7 +440,7 @@ def test_load_board_unsupported_object_types(file_handler, tmp_path):
         json.dump(board_state, f)
 
     file_handler.new_board = Mock()
-    file_handler.load_objects = Mock()
+    file_handler.load_objects = Mock(return_value=[])
 
     file_handler.load_board(str(file_path))
 
@@ -459,3 +547,496 @@ def test_export_board_skip_selection_eraser_frame(file_handler, tmp_path):
 
         mock_new_image.assert_called_once_with("RGBA", (100, 100), "white")
         mock_image.save.assert_called_once_with(str(tmp_path / "test_export.png"))
+
+
+def test_save_board_appends_journal_to_same_file(file_handler, tmp_path):
+    file_path = tmp_path / "test.pcso"
+    file_path.write_text(json.dumps({'objects': [{'type': 'line'}]}) + "\n")
+    file_handler.journal.reset(str(file_path), 1000, 0, {1: 0})
+    file_handler.journal.pending = {1: {"move"}, 2: {"create"}}
+    file_handler.canvas.find_all = Mock(return_value=(1, 2))
+    file_handler.canvas.coords = Mock(return_value=[5, 5, 6, 6])
+    file_handler.get_object_state = Mock(return_value={'type': 'oval', 'coords': [0, 0, 1, 1]})
+
+    file_handler.save_board(str(file_path))
+
+    lines = file_path.read_text().splitlines()
+    assert len(lines) == 3
+    assert json.loads(lines[1]) == {'op': 'move', 'id': 0, 'coords': [5, 5, 6, 6]}
+    assert json.loads(lines[2]) == {'op': 'create', 'id': 1, 'below': 0,
+                                    'state': {'type': 'oval', 'coords': [0, 0, 1, 1]}}
+    assert file_handler.journal.pending == {}
+    assert file_handler.journal.object_ids == {1: 0, 2: 1}
+
+
+def test_save_board_compacts_large_journal(file_handler, tmp_path):
+    file_path = tmp_path / "test.pcso"
+    file_path.write_text(json.dumps({'objects': []}) + "\n")
+    file_handler.journal.reset(str(file_path), 10, 0, {})
+    file_handler.journal.pending = {1: {"create"}}
+    file_handler.canvas.find_all = Mock(return_value=[1])
+    file_handler.get_object_state = Mock(return_value={'type': 'line', 'coords': [0, 0, 1, 1]})
+    file_handler.board.objects = [1]
+
+    file_handler.save_board(str(file_path))
+
+    lines = file_path.read_text().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0]) == {'objects': [{'type': 'line', 'coords': [0, 0, 1, 1], 'z-index': 0}]}
+    assert file_handler.journal.object_ids == {1: 0}
+    assert file_handler.journal.journal_size == 0
+
+
+def test_load_board_replays_journal(file_handler, tmp_path):
+    file_path = tmp_path / "test.pcso"
+    objects = [{'type': 'line', 'coords': [0, 0, 1, 1], 'fill': 'black', 'width': '1', 'z-index': 0}]
+    record = {'op': 'move', 'id': 0, 'coords': [2, 2, 3, 3]}
+    file_path.write_text(json.dumps({'objects': objects}) + "\n" + json.dumps(record) + "\n")
+    file_handler.new_board = Mock()
+    file_handler.load_objects = Mock(return_value=[7])
+
+    file_handler.load_board(str(file_path))
+
+    loaded_state = file_handler.load_objects.call_args[0][0]
+    assert loaded_state[0]['coords'] == [2, 2, 3, 3]
+    assert file_handler.journal.filename == str(file_path)
+    assert file_handler.journal.object_ids == {7: 0}
+
+
+def test_save_board_rewrites_legacy_file_without_trailing_newline(file_handler, tmp_path):
+    file_path = tmp_path / "test.pcso"
+    objects = [{'type': 'line', 'coords': [0, 0, 1, 1], 'fill': 'black', 'width': '1', 'z-index': 0}]
+    file_path.write_text(json.dumps({'objects': objects}))
+    file_handler.new_board = Mock()
+    file_handler.load_objects = Mock(return_value=[7])
+    file_handler.load_board(str(file_path))
+    file_handler.board.objects = [7]
+    file_handler.canvas.find_all = Mock(return_value=(7,))
+    file_handler.canvas.coords = Mock(return_value=[2, 2, 3, 3])
+    file_handler.get_object_state = Mock(return_value={'type': 'line', 'coords': [2, 2, 3, 3]})
+
+    file_handler.journal.pending = {7: {"move"}}
+    file_handler.save_board(str(file_path))
+    file_handler.canvas.coords = Mock(return_value=[4, 4, 5, 5])
+    file_handler.journal.pending = {7: {"move"}}
+    with patch.object(BoardJournal, 'COMPACTION_RATIO', 10):
+        file_handler.save_board(str(tmp_path / "." / "test.pcso"))
+
+    lines = file_path.read_text().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[1]) == {'op': 'move', 'id': 0, 'coords': [4, 4, 5, 5]}
+    file_handler.load_board(str(file_path))
+    assert file_handler.load_objects.call_args[0][0][0]['coords'] == [4, 4, 5, 5]
+
+
+def test_get_object_state_includes_groups(file_handler):
+    file_handler.canvas.type = Mock(return_value="line")
+    file_handler.canvas.coords = Mock(return_value=[0, 0, 1, 1])
+    file_handler.canvas.itemcget = Mock(side_effect=["black", "1"])
+    file_handler.board.group_handler.get_groups.return_value = ["group:2", "group:0"]
+
+    obj_state = file_handler.get_object_state(1)
+
+    assert obj_state['groups'] == ["group:2", "group:0"]
+
+
+def test_create_object_from_state_restores_groups(file_handler):
+    file_handler.canvas.create_oval = Mock(return_value=5)
+    obj_state = {'type': 'oval', 'coords': [0, 0, 1, 1], 'fill': '', 'outline': 'black', 'width': '1',
+                 'groups': ["group:1", "group:0"]}
+
+    file_handler.create_object_from_state(obj_state)
+
+    file_handler.board.group_handler.add_to_groups.assert_called_once_with(5, ["group:1", "group:0"], 'oval')
+
+
+def test_save_board_stores_symbol_instances_once(file_handler, tmp_path):
+    instance_state = {'type': 'instance', 'symbol': "symbol:0", 'transform': [1, 0, 5, 0, 1, 5],
+                      'groups': ["group:0"]}
+    file_handler.canvas.find_all = Mock(return_value=(1, 2, 3))
+    file_handler.board.objects = [1, 2, 3]
+    file_handler.get_object_state = Mock(side_effect=lambda obj: {
+        1: {'type': 'line', 'coords': [0, 0, 1, 1]},
+        2: {'type': 'line', 'coords': [5, 5, 6, 6], 'groups': ["group:0"], 'symbol': "symbol:0"},
+        3: {'type': 'oval', 'coords': [4, 4, 6, 6], 'groups': ["group:0"], 'symbol': "symbol:0"},
+    }[obj])
+    file_handler.board.symbol_handler.find_instance.side_effect = \
+        lambda obj_state: [2, 3] if 'symbol' in obj_state else []
+    file_handler.board.symbol_handler.get_instance_state.return_value = instance_state
+    file_handler.board.symbol_handler.get_definitions.return_value = {"symbol:0": []}
+
+    file_path = tmp_path / "test.pcso"
+    file_handler.save_board(str(file_path))
+
+    board_state = json.loads(file_path.read_text())
+    assert board_state['objects'] == [{'type': 'line', 'coords': [0, 0, 1, 1], 'z-index': 0},
+                                      dict(instance_state, **{'z-index': 1})]
+    assert board_state['symbols'] == {"symbol:0": []}
+    file_handler.board.symbol_handler.get_definitions.assert_called_once_with({"symbol:0"})
+    assert file_handler.journal.object_ids == {1: 0, 2: 1, 3: 2}
+
+
+def test_save_board_stores_changed_instance_as_plain_objects(file_handler, tmp_path):
+    file_handler.canvas.find_all = Mock(return_value=(2, 3))
+    file_handler.board.objects = [2, 3]
+    file_handler.get_object_state = Mock(side_effect=lambda obj: {
+        'type': 'line', 'coords': [obj, obj], 'groups': ["group:0"], 'symbol': "symbol:0"})
+    file_handler.board.symbol_handler.find_instance.side_effect = lambda obj_state: [2, 3]
+    file_handler.board.symbol_handler.get_instance_state.return_value = None
+
+    file_path = tmp_path / "test.pcso"
+    file_handler.save_board(str(file_path))
+
+    board_state = json.loads(file_path.read_text())
+    assert board_state == {'objects': [
+        {'type': 'line', 'coords': [2, 2], 'groups': ["group:0"], 'z-index': 0},
+        {'type': 'line', 'coords': [3, 3], 'groups': ["group:0"], 'z-index': 1},
+    ]}
+
+
+def test_load_board_expands_symbol_instances(file_handler, tmp_path):
+    file_path = tmp_path / "test.pcso"
+    symbols = {"symbol:0": [{'type': 'line', 'coords': [-1, 0, 1, 0], 'fill': 'black', 'width': '1'}]}
+    objects = [{'type': 'instance', 'symbol': "symbol:0", 'transform': [1, 0, 10, 0, 1, 20], 'z-index': 0},
+               {'type': 'instance', 'symbol': "symbol:0", 'transform': [2, 0, 0, 0, 2, 0], 'z-index': 1}]
+    file_path.write_text(json.dumps({'objects': objects, 'symbols': symbols}) + "\n")
+    file_handler.board.symbol_handler = SymbolHandler(file_handler.board)
+    file_handler.new_board = Mock()
+    file_handler.load_objects = Mock(return_value=[7, 8])
+
+    file_handler.load_board(str(file_path))
+
+    loaded_state = file_handler.load_objects.call_args[0][0]
+    assert [obj_state['coords'] for obj_state in loaded_state] == [[9.0, 20.0, 11.0, 20.0], [-2.0, 0.0, 2.0, 0.0]]
+    assert all(obj_state['symbol'] == "symbol:0" for obj_state in loaded_state)
+    assert file_handler.journal.object_ids == {7: 0, 8: 1}
+
+
+def test_create_object_from_state_restores_symbol(file_handler):
+    file_handler.canvas.create_line = Mock(return_value=5)
+    file_handler.canvas.addtag_withtag = Mock()
+
+    file_handler.create_object_from_state({'type': 'line', 'coords': [0, 0, 1, 1], 'fill': 'black', 'width': '1',
+                                           'symbol': "symbol:2"})
+
+    assert file_handler.canvas.addtag_withtag.call_args_list == [call("symbol:2", 5), call("layer:0", 5)]
+
+
+def test_get_object_state_includes_layer(file_handler):
+    file_handler.canvas.type = Mock(return_value="line")
+    file_handler.canvas.coords = Mock(return_value=[0, 0, 1, 1])
+    file_handler.canvas.itemcget = Mock(side_effect=["black", "1", "black", "1"])
+
+    file_handler.canvas.gettags = Mock(return_value=("object0", "layer:0"))
+    assert 'layer' not in file_handler.get_object_state(1)
+    file_handler.canvas.gettags = Mock(return_value=("object1", "layer:2"))
+    assert file_handler.get_object_state(2)['layer'] == "layer:2"
+
+
+def test_save_board_stores_layers_and_hidden_objects(file_handler, tmp_path):
+    layer_handler = file_handler.board.layer_handler
+    layer_handler.add_layer("Sketch")
+    layer_handler.layers[1]['visible'] = False
+    layer_handler.add_hidden_objects([{'type': 'line', 'coords': [5, 5, 6, 6], 'layer': "layer:1"}])
+    layer_handler.current_layer = "layer:0"
+    file_handler.canvas.find_all = Mock(return_value=(1,))
+    file_handler.board.objects = [1]
+    file_handler.get_object_state = Mock(return_value={'type': 'line', 'coords': [0, 0, 1, 1]})
+
+    file_path = tmp_path / "test.pcso"
+    file_handler.save_board(str(file_path))
+
+    board_state = json.loads(file_path.read_text())
+    assert board_state['objects'] == [{'type': 'line', 'coords': [0, 0, 1, 1], 'z-index': 0},
+                                      {'type': 'line', 'coords': [5.0, 5.0, 6.0, 6.0], 'layer': "layer:1",
+                                       'z-index': 0}]
+    assert board_state['layers'] == [
+        {'id': "layer:0", 'name': "Layer 1", 'visible': True, 'locked': False},
+        {'id': "layer:1", 'name': "Sketch", 'visible': False, 'locked': False},
+    ]
+    assert file_handler.journal.object_ids == {1: 0, -1: 1}
+
+
+def test_load_board_keeps_hidden_layers_off_the_canvas(file_handler, tmp_path):
+    file_path = tmp_path / "test.pcso"
+    layers = [{'id': "layer:0", 'name': "Layer 1", 'visible': True, 'locked': False},
+              {'id': "layer:1", 'name': "Ink", 'visible': True, 'locked': True},
+              {'id': "layer:2", 'name': "Sketch", 'visible': False, 'locked': False}]
+    objects = [{'type': 'line', 'coords': [0, 0, 1, 1], 'fill': 'black', 'width': '1', 'layer': "layer:1",
+                'z-index': 0},
+               {'type': 'line', 'coords': [2, 2, 3, 3], 'fill': 'black', 'width': '1', 'layer': "layer:2",
+                'z-index': 1},
+               {'type': 'line', 'coords': [4, 4, 5, 5], 'fill': 'black', 'width': '1', 'z-index': 2}]
+    file_path.write_text(json.dumps({'objects': objects, 'layers': layers}) + "\n")
+    file_handler.new_board = Mock()
+    file_handler.load_objects = Mock(return_value=[7, 8])
+
+    file_handler.load_board(str(file_path))
+
+    loaded_state = file_handler.load_objects.call_args[0][0]
+    assert [obj_state['coords'] for obj_state in loaded_state] == [[4, 4, 5, 5], [0, 0, 1, 1]]
+    assert [obj_state['z-index'] for obj_state in loaded_state] == [0, 1]
+    layer_handler = file_handler.board.layer_handler
+    assert [obj_state['coords'] for _, obj_state in layer_handler.get_hidden_objects()] == [[2.0, 2.0, 3.0, 3.0]]
+    assert layer_handler.current_layer == "layer:0"
+    assert file_handler.journal.object_ids == {7: 2, 8: 0, -1: 1}
+
+
+def test_import_svg_creates_objects_in_batches(file_handler, tmp_path):
+    file_path = tmp_path / "drawing.svg"
+    file_path.write_text('<svg xmlns="http://www.w3.org/2000/svg">'
+                         '<line x1="0" y1="0" x2="10" y2="0" stroke="red"/>'
+                         '<rect x="0" y="0" width="5" height="5" fill="blue"/>'
+                         '<circle cx="5" cy="5" r="5" fill="green"/></svg>')
+    board = file_handler.board
+    board.objects = []
+    board.layer_handler.add_layer()
+    file_handler.create_object_from_state = Mock(side_effect=[4, 5, 6])
+    root = board.app.get_root()
+
+    file_handler.import_svg(str(file_path), batch_size=2)
+
+    created_states = [state_call.args[0] for state_call in file_handler.create_object_from_state.call_args_list]
+    assert [(obj_state['type'], obj_state['layer']) for obj_state in created_states] == [
+        ("line", "layer:1"), ("rectangle", "layer:1")]
+    assert board.objects == [4, 5]
+    board.notify_objects_changed.assert_called_with(board.CHANGE_CREATE, [4, 5])
+    board.undo_handler.record_create.assert_not_called()
+
+    callback, *args = root.after.call_args.args[1:]
+    callback(*args)
+
+    assert board.objects == [4, 5, 6]
+    file_handler.canvas.addtag_withtag.assert_any_call("object2", 6)
+    file_handler.canvas.tag_raise.assert_called_with("layer:1")
+    board.undo_handler.record_create.assert_called_once_with([4, 5, 6])
+    assert root.after.call_count == 1
+
+
+def test_import_svg_keeps_objects_read_before_malformed_part(file_handler, tmp_path):
+    file_path = tmp_path / "broken.svg"
+    file_path.write_text('<svg xmlns="http://www.w3.org/2000/svg"><line x1="0" y1="0" x2="1" y2="1" stroke="red"/>')
+    file_handler.board.objects = []
+    file_handler.create_object_from_state = Mock(return_value=4)
+
+    file_handler.import_svg(str(file_path))
+
+    assert file_handler.board.objects == [4]
+    file_handler.board.undo_handler.record_create.assert_called_once_with([4])
+    file_handler.board.app.get_root().after.assert_not_called()
+
+
+def test_new_board_cancels_running_svg_import(file_handler):
+    file_handler.import_after_id = "after#1"
+
+    file_handler.new_board()
+
+    file_handler.board.app.get_root().after_cancel.assert_called_once_with("after#1")
+    assert file_handler.import_after_id is None
+
+
+def write_svg_lines(file_path, count):
+    file_path.write_text('<svg xmlns="http://www.w3.org/2000/svg">'
+                         + '<line x1="0" y1="0" x2="10" y2="0" stroke="red"/>' * count + '</svg>')
+    return str(file_path)
+
+
+def test_import_svg_records_imported_objects_when_cancelled(file_handler, tmp_path):
+    board = file_handler.board
+    board.objects = []
+    file_handler.create_object_from_state = Mock(side_effect=[4, 5, 6])
+    board.app.get_root().after.return_value = "after#1"
+    file_handler.import_svg(write_svg_lines(tmp_path / "first.svg", 3), batch_size=2)
+
+    file_handler.import_svg(write_svg_lines(tmp_path / "second.svg", 1), batch_size=2)
+
+    board.app.get_root().after_cancel.assert_called_once_with("after#1")
+    assert board.undo_handler.record_create.call_args_list == [call([4, 5]), call([6])]
+
+
+def test_hiding_import_layer_stops_svg_import(file_handler, tmp_path):
+    board = file_handler.board
+    board.objects = []
+    board.file_handler = file_handler
+    layer_handler = board.layer_handler
+    layer_handler.add_layer()
+    file_handler.create_object_from_state = Mock(side_effect=[4, 5, 6])
+    file_handler.get_object_state = Mock(return_value={'type': 'line', 'coords': [0, 0, 10, 0]})
+    file_handler.canvas.find_withtag = Mock(return_value=(4, 5))
+    root = board.app.get_root()
+    root.after.return_value = "after#1"
+    file_handler.import_svg(write_svg_lines(tmp_path / "drawing.svg", 3), batch_size=2)
+
+    layer_handler.set_current_layer("layer:0")
+    layer_handler.set_visible("layer:1", False)
+
+    root.after_cancel.assert_called_once_with("after#1")
+    board.undo_handler.record_create.assert_called_once_with([4, 5])
+    assert file_handler.import_after_id is None
+    assert file_handler.create_object_from_state.call_count == 2
+
+
+def png_data():
+    buffer = io.BytesIO()
+    Image.new("RGB", (2, 2), "red").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_save_board_stores_each_image_once(file_handler, tmp_path):
+    board = file_handler.board
+    board.image_handler = ImageHandler(board)
+    key = board.image_handler.add_image_data(png_data())
+    board.objects = [1, 2]
+    file_handler.canvas.find_all = Mock(return_value=(1, 2))
+    file_handler.get_object_state = Mock(side_effect=lambda obj: {'type': 'image', 'coords': [obj, 0, obj + 1, 1],
+                                                                  'image': key})
+
+    file_path = tmp_path / "test.pcso"
+    file_handler.save_board(str(file_path))
+
+    board_state = json.loads(file_path.read_text())
+    assert [obj_state['image'] for obj_state in board_state['objects']] == [key, key]
+    assert list(board_state['images']) == [key]
+    assert base64.b64decode(board_state['images'][key]) == png_data()
+    assert file_handler.saved_images == {key}
+
+
+def test_save_board_writes_snapshot_for_new_images(file_handler, tmp_path):
+    board = file_handler.board
+    board.image_handler = ImageHandler(board)
+    key = board.image_handler.add_image_data(png_data())
+    file_path = tmp_path / "test.pcso"
+    file_path.write_text(json.dumps({'objects': []}) + "\n")
+    file_handler.journal.reset(str(file_path), 1000, 0, {})
+    file_handler.journal.pending = {1: {"create"}}
+    board.objects = [1]
+    file_handler.canvas.find_all = Mock(return_value=(1,))
+    file_handler.get_object_state = Mock(return_value={'type': 'image', 'coords': [0, 0, 1, 1], 'image': key})
+
+    file_handler.save_board(str(file_path))
+
+    lines = file_path.read_text().splitlines()
+    assert len(lines) == 1
+    assert key in json.loads(lines[0])['images']
+
+
+def test_load_board_adds_images_before_objects(file_handler, tmp_path):
+    file_path = tmp_path / "test.pcso"
+    objects = [{'type': 'image', 'coords': [0, 0, 1, 1], 'image': "abc", 'z-index': 0}]
+    file_path.write_text(json.dumps({'objects': objects, 'images': {"abc": "cG5n"}}) + "\n")
+    file_handler.new_board = Mock()
+    file_handler.load_objects = Mock(side_effect=lambda states: [
+        7 if file_handler.board.image_handler.add_images.called else 0])
+
+    file_handler.load_board(str(file_path))
+
+    file_handler.board.image_handler.add_images.assert_called_once_with({"abc": "cG5n"})
+    assert file_handler.journal.object_ids == {7: 0}
+    assert file_handler.saved_images == {"abc"}
+
+
+def test_image_objects_round_trip_through_state(file_handler):
+    file_handler.canvas.type = Mock(return_value="image")
+    file_handler.board.image_handler.get_image_state.return_value = {'type': 'image', 'coords': [0, 0, 4, 3],
+                                                                     'image': "abc"}
+    file_handler.board.image_handler.create_image.return_value = 8
+
+    obj_state = file_handler.get_object_state(1)
+
+    assert obj_state == {'type': 'image', 'coords': [0, 0, 4, 3], 'image': "abc"}
+    assert file_handler.create_object_from_state(obj_state) == 8
+    file_handler.board.image_handler.create_image.assert_called_once_with(obj_state)
+    file_handler.canvas.addtag_withtag.assert_called_once_with("layer:0", 8)
+
+
+def test_journal_move_of_image_keeps_its_size(file_handler):
+    file_handler.journal.object_ids = {1: 0}
+    file_handler.journal.pending = {1: {"move"}}
+    file_handler.canvas.find_all = Mock(return_value=(1,))
+    file_handler.canvas.coords = Mock(return_value=[5, 5])
+    file_handler.canvas.type = Mock(return_value="image")
+    file_handler.board.image_handler.get_image_state.return_value = {'type': 'image', 'coords': [5, 5, 9, 8],
+                                                                     'image': "abc"}
+
+    assert file_handler._get_journal_records() == [{'op': 'move', 'id': 0, 'coords': [5, 5, 9, 8]}]
+
+
+def test_export_pastes_images_at_full_resolution(file_handler, tmp_path):
+    board = file_handler.board
+    board.image_handler = ImageHandler(board)
+    buffer = io.BytesIO()
+    Image.new("RGB", (400, 400), "blue").save(buffer, "PNG")
+    key = board.image_handler.add_image_data(buffer.getvalue())
+    file_handler.canvas.find_all = Mock(return_value=(1,))
+    file_handler.canvas.bbox = Mock(return_value=(0, 0, 40, 40))
+    file_handler.canvas.itemcget = Mock(return_value="object1")
+    file_handler.get_object_state = Mock(return_value={'type': 'image', 'coords': [10, 10, 30, 30], 'image': key})
+
+    with patch.object(ImagePyramid, 'build') as build:
+        file_handler._export_board_as_image(str(tmp_path / "board.png"))
+
+    build.assert_not_called()
+    with Image.open(tmp_path / "board.png") as image:
+        assert image.getpixel((20, 20)) == (0, 0, 255, 255)
+        assert image.getpixel((5, 5)) == (255, 255, 255, 255)
+
+
+def export_rectangles(file_handler, file_path, rectangles, tile_size=None):
+    file_handler.canvas.find_all = Mock(return_value=tuple(range(1, len(rectangles) + 1)))
+    file_handler.canvas.bbox = Mock(side_effect=[rectangle[:4] for rectangle in rectangles])
+    file_handler.canvas.itemcget = Mock(return_value="object")
+    file_handler.get_object_state = Mock(side_effect=[
+        {'type': 'rectangle', 'coords': list(rectangle[:4]), 'fill': rectangle[4], 'outline': rectangle[4],
+         'width': '1'} for rectangle in rectangles])
+    file_handler.board.image_handler.images = {}
+    file_handler._export_board_as_image(file_path, tile_size)
+
+
+def test_export_board_as_image_copies_cached_export_of_unchanged_board(file_handler, tmp_path):
+    rectangles = [(0, 0, 100, 100, "red")]
+    export_rectangles(file_handler, str(tmp_path / "first.png"), rectangles)
+
+    with patch.object(ObjectRenderer, 'draw_objects') as draw_objects:
+        export_rectangles(file_handler, str(tmp_path / "second.png"), rectangles)
+
+    draw_objects.assert_not_called()
+    assert (tmp_path / "second.png").read_bytes() == (tmp_path / "first.png").read_bytes()
+
+
+def test_export_board_as_image_renders_changed_board(file_handler, tmp_path):
+    export_rectangles(file_handler, str(tmp_path / "first.png"), [(0, 0, 100, 100, "red")])
+
+    export_rectangles(file_handler, str(tmp_path / "second.png"), [(0, 0, 100, 100, "blue")])
+
+    with Image.open(tmp_path / "second.png") as image:
+        assert image.getpixel((50, 50)) == (0, 0, 255, 255)
+
+
+def test_export_board_as_image_renders_only_changed_tiles(file_handler, tmp_path):
+    rectangles = [(0, 0, 40, 40, "red"), (200, 200, 240, 240, "green")]
+    export_rectangles(file_handler, str(tmp_path / "first.png"), rectangles, tile_size=64)
+
+    rectangles[1] = (200, 200, 240, 240, "blue")
+    with patch.object(ObjectRenderer, 'draw_objects', autospec=True,
+                      side_effect=ObjectRenderer.draw_objects) as draw_objects:
+        export_rectangles(file_handler, str(tmp_path / "second.png"), rectangles, tile_size=64)
+
+    assert draw_objects.call_count == 1
+    with Image.open(tmp_path / "second.png") as image:
+        assert image.getpixel((20, 20)) == (255, 0, 0, 255)
+        assert image.getpixel((220, 220)) == (0, 0, 255, 255)
+        assert image.getpixel((120, 120)) == (255, 255, 255, 255)
+
+
+def test_export_board_as_deep_zoom_streams_visible_objects(file_handler, tmp_path):
+    file_handler.canvas.bbox = Mock(return_value=(0, 0, 300, 200))
+    file_handler.canvas.find_withtag = Mock(return_value=(1,))
+    file_handler.get_object_state = Mock(return_value={'type': 'rectangle', 'coords': [10, 10, 20, 20],
+                                                       'fill': 'red', 'outline': 'red', 'width': '1'})
+    file_handler.board.image_handler.images = {}
+
+    counts = file_handler._export_board_as_deep_zoom(str(tmp_path / "board.dzi"), workers=1)
+
+    file_handler.canvas.find_withtag.assert_called_once_with("layer:0")
+    assert counts == {'rendered': 10, 'unchanged': 0, 'removed': 0}
+    assert (tmp_path / "board_files" / "9" / "0_0.png").exists()
@@ -18,6 +18,7 @@ def fill_handler(root):
     board.canvas = tk.Canvas(root)
     board.canvas.itemconfig = Mock()
     board.toolbox = Mock()
+    board.layer_handler.without_locked.side_effect = list
     fill_handler = FillHandler(board)
     return fill_handler
 
@@ -98,7 +99,75 @@ def test_fill_area_no_items(mock_find_overlapping, fill_handler):
     event.x = 100
     event.y = 100
     mock_find_overlapping.return_value = []
+    fill_handler.fill_region = Mock()
 
     fill_handler.fill_area(event)
 
     fill_handler.canvas.itemconfig.assert_not_called()
+    fill_handler.fill_region.assert_called_once()
+
+
+@pytest.fixture
+def region_fill_handler():
+    board = Mock()
+    board.canvas = Mock(spec=tk.Canvas)
+    board.objects = [1, 2, 3, 4]
+    board.toolbox.fill_color = "red"
+    board.canvas.create_polygon = Mock(return_value=5)
+    board.layer_handler.current_layer = "layer:0"
+    return FillHandler(board)
+
+
+def enclose(fill_handler, x1, y1, x2, y2):
+    states = {
+        1: {'type': 'line', 'coords': [x1, y1, x2, y1], 'fill': 'black', 'width': 3},
+        2: {'type': 'line', 'coords': [x2, y1, x2, y2], 'fill': 'black', 'width': 3},
+        3: {'type': 'line', 'coords': [x2, y2, x1, y2], 'fill': 'black', 'width': 3},
+        4: {'type': 'line', 'coords': [x1, y2, x1, y1], 'fill': 'black', 'width': 3},
+    }
+    fill_handler.canvas.find_overlapping = Mock(return_value=(1, 2, 3, 4, 99))
+    fill_handler.board.file_handler.get_object_state = Mock(side_effect=lambda obj: states[obj])
+
+
+def test_fill_region_enclosed_by_strokes(region_fill_handler):
+    enclose(region_fill_handler, 10, 10, 60, 40)
+
+    region = region_fill_handler.fill_region(30, 20)
+
+    assert region == 5
+    coords = region_fill_handler.canvas.create_polygon.call_args.args
+    xs, ys = coords[0::2], coords[1::2]
+    assert 10 < min(xs) < 14 and 56 < max(xs) < 60
+    assert 10 < min(ys) < 14 and 36 < max(ys) < 40
+    assert region_fill_handler.canvas.create_polygon.call_args.kwargs['fill'] == "red"
+    region_fill_handler.board.layer_handler.lower_to_layer_bottom.assert_called_once_with(5, "layer:0")
+    assert region_fill_handler.board.objects[-1] == 5
+    region_fill_handler.board.notify_objects_changed.assert_called_once_with(
+        region_fill_handler.board.CHANGE_CREATE, [5])
+    region_fill_handler.board.undo_handler.record_create.assert_called_once_with([5])
+
+
+def test_fill_area_skips_locked_objects(region_fill_handler):
+    event = Mock()
+    event.x = 100
+    event.y = 100
+    region_fill_handler.canvas.canvasx = Mock(return_value=100)
+    region_fill_handler.canvas.canvasy = Mock(return_value=100)
+    region_fill_handler.canvas.find_overlapping = Mock(return_value=(1,))
+    region_fill_handler.board.layer_handler.without_locked = Mock(return_value=[])
+    region_fill_handler.fill_region = Mock()
+
+    region_fill_handler.fill_area(event)
+
+    region_fill_handler.board.layer_handler.without_locked.assert_called_once_with([1])
+    region_fill_handler.canvas.itemconfig.assert_not_called()
+    region_fill_handler.fill_region.assert_called_once()
+
+
+def test_fill_region_not_enclosed(region_fill_handler):
+    region_fill_handler.canvas.find_overlapping = Mock(return_value=())
+
+    assert region_fill_handler.fill_region(30, 20) is None
+
+    assert region_fill_handler.canvas.find_overlapping.call_count == len(FillHandler.REGION_WINDOW_SIZES)
+    region_fill_handler.canvas.create_polygon.assert_not_called()
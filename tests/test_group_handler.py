@@ -0,0 +1,80 @@
+from unittest.mock import Mock, call
+
+import pytest
+
+from group_handler import GroupHandler
+
+
+@pytest.fixture
+def group_handler():
+    board = Mock()
+    board.CHANGE_CREATE = "create"
+    board.CHANGE_DELETE = "delete"
+    board.CHANGE_RESTYLE = "restyle"
+    return GroupHandler(board)
+
+
+def test_get_groups_orders_outermost_first(group_handler):
+    group_handler.canvas.gettags = Mock(return_value=("object1", "group:0", "group:3", "member:outlined"))
+
+    assert group_handler.get_groups(1) == ["group:3", "group:0"]
+    assert group_handler.get_outermost_group(1) == "group:3"
+
+
+def test_get_outermost_group_of_ungrouped_object(group_handler):
+    group_handler.canvas.gettags = Mock(return_value=("object1", "selected"))
+
+    assert group_handler.get_outermost_group(1) is None
+
+
+def test_get_group_types_is_cached(group_handler):
+    group_handler.canvas.find_withtag = Mock(return_value=(1, 2))
+    group_handler.canvas.type = Mock(side_effect=["line", "text"])
+
+    assert group_handler.get_group_types("group:0") == {"line", "text"}
+    assert group_handler.get_group_types("group:0") == {"line", "text"}
+    group_handler.canvas.find_withtag.assert_called_once_with("group:0")
+
+
+def test_created_or_deleted_objects_reset_group_types(group_handler):
+    group_handler.group_types = {"group:0": {"line"}}
+
+    group_handler.on_objects_changed("restyle", [1])
+    assert group_handler.group_types == {"group:0": {"line"}}
+
+    group_handler.on_objects_changed("delete", [1])
+    assert group_handler.group_types == {}
+
+
+def test_expand_to_groups(group_handler):
+    groups = {1: "group:0", 2: None, 3: "group:0", 4: "group:1"}
+    members = {"group:0": (1, 3, 5), "group:1": (4, 6)}
+    group_handler.get_outermost_group = Mock(side_effect=groups.get)
+    group_handler.canvas.find_withtag = Mock(side_effect=members.get)
+
+    assert group_handler.expand_to_groups([1, 2, 3, 4]) == [1, 3, 5, 2, 4, 6]
+
+
+def test_create_group_allocates_new_tags(group_handler):
+    assert group_handler.create_group() == "group:0"
+    assert group_handler.create_group() == "group:1"
+
+
+def test_add_to_groups(group_handler):
+    group_handler.canvas.addtag_withtag = Mock()
+
+    group_handler.add_to_groups(7, ["group:4", "group:2"], "oval")
+
+    group_handler.canvas.addtag_withtag.assert_has_calls([
+        call("group:2", 7), call("group:4", 7), call("member:outlined", 7)])
+    assert group_handler.create_group() == "group:5"
+
+
+def test_clear(group_handler):
+    group_handler.create_group()
+    group_handler.group_types = {"group:0": {"line"}}
+
+    group_handler.clear()
+
+    assert group_handler.group_types == {}
+    assert group_handler.create_group() == "group:0"
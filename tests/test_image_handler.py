@@ -0,0 +1,103 @@
+import io
+import tkinter as tk
+from unittest.mock import Mock, patch
+
+import pytest
+from PIL import Image
+
+from image_handler import ImageHandler
+
+
+def png_data(width, height, color="red"):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def image_handler():
+    board = Mock()
+    board.canvas = Mock(spec=tk.Canvas)
+    board.objects = []
+    board.CHANGE_CREATE = "create"
+    with patch('image_handler.ImageTk.PhotoImage', side_effect=lambda image: Mock(
+            size=image.size, __str__=Mock(return_value=f"photo{image.size[0]}x{image.size[1]}"))):
+        yield ImageHandler(board)
+
+
+def test_same_content_is_stored_once(image_handler):
+    first = image_handler.add_image_data(png_data(40, 40))
+    second = image_handler.add_image_data(png_data(40, 40))
+    other = image_handler.add_image_data(png_data(40, 40, "blue"))
+
+    assert first == second != other
+    assert len(image_handler.images) == 2
+
+
+def test_definitions_round_trip(image_handler):
+    key = image_handler.add_image_data(png_data(40, 40))
+    definitions = ImageHandler.encode_images(image_handler.get_images_data([key, "missing"]))
+
+    image_handler.clear()
+    image_handler.add_images(definitions)
+
+    assert list(image_handler.images) == [key]
+    assert image_handler.images[key].data == png_data(40, 40)
+
+
+def test_get_image_keys():
+    assert ImageHandler.get_image_keys([{'type': 'image', 'image': "a"}, {'type': 'line'},
+                                        {'type': 'image', 'image': "a"}]) == {"a"}
+
+
+def test_items_of_same_image_and_size_share_a_photo(image_handler):
+    key = image_handler.add_image_data(png_data(200, 100))
+    image_handler.canvas.create_image = Mock(side_effect=[5, 6, 7])
+
+    image_handler.create_image({'type': 'image', 'coords': [0, 0, 50, 25], 'image': key})
+    image_handler.create_image({'type': 'image', 'coords': [60, 0, 110, 25], 'image': key})
+    image_handler.create_image({'type': 'image', 'coords': [20, 30, 0, 40], 'image': key})
+
+    assert len(image_handler.photos) == 2
+    first_photo = image_handler.canvas.create_image.call_args_list[0].kwargs['image']
+    assert image_handler.canvas.create_image.call_args_list[1].kwargs['image'] is first_photo
+    assert first_photo.size == (50, 25)
+    image_handler.canvas.create_image.assert_called_with(0, 30, image=image_handler.photos[(key, 20, 10)],
+                                                         anchor=tk.NW)
+
+
+def test_unknown_image_is_not_created(image_handler):
+    assert image_handler.create_image({'type': 'image', 'coords': [0, 0, 5, 5], 'image': "missing"}) == 0
+    image_handler.canvas.create_image.assert_not_called()
+
+
+def test_get_image_state_keeps_the_image_size(image_handler):
+    key = image_handler.add_image_data(png_data(200, 100))
+    image_handler.get_photo(key, 50, 25)
+    image_handler.canvas.itemcget = Mock(return_value="photo50x25")
+    image_handler.canvas.coords = Mock(return_value=[10.0, 20.0])
+
+    assert image_handler.get_image_state(5) == {'type': 'image', 'coords': [10.0, 20.0, 60.0, 45.0], 'image': key}
+
+
+def test_import_image_places_it_in_the_middle_of_the_view(image_handler, tmp_path):
+    file_path = tmp_path / "screenshot.png"
+    file_path.write_bytes(png_data(200, 100))
+    board = image_handler.board
+    board.layer_handler.current_layer = "layer:1"
+    board.file_handler.create_object_from_state = Mock(return_value=9)
+    image_handler.canvas.winfo_width = Mock(return_value=800)
+    image_handler.canvas.winfo_height = Mock(return_value=600)
+    image_handler.canvas.canvasx = Mock(side_effect=lambda x: x + 1000)
+    image_handler.canvas.canvasy = Mock(side_effect=lambda y: y)
+
+    assert image_handler.import_image(str(file_path)) == 9
+
+    obj_state = board.file_handler.create_object_from_state.call_args.args[0]
+    assert obj_state['coords'] == [1300, 250, 1500, 350]
+    assert obj_state['layer'] == "layer:1"
+    assert image_handler.images[obj_state['image']].levels
+    board.layer_handler.raise_to_layer_top.assert_called_once_with(9, "layer:1")
+    assert board.objects == [9]
+    board.notify_objects_changed.assert_called_once_with("create", [9])
+    board.undo_handler.record_create.assert_called_once_with([9])
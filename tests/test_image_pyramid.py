@@ -0,0 +1,62 @@
+import io
+from unittest.mock import patch
+
+from PIL import Image
+
+from image_pyramid import ImagePyramid
+
+
+def png_data(width, height, color="red"):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_reads_size_without_building_levels():
+    pyramid = ImagePyramid(png_data(300, 200))
+
+    assert (pyramid.width, pyramid.height) == (300, 200)
+    assert pyramid.levels == []
+
+
+def test_build_halves_levels_down_to_minimum_size():
+    pyramid = ImagePyramid(png_data(300, 200))
+
+    pyramid.build()
+
+    assert [level.size for level in pyramid.levels] == [(150, 100), (75, 50)]
+
+
+def test_smaller_sizes_use_levels_without_decoding_again():
+    pyramid = ImagePyramid(png_data(300, 200))
+    pyramid.build()
+
+    with patch.object(ImagePyramid, 'decode') as decode:
+        image = pyramid.get_image(60, 40)
+
+    decode.assert_not_called()
+    assert image.size == (60, 40)
+    assert image.getpixel((30, 20)) == (255, 0, 0, 255)
+
+
+def test_larger_sizes_and_full_resolution_decode_the_original():
+    pyramid = ImagePyramid(png_data(300, 200))
+    pyramid.build()
+
+    with patch.object(ImagePyramid, 'decode', wraps=pyramid.decode) as decode:
+        assert pyramid.get_image(300, 200).size == (300, 200)
+        assert pyramid.get_image(60, 40, full_resolution=True).size == (60, 40)
+
+    assert decode.call_count == 2
+
+
+def test_small_images_are_decoded_once():
+    pyramid = ImagePyramid(png_data(40, 30))
+
+    with patch.object(ImagePyramid, 'decode', wraps=pyramid.decode) as decode:
+        assert pyramid.get_image(40, 30).size == (40, 30)
+        assert pyramid.get_image(20, 15).size == (20, 15)
+        assert pyramid.get_image(80, 60, full_resolution=True).size == (80, 60)
+
+    assert decode.call_count == 1
+    assert pyramid.levels == []
@@ -0,0 +1,47 @@
+import pytest
+
+from latency_histogram import LatencyHistogram
+
+
+def test_empty_histogram():
+    histogram = LatencyHistogram()
+
+    assert histogram.percentile(50) == 0
+    assert histogram.to_dict()['mean'] == 0
+
+
+def test_percentiles_are_accurate_upper_bounds():
+    histogram = LatencyHistogram()
+    for i in range(1, 101):
+        histogram.record(i / 1000)
+
+    assert histogram.count == 100
+    assert 0.050 <= histogram.percentile(50) <= 0.050 * 1.1
+    assert 0.099 <= histogram.percentile(99) <= 0.099 * 1.1
+    assert histogram.percentile(100) == pytest.approx(0.1)
+
+
+def test_percentile_never_exceeds_max():
+    histogram = LatencyHistogram()
+    histogram.record(0.0123)
+
+    assert histogram.percentile(99) == 0.0123
+
+
+def test_tiny_latencies_share_first_bucket():
+    assert LatencyHistogram.bucket_index(0) == 0
+    assert LatencyHistogram.bucket_index(LatencyHistogram.MIN_LATENCY) == 0
+    assert LatencyHistogram.bucket_index(2 * LatencyHistogram.MIN_LATENCY) == LatencyHistogram.SUB_BUCKETS
+
+
+def test_to_dict():
+    histogram = LatencyHistogram()
+    histogram.record(0.001)
+    histogram.record(0.003)
+
+    summary = histogram.to_dict()
+
+    assert summary['count'] == 2
+    assert summary['mean'] == pytest.approx(0.002)
+    assert summary['max'] == 0.003
+    assert sum(summary['buckets'].values()) == 2
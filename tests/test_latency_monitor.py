@@ -0,0 +1,108 @@
+import json
+import tkinter as tk
+from unittest.mock import Mock, patch
+
+import pytest
+
+from latency_monitor import LatencyMonitor
+
+
+@pytest.fixture
+def latency_monitor():
+    board = Mock()
+    board.canvas = Mock(spec=tk.Canvas)
+    board.toolbox.current_tool = "Pen"
+    return LatencyMonitor(board)
+
+
+def test_init_wraps_entry_points(latency_monitor):
+    board = latency_monitor.board
+    handle_click_event = board.handle_click_event
+
+    board.handle_click_event("event")
+
+    assert handle_click_event.__wrapped__.call_count == 1
+    assert ("Pen", "handle_click_event") in latency_monitor.histograms
+    board.object_mover.smooth_scroll()
+    assert ("Pen", "smooth_scroll") in latency_monitor.histograms
+    board.app.get_root().bind.assert_called_once()
+
+
+def test_wrap_records_latency_per_tool_and_handler(latency_monitor):
+    handler = latency_monitor.wrap("stop_drawing", Mock(return_value="result"))
+
+    assert handler("event") == "result"
+    latency_monitor.board.toolbox.current_tool = "Erase"
+    handler("event")
+
+    assert latency_monitor.histograms[("Pen", "stop_drawing")].count == 1
+    assert latency_monitor.histograms[("Erase", "stop_drawing")].count == 1
+
+
+def test_wrap_records_failing_handler(latency_monitor):
+    handler = latency_monitor.wrap("stop_drawing", Mock(side_effect=ValueError))
+
+    with pytest.raises(ValueError):
+        handler("event")
+
+    assert latency_monitor.histograms[("Pen", "stop_drawing")].count == 1
+
+
+def test_overlay_text(latency_monitor):
+    latency_monitor.canvas.find_all = Mock(return_value=(1, 2, 3))
+    for _ in range(4):
+        latency_monitor.record("Pen", "handle_drag_event", 0.002)
+
+    text = latency_monitor.get_overlay_text()
+
+    assert "p50 2.00 ms" in text
+    assert "2 events/s" in text
+    assert "3 items" in text
+
+
+def test_recent_calls_expire(latency_monitor):
+    latency_monitor.record("Pen", "handle_drag_event", 0.002)
+
+    with patch('latency_monitor.time.perf_counter', return_value=latency_monitor.recent[0][0] + 10):
+        latency_monitor.record("Pen", "handle_drag_event", 0.004)
+
+    assert len(latency_monitor.recent) == 1
+    assert latency_monitor.histograms[("Pen", "handle_drag_event")].count == 2
+
+
+@patch('latency_monitor.tk.Label')
+def test_toggle_overlay(mock_label, latency_monitor):
+    latency_monitor.canvas.find_all = Mock(return_value=())
+    root = latency_monitor.board.app.get_root()
+
+    latency_monitor.toggle_overlay()
+    mock_label.return_value.place.assert_called_once()
+    root.after.assert_called_once_with(LatencyMonitor.OVERLAY_REFRESH_MS, latency_monitor.update_overlay)
+
+    latency_monitor.toggle_overlay()
+    mock_label.return_value.destroy.assert_called_once()
+    root.after_cancel.assert_called_once_with(root.after.return_value)
+    assert latency_monitor.overlay is None
+
+
+def test_stop_writes_report(latency_monitor, tmp_path):
+    latency_monitor.record("Pen", "handle_drag_event", 0.002)
+    report_path = tmp_path / "latency.json"
+
+    with patch.object(LatencyMonitor, 'REPORT_PATH', str(report_path)):
+        latency_monitor.stop()
+
+    report = json.loads(report_path.read_text())
+    assert report[0]['tool'] == "Pen"
+    assert report[0]['handler'] == "handle_drag_event"
+    assert report[0]['count'] == 1
+
+
+@patch('latency_monitor.atexit')
+def test_report_is_written_at_exit(mock_atexit):
+    board = Mock()
+    monitor = LatencyMonitor(board)
+
+    mock_atexit.register.assert_called_once_with(monitor.stop)
+    monitor.stop()
+    mock_atexit.unregister.assert_called_once_with(monitor.stop)
@@ -0,0 +1,219 @@
+import tkinter as tk
+from unittest.mock import Mock, call
+
+import pytest
+
+from layer_handler import LayerHandler
+
+LINE = {'type': 'line', 'coords': [0, 0, 10, 0], 'fill': 'black', 'width': '2'}
+NOTE = {'type': 'rectangle', 'coords': [0, 0, 10, 20], 'fill': 'yellow', 'outline': 'black', 'width': '1'}
+
+
+@pytest.fixture
+def layer_handler():
+    board = Mock()
+    board.canvas = Mock(spec=tk.Canvas)
+    board.objects = []
+    board.CHANGE_CREATE = "create"
+    board.CHANGE_DELETE = "delete"
+    return LayerHandler(board)
+
+
+def test_starts_with_default_layer(layer_handler):
+    assert [info['id'] for info in layer_handler.layers] == ["layer:0"]
+    assert layer_handler.current_layer == "layer:0"
+    assert layer_handler.get_layers_state() == []
+
+
+def test_add_layer_becomes_current(layer_handler):
+    layer = layer_handler.add_layer("Ink")
+
+    assert layer == "layer:1"
+    assert layer_handler.current_layer == "layer:1"
+    assert layer_handler.get_rank("layer:1") == 1
+    assert layer_handler.get_layers_state()[1] == {'id': "layer:1", 'name': "Ink", 'visible': True, 'locked': False}
+    layer_handler.board.file_handler.journal.require_snapshot.assert_called_once()
+
+
+def test_new_objects_go_on_top_of_current_layer(layer_handler):
+    layer_handler.add_layer()
+    layer_handler.add_layer()
+    layer_handler.current_layer = "layer:1"
+    layer_handler.canvas.gettags = Mock(return_value=("object4",))
+
+    layer_handler.on_objects_changed("create", [4])
+
+    layer_handler.canvas.addtag_withtag.assert_called_once_with("layer:1", 4)
+    layer_handler.canvas.tag_lower.assert_called_once_with(4, "layer:2")
+
+
+def test_raise_to_layer_top_skips_empty_layers_above(layer_handler):
+    layer_handler.add_layer()
+    layer_handler.add_layer()
+    layer_handler.canvas.tag_lower = Mock(side_effect=[tk.TclError, None])
+
+    layer_handler.raise_to_layer_top(4, "layer:0")
+
+    assert layer_handler.canvas.tag_lower.call_args_list == [call(4, "layer:1"), call(4, "layer:2")]
+    layer_handler.canvas.tag_raise.assert_not_called()
+
+
+def test_raise_to_layer_top_of_topmost_layer(layer_handler):
+    layer_handler.add_layer()
+
+    layer_handler.raise_to_layer_top(4, "layer:1")
+
+    layer_handler.canvas.tag_lower.assert_not_called()
+    layer_handler.canvas.tag_raise.assert_called_once_with(4)
+
+
+def test_raise_and_lower_within_layers(layer_handler):
+    layer_handler.add_layer()
+
+    layer_handler.raise_within_layers("selected")
+    layer_handler.lower_within_layers("selected")
+
+    layer_handler.canvas.tag_lower.assert_any_call("selected&&layer:0", "layer:1")
+    layer_handler.canvas.tag_raise.assert_any_call("selected&&layer:1")
+    layer_handler.canvas.tag_lower.assert_called_with("selected&&layer:0")
+    layer_handler.canvas.tag_raise.assert_called_with("selected&&layer:1", "layer:0")
+
+
+def test_recreated_objects_on_locked_layers_are_locked(layer_handler):
+    layer_handler.add_layer()
+    layer_handler.layers[0]['locked'] = True
+    layer_handler.canvas.gettags = Mock(return_value=("object4", "layer:0"))
+
+    layer_handler.on_objects_changed("create", [4])
+
+    layer_handler.canvas.addtag_withtag.assert_called_once_with("locked", 4)
+    layer_handler.canvas.itemconfig.assert_called_once_with(4, state=tk.DISABLED)
+
+
+def test_set_locked_disables_layer_items(layer_handler):
+    layer_handler.add_layer()
+
+    layer_handler.set_locked("layer:0", True)
+
+    assert layer_handler.is_locked("layer:0")
+    layer_handler.canvas.addtag_withtag.assert_called_once_with("locked", "layer:0")
+    layer_handler.canvas.itemconfig.assert_called_once_with("layer:0", state=tk.DISABLED)
+
+    layer_handler.set_locked("layer:0", False)
+
+    layer_handler.canvas.dtag.assert_called_once_with("layer:0", "locked")
+    layer_handler.canvas.itemconfig.assert_called_with("layer:0", state=tk.NORMAL)
+
+
+def test_current_layer_cannot_be_hidden_or_locked(layer_handler):
+    layer_handler.set_visible("layer:0", False)
+    layer_handler.set_locked("layer:0", True)
+
+    assert layer_handler.is_visible("layer:0")
+    assert not layer_handler.is_locked("layer:0")
+    layer_handler.canvas.delete.assert_not_called()
+
+
+def test_hidden_or_locked_layer_cannot_become_current(layer_handler):
+    layer_handler.add_layer()
+    layer_handler.layers[0]['locked'] = True
+
+    layer_handler.set_current_layer("layer:0")
+
+    assert layer_handler.current_layer == "layer:1"
+
+
+def test_without_locked(layer_handler):
+    layer_handler.canvas.find_withtag = Mock(return_value=(2, 3))
+
+    assert layer_handler.without_locked([1, 2, 3, 4]) == [1, 4]
+    layer_handler.canvas.find_withtag.assert_called_once_with("locked")
+
+
+def test_hide_evicts_items_and_show_recreates_them(layer_handler):
+    board = layer_handler.board
+    layer_handler.add_layer()
+    board.objects = [1, 2, 3]
+    layer_handler.canvas.find_withtag = Mock(return_value=(1, 3))
+    board.file_handler.get_object_state = Mock(side_effect=lambda obj: {
+        1: dict(LINE, groups=["group:0"]),
+        3: dict(NOTE, symbol="symbol:0"),
+    }[obj])
+
+    layer_handler.set_visible("layer:0", False)
+
+    assert not layer_handler.is_visible("layer:0")
+    board.file_handler.cancel_svg_import.assert_called_once_with("layer:0")
+    board.notify_objects_changed.assert_called_once_with("delete", [1, 3])
+    layer_handler.canvas.delete.assert_called_once_with("layer:0")
+    assert board.objects == [2]
+    board.undo_handler.record_visibility.assert_called_once_with("layer:0", False)
+    assert [obj for obj, _ in layer_handler.get_hidden_objects()] == [1, 3]
+
+    board.file_handler.create_object_from_state = Mock(side_effect=[7, 8])
+    layer_handler.canvas.tag_lower = Mock()
+
+    layer_handler.set_visible("layer:0", True)
+
+    recreated_states = [state_call.args[0] for state_call in board.file_handler.create_object_from_state.call_args_list]
+    assert recreated_states == [dict(LINE, coords=[0.0, 0.0, 10.0, 0.0], groups=["group:0"]),
+                                dict(NOTE, coords=[0.0, 0.0, 10.0, 20.0], symbol="symbol:0")]
+    layer_handler.canvas.tag_lower.assert_called_once_with("layer:0", "layer:1")
+    board.undo_handler.alias_objects.assert_called_once_with([1, 3], [7, 8])
+    assert board.objects == [2, 7, 8]
+    board.notify_objects_changed.assert_called_with("create", [7, 8])
+    assert layer_handler.hidden_objects == {}
+
+
+def test_hidden_objects_keep_their_layer(layer_handler):
+    layer_handler.add_layer()
+    placeholders = layer_handler.add_hidden_objects([dict(LINE, layer="layer:1", **{'z-index': 4}),
+                                                     dict(NOTE, layer="layer:1", **{'z-index': 5})])
+
+    assert placeholders == [-1, -2]
+    hidden_objects = layer_handler.get_hidden_objects()
+    assert [obj for obj, _ in hidden_objects] == [-1, -2]
+    assert [(obj_state['layer'], obj_state['z-index']) for _, obj_state in hidden_objects] == [
+        ("layer:1", 0), ("layer:1", 1)]
+
+
+def test_load_layers_picks_topmost_editable_layer(layer_handler):
+    layer_handler.load_layers([
+        {'id': "layer:0", 'name': "Background", 'visible': True, 'locked': False},
+        {'id': "layer:3", 'name': "Ink", 'visible': True, 'locked': True},
+        {'id': "layer:5", 'name': "Notes", 'visible': False, 'locked': False},
+    ])
+
+    assert layer_handler.current_layer == "layer:0"
+    assert layer_handler.next_layer == 6
+    assert layer_handler.add_layer() == "layer:6"
+
+
+def test_lower_to_layer_bottom(layer_handler):
+    layer_handler.add_layer()
+    layer_handler.add_layer()
+    layer_handler.canvas.tag_raise = Mock(side_effect=[tk.TclError, None])
+
+    layer_handler.lower_to_layer_bottom(9, "layer:2")
+
+    assert layer_handler.canvas.tag_raise.call_args_list == [call(9, "layer:1"), call(9, "layer:0")]
+    layer_handler.canvas.tag_lower.assert_not_called()
+
+
+def test_clear_restores_default_layer(layer_handler):
+    layer_handler.add_layer()
+    layer_handler.add_hidden_objects([LINE])
+
+    layer_handler.clear()
+
+    assert layer_handler.get_layers_state() == []
+    assert layer_handler.hidden_objects == {}
+    assert layer_handler.current_layer == "layer:0"
+
+
+def test_get_objects_tag_matches_visible_layers(layer_handler):
+    layer_handler.add_layer()
+    layer_handler.add_layer()
+    layer_handler.layers[1]['visible'] = False
+
+    assert layer_handler.get_objects_tag() == "layer:0||layer:2"
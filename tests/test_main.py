@@ -1,6 +1,12 @@
+import json
 from unittest.mock import patch
 
+from batch_converter import BatchConverter
+from canvas_profiler import CanvasProfiler
+from event_recorder import EventRecorder
+from latency_monitor import LatencyMonitor
 from main import main
+from trace_recorder import TraceRecorder
 
 
 @patch('tkinter.Tk')
@@ -10,3 +16,65 @@ def test_main(mock_app, mock_tk):
     mock_tk.assert_called_once()
     mock_app.assert_called_once_with(mock_tk.return_value)
     mock_tk.return_value.mainloop.assert_called_once()
+
+
+@patch('tkinter.Tk')
+@patch('main.App')
+def test_main_enables_latency_monitor(mock_app, mock_tk):
+    with patch('sys.argv', ['main.py', '--latency-report', 'latency.json']), \
+            patch.object(LatencyMonitor, 'ENABLED', False), patch.object(LatencyMonitor, 'REPORT_PATH', None):
+        main()
+        assert LatencyMonitor.ENABLED is True
+        assert LatencyMonitor.REPORT_PATH == 'latency.json'
+
+
+@patch('tkinter.Tk')
+@patch('main.App')
+def test_main_enables_canvas_profiler(mock_app, mock_tk):
+    with patch('sys.argv', ['main.py', '--profile-canvas']), \
+            patch.object(CanvasProfiler, 'ENABLED', False), patch.object(CanvasProfiler, 'REPORT_PATH', None):
+        main()
+        assert CanvasProfiler.ENABLED is True
+        assert CanvasProfiler.REPORT_PATH is None
+
+
+@patch('tkinter.Tk')
+@patch('main.App')
+@patch.object(TraceRecorder, 'start')
+def test_main_starts_tracing(mock_start, mock_app, mock_tk):
+    with patch('sys.argv', ['main.py', '--trace', 'trace.json']):
+        main()
+    mock_start.assert_called_once_with('trace.json')
+
+
+@patch('tkinter.Tk')
+@patch('main.App')
+def test_main_enables_event_recording(mock_app, mock_tk):
+    with patch('sys.argv', ['main.py', '--record-events', 'session.events']), \
+            patch.object(EventRecorder, 'RECORD_PATH', None):
+        main()
+        assert EventRecorder.RECORD_PATH == 'session.events'
+
+
+@patch('tkinter.Tk')
+@patch('main.App')
+@patch('main.StallWatchdog')
+def test_main_starts_stall_watchdog(mock_watchdog, mock_app, mock_tk):
+    with patch('sys.argv', ['main.py', '--stall-log', 'stalls.log', '--stall-threshold', '250']):
+        main()
+    mock_watchdog.assert_called_once_with(mock_tk.return_value, 'stalls.log', 250)
+    mock_watchdog.return_value.start.assert_called_once()
+
+
+@patch('tkinter.Tk')
+@patch.object(BatchConverter, 'run', return_value={'converted': 1})
+@patch.object(BatchConverter, '__init__', return_value=None)
+def test_main_converts_boards(mock_init, mock_run, mock_tk, tmp_path):
+    summary_path = tmp_path / "summary.json"
+    with patch('sys.argv', ['main.py', '--convert', 'boards', '--convert-format', 'png',
+                            '--convert-format', 'svg', '--convert-workers', '2',
+                            '--convert-summary', str(summary_path)]):
+        main()
+    mock_init.assert_called_once_with('boards', None, ['png', 'svg'], 2, False)
+    assert json.loads(summary_path.read_text()) == {'converted': 1}
+    mock_tk.assert_not_called()
@@ -1,7 +1,11 @@
+import queue
+import threading
 import tkinter as tk
 from unittest.mock import Mock, patch
 import pytest
+from PIL import Image
 
+from autosave_handler import AutosaveHandler
 from menu import Menu
 
 
@@ -54,3 +58,87 @@ def test_menu_hide(parent):
     with patch.object(menu.frame, 'pack_forget') as mock_pack_forget:
         menu.hide()
         mock_pack_forget.assert_called_once()
+
+
+def test_menu_prompt_recovery_loads_autosave(parent):
+    menu = Menu(parent)
+    with patch('menu.AutosaveHandler.has_recovery_file', return_value=True), \
+            patch('menu.messagebox.askyesno', return_value=True), \
+            patch.object(parent, 'load_board') as mock_load_board:
+        menu.prompt_recovery()
+        mock_load_board.assert_called_once_with(AutosaveHandler.AUTOSAVE_PATH)
+
+
+def test_menu_prompt_recovery_declined_removes_autosave(parent):
+    menu = Menu(parent)
+    with patch('menu.AutosaveHandler.has_recovery_file', return_value=True), \
+            patch('menu.messagebox.askyesno', return_value=False), \
+            patch('menu.os.remove') as mock_remove, \
+            patch.object(parent, 'load_board') as mock_load_board:
+        menu.prompt_recovery()
+        mock_remove.assert_called_once_with(AutosaveHandler.AUTOSAVE_PATH)
+        mock_load_board.assert_not_called()
+
+
+def test_menu_prompt_recovery_without_autosave(parent):
+    menu = Menu(parent)
+    with patch('menu.AutosaveHandler.has_recovery_file', return_value=False), \
+            patch('menu.messagebox.askyesno') as mock_askyesno:
+        menu.prompt_recovery()
+        mock_askyesno.assert_not_called()
+
+
+def test_menu_show_lists_boards(parent):
+    menu = Menu(parent)
+    with patch('menu.RecentBoards.get_boards', return_value=['/boards/a.pcso', '/boards/b.pcso']), \
+            patch.object(menu, 'load_thumbnails'):
+        menu.show()
+    assert list(menu.board_buttons) == ['/boards/a.pcso', '/boards/b.pcso']
+    assert menu.board_buttons['/boards/a.pcso'].cget('text') == 'a'
+    menu.hide()
+
+
+def test_menu_board_button_loads_board(parent):
+    menu = Menu(parent)
+    with patch('menu.RecentBoards.get_boards', return_value=['/boards/a.pcso']), \
+            patch.object(menu, 'load_thumbnails'), \
+            patch.object(parent, 'load_board') as mock_load_board:
+        menu.refresh_boards()
+        menu.board_buttons['/boards/a.pcso'].invoke()
+        mock_load_board.assert_called_once_with('/boards/a.pcso')
+    menu.stop_thumbnails()
+
+
+def test_menu_load_thumbnails_queues_previews(parent):
+    menu = Menu(parent)
+    image = Image.new("RGB", (4, 4))
+    results = queue.Queue()
+    with patch.object(menu.thumbnail_cache, 'get_thumbnail', side_effect=[image, ValueError]):
+        menu.load_thumbnails(['a.pcso', 'b.pcso'], threading.Event(), results)
+    assert results.get_nowait() == ('a.pcso', image)
+    assert results.get_nowait() == ('b.pcso', None)
+
+
+def test_menu_load_thumbnails_stops(parent):
+    menu = Menu(parent)
+    stop = threading.Event()
+    stop.set()
+    results = queue.Queue()
+    with patch.object(menu.thumbnail_cache, 'get_thumbnail') as mock_get_thumbnail:
+        menu.load_thumbnails(['a.pcso'], stop, results)
+    mock_get_thumbnail.assert_not_called()
+    assert results.empty()
+
+
+def test_menu_poll_thumbnails_shows_previews(parent):
+    menu = Menu(parent)
+    with patch('menu.RecentBoards.get_boards', return_value=['a.pcso']), \
+            patch.object(menu, 'load_thumbnails'):
+        menu.refresh_boards()
+    menu.worker.join()
+    menu.thumbnail_queue.put(('a.pcso', Image.new("RGB", (4, 4))))
+    menu.thumbnail_queue.put(('other.pcso', Image.new("RGB", (4, 4))))
+    menu.poll_thumbnails()
+    assert list(menu.thumbnails) == ['a.pcso']
+    assert menu.board_buttons['a.pcso'].cget('image') == str(menu.thumbnails['a.pcso'])
+    assert menu.after_id is None
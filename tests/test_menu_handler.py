@@ -73,3 +73,18 @@ def test_display_shape_context_menu(mock_post, menu_handler):
     event = Mock()
     menu_handler.display_shape_context_menu(event)
     mock_post.assert_called_once_with(event.x_root, event.y_root)
+
+
+def test_display_selection_context_menu(menu_handler):
+    event = Mock()
+    with patch.object(menu_handler, 'display_shape_context_menu') as mock_display_shape_context_menu:
+        menu_handler.display_selection_context_menu(event, {"rectangle", "oval"})
+        mock_display_shape_context_menu.assert_called_once_with(event)
+
+    with patch.object(menu_handler, 'display_text_context_menu') as mock_display_text_context_menu:
+        menu_handler.display_selection_context_menu(event, {"text"})
+        mock_display_text_context_menu.assert_called_once_with(event)
+
+    with patch.object(menu_handler, 'display_mixed_context_menu') as mock_display_mixed_context_menu:
+        menu_handler.display_selection_context_menu(event, {"line", "text"})
+        mock_display_mixed_context_menu.assert_called_once_with(event)
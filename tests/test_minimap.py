@@ -0,0 +1,132 @@
+import tkinter as tk
+from unittest.mock import Mock, patch
+
+import pytest
+
+from minimap import Minimap
+
+
+@pytest.fixture
+def minimap():
+    board = Mock()
+    board.canvas = Mock(spec=tk.Canvas)
+    board.CANVAS_SCROLLREGION = (-5000, -5000, 5000, 5000)
+    board.CHANGE_DELETE = "delete"
+    with patch('minimap.tk.Canvas'), patch('minimap.ImageTk.PhotoImage'):
+        minimap = Minimap(board)
+    return minimap
+
+
+def test_init_registers_listener_and_scroll_commands(minimap):
+    minimap.board.add_objects_changed_listener.assert_called_once_with(minimap.on_objects_changed)
+    minimap.canvas.config.assert_called_once_with(xscrollcommand=minimap.handle_x_scroll,
+                                                  yscrollcommand=minimap.handle_y_scroll)
+    assert minimap.scale == 0.02
+
+
+def test_on_objects_changed_marks_only_touched_region(minimap):
+    minimap.canvas.bbox = Mock(return_value=(0, 0, 100, 50))
+
+    minimap.on_objects_changed("create", [1])
+
+    assert minimap.object_bboxes == {1: (0, 0, 100, 50)}
+    assert minimap.dirty_regions == [(0, 0, 100, 50)]
+    minimap.minimap_canvas.after_idle.assert_called_once_with(minimap.render_dirty_region)
+
+
+def test_on_objects_changed_move_includes_old_and_new_bbox(minimap):
+    minimap.object_bboxes = {1: (0, 0, 10, 10)}
+    minimap.canvas.bbox = Mock(return_value=(500, 500, 510, 510))
+
+    minimap.on_objects_changed("move", [1])
+
+    assert minimap.dirty_regions == [(0, 0, 10, 10), (500, 500, 510, 510)]
+    assert minimap.object_bboxes == {1: (500, 500, 510, 510)}
+
+
+def test_on_objects_changed_delete_forgets_object(minimap):
+    minimap.object_bboxes = {1: (0, 0, 10, 10)}
+    minimap.canvas.bbox = Mock()
+
+    minimap.on_objects_changed("delete", [1])
+
+    minimap.canvas.bbox.assert_not_called()
+    assert minimap.object_bboxes == {}
+    assert minimap.dirty_regions == [(0, 0, 10, 10)]
+
+
+def test_render_dirty_region_draws_known_objects_in_region(minimap):
+    minimap.object_bboxes = {1: (0, 0, 1000, 1000)}
+    minimap.dirty_regions = [(0, 0, 1000, 1000)]
+    minimap.canvas.find_overlapping = Mock(return_value=(1, 2))
+    minimap.board.file_handler.get_object_state = Mock(return_value={
+        'type': 'rectangle', 'coords': [0, 0, 1000, 1000], 'fill': 'black', 'outline': 'black', 'width': '1'})
+
+    minimap.render_dirty_region()
+
+    minimap.board.file_handler.get_object_state.assert_called_once_with(1)
+    assert minimap.image.getpixel((110, 110)) == (0, 0, 0)
+    assert minimap.image.getpixel((90, 90)) == (255, 255, 255)
+    minimap.photo.paste.assert_called_once_with(minimap.image)
+    assert minimap.dirty_regions == []
+
+
+def test_mark_dirty_merges_only_overlapping_regions(minimap):
+    minimap.mark_dirty((0, 0, 10, 10))
+    minimap.mark_dirty((100, 100, 110, 110))
+    minimap.mark_dirty((5, 5, 105, 20))
+
+    assert minimap.dirty_regions == [(100, 100, 110, 110), (0, 0, 105, 20)]
+
+    minimap.mark_dirty((50, 15, 60, 105))
+
+    assert minimap.dirty_regions == [(0, 0, 110, 110)]
+
+
+def test_mark_dirty_merges_all_regions_past_limit(minimap):
+    for i in range(Minimap.MAX_DIRTY_REGIONS):
+        minimap.mark_dirty((i * 100, 0, i * 100 + 10, 10))
+    assert len(minimap.dirty_regions) == Minimap.MAX_DIRTY_REGIONS
+
+    minimap.mark_dirty((0, 1000, 10, 1010))
+
+    assert minimap.dirty_regions == [(0, 0, (Minimap.MAX_DIRTY_REGIONS - 1) * 100 + 10, 1010)]
+
+
+def test_render_dirty_region_renders_each_region(minimap):
+    minimap.object_bboxes = {1: (-5000, -5000, -4000, -4000), 2: (4000, 4000, 5000, 5000)}
+    minimap.dirty_regions = [(-5000, -5000, -4000, -4000), (4000, 4000, 5000, 5000)]
+    minimap.canvas.find_overlapping = Mock(side_effect=[(1,), (2,)])
+    minimap.board.file_handler.get_object_state = Mock(side_effect=lambda obj: {
+        'type': 'rectangle', 'coords': list(minimap.object_bboxes[obj]), 'fill': 'black', 'outline': 'black',
+        'width': '1'})
+
+    with patch.object(minimap.image, 'paste', wraps=minimap.image.paste) as mock_paste:
+        minimap.render_dirty_region()
+
+    assert [paste_call.args[0].size for paste_call in mock_paste.call_args_list] == [(21, 21), (20, 20)]
+    assert minimap.image.getpixel((5, 5)) == (0, 0, 0)
+    assert minimap.image.getpixel((195, 195)) == (0, 0, 0)
+    assert minimap.image.getpixel((100, 100)) == (255, 255, 255)
+    minimap.photo.paste.assert_called_once_with(minimap.image)
+
+
+def test_update_viewport(minimap):
+    minimap.canvas.xview = Mock(return_value=(0.25, 0.5))
+    minimap.canvas.yview = Mock(return_value=(0.5, 0.75))
+
+    minimap.update_viewport()
+
+    minimap.minimap_canvas.coords.assert_called_once_with(minimap.viewport, 50, 100, 100, 150)
+
+
+def test_jump_to_centers_view(minimap):
+    event = Mock()
+    event.x, event.y = 100, 50
+    minimap.canvas.xview = Mock(return_value=(0.0, 0.2))
+    minimap.canvas.yview = Mock(return_value=(0.0, 0.1))
+
+    minimap.jump_to(event)
+
+    minimap.canvas.xview_moveto.assert_called_once_with(pytest.approx(0.4))
+    minimap.canvas.yview_moveto.assert_called_once_with(pytest.approx(0.2))
@@ -1,6 +1,7 @@
 import tkinter as tk
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, call, patch
+from clipboard import Clipboard
 from object_editor import ObjectEditor
 
 
@@ -12,40 +13,33 @@ def object_editor():
 
 
 def test_copy_selected_object(object_editor):
-    object_editor.object_selector.selected_objects = [1]
-    object_editor.canvas.coords = Mock(return_value=[10, 10, 20, 20])
-    object_editor.canvas.type = Mock(return_value="rectangle")
-    object_editor.canvas.itemcget = Mock(side_effect=["red", "2", "blue", "Text", "Arial"])
+    object_editor.object_selector.selected_objects = [2, 1]
+    object_editor.canvas.find_all = Mock(return_value=(1, 2))
+    object_editor.board.file_handler.get_object_state = Mock(side_effect=[
+        {'type': 'rectangle', 'coords': [10, 10, 20, 20], 'fill': 'red', 'width': '2', 'outline': 'blue'},
+        {'type': 'rectangle', 'coords': [30, 30, 40, 40], 'fill': 'red', 'width': '2', 'outline': 'blue'},
+    ])
 
     object_editor.copy_selected_object()
 
-    assert object_editor.copied_object == {
-        'coords': [10, 10, 20, 20],
-        'type': 'rectangle',
-        'fill': 'red',
-        'outline': 'blue',
-        'width': '2',
-        'text': None,
-        'font': None
-    }
+    object_editor.board.file_handler.get_object_state.assert_has_calls([call(1), call(2)])
+    assert len(object_editor.clipboard) == 2
+    assert object_editor.clipboard.styles == [{'type': 'rectangle', 'fill': 'red', 'width': '2', 'outline': 'blue'}]
 
 
-def test_paste_object_at_position_for_line(object_editor):
+def paste_states(object_editor, objects_state):
     object_editor.board.right_click_x, object_editor.board.right_click_y = 100, 100
-    object_editor.copied_object = {
-        'coords': [10, 10, 20, 20],
-        'type': 'line',
-        'fill': 'red',
-        'outline': None,
-        'width': '2',
-        'text': None,
-        'font': None
-    }
-    object_editor.canvas.create_line = Mock(return_value=1)
+    object_editor.clipboard = Clipboard.from_states(objects_state)
     object_editor.board.objects = []  # Initialize board.objects as an empty list
-
+    object_editor.board.undo_handler = Mock()
     object_editor.paste_object_at_position()
 
+
+def test_paste_object_at_position_for_line(object_editor):
+    object_editor.canvas.create_line = Mock(return_value=1)
+
+    paste_states(object_editor, [{'type': 'line', 'coords': [10, 10, 20, 20], 'fill': 'red', 'width': '2'}])
+
     # Calculate the expected coordinates for the pasted line
     x1, y1, x2, y2 = 10, 10, 20, 20
     center_x = (x1 + x2) / 2
@@ -60,23 +54,26 @@ def test_paste_object_at_position_for_line(object_editor):
     object_editor.canvas.create_line.assert_called_once_with(expected_x1, expected_y1, expected_x2, expected_y2,
                                                              fill='red', width='2', tags=('object0',))
     assert object_editor.board.objects == [1]
+    object_editor.board.undo_handler.record_create.assert_called_once_with([1])
+
+
+def test_paste_symbol_instance_keeps_symbol_tag(object_editor):
+    object_editor.canvas.create_line = Mock(return_value=1)
+    object_editor.canvas.addtag_withtag = Mock()
+
+    paste_states(object_editor, [{'type': 'line', 'coords': [10, 10, 20, 20], 'fill': 'red', 'width': '2',
+                                  'symbol': "symbol:3"}])
+
+    object_editor.canvas.create_line.assert_called_once_with(95, 95, 105, 105, fill='red', width='2',
+                                                             tags=('object0',))
+    object_editor.canvas.addtag_withtag.assert_called_once_with("symbol:3", 1)
 
 
 def test_paste_object_at_position_for_text(object_editor):
-    object_editor.board.right_click_x, object_editor.board.right_click_y = 100, 100
-    object_editor.copied_object = {
-        'coords': [10, 10],
-        'type': 'text',
-        'fill': 'red',
-        'outline': None,
-        'width': '2',
-        'text': 'Hello',
-        'font': 'Arial'
-    }
     object_editor.canvas.create_text = Mock(return_value=1)
-    object_editor.board.objects = []  # Initialize board.objects as an empty list
 
-    object_editor.paste_object_at_position()
+    paste_states(object_editor, [{'type': 'text', 'coords': [10, 10], 'fill': 'red', 'width': '0', 'font': 'Arial',
+                                  'text': 'Hello'}])
 
     object_editor.canvas.create_text.assert_called_once_with(100, 100, text='Hello', font='Arial', fill='red',
                                                              tags=('object0',))
@@ -84,20 +81,10 @@ def test_paste_object_at_position_for_text(object_editor):
 
 
 def test_paste_object_at_position_for_polygon(object_editor):
-    object_editor.board.right_click_x, object_editor.board.right_click_y = 100, 100
-    object_editor.copied_object = {
-        'coords': [10, 10, 20, 20, 30, 30],
-        'type': 'polygon',
-        'fill': 'red',
-        'outline': 'blue',
-        'width': '2',
-        'text': None,
-        'font': None
-    }
     object_editor.canvas.create_polygon = Mock(return_value=1)
-    object_editor.board.objects = []  # Initialize board.objects as an empty list
 
-    object_editor.paste_object_at_position()
+    paste_states(object_editor, [{'type': 'polygon', 'coords': [10, 10, 20, 20, 30, 30], 'fill': 'red', 'width': '2',
+                                  'outline': 'blue'}])
 
     object_editor.canvas.create_polygon.assert_called_once_with(90, 90, 100, 100, 110, 110, fill='red', outline='blue',
                                                                 width='2', tags=('object0',))
@@ -105,84 +92,250 @@ def test_paste_object_at_position_for_polygon(object_editor):
 
 
 def test_paste_object_at_position_for_rectangle(object_editor):
-    object_editor.board.right_click_x, object_editor.board.right_click_y = 100, 100
-    object_editor.copied_object = {
-        'coords': [10, 10, 20, 20],
-        'type': 'rectangle',
-        'fill': 'red',
-        'outline': 'blue',
-        'width': '2',
-        'text': None,
-        'font': None
-    }
     object_editor.canvas.create_rectangle = Mock(return_value=1)
-    object_editor.board.objects = []  # Initialize board.objects as an empty list
 
-    object_editor.paste_object_at_position()
+    paste_states(object_editor, [{'type': 'rectangle', 'coords': [10, 10, 20, 20], 'fill': 'red', 'width': '2',
+                                  'outline': 'blue'}])
 
     object_editor.canvas.create_rectangle.assert_called_once_with(95, 95, 105, 105, fill='red', outline='blue',
                                                                    width='2', tags=('object0',))
     assert object_editor.board.objects == [1]
 
 
-def test_delete_selected_object(object_editor):
+def test_paste_object_at_position_for_several_objects(object_editor):
+    object_editor.canvas.create_line = Mock(side_effect=[1, 3])
+    object_editor.canvas.create_oval = Mock(return_value=2)
+
+    paste_states(object_editor, [
+        {'type': 'line', 'coords': [0, 0, 10, 10], 'fill': 'red', 'width': '2'},
+        {'type': 'oval', 'coords': [10, 10, 20, 20], 'fill': 'red', 'width': '2', 'outline': 'red'},
+        {'type': 'line', 'coords': [20, 20, 20, 40], 'fill': 'red', 'width': '2'},
+    ])
+
+    assert object_editor.canvas.create_line.call_args_list == [
+        call(90, 80, 100, 90, fill='red', width='2', tags=('object0',)),
+        call(110, 100, 110, 120, fill='red', width='2', tags=('object2',)),
+    ]
+    object_editor.canvas.create_oval.assert_called_once_with(100, 90, 110, 100, fill='red', width='2', outline='red',
+                                                             tags=('object1',))
+    assert object_editor.board.objects == [1, 2, 3]
+    object_editor.board.notify_objects_changed.assert_called_with(object_editor.board.CHANGE_CREATE, [1, 2, 3])
+    object_editor.board.undo_handler.record_create.assert_called_once_with([1, 2, 3])
+
+
+def test_group_selected_objects(object_editor):
+    object_editor.object_selector.selected_objects = [1, 2]
+    object_editor.object_selector.selected_types = {"line", "oval"}
+    object_editor.board.group_handler.group_types = {}
+    object_editor.board.group_handler.create_group = Mock(return_value="group:3")
+    object_editor.board.undo_handler = Mock()
+    object_editor.canvas.addtag_withtag = Mock()
+
+    object_editor.group_selected_objects()
+
+    object_editor.canvas.addtag_withtag.assert_has_calls([
+        call("group:3", "selected"),
+        call("member:outlined", "selected_outlined"),
+        call("member:text", "selected_text"),
+        call("member:image", "selected_image"),
+    ])
+    assert object_editor.board.group_handler.group_types == {"group:3": {"line", "oval"}}
+    object_editor.board.undo_handler.record_tag.assert_called_once_with([1, 2], "group:3", added=True)
+
+
+def test_group_single_object_does_nothing(object_editor):
     object_editor.object_selector.selected_objects = [1]
+    object_editor.board.undo_handler = Mock()
+
+    object_editor.group_selected_objects()
+
+    object_editor.board.undo_handler.record_tag.assert_not_called()
+
+
+def test_ungroup_selected_objects(object_editor):
+    object_editor.object_selector.selected_objects = [1, 2, 3]
+    groups = {1: "group:1", 2: "group:1", 3: None}
+    object_editor.board.group_handler.get_outermost_group = Mock(side_effect=groups.get)
+    object_editor.board.undo_handler = Mock()
+    object_editor.canvas.find_withtag = Mock(return_value=(1, 2))
+    object_editor.canvas.dtag = Mock()
+
+    object_editor.ungroup_selected_objects()
+
+    object_editor.canvas.dtag.assert_called_once_with("group:1")
+    object_editor.board.undo_handler.assert_has_calls([
+        call.begin_group(), call.record_tag([1, 2], "group:1", added=False), call.end_group()])
+
+
+def test_create_symbol_from_selection(object_editor):
+    object_editor.object_selector.selected_objects = [2, 1]
+    object_editor.object_selector.selected_types = {"line"}
+    object_editor.canvas.find_all = Mock(return_value=(1, 2))
+    object_editor.canvas.find_withtag = Mock(return_value=(1, 2))
+    object_editor.canvas.addtag_withtag = Mock()
+    object_editor.canvas.dtag = Mock()
+    objects_state = [{'type': 'line', 'coords': [0, 0, 1, 1], 'groups': ["group:0"]},
+                     {'type': 'line', 'coords': [2, 2, 3, 3], 'groups': ["group:0"]}]
+    object_editor.board.file_handler.get_object_state = Mock(side_effect=objects_state)
+    object_editor.board.symbol_handler.create_symbol = Mock(return_value="symbol:1")
+    object_editor.board.group_handler.group_types = {}
+    object_editor.board.group_handler.create_group = Mock(return_value="group:4")
+    object_editor.board.undo_handler = Mock()
+
+    object_editor.create_symbol_from_selection()
+
+    object_editor.board.symbol_handler.create_symbol.assert_called_once_with(objects_state)
+    object_editor.canvas.dtag.assert_called_once_with("selected", "group:0")
+    object_editor.canvas.addtag_withtag.assert_any_call("group:4", "selected")
+    object_editor.canvas.addtag_withtag.assert_any_call("symbol:1", "selected")
+    object_editor.board.undo_handler.assert_has_calls([
+        call.begin_group(),
+        call.record_tag([1, 2], "group:0", added=False),
+        call.record_tag([2, 1], "group:4", added=True),
+        call.record_tag([1, 2], "symbol:1", added=True),
+        call.end_group(),
+    ])
+
+
+def test_delete_selected_object(object_editor):
+    object_editor.object_selector.selected_objects = [1, 3]
     object_editor.canvas.delete = Mock()
-    object_editor.board.objects = [1]
+    object_editor.board.objects = [1, 2, 3]
+    object_editor.board.undo_handler = Mock()
 
     object_editor.delete_selected_object()
 
-    object_editor.canvas.delete.assert_any_call(1)
-    object_editor.canvas.delete.assert_any_call("selection_frame")
-    assert object_editor.board.objects == []
-    assert object_editor.object_selector.selected_objects == []
-    assert object_editor.object_selector.selection_frame is None
+    object_editor.board.undo_handler.record_delete.assert_called_once_with([1, 3])
+    assert object_editor.canvas.delete.call_args_list == [call("selected"), call("selection_frame")]
+    assert object_editor.board.objects == [2]
+    object_editor.object_selector.deselect_current_objects.assert_called_once()
 
 
 @patch('object_editor.colorchooser.askcolor', return_value=("", "#FF0000"))
 def test_change_selected_object_color_for_line(askcolor_mock, object_editor):
     object_editor.object_selector.selected_objects = [1]
-    object_editor.canvas.type = Mock(return_value="line")
+    object_editor.object_selector.selected_types = {"line"}
+    object_editor.canvas.find_withtag = Mock(return_value=())
     object_editor.canvas.itemconfig = Mock()
+    object_editor.board.undo_handler = Mock()
 
     object_editor.change_selected_object_color()
 
-    object_editor.canvas.itemconfig.assert_called_once_with(1, fill="#FF0000")
+    object_editor.canvas.itemconfig.assert_called_once_with("selected&&!selected_image", fill="#FF0000")
+    object_editor.board.undo_handler.record_restyle.assert_any_call([1], {'fill': "#FF0000"})
 
 
 @patch('object_editor.colorchooser.askcolor', return_value=("", "#FF0000"))
 def test_change_selected_object_color_for_rectangle(askcolor_mock, object_editor):
     object_editor.object_selector.selected_objects = [1]
-    object_editor.canvas.type = Mock(return_value="rectangle")
+    object_editor.object_selector.selected_types = {"rectangle"}
+    object_editor.canvas.find_withtag = Mock(return_value=(1,))
+    object_editor.canvas.itemconfig = Mock()
+    object_editor.board.undo_handler = Mock()
+
+    object_editor.change_selected_object_color()
+
+    assert object_editor.canvas.itemconfig.call_args_list == [call("selected&&!selected_image", fill="#FF0000"),
+                                                              call("selected_outlined", outline="#FF0000")]
+    object_editor.board.undo_handler.record_restyle.assert_any_call([1], {'fill': "#FF0000", 'outline': "#FF0000"})
+
+
+@patch('object_editor.colorchooser.askcolor', return_value=("", "#FF0000"))
+def test_change_selected_object_color_for_mixed_selection(askcolor_mock, object_editor):
+    object_editor.object_selector.selected_objects = [1, 2, 3]
+    object_editor.object_selector.selected_types = {"line", "oval", "text"}
+    object_editor.canvas.find_withtag = Mock(return_value=(2,))
     object_editor.canvas.itemconfig = Mock()
+    object_editor.board.undo_handler = Mock()
+    object_editor.toolbox.text_color = "black"
 
     object_editor.change_selected_object_color()
 
-    object_editor.canvas.itemconfig.assert_called_once_with(1, fill="#FF0000", outline="#FF0000")
+    assert object_editor.canvas.itemconfig.call_count == 2
+    undo_handler = object_editor.board.undo_handler
+    undo_handler.begin_group.assert_called_once()
+    undo_handler.record_restyle.assert_any_call([1, 3], {'fill': "#FF0000"})
+    undo_handler.record_restyle.assert_any_call([2], {'fill': "#FF0000", 'outline': "#FF0000"})
+    undo_handler.end_group.assert_called_once()
+    assert object_editor.toolbox.text_color == "#FF0000"
+    object_editor.board.notify_objects_changed.assert_called_with(object_editor.board.CHANGE_RESTYLE, [1, 2, 3])
 
 
 @patch('object_editor.WidthDialog')
 def test_change_selected_object_width(width_dialog_mock, object_editor):
     width_dialog_instance = width_dialog_mock.return_value
     width_dialog_instance.result = 5
-    object_editor.object_selector.selected_objects = [1]
+    object_editor.object_selector.selected_objects = [1, 2, 3]
+    object_editor.object_selector.selected_types = {"line", "text"}
+    object_editor.canvas.find_withtag = Mock(return_value=(2,))
     object_editor.canvas.itemcget = Mock(return_value="2")
     object_editor.canvas.itemconfig = Mock()
     object_editor.board.app.get_root().wait_window = Mock()
+    object_editor.board.undo_handler = Mock()
 
     object_editor.change_selected_object_width()
 
     width_dialog_mock.assert_called_once_with(object_editor.board.app.get_root(), '2')
     object_editor.board.app.get_root().wait_window.assert_called_once_with(width_dialog_instance)
-    object_editor.canvas.itemconfig.assert_called_once_with(1, width=5)
+    object_editor.canvas.itemconfig.assert_called_once_with("selected&&!selected_image&&!selected_text", width=5)
+    object_editor.board.undo_handler.record_restyle.assert_called_once_with([1, 3], {'width': 5})
+
+
+@patch('object_editor.colorchooser.askcolor', return_value=("", "#FF0000"))
+def test_change_selected_object_color_skips_images(askcolor_mock, object_editor):
+    object_editor.object_selector.selected_objects = [1, 2]
+    object_editor.object_selector.selected_types = {"rectangle", "image"}
+    object_editor.canvas.find_withtag = Mock(side_effect=lambda tag: {"selected_image": (2,),
+                                                                      "selected_outlined": (1,)}[tag])
+    object_editor.canvas.itemconfig = Mock()
+    object_editor.board.undo_handler = Mock()
+
+    object_editor.change_selected_object_color()
+
+    assert object_editor.canvas.itemconfig.call_args_list == [call("selected&&!selected_image", fill="#FF0000"),
+                                                              call("selected_outlined", outline="#FF0000")]
+    undo_handler = object_editor.board.undo_handler
+    assert undo_handler.record_restyle.call_args_list == [call([], {'fill': "#FF0000"}),
+                                                          call([1], {'fill': "#FF0000", 'outline': "#FF0000"})]
+    object_editor.board.notify_objects_changed.assert_called_with(object_editor.board.CHANGE_RESTYLE, [1])
+
+
+@patch('object_editor.WidthDialog')
+def test_change_selected_object_width_skips_images(width_dialog_mock, object_editor):
+    width_dialog_mock.return_value.result = 4
+    object_editor.object_selector.selected_objects = [1, 2]
+    object_editor.object_selector.selected_types = {"rectangle", "image"}
+    object_editor.canvas.find_withtag = Mock(side_effect=lambda tag: {"selected_text": (),
+                                                                      "selected_image": (2,)}[tag])
+    object_editor.canvas.itemcget = Mock(return_value="2")
+    object_editor.canvas.itemconfig = Mock()
+    object_editor.board.app.get_root().wait_window = Mock()
+    object_editor.board.undo_handler = Mock()
+
+    object_editor.change_selected_object_width()
+
+    object_editor.canvas.itemcget.assert_called_once_with(1, 'width')
+    object_editor.canvas.itemconfig.assert_called_once_with("selected&&!selected_image&&!selected_text", width=4)
+    object_editor.board.undo_handler.record_restyle.assert_called_once_with([1], {'width': 4})
+
+
+@patch('object_editor.WidthDialog')
+def test_change_selected_object_width_ignores_text_selection(width_dialog_mock, object_editor):
+    object_editor.object_selector.selected_objects = [1]
+    object_editor.object_selector.selected_types = {"text"}
+
+    object_editor.change_selected_object_width()
+
+    width_dialog_mock.assert_not_called()
 
 
 @patch('object_editor.FontDialog')
 def test_change_selected_object_font(font_dialog_mock, object_editor):
     font_dialog_instance = font_dialog_mock.return_value
     font_dialog_instance.result = "Arial"
-    object_editor.object_selector.selected_objects = [1]
-    object_editor.canvas.type = Mock(return_value="text")
+    object_editor.object_selector.selected_objects = [1, 2]
+    object_editor.object_selector.selected_types = {"text", "line"}
+    object_editor.canvas.find_withtag = Mock(return_value=(1,))
     object_editor.canvas.itemcget = Mock(return_value="Helvetica 12")
     object_editor.canvas.itemconfig = Mock()
     object_editor.board.app.get_root().wait_window = Mock()
@@ -192,7 +345,7 @@ def test_change_selected_object_font(font_dialog_mock, object_editor):
     object_editor.canvas.itemcget.assert_called_once_with(1, "font")
     font_dialog_mock.assert_called_once_with(object_editor.board.app.get_root(), "Helvetica")
     object_editor.board.app.get_root().wait_window.assert_called_once_with(font_dialog_instance)
-    object_editor.canvas.itemconfig.assert_called_once_with(1, font=("Arial", "12"))
+    object_editor.canvas.itemconfig.assert_called_once_with("selected_text", font=("Arial", "12"))
 
 
 @patch('object_editor.FontSizeDialog')
@@ -200,7 +353,8 @@ def test_change_selected_object_font_size(font_size_dialog_mock, object_editor):
     font_size_dialog_instance = font_size_dialog_mock.return_value
     font_size_dialog_instance.result = "16"
     object_editor.object_selector.selected_objects = [1]
-    object_editor.canvas.type = Mock(return_value="text")
+    object_editor.object_selector.selected_types = {"text"}
+    object_editor.canvas.find_withtag = Mock(return_value=(1,))
     object_editor.canvas.itemcget = Mock(return_value="Helvetica 12")
     object_editor.canvas.itemconfig = Mock()
     object_editor.board.app.get_root().wait_window = Mock()
@@ -211,23 +365,25 @@ def test_change_selected_object_font_size(font_size_dialog_mock, object_editor):
     object_editor.canvas.itemcget.assert_called_once_with(1, "font")
     font_size_dialog_mock.assert_called_once_with(object_editor.board.app.get_root(), "12")
     object_editor.board.app.get_root().wait_window.assert_called_once_with(font_size_dialog_instance)
-    object_editor.canvas.itemconfig.assert_called_once_with(1, font=("Helvetica", "16"))
+    object_editor.canvas.itemconfig.assert_called_once_with("selected_text", font=("Helvetica", "16"))
     object_editor.object_selector.draw_selection_frame.assert_called_once()
 
 
 def test_move_selected_object_to_front(object_editor):
-    object_editor.object_selector.selected_objects = [1]
-    object_editor.canvas.tag_raise = Mock()
+    object_editor.object_selector.selected_objects = [1, 2]
+    object_editor.board.undo_handler = Mock()
 
     object_editor.move_selected_object_to_front()
 
-    object_editor.canvas.tag_raise.assert_called_once_with(1)
+    object_editor.board.layer_handler.raise_within_layers.assert_called_once_with("selected")
+    object_editor.board.undo_handler.record_reorder.assert_called_once_with([1, 2], to_front=True)
 
 
 def test_move_selected_object_to_back(object_editor):
-    object_editor.object_selector.selected_objects = [1]
-    object_editor.canvas.tag_lower = Mock()
+    object_editor.object_selector.selected_objects = [1, 2]
+    object_editor.board.undo_handler = Mock()
 
     object_editor.move_selected_object_to_back()
 
-    object_editor.canvas.tag_lower.assert_called_once_with(1)
+    object_editor.board.layer_handler.lower_within_layers.assert_called_once_with("selected")
+    object_editor.board.undo_handler.record_reorder.assert_called_once_with([1, 2], to_front=False)
@@ -37,9 +37,8 @@ def test_continue_move(object_mover):
 
     object_mover.continue_move(event)
 
-    assert object_mover.canvas.move.call_count == 3
-    object_mover.canvas.move.assert_any_call(1, 50, 50)
-    object_mover.canvas.move.assert_any_call(2, 50, 50)
+    assert object_mover.canvas.move.call_count == 2
+    object_mover.canvas.move.assert_any_call("selected", 50, 50)
     object_mover.canvas.move.assert_any_call("selection_frame", 50, 50)
     assert object_mover.drag_start_x == 150
     assert object_mover.drag_start_y == 150
@@ -66,9 +65,8 @@ def test_perform_move(object_mover):
 
     object_mover.perform_move(event)
 
-    assert object_mover.canvas.move.call_count == 3
-    object_mover.canvas.move.assert_any_call(1, 50, 50)
-    object_mover.canvas.move.assert_any_call(2, 50, 50)
+    assert object_mover.canvas.move.call_count == 2
+    object_mover.canvas.move.assert_any_call("selected", 50, 50)
     object_mover.canvas.move.assert_any_call("selection_frame", 50, 50)
     assert object_mover.board.last_x == 150
     assert object_mover.board.last_y == 150
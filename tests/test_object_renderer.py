@@ -0,0 +1,91 @@
+import io
+
+from PIL import Image
+
+from clipboard import Clipboard
+from image_pyramid import ImagePyramid
+from object_renderer import ObjectRenderer
+
+
+def test_transform_coords():
+    renderer = ObjectRenderer(Image.new("RGB", (10, 10), "white"), -100, -50, 0.5)
+
+    assert renderer.transform_coords([-100, -50, 0, 50]) == [0, 0, 50, 50]
+
+
+def test_draw_rectangle():
+    image = Image.new("RGB", (20, 20), "white")
+    renderer = ObjectRenderer(image, 0, 0)
+
+    renderer.draw_object({'type': 'rectangle', 'coords': [15, 15, 5, 5], 'fill': 'red', 'outline': 'red',
+                          'width': '1'})
+
+    assert image.getpixel((10, 10)) == (255, 0, 0)
+    assert image.getpixel((1, 1)) == (255, 255, 255)
+
+
+def test_draw_line_scaled_width_is_at_least_one_pixel():
+    image = Image.new("RGB", (20, 20), "white")
+    renderer = ObjectRenderer(image, 0, 0, 0.1)
+
+    renderer.draw_object({'type': 'line', 'coords': [0, 50, 200, 50], 'fill': 'black', 'width': '2.0'})
+
+    assert image.getpixel((10, 5)) == (0, 0, 0)
+
+
+def test_draw_unfilled_shape_uses_outline_only():
+    image = Image.new("RGB", (20, 20), "white")
+    renderer = ObjectRenderer(image, 0, 0)
+
+    renderer.draw_object({'type': 'oval', 'coords': [0, 0, 19, 19], 'fill': '', 'outline': 'blue', 'width': '1'})
+
+    assert image.getpixel((10, 10)) == (255, 255, 255)
+    assert image.getpixel((10, 0)) == (0, 0, 255)
+
+
+def test_draw_text_falls_back_to_arial():
+    image = Image.new("RGB", (100, 40), "white")
+    renderer = ObjectRenderer(image, 0, 0)
+
+    renderer.draw_object({'type': 'text', 'coords': [50, 20], 'fill': 'black', 'font': 'Unknown 12',
+                          'text': 'Hello'})
+
+    assert ('Unknown', 12) in renderer.fonts
+    assert image.getbbox() is not None
+
+
+def test_draw_objects_skips_degenerate_shapes():
+    image = Image.new("RGB", (20, 20), "white")
+    renderer = ObjectRenderer(image, 0, 0)
+
+    renderer.draw_objects([{'type': 'line', 'coords': [5, 5], 'fill': 'black', 'width': '1'},
+                           {'type': 'polygon', 'coords': [1, 1, 5, 5], 'fill': 'black', 'width': '1'}])
+
+    assert image.getpixel((5, 5)) == (255, 255, 255)
+
+
+def test_draw_instance_uses_symbol_definition():
+    image = Image.new("RGB", (20, 20), "white")
+    symbols = {"symbol:0": Clipboard.from_states([{'type': 'rectangle', 'coords': [-2, -2, 2, 2], 'fill': 'red',
+                                                    'outline': 'red', 'width': '1'}])}
+    renderer = ObjectRenderer(image, 0, 0, symbols=symbols)
+
+    renderer.draw_object({'type': 'instance', 'symbol': "symbol:0", 'transform': [2, 0, 10, 0, 2, 10],
+                          'z-index': 0})
+
+    assert image.getpixel((13, 13)) == (255, 0, 0)
+    assert image.getpixel((16, 16)) == (255, 255, 255)
+
+
+def test_draw_image_uses_pyramid():
+    buffer = io.BytesIO()
+    Image.new("RGB", (200, 200), "green").save(buffer, "PNG")
+    pyramid = ImagePyramid(buffer.getvalue())
+    image = Image.new("RGB", (20, 20), "white")
+    renderer = ObjectRenderer(image, 0, 0, 0.1, images={"abc": pyramid})
+
+    renderer.draw_object({'type': 'image', 'coords': [0, 0, 100, 100], 'image': "abc"})
+
+    assert image.getpixel((5, 5)) == (0, 128, 0)
+    assert image.getpixel((15, 15)) == (255, 255, 255)
+    assert pyramid.levels
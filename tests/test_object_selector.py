@@ -1,6 +1,6 @@
 import tkinter as tk
 import pytest
-from unittest.mock import Mock
+from unittest.mock import Mock, call
 from object_selector import ObjectSelector
 
 
@@ -8,6 +8,9 @@ from object_selector import ObjectSelector
 def object_selector():
     board = Mock()
     board.canvas = tk.Canvas()
+    board.group_handler.get_outermost_group.return_value = None
+    board.group_handler.expand_to_groups.side_effect = list
+    board.layer_handler.without_locked.side_effect = list
     return ObjectSelector(board)
 
 
@@ -97,6 +100,65 @@ def test_select_object(object_selector):
     object_selector.draw_selection_frame.assert_called_once()
 
 
+def test_select_object_selects_outermost_group(object_selector):
+    object_selector.board.group_handler.get_outermost_group.return_value = "group:0"
+    object_selector.select_group = Mock()
+
+    object_selector.select_object(1)
+
+    object_selector.select_group.assert_called_once_with("group:0")
+
+
+def test_select_group(object_selector):
+    object_selector.canvas.find_withtag = Mock(return_value=(1, 2, 3))
+    object_selector.canvas.addtag_withtag = Mock()
+    object_selector.deselect_current_objects = Mock()
+    object_selector.draw_selection_frame = Mock()
+    object_selector.board.group_handler.get_group_types.return_value = {"line", "rectangle"}
+
+    object_selector.select_group("group:0")
+
+    assert object_selector.selected_objects == [1, 2, 3]
+    assert object_selector.selected_types == {"line", "rectangle"}
+    object_selector.canvas.addtag_withtag.assert_has_calls([
+        call("selected", "group:0&&!locked"),
+        call("selected_outlined", "group:0&&!locked&&member:outlined"),
+        call("selected_text", "group:0&&!locked&&member:text"),
+        call("selected_image", "group:0&&!locked&&member:image"),
+    ])
+    object_selector.canvas.find_withtag.assert_called_once_with("group:0&&!locked")
+    object_selector.draw_selection_frame.assert_called_once()
+
+
+def test_handle_select_tool_release_expands_groups(object_selector):
+    object_selector.is_dragging = True
+    object_selector.selection_frame = 1
+    object_selector.canvas.coords = Mock(return_value=[50, 50, 150, 150])
+    object_selector.canvas.find_enclosed = Mock(return_value=(1, 2))
+    object_selector.board.group_handler.expand_to_groups.side_effect = lambda objects: [1, 2, 5]
+    object_selector.select_multiple_objects = Mock()
+
+    object_selector.handle_select_tool_release(None)
+
+    object_selector.select_multiple_objects.assert_called_once_with([1, 2, 5])
+
+
+def test_handle_select_tool_release_skips_locked_objects(object_selector):
+    object_selector.is_dragging = True
+    object_selector.selection_frame = 1
+    object_selector.canvas.coords = Mock(return_value=[50, 50, 150, 150])
+    object_selector.canvas.find_enclosed = Mock(return_value=(1, 2))
+    object_selector.board.layer_handler.without_locked.side_effect = lambda objects: []
+    object_selector.select_multiple_objects = Mock()
+    object_selector.deselect_current_objects = Mock()
+
+    object_selector.handle_select_tool_release(None)
+
+    object_selector.board.layer_handler.without_locked.assert_called_once_with([1, 2])
+    object_selector.select_multiple_objects.assert_not_called()
+    object_selector.deselect_current_objects.assert_called_once()
+
+
 def test_select_object_when_already_selected(object_selector):
     object_selector.selected_objects = [1]
     object_selector.draw_selection_frame = Mock()
@@ -127,6 +189,32 @@ def test_deselect_current_objects(object_selector):
     assert object_selector.selection_frame is None
 
 
+def test_tag_selected_objects(object_selector):
+    object_selector.selected_objects = [1, 2, 3, 4]
+    object_selector.canvas.type = Mock(side_effect=["line", "oval", "text", "image"])
+    object_selector.canvas.addtag_withtag = Mock()
+    object_selector.canvas.dtag = Mock()
+
+    object_selector.tag_selected_objects()
+
+    assert object_selector.canvas.dtag.call_count == 4
+    assert object_selector.canvas.addtag_withtag.call_args_list == [
+        call("selected", 1), call("selected", 2), call("selected_outlined", 2), call("selected", 3),
+        call("selected_text", 3), call("selected", 4), call("selected_image", 4)]
+    assert object_selector.selected_types == {"line", "oval", "text", "image"}
+
+
+def test_untag_selected_objects(object_selector):
+    object_selector.selected_types = {"line"}
+    object_selector.canvas.dtag = Mock()
+
+    object_selector.untag_selected_objects()
+
+    assert object_selector.canvas.dtag.call_args_list == [call("selected"), call("selected_outlined"),
+                                                          call("selected_text"), call("selected_image")]
+    assert object_selector.selected_types == set()
+
+
 def test_draw_selection_frame(object_selector):
     object_selector.canvas.delete = Mock()
     object_selector.selected_objects = [1, 2]
@@ -0,0 +1,64 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from autosave_handler import AutosaveHandler
+from recent_boards import RecentBoards
+
+
+@pytest.fixture(autouse=True)
+def recent_path(tmp_path):
+    with patch.object(RecentBoards, 'RECENT_PATH', str(tmp_path / ".recent.json")):
+        yield
+
+
+def touch(path, mtime_ns):
+    path.write_text("{}\n")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+def test_add_moves_board_to_top(tmp_path):
+    RecentBoards.add(str(tmp_path / "a.pcso"))
+    RecentBoards.add(str(tmp_path / "b.pcso"))
+    RecentBoards.add(str(tmp_path / "a.pcso"))
+
+    assert RecentBoards.get_recent() == [str(tmp_path / "a.pcso"), str(tmp_path / "b.pcso")]
+
+
+def test_add_keeps_max_recent(tmp_path):
+    with patch.object(RecentBoards, 'MAX_RECENT', 2):
+        for name in ("a", "b", "c"):
+            RecentBoards.add(str(tmp_path / f"{name}.pcso"))
+
+    assert RecentBoards.get_recent() == [str(tmp_path / "c.pcso"), str(tmp_path / "b.pcso")]
+
+
+def test_add_ignores_autosave():
+    RecentBoards.add(AutosaveHandler.AUTOSAVE_PATH)
+
+    assert RecentBoards.get_recent() == []
+
+
+def test_get_recent_ignores_corrupt_list():
+    with open(RecentBoards.RECENT_PATH, 'w') as f:
+        f.write("not json")
+
+    assert RecentBoards.get_recent() == []
+
+
+def test_get_boards_lists_recent_then_nearby(tmp_path):
+    boards = tmp_path / "boards"
+    boards.mkdir()
+    old = touch(boards / "old.pcso", 10 ** 18)
+    new = touch(boards / "new.pcso", 2 * 10 ** 18)
+    touch(boards / "notes.txt", 3 * 10 ** 18)
+    elsewhere = touch(tmp_path / "elsewhere.pcso", 10 ** 18)
+    RecentBoards.add(old)
+    RecentBoards.add(elsewhere)
+    RecentBoards.add(str(tmp_path / "deleted.pcso"))
+
+    assert RecentBoards.get_boards(str(boards)) == [elsewhere, old, new]
+    assert RecentBoards.get_boards(str(boards), limit=2) == [elsewhere, old]
+    assert RecentBoards.get_boards(str(tmp_path / "missing")) == [elsewhere, old]
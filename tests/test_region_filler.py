@@ -0,0 +1,77 @@
+import numpy as np
+
+from region_filler import RegionFiller
+
+
+def test_rasterize_marks_objects_as_barriers():
+    objects_state = [{'type': 'rectangle', 'coords': [12, 12, 15, 15], 'fill': 'white', 'outline': 'white',
+                      'width': 1}]
+
+    free = RegionFiller.rasterize(objects_state, 10, 10, 8, 8)
+
+    assert free.shape == (8, 8)
+    assert not free[3, 3]
+    assert free[0, 0]
+
+
+def test_rasterize_keeps_unfilled_interior_free():
+    objects_state = [{'type': 'rectangle', 'coords': [0, 0, 9, 9], 'fill': '', 'outline': 'blue', 'width': 1}]
+
+    free = RegionFiller.rasterize(objects_state, 0, 0, 10, 10)
+
+    assert free[5, 5]
+    assert not free[0, 5]
+
+
+def test_flood_fill_enclosed_region():
+    free = np.ones((7, 7), dtype=bool)
+    free[1, 1:6] = free[5, 1:6] = free[1:6, 1] = free[1:6, 5] = False
+    free[3, 3] = False
+
+    filled = RegionFiller.flood_fill(free, 2, 2)
+
+    assert filled is not None
+    assert filled.sum() == 8
+    assert not filled[3, 3]
+    assert not filled[0, 0]
+
+
+def test_flood_fill_follows_winding_region():
+    free = np.zeros((7, 9), dtype=bool)
+    free[1, 1:8] = True
+    free[2:5, 7] = True
+    free[5, 1:8] = True
+    free[3, 1:7] = True
+
+    filled = RegionFiller.flood_fill(free, 1, 1)
+
+    assert filled is not None
+    assert (filled == free).all()
+
+
+def test_flood_fill_unbounded_region():
+    free = np.ones((5, 5), dtype=bool)
+
+    assert RegionFiller.flood_fill(free, 2, 2) is None
+
+
+def test_flood_fill_on_barrier():
+    free = np.ones((5, 5), dtype=bool)
+    free[2, 2] = False
+
+    assert RegionFiller.flood_fill(free, 2, 2) is None
+
+
+def test_trace_outline_single_pixel():
+    filled = np.zeros((5, 5), dtype=bool)
+    filled[2, 2] = True
+
+    assert RegionFiller.trace_outline(filled) == [(2, 2), (3, 2), (3, 3), (2, 3)]
+
+
+def test_trace_outline_l_shape():
+    filled = np.zeros((6, 6), dtype=bool)
+    filled[1:4, 1] = True
+    filled[3, 1:4] = True
+
+    assert RegionFiller.trace_outline(filled) == [(1, 1), (2, 1), (2, 3), (4, 3), (4, 4), (1, 4)]
@@ -0,0 +1,146 @@
+import math
+import tkinter as tk
+from unittest.mock import Mock, call
+
+import numpy as np
+import pytest
+
+from selection_transformer import SelectionTransformer
+
+
+@pytest.fixture
+def transformer():
+    board = Mock()
+    board.canvas = Mock(spec=tk.Canvas)
+    board.objects = [1, 2]
+    board.object_selector.selected_objects = [1, 2]
+    board.object_selector.selected_types = {"line", "rectangle"}
+    board.object_selector.selection_frame = 5
+    board.CHANGE_MOVE = "move"
+    board.CHANGE_CREATE = "create"
+    board.CHANGE_DELETE = "delete"
+    return SelectionTransformer(board)
+
+
+def test_scaling_keeps_pivot():
+    matrix = SelectionTransformer.scaling(2, -1, 10, 20)
+    points = SelectionTransformer.transform_points(np.array([[10, 20], [15, 25]], dtype=float), matrix)
+    assert points.tolist() == [[10, 20], [20, 15]]
+
+
+def test_rotation_turns_clockwise_on_screen():
+    matrix = SelectionTransformer.rotation(math.pi / 2, 0, 0)
+    points = SelectionTransformer.transform_points(np.array([[10, 0]], dtype=float), matrix)
+    assert np.allclose(points, [[0, 10]])
+
+
+def test_is_axis_aligned():
+    assert SelectionTransformer.is_axis_aligned(SelectionTransformer.scaling(2, -1, 5, 5))
+    assert SelectionTransformer.is_axis_aligned(SelectionTransformer.rotation(math.pi / 2, 5, 5))
+    assert not SelectionTransformer.is_axis_aligned(SelectionTransformer.rotation(math.pi / 4, 5, 5))
+
+
+def test_apply_scaling(transformer):
+    canvas = transformer.canvas
+    canvas.find_withtag = Mock(return_value=(2,))
+    coords = {1: [0, 0, 10, 10, 20, 0], 2: [10, 10, 20, 30]}
+    canvas.coords = Mock(side_effect=lambda obj, *args: coords[obj] if not args else None)
+
+    transformer.apply_transform(SelectionTransformer.scaling(-2, 1, 0, 0))
+
+    transformer.board.undo_handler.record_reshape.assert_called_once_with(
+        [1, 2], [[0, 0, -20, 10, -40, 0], [-40, 10, -20, 30]])
+    canvas.coords.assert_any_call(1, 0, 0, -20, 10, -40, 0)
+    canvas.coords.assert_any_call(2, -40, 10, -20, 30)
+    canvas.create_polygon.assert_not_called()
+    transformer.board.notify_objects_changed.assert_called_once_with("move", [1, 2])
+    transformer.object_selector.select_multiple_objects.assert_called_once_with([1, 2])
+
+
+def test_apply_rotation_converts_rectangles_to_polygons(transformer):
+    canvas = transformer.canvas
+    canvas.find_withtag = Mock(return_value=(2,))
+    canvas.coords = Mock(side_effect=lambda obj, *args: {1: [0, 0, 10, 0], 2: [0, 0, 10, 10]}[obj] if not args
+                         else None)
+    canvas.type = Mock(return_value="rectangle")
+    canvas.gettags = Mock(return_value=("object1", "selected", "selected_outlined"))
+    canvas.itemcget = Mock(side_effect=lambda obj, option: {'fill': "red", 'outline': "blue", 'width': "2"}[option])
+    canvas.create_polygon = Mock(return_value=7)
+
+    transformer.apply_transform(SelectionTransformer.rotation(math.pi / 4, 0, 0))
+
+    polygon_coords = canvas.create_polygon.call_args.args
+    assert len(polygon_coords) == 8
+    assert np.allclose(polygon_coords[4:6], [0, math.sqrt(200)])
+    assert canvas.create_polygon.call_args.kwargs == {'fill': "red", 'outline': "blue", 'width': "2",
+                                                      'tags': ["object1", "selected"]}
+    canvas.tag_raise.assert_called_once_with(7, 2)
+    canvas.delete.assert_called_once_with(2)
+    undo_handler = transformer.board.undo_handler
+    assert undo_handler.record_reshape.call_args.args[0] == [1]
+    undo_handler.record_delete.assert_called_once_with([2])
+    undo_handler.record_create.assert_called_once_with([7])
+    undo_handler.begin_group.assert_called_once()
+    undo_handler.end_group.assert_called_once()
+    assert transformer.board.objects == [1, 7]
+    transformer.object_selector.select_multiple_objects.assert_called_once_with([1, 7])
+
+
+def test_apply_transform_only_moves_images(transformer):
+    canvas = transformer.canvas
+    transformer.object_selector.selected_types = {"line", "image"}
+    canvas.find_withtag = Mock(side_effect=lambda tag: {"selected_outlined": (), "selected_image": (2,)}[tag])
+    canvas.coords = Mock(side_effect=lambda obj, *args: {1: [0, 0, 10, 0], 2: [20, 10]}[obj] if not args else None)
+    canvas.bbox = Mock(return_value=(20, 10, 60, 30))
+
+    transformer.apply_transform(SelectionTransformer.scaling(-1, 1, 0, 0))
+
+    transformer.board.undo_handler.record_reshape.assert_called_once_with([1, 2], [[0, 0, -10, 0], [-60, 10]])
+    canvas.coords.assert_any_call(2, -60, 10)
+    canvas.create_polygon.assert_not_called()
+
+
+def test_drag_corner_handle_scales_from_opposite_corner(transformer):
+    canvas = transformer.canvas
+    canvas.create_rectangle = Mock(side_effect=[11, 12, 13, 14])
+    canvas.create_oval = Mock(return_value=15)
+    canvas.create_polygon = Mock(return_value=16)
+    canvas.coords = Mock(return_value=[0, 0, 100, 50])
+    canvas.canvasx = Mock(side_effect=lambda x: x)
+    canvas.canvasy = Mock(side_effect=lambda y: y)
+    transformer.apply_transform = Mock()
+
+    transformer.draw_handles(0, 0, 100, 50)
+    assert transformer.is_handle(14)
+    assert not transformer.is_handle(5)
+
+    transformer.start_transform(Mock(x=100, y=50), 14)
+    transformer.continue_transform(Mock(x=200, y=25))
+    transformer.end_transform()
+
+    assert canvas.coords.call_args_list[-1] == call(16, 0.0, 0.0, 200.0, 0.0, 200.0, 25.0, 0.0, 25.0)
+    canvas.delete.assert_called_once_with(16)
+    assert np.allclose(transformer.apply_transform.call_args.args[0], SelectionTransformer.scaling(2, 0.5, 0, 0))
+    assert transformer.is_transforming is False
+
+
+def test_release_without_drag_does_not_transform(transformer):
+    transformer.canvas.create_rectangle = Mock(side_effect=[11, 12, 13, 14])
+    transformer.canvas.create_oval = Mock(return_value=15)
+    transformer.canvas.coords = Mock(return_value=[0, 0, 100, 50])
+    transformer.apply_transform = Mock()
+
+    transformer.draw_handles(0, 0, 100, 50)
+    transformer.start_transform(Mock(x=50, y=-20), 15)
+    transformer.end_transform()
+
+    transformer.apply_transform.assert_not_called()
+
+
+def test_flip_horizontal(transformer):
+    transformer.canvas.bbox = Mock(return_value=(0, 0, 10, 20))
+    transformer.apply_transform = Mock()
+
+    transformer.flip_horizontal()
+
+    assert np.allclose(transformer.apply_transform.call_args.args[0], SelectionTransformer.scaling(-1, 1, 5, 10))
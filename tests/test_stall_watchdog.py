@@ -0,0 +1,79 @@
+import json
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from stall_watchdog import StallWatchdog
+
+
+@pytest.fixture
+def watchdog(tmp_path):
+    return StallWatchdog(Mock(), str(tmp_path / "stalls.log"), threshold_ms=200)
+
+
+def test_heartbeat_reschedules(watchdog):
+    watchdog.heartbeat()
+
+    watchdog.root.after.assert_called_once_with(StallWatchdog.HEARTBEAT_MS, watchdog.heartbeat)
+
+
+def test_no_stall_while_heartbeat_is_on_time(watchdog):
+    with patch('stall_watchdog.time.monotonic', return_value=watchdog.last_heartbeat + 0.2):
+        watchdog.check()
+
+    assert watchdog.stall_start is None
+
+
+def test_stall_is_sampled_and_logged(watchdog):
+    start = watchdog.last_heartbeat
+    watchdog.capture_main_stack = Mock(side_effect=[["app.py:10 (main)", "file_handler.py:5 (load_objects)"],
+                                                    ["app.py:10 (main)", "file_handler.py:5 (load_objects)"],
+                                                    ["app.py:10 (main)", "board.py:7 (draw)"]])
+
+    with patch('stall_watchdog.time.monotonic', return_value=start + 0.5):
+        watchdog.check()
+        watchdog.check()
+        watchdog.check()
+    assert watchdog.stall_start == pytest.approx(start + 0.1)
+    assert len(watchdog.samples) == 3
+
+    watchdog.last_heartbeat = start + 1.1
+    watchdog.check()
+
+    record = json.loads(open(watchdog.log_path).read())
+    assert record['duration_ms'] == 1000
+    assert record['location'] == "file_handler.py:5 (load_objects)"
+    assert record['samples'] == 3
+    assert record['stack'][-1] == "file_handler.py:5 (load_objects)"
+    assert watchdog.stall_start is None
+
+
+def test_stall_without_log_path_is_printed(capsys):
+    watchdog = StallWatchdog(Mock())
+
+    watchdog.log_stall(0.75, [["board.py:7 (draw)"]])
+
+    assert "750 ms at board.py:7 (draw)" in capsys.readouterr().err
+
+
+def test_capture_main_stack_from_other_thread(watchdog):
+    stacks = []
+    thread = threading.Thread(target=lambda: stacks.append(watchdog.capture_main_stack()))
+    thread.start()
+    thread.join()
+
+    assert stacks[0][-1].startswith("threading.py:")
+    assert any("test_capture_main_stack_from_other_thread" in frame for frame in stacks[0])
+
+
+@patch('stall_watchdog.atexit')
+def test_start_and_stop(mock_atexit, watchdog):
+    watchdog.start()
+    assert watchdog.thread.is_alive()
+
+    watchdog.stop()
+    assert not watchdog.thread.is_alive()
+    watchdog.root.after_cancel.assert_called_once()
+    mock_atexit.unregister.assert_called_once_with(watchdog.stop)
@@ -0,0 +1,97 @@
+import math
+
+import pytest
+
+from svg_reader import SvgReader
+from svg_writer import SvgWriter
+
+
+def read(tmp_path, content, tolerance=SvgReader.DEFAULT_TOLERANCE):
+    file_path = tmp_path / "drawing.svg"
+    file_path.write_text(f'<svg xmlns="http://www.w3.org/2000/svg">{content}</svg>')
+    return list(SvgReader(tolerance).read_objects(str(file_path)))
+
+
+def test_reads_basic_shapes(tmp_path):
+    rectangle, oval, line, polyline, polygon = read(tmp_path, (
+        '<rect x="10" y="20" width="30" height="40" fill="red" stroke="black" stroke-width="2"/>'
+        '<ellipse cx="5" cy="5" rx="5" ry="3" fill="none" stroke="rgb(0, 128, 255)"/>'
+        '<line x1="0" y1="0" x2="10" y2="10" stroke="green"/>'
+        '<polyline points="0,0 10,0 10,10" fill="none" stroke="blue"/>'
+        '<polygon points="0,0 10,0 5,5" fill="yellow"/>'))
+
+    assert rectangle == {'type': "rectangle", 'coords': [10, 20, 40, 60], 'fill': "red", 'outline': "black",
+                         'width': 2}
+    assert oval == {'type': "oval", 'coords': [0, 2, 10, 8], 'fill': "", 'outline': "#0080ff", 'width': 1}
+    assert line == {'type': "line", 'coords': [0, 0, 10, 10], 'fill': "green", 'width': 1}
+    assert polyline['type'] == "line" and polyline['coords'] == [0, 0, 10, 0, 10, 10]
+    assert polygon == {'type': "polygon", 'coords': [0, 0, 10, 0, 5, 5], 'fill': "yellow", 'outline': "",
+                       'width': 1}
+
+
+def test_applies_nested_transforms_and_inherited_styles(tmp_path):
+    rectangle, rotated = read(tmp_path, (
+        '<g transform="translate(100 50)" style="fill:orange;stroke-width:2">'
+        '<rect transform="scale(2)" x="1" y="1" width="2" height="3"/>'
+        '<rect transform="rotate(90)" x="0" y="0" width="10" height="5"/></g>'))
+
+    assert rectangle == {'type': "rectangle", 'coords': [102, 52, 106, 58], 'fill': "orange", 'outline': "",
+                         'width': 4}
+    assert rotated['type'] == "polygon"
+    assert rotated['coords'] == [100, 50, 100, 60, 95, 60, 95, 50]
+
+
+def test_flattens_curves_within_tolerance(tmp_path):
+    coarse, = read(tmp_path, '<path d="M0,0 C0,100 100,100 100,0" fill="none" stroke="black"/>', tolerance=1)
+    fine, = read(tmp_path, '<path d="M0,0 C0,100 100,100 100,0" fill="none" stroke="black"/>', tolerance=0.01)
+
+    assert coarse['coords'][:2] == [0, 0] and coarse['coords'][-2:] == [100, 0]
+    assert len(fine['coords']) > len(coarse['coords'])
+    # Points are taken at even steps of t, so every segment midpoint must be close to the curve halfway between
+    points = list(zip(coarse['coords'][::2], coarse['coords'][1::2]))
+    segments = len(points) - 1
+    for i in range(segments):
+        t = (i + 0.5) / segments
+        curve_x, curve_y = 300 * (1 - t) * t ** 2 + 100 * t ** 3, 300 * (1 - t) * t
+        middle_x, middle_y = (points[i][0] + points[i + 1][0]) / 2, (points[i][1] + points[i + 1][1]) / 2
+        assert math.hypot(curve_x - middle_x, curve_y - middle_y) <= 1
+
+def test_arcs_end_at_their_end_point(tmp_path):
+    arc, = read(tmp_path, '<path d="M0,0 a50,50 0 01 100,0" fill="none" stroke="black"/>')
+
+    points = list(zip(arc['coords'][::2], arc['coords'][1::2]))
+    assert points[-1] == (100, 0)
+    assert all(math.isclose(math.hypot(x - 50, y), 50, abs_tol=0.01) for x, y in points)
+    assert min(y for _, y in points) == pytest.approx(-50, abs=0.3)
+
+
+def test_path_subpaths_and_relative_commands(tmp_path):
+    square, line = read(tmp_path, '<path d="m0 0h10v10h-10z M20 20 l5 5" fill="none" stroke="red"/>')
+
+    assert square['coords'] == [0, 0, 10, 0, 10, 10, 0, 10, 0, 0]
+    assert line['coords'] == [20, 20, 25, 25]
+
+
+def test_reads_text_and_skips_definitions(tmp_path):
+    text, = read(tmp_path, (
+        '<defs><rect x="0" y="0" width="5" height="5" fill="red"/></defs>'
+        '<text x="5" y="6" font-family="Comic Sans, serif" font-size="12px">Hello <tspan>world</tspan></text>'))
+
+    assert text == {'type': "text", 'coords': [5, 6], 'fill': "black", 'width': "0", 'font': "ComicSans 12",
+                    'text': "Hello world"}
+
+
+def test_reads_styles_written_after_the_elements(tmp_path):
+    file_path = tmp_path / "export.svg"
+    with open(file_path, 'w') as f:
+        writer = SvgWriter(f, 0, 0, 100, 100)
+        writer.write_objects([{'type': 'line', 'coords': [0, 0, 10, 5], 'fill': 'red', 'width': '3'},
+                              {'type': 'rectangle', 'coords': [0, 0, 10, 20], 'fill': 'blue', 'outline': 'black',
+                               'width': '1'}])
+        writer.close()
+
+    line, rectangle = SvgReader().read_objects(str(file_path))
+
+    assert line == {'type': "line", 'coords': [0, 0, 10, 5], 'fill': "red", 'width': 3}
+    assert rectangle == {'type': "rectangle", 'coords': [0, 0, 10, 20], 'fill': "blue", 'outline': "black",
+                         'width': 1}
@@ -0,0 +1,70 @@
+import io
+import xml.etree.ElementTree as ElementTree
+
+from clipboard import Clipboard
+from svg_writer import SvgWriter
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+def write(objects_state, precision=SvgWriter.DEFAULT_PRECISION, symbols=None):
+    file = io.StringIO()
+    writer = SvgWriter(file, -10, -20, 200, 100, precision, symbols)
+    writer.write_objects(objects_state)
+    writer.close()
+    return file.getvalue()
+
+
+def test_writes_document_with_view_box():
+    root = ElementTree.fromstring(write([]))
+
+    assert root.tag == f"{SVG}svg"
+    assert root.get('viewBox') == "-10 -20 200 100"
+
+
+def test_writes_elements_for_every_item_type():
+    root = ElementTree.fromstring(write([
+        {'type': 'line', 'coords': [0, 0, 10, 5, 20, 0], 'fill': 'black', 'width': '2'},
+        {'type': 'rectangle', 'coords': [30, 40, 10, 20], 'fill': '', 'outline': 'red', 'width': '1'},
+        {'type': 'oval', 'coords': [0, 0, 10, 20], 'fill': 'blue', 'outline': '', 'width': '1'},
+        {'type': 'polygon', 'coords': [0, 0, 10, 0, 5, 5], 'fill': 'green', 'outline': '', 'width': '0'},
+        {'type': 'text', 'coords': [5, 5], 'fill': 'black', 'width': '1', 'font': 'Comic Sans 12',
+         'text': 'a < b & c'},
+    ]))
+
+    path, rect, ellipse, polygon, text, style = list(root)
+    assert path.get('d') == "M0,0L10,5 20,0"
+    assert (rect.get('x'), rect.get('y'), rect.get('width'), rect.get('height')) == ("10", "20", "20", "20")
+    assert (ellipse.get('cx'), ellipse.get('cy'), ellipse.get('rx'), ellipse.get('ry')) == ("5", "10", "5", "10")
+    assert polygon.get('points') == "0,0 10,0 5,5"
+    assert text.text == "a < b & c"
+    assert style.tag == f"{SVG}style"
+    assert ".s1{fill:none;stroke:red;stroke-width:1}" in style.text
+    assert 'font-family:"Comic Sans";font-size:12px' in style.text
+
+
+def test_repeated_styles_share_a_class():
+    root = ElementTree.fromstring(write([
+        {'type': 'line', 'coords': [0, 0, 1, 1], 'fill': 'black', 'width': '2'},
+        {'type': 'line', 'coords': [1, 1, 2, 2], 'fill': 'black', 'width': '2.0'},
+        {'type': 'line', 'coords': [2, 2, 3, 3], 'fill': 'red', 'width': '2'},
+    ]))
+
+    assert [element.get('class') for element in root if element.tag == f"{SVG}path"] == ["s0", "s0", "s1"]
+    assert root.find(f"{SVG}style").text.count("{") == 2
+
+
+def test_coordinate_precision_is_configurable():
+    line = {'type': 'line', 'coords': [0.123456, 1.5, 2.0, -0.0001], 'fill': 'black', 'width': '1'}
+
+    assert 'd="M0.12,1.5L2,0"' in write([line])
+    assert 'd="M0.1235,1.5L2,-0.0001"' in write([line], precision=4)
+    assert 'd="M0,2L2,0"' in write([line], precision=0)
+
+
+def test_expands_symbol_instances():
+    symbols = {"symbol:0": Clipboard.from_states([{'type': 'line', 'coords': [-1, 0, 1, 0], 'fill': 'black',
+                                                   'width': '1'}])}
+    instance = {'type': 'instance', 'symbol': "symbol:0", 'transform': [2, 0, 10, 0, 2, 20], 'z-index': 0}
+
+    assert 'd="M8,20L12,20"' in write([instance], symbols=symbols)
@@ -0,0 +1,111 @@
+import numpy as np
+from unittest.mock import Mock
+
+import pytest
+
+from selection_transformer import SelectionTransformer
+from symbol_handler import SymbolHandler
+
+LINE = {'type': 'line', 'coords': [0, 0, 10, 0], 'fill': 'black', 'width': '2'}
+NOTE = {'type': 'rectangle', 'coords': [0, 0, 10, 20], 'fill': 'yellow', 'outline': 'black', 'width': '1'}
+LABEL = {'type': 'text', 'coords': [5, 10], 'fill': 'black', 'width': '1', 'font': 'Arial 12', 'text': 'Hi'}
+
+
+@pytest.fixture
+def symbol_handler():
+    board = Mock()
+    return SymbolHandler(board)
+
+
+def transformed(obj_state, matrix, **extra):
+    points = SelectionTransformer.transform_points(np.array(obj_state['coords'], dtype=float).reshape(-1, 2),
+                                                   matrix)
+    return dict(obj_state, coords=points.ravel().tolist(), **extra)
+
+
+def test_create_symbol_centers_definition(symbol_handler):
+    symbol = symbol_handler.create_symbol([dict(NOTE, groups=["group:0"], symbol="symbol:5"), LABEL])
+
+    assert symbol == "symbol:0"
+    assert symbol_handler.get_definitions([symbol]) == {symbol: [
+        dict(NOTE, coords=[-5.0, -10.0, 5.0, 10.0]),
+        {'type': 'text', 'coords': [0.0, 0.0], 'fill': 'black', 'font': 'Arial 12', 'text': 'Hi'},
+    ]}
+    symbol_handler.board.file_handler.journal.require_snapshot.assert_called_once()
+
+
+def test_get_instance_state_finds_transform(symbol_handler):
+    symbol = symbol_handler.create_symbol([NOTE, LABEL])
+    matrix = SelectionTransformer.rotation(0.5, 3, 4) @ np.vstack((SelectionTransformer.scaling(2, 3, 0, 0),
+                                                                   [0, 0, 1]))
+    local = symbol_handler.get_definitions([symbol])[symbol]
+    members_state = [transformed(dict(obj_state, width=LABEL['width']) if obj_state['type'] == 'text' else obj_state,
+                                 matrix, symbol=symbol, groups=["group:1"]) for obj_state in local]
+    instance_state = symbol_handler.get_instance_state(members_state)
+
+    assert instance_state['type'] == 'instance'
+    assert instance_state['symbol'] == symbol
+    assert instance_state['groups'] == ["group:1"]
+    expanded = SymbolHandler.expand_instance(instance_state, symbol_handler.symbols[symbol])
+    for obj_state, member_state in zip(expanded, members_state):
+        assert np.allclose(obj_state['coords'], member_state['coords'], atol=SymbolHandler.POSITION_TOLERANCE)
+
+
+def test_get_instance_state_rejects_changed_objects(symbol_handler):
+    symbol = symbol_handler.create_symbol([NOTE, LINE])
+    local = symbol_handler.get_definitions([symbol])[symbol]
+
+    restyled = [dict(local[0], symbol=symbol), dict(local[1], fill='red', symbol=symbol)]
+    assert symbol_handler.get_instance_state(restyled) is None
+
+    bent = [dict(local[0], symbol=symbol), dict(local[1], coords=[-5, 0, 5, 3], symbol=symbol)]
+    assert symbol_handler.get_instance_state(bent) is None
+
+
+def test_expand_instance_round_trip(symbol_handler):
+    symbol = symbol_handler.create_symbol([NOTE, LINE])
+    instance_state = {'type': 'instance', 'symbol': symbol, 'transform': [1, 0, 100, 0, 1, 50],
+                      'groups': ["group:2"], 'z-index': 7}
+
+    objects_state = SymbolHandler.expand_instance(instance_state, symbol_handler.symbols[symbol])
+
+    assert objects_state == [
+        dict(NOTE, coords=[95.0, 40.0, 105.0, 60.0], symbol=symbol, groups=["group:2"], **{'z-index': 7}),
+        dict(LINE, coords=[95.0, 40.0, 105.0, 40.0], symbol=symbol, groups=["group:2"], **{'z-index': 8}),
+    ]
+    assert symbol_handler.get_instance_state(objects_state)['transform'] == [1, 0, 100, 0, 1, 50]
+
+
+def test_expand_instances_keeps_plain_objects_in_place(symbol_handler):
+    symbol = symbol_handler.create_symbol([LINE])
+    instance_state = {'type': 'instance', 'symbol': symbol, 'transform': [1, 0, 0, 0, 1, 0], 'z-index': 1}
+
+    objects_state = SymbolHandler.expand_instances([dict(NOTE, **{'z-index': 0}), instance_state],
+                                                   symbol_handler.symbols)
+
+    assert [obj_state['type'] for obj_state in objects_state] == ['rectangle', 'line']
+    assert 'groups' not in objects_state[1]
+
+
+def test_find_instance(symbol_handler):
+    symbol_handler.create_symbol([NOTE, LINE])
+    members = {"group:3": (4, 5), "group:3&&symbol:0": (4, 5)}
+    symbol_handler.canvas.find_withtag = Mock(side_effect=lambda tag: members.get(tag, ()))
+
+    assert symbol_handler.find_instance({'symbol': "symbol:0", 'groups': ["group:0", "group:3"]}) == [4, 5]
+    assert symbol_handler.find_instance({'symbol': "symbol:0"}) == []
+    assert symbol_handler.find_instance({'symbol': "symbol:1", 'groups': ["group:3"]}) == []
+
+    members["group:3"] = (4, 5, 6)
+    assert symbol_handler.find_instance({'symbol': "symbol:0", 'groups': ["group:3"]}) == []
+
+
+def test_add_symbols_continues_numbering(symbol_handler):
+    symbol_handler.add_symbols({"symbol:4": [LINE]})
+
+    assert len(symbol_handler.symbols["symbol:4"]) == 1
+    assert symbol_handler.create_symbol([LINE]) == "symbol:5"
+
+    symbol_handler.clear()
+    assert symbol_handler.symbols == {}
+    assert symbol_handler.create_symbol([LINE]) == "symbol:0"
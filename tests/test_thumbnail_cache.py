@@ -0,0 +1,74 @@
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from thumbnail_cache import ThumbnailCache
+
+
+def write_board(path, objects_state):
+    path.write_text(json.dumps({'objects': objects_state}) + "\n")
+    return str(path)
+
+
+@pytest.fixture
+def thumbnail_cache(tmp_path):
+    return ThumbnailCache(str(tmp_path / "thumbnails"), size=64)
+
+
+@pytest.fixture
+def board_file(tmp_path):
+    return write_board(tmp_path / "board.pcso", [
+        {'type': 'rectangle', 'coords': [0, 0, 200, 100], 'z-index': 0, 'fill': 'red', 'outline': 'red'},
+    ])
+
+
+def test_render_fits_preview_size(thumbnail_cache, board_file):
+    image = thumbnail_cache.render(board_file)
+
+    assert max(image.size) == 64
+    assert image.size[0] > image.size[1]
+    assert image.getpixel((image.size[0] // 2, image.size[1] // 2)) == (255, 0, 0)
+
+
+def test_render_empty_board(thumbnail_cache, tmp_path):
+    image = thumbnail_cache.render(write_board(tmp_path / "empty.pcso", []))
+
+    assert max(image.size) == 64
+
+
+def test_get_thumbnail_is_cached_until_board_changes(thumbnail_cache, board_file):
+    thumbnail_cache.get_thumbnail(board_file)
+
+    with patch.object(thumbnail_cache, 'render', wraps=thumbnail_cache.render) as mock_render:
+        assert max(thumbnail_cache.get_thumbnail(board_file).size) == 64
+        mock_render.assert_not_called()
+
+        os.utime(board_file, ns=(2 ** 62, 2 ** 62))
+        thumbnail_cache.get_thumbnail(board_file)
+        mock_render.assert_called_once_with(board_file)
+
+
+def test_get_thumbnail_of_missing_board_raises(thumbnail_cache, tmp_path):
+    with pytest.raises(OSError):
+        thumbnail_cache.get_thumbnail(str(tmp_path / "missing.pcso"))
+
+
+def test_cull_drops_objects_smaller_than_a_pixel():
+    objects_state = [{'type': 'rectangle', 'coords': [0, 0, 1000, 1000]},
+                     {'type': 'rectangle', 'coords': [0, 0, 2, 2]},
+                     {'type': 'line', 'coords': [0, 0, 500, 0]}]
+
+    culled = ThumbnailCache.cull(objects_state, 0.1)
+
+    assert culled == [objects_state[0], objects_state[2]]
+
+
+def test_cull_keeps_largest_objects_in_order():
+    objects_state = [{'type': 'rectangle', 'coords': [0, 0, size, size]} for size in (50, 300, 100, 200)]
+
+    with patch.object(ThumbnailCache, 'MAX_OBJECTS', 2):
+        culled = ThumbnailCache.cull(objects_state, 1.0)
+
+    assert culled == [objects_state[1], objects_state[3]]
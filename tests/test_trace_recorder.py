@@ -0,0 +1,89 @@
+import json
+import threading
+import tkinter as tk
+from unittest.mock import Mock, patch
+
+import pytest
+
+from trace_recorder import TraceRecorder
+
+
+@pytest.fixture
+def trace_recorder(tmp_path):
+    recorder = TraceRecorder(str(tmp_path / "trace.json"))
+    with patch.object(TraceRecorder, 'active', recorder):
+        yield recorder
+
+
+def test_span_records_begin_and_end(trace_recorder):
+    with TraceRecorder.span("App.load_fonts", TraceRecorder.CATEGORY_FONTS):
+        pass
+
+    begin, end = trace_recorder.events
+    assert (begin['name'], begin['cat'], begin['ph']) == ("App.load_fonts", "fonts", "B")
+    assert (end['name'], end['ph']) == ("App.load_fonts", "E")
+    assert begin['tid'] == end['tid'] == threading.get_ident()
+    assert begin['ts'] <= end['ts']
+
+
+def test_span_without_active_recorder():
+    with patch.object(TraceRecorder, 'active', None):
+        with TraceRecorder.span("App.load_fonts", TraceRecorder.CATEGORY_FONTS):
+            pass
+
+
+def test_wrap_ends_span_on_error(trace_recorder):
+    traced = trace_recorder.wrap("FileHandler.save_board", TraceRecorder.CATEGORY_IO, Mock(side_effect=OSError))
+
+    with pytest.raises(OSError):
+        traced("board.pcso")
+
+    assert [event['ph'] for event in trace_recorder.events] == ["B", "E"]
+
+
+def test_install_wraps_board(trace_recorder):
+    board = Mock()
+    save_board = board.file_handler.save_board
+
+    trace_recorder.install(board)
+    board.handle_drag_event("event")
+    board.file_handler.save_board("board.pcso")
+    board.file_handler._export_board_as_svg("board.svg")
+
+    save_board.assert_called_once_with("board.pcso")
+    assert [event['name'] for event in trace_recorder.events if event['ph'] == "B"] == [
+        "Board.handle_drag_event", "FileHandler.save_board", "FileHandler._export_board_as_svg"]
+
+
+def test_after_callbacks_are_traced(trace_recorder):
+    with patch.object(tk.Misc, 'after') as mock_after, patch.object(tk.Misc, 'after_idle') as mock_after_idle:
+        trace_recorder.trace_after_callbacks()
+        callback = Mock(__qualname__="Minimap.render_dirty_region")
+
+        tk.Misc.after("widget", 20, callback, 1)
+        tk.Misc.after_idle("widget", callback)
+        mock_after.call_args.args[2](1)
+
+        assert mock_after.call_args.args[:2] == ("widget", 20)
+        assert mock_after_idle.call_args.args[0] == "widget"
+        callback.assert_called_once_with(1)
+        assert trace_recorder.events[0]['name'] == "Minimap.render_dirty_region"
+        assert trace_recorder.events[0]['cat'] == TraceRecorder.CATEGORY_AFTER
+
+        trace_recorder.stop()
+        assert tk.Misc.after is mock_after
+        assert tk.Misc.after_idle is mock_after_idle
+
+
+def test_stop_writes_chrome_trace(trace_recorder):
+    with TraceRecorder.span("App.load_fonts", TraceRecorder.CATEGORY_FONTS):
+        pass
+
+    trace_recorder.stop()
+
+    with open(trace_recorder.filename) as f:
+        trace = json.load(f)
+    assert trace['displayTimeUnit'] == "ms"
+    phases = [event['ph'] for event in trace['traceEvents']]
+    assert phases == ["M", "M", "B", "E"]
+    assert TraceRecorder.active is None
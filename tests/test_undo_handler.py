@@ -0,0 +1,302 @@
+import tkinter as tk
+from unittest.mock import Mock, call, patch
+
+import pytest
+
+from layer_handler import LayerHandler
+from undo_handler import UndoHandler
+
+
+@pytest.fixture
+def undo_handler():
+    board = Mock()
+    board.canvas = Mock(spec=tk.Canvas)
+    board.objects = []
+    board.CHANGE_CREATE = "create"
+    board.CHANGE_MOVE = "move"
+    board.CHANGE_RESTYLE = "restyle"
+    board.CHANGE_REORDER = "reorder"
+    board.CHANGE_DELETE = "delete"
+    board.canvas.gettags.return_value = ()
+    board.layer_handler = LayerHandler(board)
+    return UndoHandler(board)
+
+
+def test_init_binds_shortcuts(undo_handler):
+    root = undo_handler.board.app.get_root()
+    bound_keys = [bind_call.args[0] for bind_call in root.bind.call_args_list]
+    assert bound_keys == ["<Control-z>", "<Control-y>"]
+
+
+def test_undo_redo_move(undo_handler):
+    undo_handler.record_move([1, 2], 10, -5)
+
+    undo_handler.undo()
+    undo_handler.canvas.move.assert_has_calls([call(1, -10, 5), call(2, -10, 5)])
+    undo_handler.board.notify_objects_changed.assert_called_with("move", [1, 2])
+
+    undo_handler.canvas.move.reset_mock()
+    undo_handler.redo()
+    undo_handler.canvas.move.assert_has_calls([call(1, 10, -5), call(2, 10, -5)])
+    assert len(undo_handler.undo_stack) == 1
+    assert undo_handler.redo_stack == []
+
+
+def test_record_move_ignores_zero_offset(undo_handler):
+    undo_handler.record_move([1], 0, 0)
+
+    assert undo_handler.undo_stack == []
+
+
+def test_undo_redo_restyle(undo_handler):
+    undo_handler.canvas.itemcget = Mock(return_value="black")
+    undo_handler.record_restyle([1], {'fill': "red"})
+
+    undo_handler.undo()
+    undo_handler.canvas.itemconfig.assert_called_with(1, fill="black")
+
+    undo_handler.redo()
+    undo_handler.canvas.itemconfig.assert_called_with(1, fill="red")
+
+
+def test_undo_create_deletes_and_redo_recreates(undo_handler):
+    state = {'type': 'line', 'coords': [0, 0, 5, 5]}
+    undo_handler.board.objects = [1]
+    undo_handler.canvas.find_all = Mock(return_value=(1,))
+    undo_handler.canvas.find_below = Mock(return_value=())
+    undo_handler.board.file_handler.get_object_state = Mock(return_value=state)
+    undo_handler.board.file_handler.create_object_from_state = Mock(return_value=7)
+    undo_handler.record_create([1])
+
+    undo_handler.undo()
+    undo_handler.canvas.delete.assert_called_once_with(1)
+    assert undo_handler.board.objects == []
+
+    undo_handler.redo()
+    undo_handler.board.file_handler.create_object_from_state.assert_called_once_with(state)
+    undo_handler.canvas.tag_lower.assert_called_once_with(7)
+    assert undo_handler.board.objects == [7]
+    assert undo_handler.resolve(1) == 7
+
+
+def test_undo_delete_restores_stacking_position(undo_handler):
+    undo_handler.board.objects = [1, 2]
+    undo_handler.canvas.find_all = Mock(return_value=(1, 2))
+    undo_handler.canvas.find_below = Mock(return_value=(1,))
+    undo_handler.canvas.type = Mock(return_value="line")
+    undo_handler.board.file_handler.get_object_state = Mock(return_value={'type': 'oval'})
+    undo_handler.board.file_handler.create_object_from_state = Mock(return_value=3)
+    undo_handler.record_delete([2])
+    undo_handler.board.objects.remove(2)
+
+    undo_handler.undo()
+
+    undo_handler.canvas.tag_raise.assert_called_once_with(3, 1)
+    undo_handler.board.notify_objects_changed.assert_called_with("create", [3])
+    assert undo_handler.board.objects == [1, 3]
+
+
+def test_later_records_follow_recreated_objects(undo_handler):
+    undo_handler.board.objects = [1]
+    undo_handler.canvas.find_all = Mock(return_value=(1,))
+    undo_handler.canvas.find_below = Mock(return_value=())
+    undo_handler.board.file_handler.get_object_state = Mock(return_value={'type': 'line'})
+    undo_handler.board.file_handler.create_object_from_state = Mock(return_value=4)
+    undo_handler.record_delete([1])
+    undo_handler.board.objects.remove(1)
+    undo_handler.undo()
+    undo_handler.record_move([1], 3, 3)
+
+    undo_handler.undo()
+
+    undo_handler.canvas.move.assert_called_once_with(4, -3, -3)
+
+
+def test_undo_reorder_restores_neighbour(undo_handler):
+    undo_handler.canvas.find_all = Mock(return_value=(2, 5))
+    undo_handler.canvas.find_below = Mock(return_value=(5,))
+    undo_handler.canvas.type = Mock(return_value="rectangle")
+    undo_handler.record_reorder([2], to_front=True)
+
+    undo_handler.undo()
+    undo_handler.canvas.tag_raise.assert_called_once_with(2, 5)
+
+    undo_handler.redo()
+    undo_handler.canvas.tag_raise.assert_called_with(2)
+
+
+def test_redo_reorder_stays_within_layer(undo_handler):
+    undo_handler.board.layer_handler.add_layer()
+    undo_handler.canvas.find_all = Mock(return_value=(2, 5, 8))
+    undo_handler.canvas.find_below = Mock(return_value=(5,))
+    undo_handler.canvas.type = Mock(return_value="rectangle")
+    undo_handler.canvas.gettags = Mock(return_value=("object0", "layer:0"))
+    undo_handler.record_reorder([2], to_front=True)
+
+    undo_handler.undo()
+    undo_handler.redo()
+
+    undo_handler.canvas.tag_lower.assert_called_once_with(2, "layer:1")
+
+
+def test_undo_reorder_of_several_objects_restores_stacking_order(undo_handler):
+    stack = [1, 10, 2, 20]
+
+    def tag_raise(obj, above=None):
+        stack.remove(obj)
+        stack.insert(stack.index(above) + 1 if above is not None else len(stack), obj)
+
+    def tag_lower(obj):
+        stack.remove(obj)
+        stack.insert(0, obj)
+
+    undo_handler.canvas.find_all = Mock(side_effect=lambda: tuple(stack))
+    undo_handler.canvas.find_below = Mock(side_effect=lambda obj: tuple(stack[:stack.index(obj)][-1:]))
+    undo_handler.canvas.type = Mock(return_value="rectangle")
+    undo_handler.canvas.tag_raise = Mock(side_effect=tag_raise)
+    undo_handler.canvas.tag_lower = Mock(side_effect=tag_lower)
+
+    undo_handler.record_reorder([2, 1], to_front=True)
+    tag_raise(1)
+    tag_raise(2)
+    assert stack == [10, 20, 1, 2]
+
+    undo_handler.undo()
+    assert stack == [1, 10, 2, 20]
+
+    undo_handler.redo()
+    assert stack == [10, 20, 1, 2]
+
+    undo_handler.record_reorder([2, 20], to_front=False)
+    tag_lower(2)
+    tag_lower(20)
+    assert stack == [20, 2, 10, 1]
+
+    undo_handler.undo()
+    assert stack == [10, 20, 1, 2]
+
+    undo_handler.redo()
+    assert stack == [20, 2, 10, 1]
+
+
+def test_undo_redo_reshape(undo_handler):
+    undo_handler.canvas.coords = Mock(return_value=[0, 0, 10, 10])
+    undo_handler.record_reshape([1], [[0, 0, 20, 20]])
+
+    undo_handler.undo()
+    undo_handler.canvas.coords.assert_called_with(1, 0, 0, 10, 10)
+    undo_handler.board.notify_objects_changed.assert_called_with("move", [1])
+
+    undo_handler.redo()
+    undo_handler.canvas.coords.assert_called_with(1, 0, 0, 20, 20)
+
+
+def test_undo_redo_tag(undo_handler):
+    undo_handler.record_tag([1, 2], "group:0", added=True)
+
+    undo_handler.undo()
+    undo_handler.canvas.dtag.assert_has_calls([call(1, "group:0"), call(2, "group:0")])
+    undo_handler.board.notify_objects_changed.assert_called_with("restyle", [1, 2])
+
+    undo_handler.redo()
+    undo_handler.canvas.addtag_withtag.assert_has_calls([call("group:0", 1), call("group:0", 2)])
+
+
+def test_undo_redo_visibility(undo_handler):
+    undo_handler.board.layer_handler = Mock()
+    undo_handler.record_visibility("layer:1", False)
+
+    undo_handler.undo()
+    undo_handler.board.layer_handler.set_visible.assert_called_once_with("layer:1", True, record=False)
+
+    undo_handler.redo()
+    undo_handler.board.layer_handler.set_visible.assert_called_with("layer:1", False, record=False)
+
+
+def test_alias_objects_follows_recreated_objects(undo_handler):
+    undo_handler.alias_objects([1, 2, -1], [5, 0, 6])
+
+    assert undo_handler.resolve(1) == 5
+    assert undo_handler.resolve(2) == 2
+    assert undo_handler.resolve(-1) == 6
+
+
+def test_resolve_shortens_alias_chains(undo_handler):
+    undo_handler.alias_objects([1], [2])
+    undo_handler.alias_objects([2], [3])
+    undo_handler.alias_objects([3], [4])
+
+    assert undo_handler.resolve(1) == 4
+    assert undo_handler.id_aliases == {1: 4, 2: 4, 3: 4}
+
+
+def test_aliases_of_evicted_records_are_dropped(undo_handler):
+    undo_handler.memory_budget = 3 * UndoHandler.RECORD_OVERHEAD
+    with patch.object(UndoHandler, 'MIN_ALIAS_PRUNE_SIZE', 2):
+        undo_handler.alias_prune_size = 2
+        undo_handler.record_move([1], 1, 0)
+        undo_handler.record_move([2], 1, 0)
+        undo_handler.alias_objects([1, 2], [11, 12])
+        undo_handler.alias_objects([11], [21])
+        for obj in range(3, 6):
+            undo_handler.record_move([obj], 1, 0)
+        undo_handler.alias_objects([3, 4, 5], [13, 14, 15])
+
+    assert [record['objects'] for record in undo_handler.undo_stack] == [[4], [5]]
+    assert undo_handler.id_aliases == {4: 14, 5: 15}
+    assert undo_handler.resolve(4) == 14
+
+
+def test_group_is_undone_as_one_step(undo_handler):
+    undo_handler.begin_group()
+    undo_handler.record_move([1], 1, 0)
+    undo_handler.record_move([2], 2, 0)
+    undo_handler.end_group()
+
+    assert len(undo_handler.undo_stack) == 1
+    undo_handler.undo()
+    undo_handler.canvas.move.assert_has_calls([call(2, -2, 0), call(1, -1, 0)])
+
+
+def test_new_record_clears_redo_history(undo_handler):
+    undo_handler.record_move([1], 1, 1)
+    undo_handler.undo()
+
+    undo_handler.record_move([1], 2, 2)
+
+    assert undo_handler.redo_stack == []
+    assert undo_handler.history_size == undo_handler.undo_stack[0]['size']
+
+
+def test_old_records_are_compressed(undo_handler):
+    undo_handler.canvas.itemcget = Mock(return_value="black")
+    for _ in range(UndoHandler.UNCOMPRESSED_HISTORY + 1):
+        undo_handler.record_restyle([1], {'fill': "red"})
+
+    assert isinstance(undo_handler.undo_stack[0]['before'], bytes)
+    assert not isinstance(undo_handler.undo_stack[1]['before'], bytes)
+
+    for _ in range(UndoHandler.UNCOMPRESSED_HISTORY + 1):
+        undo_handler.undo()
+    undo_handler.canvas.itemconfig.assert_called_with(1, fill="black")
+
+
+def test_memory_budget_evicts_oldest_records(undo_handler):
+    undo_handler.memory_budget = 3 * UndoHandler.RECORD_OVERHEAD
+    for dx in range(1, 6):
+        undo_handler.record_move([1], dx, 0)
+
+    assert [record['dx'] for record in undo_handler.undo_stack] == [4, 5]
+    assert undo_handler.history_size <= undo_handler.memory_budget
+
+
+def test_clear(undo_handler):
+    undo_handler.record_move([1], 1, 1)
+    undo_handler.undo()
+    undo_handler.record_move([1], 1, 1)
+
+    undo_handler.clear()
+
+    assert undo_handler.undo_stack == []
+    assert undo_handler.redo_stack == []
+    assert undo_handler.history_size == 0
@@ -109,6 +109,8 @@ class TextEntryHandler:
                                       fill=self.toolbox.text_color)
             self.canvas.itemconfigure(text_object, state="normal")
             self.board.objects.append(text_object)
+            self.board.notify_objects_changed(self.board.CHANGE_CREATE, [text_object])
+            self.board.undo_handler.record_create([text_object])
         else:
             self.canvas.delete(text_object)
         self.canvas.delete(label_window)
@@ -0,0 +1,103 @@
+import os
+from typing import Any, Dict, List
+
+import numpy as np
+from PIL import Image
+
+from board_reader import BoardReader
+from deep_zoom_writer import DeepZoomWriter
+from export_cache import ExportCache
+from file_handler import FileHandler
+from object_renderer import ObjectRenderer
+
+
+class ThumbnailCache:
+    """
+    A class that renders small previews of board files and keeps them on disk, keyed by the path, modification
+    time and size of the board file, so that a board is only read again once it changes.
+
+    Previews are coarse renders: objects smaller than MIN_PIXELS in the preview are culled, and of boards with
+    more than MAX_OBJECTS objects only the largest are drawn.
+    """
+
+    CACHE_DIR = os.path.join(FileHandler.DEFAULT_DIR, ".thumbnails")
+    MAX_BYTES = 16 * 1024 * 1024
+    SIZE = 96
+    MAX_OBJECTS = 2000
+    MIN_PIXELS = 1.0
+    BACKGROUND_COLOR = "white"
+
+    def __init__(self, cache_dir: str = CACHE_DIR, size: int = SIZE) -> None:
+        """
+        Initialize the ThumbnailCache.
+
+        :param cache_dir: The directory holding the cached previews.
+        :param size: The length of the longer side of a preview in pixels.
+        """
+        self.cache = ExportCache(cache_dir, ThumbnailCache.MAX_BYTES)
+        self.size = size
+
+    def get_key(self, filename: str) -> str:
+        """
+        Get the cache key of the preview of a board file.
+
+        :param filename: The name of the board file.
+        :return: The key.
+        :raises OSError: If the file does not exist.
+        """
+        file_stat = os.stat(filename)
+        return ExportCache.get_key(os.path.abspath(filename), file_stat.st_mtime_ns, file_stat.st_size, self.size)
+
+    def get_thumbnail(self, filename: str) -> Image.Image:
+        """
+        Get the preview of a board file, rendering and caching it if the file changed since it was cached.
+        This reads the whole board, so it is meant to be called off the Tk thread.
+
+        :param filename: The name of the board file.
+        :return: The preview.
+        :raises OSError: If the file cannot be read.
+        :raises ValueError: If the file is not a board file.
+        """
+        key = self.get_key(filename)
+        image = self.cache.load_image(key)
+        if image is None:
+            image = self.render(filename)
+            self.cache.store_image(key, image)
+            self.cache.evict()
+        return image
+
+    def render(self, filename: str) -> Image.Image:
+        """
+        Render the visible objects of a board file to a preview.
+
+        :param filename: The name of the board file.
+        :return: The preview, with its longer side as long as the preview size.
+        """
+        reader = BoardReader(filename)
+        objects_state = [obj_state for obj_state in reader.get_visible_objects() if obj_state['coords']]
+        min_x, min_y, max_x, max_y = BoardReader.get_bounds(objects_state, FileHandler.MAX_COORDINATE_VALUE)
+        scale = self.size / max(max_x - min_x, max_y - min_y, 1.0)
+        image = Image.new("RGB", (max(1, round((max_x - min_x) * scale)), max(1, round((max_y - min_y) * scale))),
+                          ThumbnailCache.BACKGROUND_COLOR)
+        ObjectRenderer(image, min_x, min_y, scale, images=reader.get_images()).draw_objects(
+            ThumbnailCache.cull(objects_state, scale))
+        return image
+
+    @staticmethod
+    def cull(objects_state: List[Dict[str, Any]], scale: float) -> List[Dict[str, Any]]:
+        """
+        Drop the objects that are too small to show in a preview, and keep only the largest of the rest if
+        there are more than MAX_OBJECTS.
+
+        :param objects_state: The states of the objects, each with at least one point, bottom-most first.
+        :param scale: The number of preview pixels per board unit.
+        :return: The states of the objects to draw, in their original order.
+        """
+        if not objects_state:
+            return []
+        bounds = DeepZoomWriter.get_bounds(objects_state)
+        sizes = (bounds[:, 2:] - bounds[:, :2]).max(axis=1) * scale
+        indices = np.flatnonzero(sizes >= ThumbnailCache.MIN_PIXELS)
+        if len(indices) > ThumbnailCache.MAX_OBJECTS:
+            indices = np.sort(indices[np.argsort(-sizes[indices], kind="stable")[:ThumbnailCache.MAX_OBJECTS]])
+        return [objects_state[index] for index in indices]
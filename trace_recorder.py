@@ -0,0 +1,201 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+import tkinter as tk
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, TYPE_CHECKING
+
+from latency_monitor import LatencyMonitor
+
+if TYPE_CHECKING:
+    from board import Board
+
+
+class TraceRecorder:
+    """
+    A class that records begin and end spans of the application work in the Chrome trace-event format,
+    so that a session can be opened in a trace viewer such as chrome://tracing or Perfetto.
+
+    Tracing is process wide: it is started once, for example with the --trace option, and then covers the
+    event handlers and file operations of every board, all after callbacks and the font loading.
+    """
+
+    active: Optional['TraceRecorder'] = None
+
+    CATEGORY_EVENT = "event"
+    CATEGORY_AFTER = "after"
+    CATEGORY_IO = "io"
+    CATEGORY_FONTS = "fonts"
+
+    FILE_OPERATIONS = ["save_board", "load_board", "import_svg", "_export_board_as_image", "_export_board_as_svg",
+                       "_export_board_as_postscript", "_export_board_as_deep_zoom"]
+    PROCESS_NAME = "Picasso"
+
+    def __init__(self, filename: str) -> None:
+        """
+        Initialize the TraceRecorder.
+
+        :param filename: The name of the trace file to write.
+        """
+        self.filename = filename
+        self.events: List[Dict[str, Any]] = []
+        self.thread_names: Dict[int, str] = {}
+        self.pid = os.getpid()
+        self.start_time = time.perf_counter()
+        self.original_after: Optional[Callable[..., Any]] = None
+        self.original_after_idle: Optional[Callable[..., Any]] = None
+
+    @staticmethod
+    def start(filename: str) -> 'TraceRecorder':
+        """
+        Start tracing the application.
+
+        :param filename: The name of the trace file, written when the application exits.
+        :return: The active recorder.
+        """
+        recorder = TraceRecorder(filename)
+        recorder.trace_after_callbacks()
+        TraceRecorder.active = recorder
+        atexit.register(recorder.stop)
+        return recorder
+
+    @staticmethod
+    @contextmanager
+    def span(name: str, category: str) -> Iterator[None]:
+        """
+        Record a span around a block of code if tracing is active.
+
+        :param name: The name of the span.
+        :param category: The category of the span.
+        """
+        recorder = TraceRecorder.active
+        if recorder is None:
+            yield
+            return
+        recorder.add_event(name, category, "B")
+        try:
+            yield
+        finally:
+            recorder.add_event(name, category, "E")
+
+    def add_event(self, name: str, category: str, phase: str) -> None:
+        """
+        Add a trace event for the current thread.
+
+        :param name: The name of the span.
+        :param category: The category of the span.
+        :param phase: "B" for the beginning of a span, "E" for its end.
+        """
+        thread = threading.current_thread()
+        tid = thread.ident or 0
+        if tid not in self.thread_names:
+            self.thread_names[tid] = thread.name
+        self.events.append({
+            'name': name,
+            'cat': category,
+            'ph': phase,
+            'ts': (time.perf_counter() - self.start_time) * 1e6,
+            'pid': self.pid,
+            'tid': tid,
+        })
+
+    def wrap(self, name: str, category: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap a function so that every call is recorded as a span.
+
+        :param name: The name of the span.
+        :param category: The category of the span.
+        :param func: The function.
+        :return: The traced function.
+        """
+        @functools.wraps(func)
+        def traced(*args: Any, **kwargs: Any) -> Any:
+            self.add_event(name, category, "B")
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add_event(name, category, "E")
+        return traced
+
+    def install(self, board: 'Board') -> None:
+        """
+        Trace the event handlers and the file operations of a board.
+        Must be called before the board sets up its bindings.
+
+        :param board: The board instance.
+        """
+        for handler in LatencyMonitor.EVENT_HANDLERS:
+            setattr(board, handler, self.wrap(f"Board.{handler}", TraceRecorder.CATEGORY_EVENT,
+                                              getattr(board, handler)))
+        for operation in TraceRecorder.FILE_OPERATIONS:
+            setattr(board.file_handler, operation, self.wrap(f"FileHandler.{operation}", TraceRecorder.CATEGORY_IO,
+                                                             getattr(board.file_handler, operation)))
+        board.autosave_handler.write_snapshot = self.wrap(  # type: ignore
+            "AutosaveHandler.write_snapshot", TraceRecorder.CATEGORY_IO, board.autosave_handler.write_snapshot)
+
+    def trace_after_callbacks(self) -> None:
+        """
+        Trace every callback scheduled with after or after_idle on any widget.
+        """
+        original_after = self.original_after = tk.Misc.after
+        original_after_idle = self.original_after_idle = tk.Misc.after_idle
+
+        def traced_after(widget: tk.Misc, ms: Any, func: Optional[Callable[..., Any]] = None, *args: Any) -> Any:
+            if func is None:
+                return original_after(widget, ms)  # type: ignore
+            return original_after(widget, ms, self.wrap(self._callback_name(func), TraceRecorder.CATEGORY_AFTER,
+                                                        func), *args)
+
+        def traced_after_idle(widget: tk.Misc, func: Callable[..., Any], *args: Any) -> Any:
+            return original_after_idle(widget, self.wrap(self._callback_name(func), TraceRecorder.CATEGORY_AFTER,
+                                                         func), *args)
+
+        tk.Misc.after = traced_after  # type: ignore
+        tk.Misc.after_idle = traced_after_idle  # type: ignore
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Build the trace in the Chrome trace-event format.
+
+        :return: The trace.
+        """
+        metadata: List[Dict[str, Any]] = [
+            {'name': "process_name", 'ph': "M", 'pid': self.pid, 'tid': 0,
+             'args': {'name': TraceRecorder.PROCESS_NAME}},
+        ]
+        for tid, thread_name in self.thread_names.items():
+            metadata.append({'name': "thread_name", 'ph': "M", 'pid': self.pid, 'tid': tid,
+                             'args': {'name': thread_name}})
+        return {'traceEvents': metadata + self.events, 'displayTimeUnit': "ms"}
+
+    def write(self) -> None:
+        """
+        Write the trace file.
+        """
+        with open(self.filename, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    def stop(self) -> None:
+        """
+        Stop tracing and write the trace file.
+        """
+        atexit.unregister(self.stop)
+        if self.original_after is not None and self.original_after_idle is not None:
+            tk.Misc.after = self.original_after  # type: ignore
+            tk.Misc.after_idle = self.original_after_idle  # type: ignore
+        if TraceRecorder.active is self:
+            TraceRecorder.active = None
+        self.write()
+
+    @staticmethod
+    def _callback_name(func: Callable[..., Any]) -> str:
+        """
+        Get a readable name for a scheduled callback.
+
+        :param func: The callback.
+        :return: The qualified name of the callback.
+        """
+        return getattr(func, '__qualname__', repr(func))
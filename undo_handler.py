@@ -0,0 +1,464 @@
+import json
+import zlib
+from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from board import Board
+
+
+class UndoHandler:
+    """
+    A class that handles the undo and redo history of the board.
+
+    Every mutating action is recorded as a compact change record (for example the offset of a move or the
+    previous values of the changed options). Only deletions keep full object states. The history is kept
+    within a memory budget by compressing older records and evicting the oldest ones.
+    """
+
+    DEFAULT_MEMORY_BUDGET = 8 * 1024 * 1024
+    UNCOMPRESSED_HISTORY = 20
+    RECORD_OVERHEAD = 64
+    MIN_ALIAS_PRUNE_SIZE = 1024
+
+    ACTION_CREATE = "create"
+    ACTION_DELETE = "delete"
+    ACTION_MOVE = "move"
+    ACTION_RESTYLE = "restyle"
+    ACTION_REORDER = "reorder"
+    ACTION_RESHAPE = "reshape"
+    ACTION_TAG = "tag"
+    ACTION_GROUP = "group"
+    ACTION_VISIBILITY = "visibility"
+
+    def __init__(self, board: 'Board', memory_budget: int = DEFAULT_MEMORY_BUDGET) -> None:
+        """
+        Initialize the UndoHandler.
+
+        :param board: The board instance.
+        :param memory_budget: The approximate maximum size of the history in bytes.
+        """
+        self.board = board
+        self.canvas = board.canvas
+        self.memory_budget = memory_budget
+        self.undo_stack: List[Dict[str, Any]] = []
+        self.redo_stack: List[Dict[str, Any]] = []
+        self.history_size: int = 0
+        self.id_aliases: Dict[int, int] = {}
+        self.alias_prune_size: int = UndoHandler.MIN_ALIAS_PRUNE_SIZE
+        self.group: Optional[List[Dict[str, Any]]] = None
+        root = board.app.get_root()
+        root.bind("<Control-z>", lambda _: self.undo())
+        root.bind("<Control-y>", lambda _: self.redo())
+
+    def record_create(self, objects: List[int]) -> None:
+        """
+        Record that objects have been created.
+
+        :param objects: The IDs of the created objects.
+        """
+        if objects:
+            self._push({'action': UndoHandler.ACTION_CREATE, 'objects': list(objects)})
+
+    def record_delete(self, objects: List[int]) -> None:
+        """
+        Record that objects are about to be deleted. Must be called before the objects are removed.
+
+        :param objects: The IDs of the objects to be deleted.
+        """
+        if objects:
+            self._push(dict(self._capture_objects(objects), action=UndoHandler.ACTION_DELETE))
+
+    def record_move(self, objects: List[int], dx: float, dy: float) -> None:
+        """
+        Record that objects have been moved.
+
+        :param objects: The IDs of the moved objects.
+        :param dx: The horizontal offset of the move.
+        :param dy: The vertical offset of the move.
+        """
+        if objects and (dx or dy):
+            self._push({'action': UndoHandler.ACTION_MOVE, 'objects': list(objects), 'dx': dx, 'dy': dy})
+
+    def record_restyle(self, objects: List[int], options: Dict[str, Any]) -> None:
+        """
+        Record that options of objects are about to change. Must be called before the options are applied.
+
+        :param objects: The IDs of the objects to be restyled.
+        :param options: The new option values.
+        """
+        if objects:
+            before = [{option: self.canvas.itemcget(obj, option) for option in options}  # type: ignore
+                      for obj in objects]
+            self._push({'action': UndoHandler.ACTION_RESTYLE, 'objects': list(objects),
+                        'before': before, 'after': dict(options)})
+
+    def record_reshape(self, objects: List[int], objects_coords: List[List[float]]) -> None:
+        """
+        Record that the coordinates of objects are about to change, for example when they are scaled or rotated.
+        Must be called before the coordinates are applied.
+
+        :param objects: The IDs of the objects to be reshaped.
+        :param objects_coords: The new coordinates of every object.
+        """
+        if objects:
+            self._push({'action': UndoHandler.ACTION_RESHAPE, 'objects': list(objects),
+                        'before': [self.canvas.coords(obj) for obj in objects], 'coords': list(objects_coords)})
+
+    def record_tag(self, objects: List[int], tag: str, added: bool) -> None:
+        """
+        Record that a tag has been added to or removed from objects, for example when they are grouped.
+
+        :param objects: The IDs of the objects.
+        :param tag: The tag.
+        :param added: True if the tag was added, False if it was removed.
+        """
+        if objects:
+            self._push({'action': UndoHandler.ACTION_TAG, 'objects': list(objects), 'tag': tag, 'added': added})
+
+    def record_visibility(self, layer: str, visible: bool) -> None:
+        """
+        Record that a layer has been shown or hidden.
+
+        :param layer: The layer tag.
+        :param visible: True if the layer was shown, False if it was hidden.
+        """
+        self._push({'action': UndoHandler.ACTION_VISIBILITY, 'objects': [], 'layer': layer, 'visible': visible})
+
+    def record_reorder(self, objects: List[int], to_front: bool) -> None:
+        """
+        Record that objects are about to be moved to the front or back. Must be called before reordering.
+
+        :param objects: The IDs of the objects to be reordered.
+        :param to_front: True if the objects move to the front, False if they move to the back.
+        """
+        if objects:
+            positions = {obj: position for position, obj in enumerate(self.canvas.find_all())}
+            ordered = sorted(objects, key=lambda obj: positions.get(obj, -1))
+            self._push({'action': UndoHandler.ACTION_REORDER, 'objects': ordered,
+                        'below': [self._find_below(obj) for obj in ordered], 'to_front': to_front})
+
+    def begin_group(self) -> None:
+        """
+        Start collecting records into a single undo step, for example during an eraser stroke.
+        """
+        if self.group is None:
+            self.group = []
+
+    def end_group(self) -> None:
+        """
+        Finish the current undo step started with begin_group.
+        """
+        group = self.group
+        self.group = None
+        if group:
+            self._push(group[0] if len(group) == 1 else {'action': UndoHandler.ACTION_GROUP, 'records': group})
+
+    def undo(self) -> None:
+        """
+        Undo the most recent change.
+        """
+        if self.undo_stack:
+            record = self.undo_stack.pop()
+            self.history_size -= record['size']
+            self.board.object_selector.deselect_current_objects()
+            self._apply(record, undo=True)
+            self._store(self.redo_stack, record)
+
+    def redo(self) -> None:
+        """
+        Redo the most recently undone change.
+        """
+        if self.redo_stack:
+            record = self.redo_stack.pop()
+            self.history_size -= record['size']
+            self.board.object_selector.deselect_current_objects()
+            self._apply(record, undo=False)
+            self._store(self.undo_stack, record)
+
+    def clear(self) -> None:
+        """
+        Clear the whole history, for example when a new board is loaded.
+        """
+        self.undo_stack = []
+        self.redo_stack = []
+        self.history_size = 0
+        self.id_aliases = {}
+        self.alias_prune_size = UndoHandler.MIN_ALIAS_PRUNE_SIZE
+        self.group = None
+
+    def resolve(self, obj: int) -> int:
+        """
+        Get the current ID of an object that may have been recreated by undo or redo.
+        The chain of aliases followed is shortened to a single step.
+
+        :param obj: The recorded object ID.
+        :return: The current object ID.
+        """
+        chain = []
+        while obj in self.id_aliases:
+            chain.append(obj)
+            obj = self.id_aliases[obj]
+        for old_obj in chain[:-1]:
+            self.id_aliases[old_obj] = obj
+        return obj
+
+    def alias_objects(self, old_objects: List[int], new_objects: List[int]) -> None:
+        """
+        Make the records of objects that have been recreated, for example when a hidden layer is shown again,
+        refer to the new objects.
+
+        :param old_objects: The former object IDs.
+        :param new_objects: The IDs of the recreated objects, in the same order (0 for objects not recreated).
+        """
+        for old_obj, new_obj in zip(old_objects, new_objects):
+            if new_obj != 0 and old_obj != new_obj:
+                self.id_aliases[old_obj] = new_obj
+        self._limit_aliases()
+
+    def _push(self, record: Dict[str, Any]) -> None:
+        """
+        Add a new record to the current group or the undo stack, discarding the redo history.
+
+        :param record: The change record.
+        """
+        if self.group is not None:
+            self.group.append(record)
+            return
+        for redo_record in self.redo_stack:
+            self.history_size -= redo_record['size']
+        self.redo_stack = []
+        self._store(self.undo_stack, record)
+
+    def _store(self, stack: List[Dict[str, Any]], record: Dict[str, Any]) -> None:
+        """
+        Put a record on a stack and enforce the memory budget.
+
+        :param stack: The undo or redo stack.
+        :param record: The change record.
+        """
+        record['size'] = self._get_record_size(record)
+        stack.append(record)
+        self.history_size += record['size']
+        if len(stack) > UndoHandler.UNCOMPRESSED_HISTORY:
+            old_record = stack[-UndoHandler.UNCOMPRESSED_HISTORY - 1]
+            self.history_size -= old_record['size']
+            self._compress(old_record)
+            old_record['size'] = self._get_record_size(old_record)
+            self.history_size += old_record['size']
+        while self.history_size > self.memory_budget and (self.undo_stack or self.redo_stack):
+            oldest_stack = self.undo_stack if self.undo_stack else self.redo_stack
+            self.history_size -= oldest_stack.pop(0)['size']
+        self._limit_aliases()
+
+    def _limit_aliases(self) -> None:
+        """
+        Drop the aliases that no record refers to any more, for example after their records have been evicted.
+        This runs whenever the aliases have doubled since they were last pruned, so its cost is spread over
+        the changes that added them.
+        """
+        if len(self.id_aliases) <= self.alias_prune_size:
+            return
+        referenced: Set[int] = set()
+        for record in self.undo_stack + self.redo_stack + (self.group or []):
+            self._collect_objects(record, referenced)
+        self.id_aliases = {obj: self.resolve(obj) for obj in referenced if obj in self.id_aliases}
+        self.alias_prune_size = max(UndoHandler.MIN_ALIAS_PRUNE_SIZE, 2 * len(self.id_aliases))
+
+    def _collect_objects(self, record: Dict[str, Any], objects: Set[int]) -> None:
+        """
+        Collect the object IDs a record refers to.
+
+        :param record: The change record.
+        :param objects: The set the object IDs are added to.
+        """
+        if record['action'] == UndoHandler.ACTION_GROUP:
+            for sub_record in record['records']:
+                self._collect_objects(sub_record, objects)
+            return
+        objects.update(record['objects'])
+        objects.update(obj for obj in record.get('below', []) if obj is not None)
+
+    def _get_record_size(self, record: Dict[str, Any]) -> int:
+        """
+        Estimate the memory used by a record.
+
+        :param record: The change record.
+        :return: The estimated size in bytes.
+        """
+        if record['action'] == UndoHandler.ACTION_GROUP:
+            return sum(self._get_record_size(sub_record) for sub_record in record['records'])
+        size = UndoHandler.RECORD_OVERHEAD + 8 * len(record['objects'])
+        for key in ('states', 'before', 'coords'):
+            value = record.get(key)
+            if isinstance(value, bytes):
+                size += len(value)
+            elif value is not None:
+                size += len(json.dumps(value))
+        return size
+
+    def _compress(self, record: Dict[str, Any]) -> None:
+        """
+        Compress the bulky parts of an old record.
+
+        :param record: The change record.
+        """
+        if record['action'] == UndoHandler.ACTION_GROUP:
+            for sub_record in record['records']:
+                self._compress(sub_record)
+            return
+        for key in ('states', 'before', 'coords'):
+            value = record.get(key)
+            if value is not None and not isinstance(value, bytes):
+                record[key] = zlib.compress(json.dumps(value).encode())
+
+    @staticmethod
+    def _decompress(value: Any) -> Any:
+        """
+        Decompress a part of a record if it was compressed.
+
+        :param value: The possibly compressed value.
+        :return: The plain value.
+        """
+        if isinstance(value, bytes):
+            return json.loads(zlib.decompress(value))
+        return value
+
+    def _apply(self, record: Dict[str, Any], undo: bool) -> None:
+        """
+        Undo or redo a record.
+
+        :param record: The change record.
+        :param undo: True to undo the record, False to redo it.
+        """
+        action = record['action']
+        if action == UndoHandler.ACTION_GROUP:
+            sub_records = reversed(record['records']) if undo else record['records']
+            for sub_record in sub_records:
+                self._apply(sub_record, undo)
+        elif action == UndoHandler.ACTION_MOVE:
+            sign = -1 if undo else 1
+            objects = [self.resolve(obj) for obj in record['objects']]
+            for obj in objects:
+                self.canvas.move(obj, sign * record['dx'], sign * record['dy'])
+            self.board.notify_objects_changed(self.board.CHANGE_MOVE, objects)
+        elif action == UndoHandler.ACTION_RESTYLE:
+            objects = [self.resolve(obj) for obj in record['objects']]
+            before = self._decompress(record['before'])
+            for obj, options in zip(objects, before):
+                self.canvas.itemconfig(obj, **(options if undo else record['after']))
+            self.board.notify_objects_changed(self.board.CHANGE_RESTYLE, objects)
+        elif action == UndoHandler.ACTION_RESHAPE:
+            objects = [self.resolve(obj) for obj in record['objects']]
+            objects_coords = self._decompress(record['before'] if undo else record['coords'])
+            for obj, coords in zip(objects, objects_coords):
+                self.canvas.coords(obj, *coords)
+            self.board.notify_objects_changed(self.board.CHANGE_MOVE, objects)
+        elif action == UndoHandler.ACTION_TAG:
+            objects = [self.resolve(obj) for obj in record['objects']]
+            for obj in objects:
+                if record['added'] != undo:
+                    self.canvas.addtag_withtag(record['tag'], obj)
+                else:
+                    self.canvas.dtag(obj, record['tag'])
+            self.board.notify_objects_changed(self.board.CHANGE_RESTYLE, objects)
+        elif action == UndoHandler.ACTION_REORDER:
+            self._apply_reorder(record, undo)
+        elif action == UndoHandler.ACTION_VISIBILITY:
+            self.board.layer_handler.set_visible(record['layer'], record['visible'] != undo, record=False)
+        elif (action == UndoHandler.ACTION_CREATE) != undo:
+            self._recreate_objects(record)
+        else:
+            record.update(self._capture_objects(record['objects']))
+            self._delete_objects(record['objects'])
+
+    def _apply_reorder(self, record: Dict[str, Any], undo: bool) -> None:
+        """
+        Undo or redo a move to the front or back.
+
+        :param record: The reorder record.
+        :param undo: True to restore the previous stacking order, False to reorder again.
+        """
+        objects = [self.resolve(obj) for obj in record['objects']]
+        layer_handler = self.board.layer_handler
+        if undo:
+            # Bottom-most first, so that a neighbour that was reordered too is already back in place
+            for obj, below in zip(objects, record['below']):
+                self._restore_position(obj, below)
+        elif record['to_front']:
+            for obj in objects:
+                layer_handler.raise_to_layer_top(obj, layer_handler.get_layer(obj))
+        else:
+            for obj in reversed(objects):
+                layer_handler.lower_to_layer_bottom(obj, layer_handler.get_layer(obj))
+        self.board.notify_objects_changed(self.board.CHANGE_REORDER, objects)
+
+    def _capture_objects(self, objects: List[int]) -> Dict[str, Any]:
+        """
+        Capture what is needed to recreate objects, bottom-most first.
+
+        :param objects: The IDs of the objects.
+        :return: The record fields holding the object IDs, states and stacking neighbours.
+        """
+        resolved = [self.resolve(obj) for obj in objects]
+        positions = {obj: position for position, obj in enumerate(self.canvas.find_all())}
+        ordered = sorted((obj for obj in resolved if obj in positions), key=lambda x: positions[x])
+        return {
+            'objects': ordered,
+            'states': [self.board.file_handler.get_object_state(obj) for obj in ordered],
+            'below': [self._find_below(obj) for obj in ordered],
+        }
+
+    def _find_below(self, obj: int) -> Optional[int]:
+        """
+        Find the item directly below an object in the stacking order.
+
+        :param obj: The object ID.
+        :return: The ID of the item below, or None if the object is at the bottom.
+        """
+        below = self.canvas.find_below(obj)
+        return below[0] if below else None
+
+    def _restore_position(self, obj: int, below: Optional[int]) -> None:
+        """
+        Put an object back directly above its former neighbour.
+
+        :param obj: The object ID.
+        :param below: The recorded ID of the item that was directly below the object.
+        """
+        below = self.resolve(below) if below is not None else None
+        if below is not None and self.canvas.type(below):  # type: ignore
+            self.canvas.tag_raise(obj, below)
+        else:
+            self.canvas.tag_lower(obj)
+
+    def _recreate_objects(self, record: Dict[str, Any]) -> None:
+        """
+        Recreate deleted objects from their captured states.
+
+        :param record: The record holding the object states.
+        """
+        created_objects: List[int] = []
+        states = self._decompress(record['states'])
+        for old_obj, obj_state, below in zip(record['objects'], states, record['below']):
+            obj = self.board.file_handler.create_object_from_state(obj_state)
+            if obj == 0:
+                continue
+            self.canvas.addtag_withtag(f"object{len(self.board.objects)}", obj)
+            self._restore_position(obj, below)
+            self.id_aliases[old_obj] = obj
+            self.board.objects.append(obj)
+            created_objects.append(obj)
+        self.board.notify_objects_changed(self.board.CHANGE_CREATE, created_objects)
+
+    def _delete_objects(self, objects: List[int]) -> None:
+        """
+        Delete objects from the canvas and the board.
+
+        :param objects: The IDs of the objects.
+        """
+        resolved = [self.resolve(obj) for obj in objects]
+        self.board.notify_objects_changed(self.board.CHANGE_DELETE, resolved)
+        deleted = set(resolved)
+        for obj in resolved:
+            self.canvas.delete(obj)
+        self.board.objects[:] = [obj for obj in self.board.objects if obj not in deleted]